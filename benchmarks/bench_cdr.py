@@ -0,0 +1,48 @@
+"""
+Benchmarks for CDR parsing and aggregation.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+
+
+class _StaticGraph:
+    """Graph stand-in that returns pre-generated records without I/O."""
+
+    def __init__(self, records: List[Dict[str, Any]]) -> None:
+        self._records = records
+
+    def get_call_records(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self._records
+
+
+def bench_parse_call_record(
+    measure: Callable, raw_records: List[Dict[str, Any]]
+) -> None:
+    """Benchmark parsing raw Graph records into CallRecord models."""
+    service = CallRecordService.__new__(CallRecordService)
+
+    def parse() -> List[CallRecord]:
+        return [service._parse_call_record(r) for r in raw_records]
+
+    records = measure(parse)
+    assert len(records) == len(raw_records)
+
+
+def bench_get_call_summary(measure: Callable, call_records: List[CallRecord]) -> None:
+    """Benchmark summary statistics over parsed records."""
+    service = CallRecordService.__new__(CallRecordService)
+    summary = measure(service.get_call_summary, call_records)
+    assert summary["total_calls"] == len(call_records)
+
+
+def bench_get_user_calls(measure: Callable, raw_records: List[Dict[str, Any]]) -> None:
+    """Benchmark fetching, parsing and filtering one user's calls."""
+    graph: Any = _StaticGraph(raw_records)
+    service = CallRecordService(graph_client=graph)
+    user = raw_records[0]["organizer"]["identity"]["userPrincipalName"]
+
+    calls = measure(service.get_user_calls, user)
+    assert calls
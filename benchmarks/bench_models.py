@@ -0,0 +1,72 @@
+"""
+Benchmarks for LLM context, embedding documents and vector search.
+"""
+
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.main import CDRAssistant
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.models.vector_index import VectorIndex
+
+
+def bench_record_to_document(measure: Callable, call_records: List[CallRecord]) -> None:
+    """Benchmark building embedding documents from records."""
+    client = EmbeddingsClient()
+
+    def build() -> List[str]:
+        return [client._record_to_document(r) for r in call_records]
+
+    documents = measure(build)
+    assert len(documents) == len(call_records)
+
+
+def bench_format_call_records(
+    measure: Callable, call_records: List[CallRecord]
+) -> None:
+    """Benchmark formatting records as LLM context."""
+    assistant = CDRAssistant()
+    context = measure(assistant._format_call_records, call_records)
+    assert context.startswith(f"Found {len(call_records)}")
+
+
+def _vector_index(path: Path, scale: int, quantize: bool) -> VectorIndex:
+    """Fill a vector index with ``scale`` random 384-dimension vectors."""
+    rng = np.random.default_rng(0)
+    index = VectorIndex(str(path), quantize=quantize)
+    for start in range(0, scale, 50_000):
+        count = min(50_000, scale - start)
+        index.upsert(
+            ids=[f"call-{i}" for i in range(start, start + count)],
+            embeddings=rng.standard_normal((count, 384), dtype=np.float32),
+            # Spread durations over the hour so the >= 3000 s filter matches
+            metadatas=[
+                {"duration_seconds": (i * 7) % 3600}
+                for i in range(start, start + count)
+            ],
+        )
+    return index
+
+
+def bench_vector_index_query(measure: Callable, scale: int, tmp_path: Path) -> None:
+    """Benchmark a top-10 search over float32 vectors."""
+    index = _vector_index(tmp_path, scale, quantize=False)
+    query = [np.random.default_rng(1).standard_normal(384).tolist()]
+
+    result = measure(index.query, query, 10)
+    assert len(result["ids"][0]) == min(10, scale)
+
+
+def bench_vector_index_query_int8_filtered(
+    measure: Callable, scale: int, tmp_path: Path
+) -> None:
+    """Benchmark a filtered top-10 search over int8 vectors."""
+    index = _vector_index(tmp_path, scale, quantize=True)
+    query = [np.random.default_rng(1).standard_normal(384).tolist()]
+    where = {"duration_seconds": {"$gte": 3000}}
+
+    result = measure(index.query, query, 10, where)
+    assert result["ids"][0]
@@ -0,0 +1,192 @@
+"""
+Benchmark configuration, data fixtures and baseline regression checks.
+
+Each benchmark records its median time (via pytest-benchmark) and its peak
+traced memory (via tracemalloc). Results can be saved as a baseline JSON
+file; later runs fail if any benchmark regresses past the threshold.
+
+Usage:
+    pytest benchmarks --bench-save-baseline
+    pytest benchmarks --bench-scale=1k,100k --bench-threshold=0.25
+"""
+
+import json
+import os
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.testing.synthetic import SyntheticCDRConfig, SyntheticCDRGenerator
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Unique records generated per scale; larger scales repeat this pool so a
+# 1M-record run keeps per-record costs realistic without holding 1M objects.
+POOL_SIZE = 20_000
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+_results: Dict[str, Dict[str, float]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register benchmark options."""
+    group = parser.getgroup("eden-teams benchmarks")
+    group.addoption(
+        "--bench-scale",
+        default=os.environ.get("EDEN_BENCH_SCALE", "1k"),
+        help="Comma-separated record counts to run: 1k, 100k, 1m (default: 1k)",
+    )
+    group.addoption(
+        "--bench-baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON file to compare against or save to",
+    )
+    group.addoption(
+        "--bench-save-baseline",
+        action="store_true",
+        help="Write this run's results to the baseline file",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=float(os.environ.get("EDEN_BENCH_THRESHOLD", "0.25")),
+        help="Allowed relative regression before failing (default: 0.25)",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize benchmarks that take a ``scale`` argument."""
+    if "scale" in metafunc.fixturenames:
+        names = [s.strip() for s in metafunc.config.getoption("bench_scale").split(",")]
+        unknown = [n for n in names if n not in SCALES]
+        if unknown:
+            raise pytest.UsageError(f"Unknown --bench-scale: {', '.join(unknown)}")
+        metafunc.parametrize("scale", [SCALES[n] for n in names], ids=names)
+
+
+_raw_pool: List[Dict[str, Any]] = []
+
+
+def _pool(size: int) -> List[Dict[str, Any]]:
+    """Get the first ``size`` records of the shared synthetic pool."""
+    if len(_raw_pool) < size:
+        config = SyntheticCDRConfig(seed=2024, include_sessions=False)
+        generator = SyntheticCDRGenerator(config)
+        _raw_pool[:] = list(generator.iter_call_records(POOL_SIZE))
+    return _raw_pool[:size]
+
+
+def _repeat(pool: List[Any], scale: int) -> List[Any]:
+    """Extend a pool to ``scale`` items by repetition."""
+    copies, remainder = divmod(scale, len(pool))
+    return pool * copies + pool[:remainder]
+
+
+@pytest.fixture
+def raw_records(scale: int) -> List[Dict[str, Any]]:
+    """Provide ``scale`` Graph-shaped call record dictionaries."""
+    return _repeat(_pool(min(scale, POOL_SIZE)), scale)
+
+
+@pytest.fixture
+def call_records(scale: int) -> List[CallRecord]:
+    """Provide ``scale`` parsed CallRecord models."""
+    service = CallRecordService.__new__(CallRecordService)
+    pool = [service._parse_call_record(r) for r in _pool(min(scale, POOL_SIZE))]
+    return _repeat(pool, scale)
+
+
+def _peak_memory(func: Callable[..., Any], args: Tuple[Any, ...]) -> int:
+    """Run a function once under tracemalloc and return its peak allocation."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.fixture
+def measure(benchmark: Any, request: pytest.FixtureRequest, scale: int) -> Callable:
+    """
+    Provide a runner that benchmarks a function for time and peak memory.
+
+    Returns:
+        Callable taking the function and its positional arguments.
+    """
+
+    def run(func: Callable[..., Any], *args: Any) -> Any:
+        rounds = max(3, min(20, 200_000 // scale))
+        result = benchmark.pedantic(
+            func, args=args, rounds=rounds, iterations=1, warmup_rounds=1
+        )
+        peak = _peak_memory(func, args)
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        if benchmark.stats is not None:
+            _results[request.node.name] = {
+                "median_seconds": benchmark.stats.stats.median,
+                "peak_memory_bytes": peak,
+            }
+        return result
+
+    return run
+
+
+def _regressions(baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Compare this run's results with a baseline."""
+    failures = []
+    for name, current in sorted(_results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, value in current.items():
+            reference = previous.get(metric)
+            if reference and value > reference * (1 + threshold):
+                failures.append(
+                    f"{name}: {metric} {value:.6g} vs baseline {reference:.6g} "
+                    f"({(value / reference - 1) * 100:+.0f}%)"
+                )
+    return failures
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    """Report peak memory alongside pytest-benchmark's timing table."""
+    if not _results:
+        return
+    terminalreporter.section("peak traced memory")
+    for name, result in sorted(_results.items()):
+        mib = result["peak_memory_bytes"] / (1024 * 1024)
+        terminalreporter.write_line(f"{name:<45} {mib:>10.2f} MiB")
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Save the baseline or fail the run on regressions."""
+    config = session.config
+    if not _results:
+        return
+
+    path: Path = config.getoption("bench_baseline")
+    if config.getoption("bench_save_baseline"):
+        merged = json.loads(path.read_text()) if path.exists() else {}
+        merged.update(_results)
+        path.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved benchmark baseline to {path}")
+        return
+
+    if not path.exists():
+        return
+
+    threshold = config.getoption("bench_threshold")
+    failures = _regressions(json.loads(path.read_text()), threshold)
+    if failures:
+        print(f"\nPerformance regressions beyond {threshold:.0%}:")
+        for failure in failures:
+            print(f"  {failure}")
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
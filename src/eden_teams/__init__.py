@@ -9,6 +9,14 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from eden_teams.main import main
+from typing import TYPE_CHECKING
+
+from eden_teams.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from eden_teams.main import main
 
 __all__ = ["main", "__version__"]
+
+# Imported on first use, to keep the CLI quick to start
+__getattr__, __dir__ = lazy_exports(__name__, {"main": "eden_teams.main"})
@@ -5,8 +5,22 @@ This package provides models and services for working with
 Microsoft Teams call records.
 """
 
-from eden_teams.cdr.models import CallQuality, CallRecord, CallSession, Participant
-from eden_teams.cdr.service import CallRecordService
+from typing import TYPE_CHECKING
+
+from eden_teams.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from eden_teams.cdr.index import CallIndex, CallRow
+    from eden_teams.cdr.models import (
+        CallQuality,
+        CallRecord,
+        CallSession,
+        Participant,
+    )
+    from eden_teams.cdr.rollups import CallRollup
+    from eden_teams.cdr.service import CallRecordService
+    from eden_teams.cdr.tools import CallTools
+    from eden_teams.cdr.working_set import WorkingSet, WorkingSetStats
 
 __all__ = [
     "CallRecord",
@@ -14,4 +28,28 @@ __all__ = [
     "Participant",
     "CallQuality",
     "CallRecordService",
+    "CallRollup",
+    "CallIndex",
+    "CallRow",
+    "CallTools",
+    "WorkingSet",
+    "WorkingSetStats",
 ]
+
+# Imported on first use, so that the models load without the Graph client
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CallRecord": "eden_teams.cdr.models",
+        "CallSession": "eden_teams.cdr.models",
+        "Participant": "eden_teams.cdr.models",
+        "CallQuality": "eden_teams.cdr.models",
+        "CallRecordService": "eden_teams.cdr.service",
+        "CallRollup": "eden_teams.cdr.rollups",
+        "CallIndex": "eden_teams.cdr.index",
+        "CallRow": "eden_teams.cdr.index",
+        "CallTools": "eden_teams.cdr.tools",
+        "WorkingSet": "eden_teams.cdr.working_set",
+        "WorkingSetStats": "eden_teams.cdr.working_set",
+    },
+)
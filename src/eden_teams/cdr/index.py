@@ -0,0 +1,361 @@
+"""
+In-memory index over call records.
+
+This module provides CallIndex, which answers aggregate questions (summary,
+per-user calls, top callers, quality and peak concurrency) over every call
+in a window. Records are reduced to compact CallRow tuples sorted by start
+time, so date ranges are found by bisection and users by a hash lookup.
+"""
+
+import bisect
+import heapq
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+
+
+class CallRow(NamedTuple):
+    """Compact, immutable view of a call record used by CallIndex."""
+
+    id: str
+    call_type: str
+    start: datetime
+    end: Optional[datetime]
+    duration_seconds: int
+    organizer: Optional[str]
+    participants: Tuple[str, ...]
+    aliases: FrozenSet[str]
+    packet_loss: Optional[float]
+    jitter_ms: Optional[float]
+    poor_quality: bool
+
+    @classmethod
+    def from_record(cls, record: CallRecord) -> "CallRow":
+        """
+        Reduce a call record to a row.
+
+        Args:
+            record: Parsed call record.
+
+        Returns:
+            Row holding the fields CallIndex needs.
+        """
+        aliases: Set[str] = set()
+        for participant in record.participants:
+            for name in (
+                participant.email,
+                participant.display_name,
+                participant.user_id,
+                participant.phone_number,
+            ):
+                if name:
+                    aliases.add(name.lower())
+
+        qualities = [s.quality for s in record.sessions if s.quality is not None]
+        losses = [
+            q.average_packet_loss_rate
+            for q in qualities
+            if q.average_packet_loss_rate is not None
+        ]
+        jitters = [
+            q.average_jitter.total_seconds() * 1000
+            for q in qualities
+            if q.average_jitter is not None
+        ]
+        return cls(
+            id=record.id,
+            call_type=record.call_type.value,
+            start=record.start_time,
+            end=record.end_time,
+            duration_seconds=record.duration_seconds or 0,
+            organizer=record.organizer.identifier if record.organizer else None,
+            participants=tuple(p.identifier for p in record.participants),
+            aliases=frozenset(aliases),
+            packet_loss=sum(losses) / len(losses) if losses else None,
+            jitter_ms=sum(jitters) / len(jitters) if jitters else None,
+            poor_quality=any(not q.is_good_quality for q in qualities),
+        )
+
+    def brief(self) -> Dict[str, Any]:
+        """Describe the call in a few fields for an LLM tool result."""
+        return {
+            "id": self.id,
+            "type": self.call_type,
+            "start": self.start.isoformat(),
+            "duration": CallRecordService._format_duration(self.duration_seconds),
+            "organizer": self.organizer,
+            "participants": len(self.participants),
+        }
+
+
+class CallIndex:
+    """
+    Read-only index answering aggregate questions over call rows.
+
+    Every query accepts the same optional filters: ``start`` and ``end``
+    (datetimes bounding the call start), ``call_type`` and ``user`` (email,
+    display name, user ID or phone number, case-insensitive).
+    """
+
+    def __init__(self, rows: Iterable[CallRow]) -> None:
+        """
+        Build the index.
+
+        Args:
+            rows: Call rows, in any order.
+        """
+        self._rows = sorted(rows, key=lambda row: row.start)
+        self._starts = [row.start for row in self._rows]
+        self._by_user: Dict[str, List[int]] = {}
+        for position, row in enumerate(self._rows):
+            for alias in row.aliases:
+                self._by_user.setdefault(alias, []).append(position)
+
+    @classmethod
+    def from_records(cls, records: Iterable[CallRecord]) -> "CallIndex":
+        """
+        Build an index from parsed call records.
+
+        Args:
+            records: Call records.
+
+        Returns:
+            Index over the records.
+        """
+        return cls(CallRow.from_record(record) for record in records)
+
+    def __len__(self) -> int:
+        """Get the number of indexed calls."""
+        return len(self._rows)
+
+    def select(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        call_type: Optional[str] = None,
+        user: Optional[str] = None,
+    ) -> List[CallRow]:
+        """
+        Select the calls matching the filters.
+
+        Args:
+            start: Earliest call start, inclusive.
+            end: Latest call start, exclusive.
+            call_type: Call type value, e.g. "meeting".
+            user: Participant to filter on.
+
+        Returns:
+            Matching rows, oldest first.
+        """
+        low = bisect.bisect_left(self._starts, start) if start else 0
+        high = bisect.bisect_left(self._starts, end) if end else len(self._rows)
+
+        if user is not None:
+            positions = self._by_user.get(user.lower(), [])
+            first = bisect.bisect_left(positions, low)
+            last = bisect.bisect_left(positions, high)
+            rows = [self._rows[p] for p in positions[first:last]]
+        else:
+            rows = self._rows[low:high]
+
+        if call_type is not None:
+            rows = [row for row in rows if row.call_type == call_type]
+        return rows
+
+    def summary(self, **filters: Any) -> Dict[str, Any]:
+        """
+        Summarize the matching calls.
+
+        Args:
+            **filters: Filters accepted by select().
+
+        Returns:
+            Dictionary with the same keys as CallRecordService.get_call_summary.
+        """
+        rows = self.select(**filters)
+        total = sum(row.duration_seconds for row in rows)
+        average = total // len(rows) if rows else 0
+        participants: Set[str] = set()
+        for row in rows:
+            participants.update(row.participants)
+
+        summary: Dict[str, Any] = {
+            "total_calls": len(rows),
+            "total_duration_seconds": total,
+            "average_duration_seconds": average,
+            "total_duration_formatted": CallRecordService._format_duration(total),
+            "average_duration_formatted": CallRecordService._format_duration(average),
+            "call_types": dict(Counter(row.call_type for row in rows)),
+            "participant_count": len(participants),
+        }
+        if rows:
+            summary["date_range"] = {
+                "start": rows[0].start.isoformat(),
+                "end": rows[-1].start.isoformat(),
+            }
+        return summary
+
+    def user_calls(self, user: str, limit: int = 10, **filters: Any) -> Dict[str, Any]:
+        """
+        Summarize one user's calls and list the most recent ones.
+
+        Args:
+            user: Participant to look up.
+            limit: Maximum calls to list.
+            **filters: Other filters accepted by select().
+
+        Returns:
+            Dictionary with the user's totals and recent calls.
+        """
+        rows = self.select(user=user, **filters)
+        total = sum(row.duration_seconds for row in rows)
+        return {
+            "user": user,
+            "total_calls": len(rows),
+            "total_duration_formatted": CallRecordService._format_duration(total),
+            "call_types": dict(Counter(row.call_type for row in rows)),
+            "organized": sum(
+                1
+                for row in rows
+                if row.organizer and row.organizer.lower() == user.lower()
+            ),
+            "recent_calls": [row.brief() for row in reversed(rows[-limit:])],
+        }
+
+    def top_callers(
+        self, k: int = 5, by: str = "calls", **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank participants by number of calls or time spent in calls.
+
+        Args:
+            k: Number of participants to return.
+            by: "calls" or "duration".
+            **filters: Filters accepted by select().
+
+        Returns:
+            Participants with their call count and total duration, best first.
+
+        Raises:
+            ValueError: If ``by`` is not "calls" or "duration".
+        """
+        if by not in ("calls", "duration"):
+            raise ValueError(f"Unknown ranking: {by}")
+
+        calls: Counter = Counter()
+        seconds: Counter = Counter()
+        for row in self.select(**filters):
+            for participant in set(row.participants):
+                calls[participant] += 1
+                seconds[participant] += row.duration_seconds
+
+        ranking = calls if by == "calls" else seconds
+        return [
+            {
+                "user": user,
+                "calls": calls[user],
+                "total_duration": CallRecordService._format_duration(seconds[user]),
+            }
+            for user, _ in ranking.most_common(k)
+        ]
+
+    def quality_stats(self, worst: int = 5, **filters: Any) -> Dict[str, Any]:
+        """
+        Aggregate media quality over the matching calls.
+
+        Only calls fetched with their sessions carry quality metrics. When
+        none of the matching calls do, the result says so instead of
+        reporting zeros.
+
+        Args:
+            worst: Number of calls with the highest packet loss to list.
+            **filters: Filters accepted by select().
+
+        Returns:
+            Dictionary with average packet loss and jitter and poor-call
+            counts, or a note that quality data is not loaded.
+        """
+        rows = self.select(**filters)
+        measured = [row for row in rows if row.packet_loss is not None]
+        losses = [row.packet_loss for row in measured if row.packet_loss is not None]
+        jitters = [row.jitter_ms for row in rows if row.jitter_ms is not None]
+        if not measured and not jitters:
+            return {
+                "total_calls": len(rows),
+                "calls_with_quality_data": 0,
+                "note": (
+                    "Media quality data is not loaded: call records are listed "
+                    "without their sessions, so packet loss and jitter are "
+                    "unknown. Do not report quality as zero."
+                ),
+            }
+        poor = sum(1 for row in rows if row.poor_quality)
+
+        stats: Dict[str, Any] = {
+            "total_calls": len(rows),
+            "calls_with_quality_data": len(measured),
+            "poor_quality_calls": poor,
+            "poor_quality_rate": round(poor / len(measured), 4) if measured else None,
+            "average_packet_loss_rate": (
+                round(sum(losses) / len(losses), 4) if losses else None
+            ),
+            "average_jitter_ms": (
+                round(sum(jitters) / len(jitters), 1) if jitters else None
+            ),
+        }
+        stats["worst_calls"] = [
+            dict(row.brief(), packet_loss_rate=row.packet_loss)
+            for row in heapq.nlargest(
+                worst, measured, key=lambda r: r.packet_loss or 0.0
+            )
+        ]
+        return stats
+
+    def peak_concurrency(self, **filters: Any) -> Dict[str, Any]:
+        """
+        Find the largest number of calls in progress at the same time.
+
+        Args:
+            **filters: Filters accepted by select().
+
+        Returns:
+            Dictionary with the peak, when it started and the busiest hours.
+        """
+        rows = self.select(**filters)
+        # Ends sort before starts at the same instant so back-to-back calls
+        # do not count as overlapping
+        events: List[Tuple[datetime, int]] = []
+        for row in rows:
+            end = row.end or row.start + timedelta(seconds=row.duration_seconds)
+            events.append((row.start, 1))
+            events.append((end, -1))
+        events.sort()
+
+        peak, current, peak_at = 0, 0, None
+        for when, change in events:
+            current += change
+            if current > peak:
+                peak, peak_at = current, when
+
+        hours = Counter(row.start.hour for row in rows)
+        return {
+            "total_calls": len(rows),
+            "peak_concurrent_calls": peak,
+            "peak_at": peak_at.isoformat() if peak_at else None,
+            "busiest_hours": [
+                {"hour": hour, "calls": count} for hour, count in hours.most_common(3)
+            ],
+        }
@@ -0,0 +1,171 @@
+"""
+Streaming aggregates of call records.
+
+This module provides CallRollup, which summarizes any number of call
+records in one pass while keeping only counters and a bounded sample of the
+most recent records. It lets wide time windows (e.g. 90 days) be analyzed
+without holding every record in memory.
+"""
+
+import heapq
+import itertools
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+
+
+class CallRollup:
+    """
+    One-pass aggregate of call records.
+
+    Memory grows with the number of distinct participants, organizers and
+    days, not with the number of records. Rollups over disjoint record sets
+    can be combined, so callers can keep one rollup per day and rebuild only
+    the days that change.
+    """
+
+    def __init__(self, sample_size: int = 20) -> None:
+        """
+        Initialize an empty rollup.
+
+        Args:
+            sample_size: Number of most recent records to keep.
+        """
+        self.sample_size = sample_size
+        self.count = 0
+        self.total_duration_seconds = 0
+        self.call_types: Counter = Counter()
+        self.modalities: Counter = Counter()
+        self.organizers: Counter = Counter()
+        self.daily_counts: Counter = Counter()
+        self.participants: Set[str] = set()
+        self.first_start: Optional[datetime] = None
+        self.last_start: Optional[datetime] = None
+        self._sample: List[Tuple[datetime, int, CallRecord]] = []
+        self._sequence = itertools.count()
+
+    def add(self, record: CallRecord) -> None:
+        """
+        Add a record to the rollup.
+
+        Args:
+            record: Call record to count.
+        """
+        self.count += 1
+        self.total_duration_seconds += record.duration_seconds or 0
+        self.call_types[record.call_type.value] += 1
+        for modality in record.modalities:
+            self.modalities[modality.value] += 1
+        if record.organizer:
+            self.organizers[record.organizer.identifier] += 1
+        for participant in record.participants:
+            self.participants.add(participant.identifier)
+
+        start = record.start_time
+        self.daily_counts[start.date().isoformat()] += 1
+        if self.first_start is None or start < self.first_start:
+            self.first_start = start
+        if self.last_start is None or start > self.last_start:
+            self.last_start = start
+        self._offer(start, record)
+
+    def add_all(self, records: Iterable[CallRecord]) -> "CallRollup":
+        """
+        Add records from an iterable, consuming it lazily.
+
+        Args:
+            records: Call records to count.
+
+        Returns:
+            This rollup.
+        """
+        for record in records:
+            self.add(record)
+        return self
+
+    def _offer(self, start: datetime, record: CallRecord) -> None:
+        """Keep the record if it is among the most recent seen."""
+        if self.sample_size <= 0:
+            return
+        entry = (start, next(self._sequence), record)
+        if len(self._sample) < self.sample_size:
+            heapq.heappush(self._sample, entry)
+        elif start > self._sample[0][0]:
+            heapq.heapreplace(self._sample, entry)
+
+    @property
+    def sample(self) -> List[CallRecord]:
+        """Get the most recent records kept, newest first."""
+        return [record for _, _, record in sorted(self._sample, reverse=True)]
+
+    @classmethod
+    def combine(
+        cls, rollups: Iterable["CallRollup"], sample_size: int = 20
+    ) -> "CallRollup":
+        """
+        Combine rollups over disjoint sets of records.
+
+        Args:
+            rollups: Rollups to combine.
+            sample_size: Number of most recent records to keep.
+
+        Returns:
+            A new rollup equal to one built from all the records.
+        """
+        combined = cls(sample_size=sample_size)
+        for rollup in rollups:
+            combined.count += rollup.count
+            combined.total_duration_seconds += rollup.total_duration_seconds
+            combined.call_types.update(rollup.call_types)
+            combined.modalities.update(rollup.modalities)
+            combined.organizers.update(rollup.organizers)
+            combined.daily_counts.update(rollup.daily_counts)
+            combined.participants |= rollup.participants
+            for start in (rollup.first_start, rollup.last_start):
+                if start is None:
+                    continue
+                if combined.first_start is None or start < combined.first_start:
+                    combined.first_start = start
+                if combined.last_start is None or start > combined.last_start:
+                    combined.last_start = start
+            for start, _, record in rollup._sample:
+                combined._offer(start, record)
+        return combined
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """
+        Summarize the rollup.
+
+        The result has the same keys as CallRecordService.get_call_summary,
+        plus ``modalities``, ``top_organizers`` and ``daily_counts``.
+
+        Args:
+            top: Number of top organizers to include.
+
+        Returns:
+            Dictionary with summary statistics.
+        """
+        average = self.total_duration_seconds // self.count if self.count else 0
+        summary: Dict[str, Any] = {
+            "total_calls": self.count,
+            "total_duration_seconds": self.total_duration_seconds,
+            "average_duration_seconds": average,
+            "total_duration_formatted": CallRecordService._format_duration(
+                self.total_duration_seconds
+            ),
+            "average_duration_formatted": CallRecordService._format_duration(average),
+            "call_types": dict(self.call_types),
+            "participant_count": len(self.participants),
+            "modalities": dict(self.modalities),
+            "top_organizers": self.organizers.most_common(top),
+            "daily_counts": dict(sorted(self.daily_counts.items())),
+        }
+        if self.first_start is not None and self.last_start is not None:
+            summary["date_range"] = {
+                "start": self.first_start.isoformat(),
+                "end": self.last_start.isoformat(),
+            }
+        return summary
@@ -6,10 +6,12 @@ Microsoft Teams call records.
 """
 
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from eden_teams.cdr.models import (
+    CallQuality,
     CallRecord,
     CallSession,
     CallType,
@@ -17,9 +19,18 @@ from eden_teams.cdr.models import (
     Participant,
 )
 from eden_teams.graph.client import GraphClient
+from eden_teams.utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
+# Media stream timings in Graph are ISO 8601 durations such as "PT0.015S"
+_TIMESPAN = re.compile(r"PT(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?")
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    """Average a list of numbers, or None if it is empty."""
+    return sum(values) / len(values) if values else None
+
 
 class CallRecordService:
     """
@@ -40,6 +51,11 @@ class CallRecordService:
         self._user_cache: Dict[str, Dict[str, Any]] = {}
         logger.info("CallRecordService initialized")
 
+    @property
+    def graph(self) -> GraphClient:
+        """Get the underlying Graph API client."""
+        return self._graph
+
     def get_call_records(
         self,
         start_date: Optional[datetime] = None,
@@ -68,16 +84,77 @@ class CallRecordService:
             end_date.isoformat(),
         )
 
-        raw_records = self._graph.get_call_records(
-            start_date=start_date,
-            end_date=end_date,
-            top=limit,
-        )
+        with tracing.span(
+            "cdr.get_call_records",
+            **{
+                "cdr.start_date": start_date.isoformat(),
+                "cdr.end_date": end_date.isoformat(),
+                "cdr.limit": limit,
+            },
+        ) as span:
+            raw_records = self._graph.get_call_records(
+                start_date=start_date,
+                end_date=end_date,
+                top=limit,
+            )
+            records = self.parse_call_records(raw_records)
+            span.set_attribute("cdr.record_count", len(records))
+            return records
+
+    def parse_call_records(self, raw_records: List[Dict[str, Any]]) -> List[CallRecord]:
+        """
+        Parse raw Graph API call records.
+
+        Args:
+            raw_records: Call record dictionaries from the Graph API.
 
-        records = [self._parse_call_record(r) for r in raw_records]
+        Returns:
+            List of CallRecord objects.
+        """
+        with (
+            metrics.timer("cdr_parse_seconds", kind="batch"),
+            tracing.span("cdr.parse", **{"cdr.record_count": len(raw_records)}),
+        ):
+            records = [self._parse_call_record(r) for r in raw_records]
+        metrics.increment("cdr_records_parsed_total", len(records))
         logger.info("Parsed %d call records", len(records))
         return records
 
+    def iter_call_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CallRecord]:
+        """
+        Stream call records within a date range.
+
+        Records are parsed one at a time as Graph response pages arrive,
+        so memory stays bounded by a single record rather than a page.
+
+        Args:
+            start_date: Start of date range. Defaults to 7 days ago.
+            end_date: End of date range. Defaults to now.
+            limit: Maximum number of records to yield.
+
+        Yields:
+            CallRecord objects in response order.
+        """
+        if start_date is None:
+            start_date = datetime.utcnow() - timedelta(days=7)
+        if end_date is None:
+            end_date = datetime.utcnow()
+
+        for raw_record in self._graph.iter_call_records(
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+        ):
+            with metrics.timer("cdr_parse_seconds", kind="record"):
+                record = self._parse_call_record(raw_record)
+            metrics.increment("cdr_records_parsed_total")
+            yield record
+
     def get_call_record(
         self, call_id: str, include_sessions: bool = False
     ) -> CallRecord:
@@ -91,14 +168,47 @@ class CallRecordService:
         Returns:
             CallRecord object.
         """
-        raw_record = self._graph.get_call_record(call_id)
-        record = self._parse_call_record(raw_record)
+        with tracing.span(
+            "cdr.get_call_record", **{"cdr.include_sessions": include_sessions}
+        ) as span:
+            raw_record = self._graph.get_call_record(call_id)
+            record = self._parse_call_record(raw_record)
+
+            if include_sessions:
+                raw_sessions = self._graph.get_call_record_sessions(call_id)
+                record.sessions = [self._parse_session(s) for s in raw_sessions]
+                span.set_attribute("cdr.session_count", len(record.sessions))
 
-        if include_sessions:
-            raw_sessions = self._graph.get_call_record_sessions(call_id)
-            record.sessions = [self._parse_session(s) for s in raw_sessions]
+            return record
 
-        return record
+    def get_call_records_by_id(self, call_ids: List[str]) -> Dict[str, CallRecord]:
+        """
+        Get several call records by ID with batched requests.
+
+        Args:
+            call_ids: Unique identifiers of the call records.
+
+        Returns:
+            The records found, by ID. Records Graph could not return, e.g.
+            because they no longer exist, are left out.
+        """
+        with tracing.span(
+            "cdr.get_call_records_by_id", **{"cdr.requested": len(call_ids)}
+        ) as span:
+            responses = self._graph.batch(
+                [{"url": f"/communications/callRecords/{i}"} for i in call_ids]
+            )
+            records: Dict[str, CallRecord] = {}
+            for call_id, response in zip(call_ids, responses):
+                status = response.get("status", 0)
+                if 200 <= status < 300:
+                    records[call_id] = self._parse_call_record(response["body"])
+                else:
+                    logger.warning(
+                        "Could not fetch call record %s: status %d", call_id, status
+                    )
+            span.set_attribute("cdr.record_count", len(records))
+            return records
 
     def get_user_calls(
         self,
@@ -134,6 +244,8 @@ class CallRecordService:
         logger.info("Found %d calls for user %s", len(user_records), user_id)
         return user_records
 
+    @metrics.timed("cdr_summary_seconds")
+    @tracing.traced("cdr.get_call_summary")
     def get_call_summary(self, records: List[CallRecord]) -> Dict[str, Any]:
         """
         Generate a summary of call records.
@@ -204,6 +316,7 @@ class CallRecordService:
             organizer=self._parse_participant(data.get("organizer")),
             participants=participants,
             modalities=[self._parse_modality(m) for m in data.get("modalities", [])],
+            sessions=[self._parse_session(s) for s in data.get("sessions", [])],
             version=data.get("version", 1),
             join_web_url=data.get("joinWebUrl"),
         )
@@ -217,9 +330,42 @@ class CallRecordService:
             start_time=self._parse_datetime(data.get("startDateTime")),
             end_time=self._parse_datetime(data.get("endDateTime")),
             modalities=[self._parse_modality(m) for m in data.get("modalities", [])],
+            quality=self._parse_quality(data.get("segments", [])),
             failure_info=data.get("failureInfo", {}).get("reason"),
         )
 
+    def _parse_quality(self, segments: List[Dict[str, Any]]) -> Optional[CallQuality]:
+        """Aggregate media stream metrics across a session's segments."""
+        streams = [
+            stream
+            for segment in segments
+            for media in segment.get("media", [])
+            for stream in media.get("streams", [])
+        ]
+        if not streams:
+            return None
+
+        def numbers(key: str) -> List[float]:
+            return [s[key] for s in streams if s.get(key) is not None]
+
+        def timespans(key: str) -> List[timedelta]:
+            parsed = (self._parse_timespan(s.get(key)) for s in streams)
+            return [t for t in parsed if t is not None]
+
+        jitter = timespans("averageJitter")
+        round_trip = timespans("averageRoundTripTime")
+        return CallQuality(
+            average_audio_degradation=_mean(numbers("averageAudioDegradation")),
+            average_jitter=sum(jitter, timedelta()) / len(jitter) if jitter else None,
+            average_packet_loss_rate=_mean(numbers("averagePacketLossRate")),
+            average_round_trip_time=(
+                sum(round_trip, timedelta()) / len(round_trip) if round_trip else None
+            ),
+            average_video_frame_rate=_mean(numbers("averageVideoFrameRate")),
+            jitter_max=max(timespans("maxJitter"), default=None),
+            packet_loss_max=max(numbers("maxPacketLossRate"), default=None),
+        )
+
     def _parse_participant(
         self, data: Optional[Dict[str, Any]]
     ) -> Optional[Participant]:
@@ -268,6 +414,15 @@ class CallRecordService:
         except ValueError:
             return None
 
+    @staticmethod
+    def _parse_timespan(value: Optional[str]) -> Optional[timedelta]:
+        """Parse an ISO 8601 duration in seconds, e.g. "PT0.015S"."""
+        match = _TIMESPAN.fullmatch(value or "")
+        if match is None:
+            return None
+        minutes, seconds = match.groups()
+        return timedelta(minutes=int(minutes or 0), seconds=float(seconds or 0))
+
     @staticmethod
     def _format_duration(seconds: int) -> str:
         """Format seconds as human-readable duration."""
@@ -0,0 +1,174 @@
+"""
+LLM tools over the local call index.
+
+This module defines the function-calling schemas offered to the model and
+CallTools, which executes the model's tool calls against a CallIndex. The
+model receives small JSON aggregates computed over every call in the window
+instead of reading raw records in its prompt.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from eden_teams.cdr.index import CallIndex
+from eden_teams.cdr.models import CallType
+
+logger = logging.getLogger(__name__)
+
+_FILTER_PROPERTIES: Dict[str, Any] = {
+    "start_date": {
+        "type": "string",
+        "description": "Earliest call start, ISO 8601 date or datetime (UTC).",
+    },
+    "end_date": {
+        "type": "string",
+        "description": "Latest call start, ISO 8601 date (inclusive) or "
+        "datetime (exclusive), UTC.",
+    },
+    "call_type": {
+        "type": "string",
+        "enum": [t.value for t in CallType],
+        "description": "Only include calls of this type.",
+    },
+}
+
+_USER_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "Email address, display name, user ID or phone number.",
+}
+
+
+def _function(
+    name: str,
+    description: str,
+    properties: Dict[str, Any],
+    required: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build an OpenAI function tool schema."""
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": required or [],
+            },
+        },
+    }
+
+
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    _function(
+        "get_call_summary",
+        "Count calls and total and average duration, broken down by call "
+        "type, for an optional date range, call type and participant.",
+        dict(_FILTER_PROPERTIES, user=_USER_PROPERTY),
+    ),
+    _function(
+        "get_user_calls",
+        "Get one participant's call totals and their most recent calls.",
+        dict(
+            _FILTER_PROPERTIES,
+            user=_USER_PROPERTY,
+            limit={"type": "integer", "description": "Calls to list (default 10)."},
+        ),
+        required=["user"],
+    ),
+    _function(
+        "get_top_callers",
+        "Rank participants by number of calls or by time spent in calls.",
+        dict(
+            _FILTER_PROPERTIES,
+            k={"type": "integer", "description": "Participants to return (default 5)."},
+            by={"type": "string", "enum": ["calls", "duration"]},
+        ),
+    ),
+    _function(
+        "get_quality_stats",
+        "Average packet loss and jitter, poor-quality call counts and the "
+        "calls with the worst packet loss. Says so when quality data is not "
+        "loaded for the matching calls.",
+        dict(_FILTER_PROPERTIES, user=_USER_PROPERTY),
+    ),
+    _function(
+        "get_peak_concurrency",
+        "Largest number of calls in progress at once, when it happened and "
+        "the busiest hours of the day (UTC).",
+        dict(_FILTER_PROPERTIES, user=_USER_PROPERTY),
+    ),
+]
+
+
+def _parse_bound(value: Optional[str], end: bool = False) -> Optional[datetime]:
+    """
+    Parse a date or datetime argument as naive UTC.
+
+    Whole end dates are inclusive. Offsets are converted to UTC, and naive
+    values are taken to be UTC already.
+    """
+    if not value:
+        return None
+    text = value.rstrip("Z")
+    parsed = datetime.fromisoformat(text)
+    if end and len(text) == 10:
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class CallTools:
+    """
+    Executes LLM tool calls against a call index.
+
+    Tool errors are returned to the model as ``{"error": ...}`` results so it
+    can correct its arguments, rather than failing the whole query.
+    """
+
+    definitions = TOOL_DEFINITIONS
+
+    def __init__(self, index: CallIndex) -> None:
+        """
+        Initialize the tools.
+
+        Args:
+            index: Index over the calls in the working set.
+        """
+        self.index = index
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            "get_call_summary": index.summary,
+            "get_user_calls": index.user_calls,
+            "get_top_callers": lambda **kw: {"top_callers": index.top_callers(**kw)},
+            "get_quality_stats": index.quality_stats,
+            "get_peak_concurrency": index.peak_concurrency,
+        }
+
+    def call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a tool.
+
+        Args:
+            name: Tool name from TOOL_DEFINITIONS.
+            arguments: Arguments decoded from the model's tool call.
+
+        Returns:
+            JSON-serializable tool result.
+        """
+        handler = self._handlers.get(name)
+        if handler is None:
+            return {"error": f"Unknown tool: {name}"}
+
+        kwargs = dict(arguments)
+        try:
+            kwargs["start"] = _parse_bound(kwargs.pop("start_date", None))
+            kwargs["end"] = _parse_bound(kwargs.pop("end_date", None), end=True)
+            result: Dict[str, Any] = handler(**kwargs)
+        except (TypeError, ValueError) as e:
+            logger.warning("Tool %s rejected arguments %s: %s", name, arguments, e)
+            return {"error": str(e)}
+
+        logger.debug("Tool %s(%s) answered", name, arguments)
+        return result
@@ -0,0 +1,396 @@
+"""
+Session-scoped working set of call records.
+
+This module keeps the call records for the active time window, and the
+summary derived from them, between queries. Follow-up questions reuse the
+cached data; once it is older than the staleness interval only the tail of
+the window is refetched and merged in.
+
+Windows longer than ``settings.rollup_threshold_days`` are streamed into
+per-day CallRollups instead of being held as records, so memory stays
+bounded for wide windows such as 90 days. Each record is also reduced to
+a compact CallRow so tools can query every call through a CallIndex.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from eden_teams.cdr.index import CallIndex, CallRow
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.rollups import CallRollup
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.config import settings
+from eden_teams.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+
+class WorkingSetStats(BaseModel):
+    """How the working set satisfied the latest request."""
+
+    result: str = Field(description="'load', 'refresh' or 'hit'")
+    seconds: float = Field(description="Time spent fetching and merging")
+    records: int = Field(description="Records in the working set")
+    new_records: int = Field(default=0, description="Records added or updated")
+    age_seconds: float = Field(default=0.0, description="Age of the cached data")
+
+    @property
+    def cache_hit(self) -> bool:
+        """Check if the request was served without calling Graph."""
+        return self.result == "hit"
+
+
+class WorkingSet:
+    """
+    Call records for a sliding time window, refreshed incrementally.
+
+    The first request loads the whole window. Later requests within the
+    staleness interval are served from memory. After that, records starting
+    from the last refresh (minus an overlap, since Graph publishes records
+    once calls end) are fetched and merged by call ID, and records that
+    have slid out of the window are dropped.
+
+    In rollup mode records are streamed into one CallRollup per day. The
+    window starts at midnight, a refresh re-streams the days touched by the
+    tail, and days that slide out of the window are dropped whole. Only a
+    sample of the most recent records is kept for the LLM context, plus a
+    compact CallRow per call for the tool index.
+    """
+
+    def __init__(
+        self,
+        service: CallRecordService,
+        days: int = 7,
+        limit: Optional[int] = 100,
+        staleness_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        rollup: Optional[bool] = None,
+        sample_size: int = 20,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        """
+        Initialize the working set.
+
+        Args:
+            service: Service used to fetch call records.
+            days: Length of the window in days, ending now.
+            limit: Maximum records per fetch in record mode. Unbounded if
+                None. Rollup mode always streams the whole window.
+            staleness_seconds: Age after which the tail is refreshed.
+                Uses settings.working_set_staleness_seconds if None.
+            overlap_seconds: How far before the last refresh to refetch.
+                Uses settings.working_set_overlap_seconds if None.
+            rollup: Whether to stream into per-day rollups instead of
+                keeping records. Defaults to True for windows longer than
+                settings.rollup_threshold_days.
+            sample_size: Most recent records kept in rollup mode.
+            clock: Returns the current UTC time.
+        """
+        self.service = service
+        self.days = days
+        self.limit = limit
+        self.staleness_seconds = (
+            staleness_seconds
+            if staleness_seconds is not None
+            else settings.working_set_staleness_seconds
+        )
+        self.overlap_seconds = (
+            overlap_seconds
+            if overlap_seconds is not None
+            else settings.working_set_overlap_seconds
+        )
+        self.rollup = (
+            days > settings.rollup_threshold_days if rollup is None else rollup
+        )
+        self.sample_size = sample_size
+        self._clock = clock
+        self._records: Dict[str, CallRecord] = {}
+        self._days: Dict[date, CallRollup] = {}
+        self._day_rows: Dict[date, List[CallRow]] = {}
+        self._combined: Optional[CallRollup] = None
+        self._index: Optional[Tuple[int, CallIndex]] = None
+        self._digest: Optional[Tuple[int, str]] = None
+        self._summary: Optional[Dict[str, Any]] = None
+        self._fetched_until: Optional[datetime] = None
+        self._fetched_at = 0.0
+        self.version = 0
+        self.last_stats: Optional[WorkingSetStats] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Check if the window has been loaded."""
+        return self._fetched_until is not None
+
+    @property
+    def records(self) -> List[CallRecord]:
+        """
+        Get the cached records without refreshing.
+
+        In rollup mode this is the sample of most recent records.
+        """
+        if self.rollup:
+            return self._rollup().sample
+        return list(self._records.values())
+
+    @property
+    def total_records(self) -> int:
+        """Get the number of records in the window."""
+        if self.rollup:
+            return self._rollup().count
+        return len(self._records)
+
+    def get_records(self) -> List[CallRecord]:
+        """
+        Get the records for the window, refreshing them if stale.
+
+        Returns:
+            Call records in the window, or in rollup mode the sample of the
+            most recent ones.
+        """
+        started = time.perf_counter()
+        now = self._clock()
+        age = time.monotonic() - self._fetched_at
+
+        with tracing.span("cdr.working_set") as span:
+            if not self.loaded:
+                result = "load"
+                new_records = self._load_days(now) if self.rollup else self._load(now)
+            elif age >= self.staleness_seconds:
+                result = "refresh"
+                new_records = (
+                    self._refresh_days(now) if self.rollup else self._refresh_tail(now)
+                )
+            else:
+                result = "hit"
+                new_records = 0
+            span.set_attributes(
+                **{
+                    "cache.hit": result == "hit",
+                    "cdr.working_set.result": result,
+                    "cdr.record_count": self.total_records,
+                    "cdr.working_set.rollup": self.rollup,
+                }
+            )
+
+        metrics.increment("working_set_requests_total", result=result)
+        self.last_stats = WorkingSetStats(
+            result=result,
+            seconds=time.perf_counter() - started,
+            records=self.total_records,
+            new_records=new_records,
+            age_seconds=0.0 if result != "hit" else age,
+        )
+        return self.records
+
+    def get_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary of the cached records.
+
+        The summary is computed once per change to the working set.
+
+        Returns:
+            Summary from CallRecordService.get_call_summary (or
+            CallRollup.summary in rollup mode), or None if the working set
+            is empty.
+        """
+        if not self.total_records:
+            return None
+        if self._summary is None and self.rollup:
+            self._summary = self._rollup().summary()
+        elif self._summary is None:
+            self._summary = self.service.get_call_summary(self.records)
+        return self._summary
+
+    def get_index(self) -> CallIndex:
+        """
+        Get an index over every call in the window.
+
+        The index is rebuilt once per change to the working set. In rollup
+        mode it is built from the rows kept alongside the daily rollups, so
+        it covers all calls, not just the sample.
+
+        Returns:
+            CallIndex over the cached calls.
+        """
+        if self._index is None or self._index[0] != self.version:
+            if self.rollup:
+                index = CallIndex(
+                    row for rows in self._day_rows.values() for row in rows
+                )
+            else:
+                index = CallIndex.from_records(self._records.values())
+            self._index = (self.version, index)
+        return self._index[1]
+
+    def get_watermark(self) -> str:
+        """
+        Identify the data in the window, for caching answers about it.
+
+        The watermark changes whenever records are added, updated or
+        expire, and at midnight UTC, since questions such as "yesterday"
+        are relative to the current date. The digest of the records is
+        computed once per change to the working set.
+
+        Returns:
+            Watermark string.
+        """
+        if self._digest is None or self._digest[0] != self.version:
+            if self.rollup:
+                parts = sorted(
+                    f"{day}:{rollup.count}:{rollup.total_duration_seconds}:"
+                    f"{rollup.last_start}"
+                    for day, rollup in self._days.items()
+                )
+            else:
+                parts = sorted(
+                    f"{record.id}:{record.version}" for record in self._records.values()
+                )
+            digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+            self._digest = (self.version, digest)
+        return f"{self._clock():%Y-%m-%d}/{self.days}d/{self._digest[1]}"
+
+    def clear(self) -> None:
+        """Drop all cached records so the next request reloads the window."""
+        self._records.clear()
+        self._days.clear()
+        self._day_rows.clear()
+        self._index = None
+        self._digest = None
+        self._combined = None
+        self._summary = None
+        self._fetched_until = None
+        self._fetched_at = 0.0
+        self.version += 1
+        self.last_stats = None
+        logger.info("Working set cleared")
+
+    def _load(self, now: datetime) -> int:
+        """Fetch the whole window."""
+        start_date = now - timedelta(days=self.days)
+        self._records = {
+            record.id: record
+            for record in self.service.iter_call_records(
+                start_date=start_date, end_date=now, limit=self.limit
+            )
+        }
+        self._mark_fetched(now)
+        logger.info("Working set loaded %d records", len(self._records))
+        return len(self._records)
+
+    def _refresh_tail(self, now: datetime) -> int:
+        """Fetch records since the last refresh and merge them in."""
+        assert self._fetched_until is not None
+        tail_start = self._fetched_until - timedelta(seconds=self.overlap_seconds)
+        window_start = now - timedelta(days=self.days)
+        records = self.service.iter_call_records(
+            start_date=max(tail_start, window_start), end_date=now, limit=self.limit
+        )
+
+        changed = 0
+        for record in records:
+            existing = self._records.get(record.id)
+            if existing is None or existing.version != record.version:
+                changed += 1
+            self._records[record.id] = record
+
+        expired = [
+            call_id
+            for call_id, record in self._records.items()
+            if record.start_time < window_start
+        ]
+        if self.limit is not None and len(self._records) > len(expired) + self.limit:
+            # Keep the newest records, as a fresh load with the limit would
+            newest_first = sorted(
+                (r for r in self._records.values() if r.start_time >= window_start),
+                key=lambda r: r.start_time,
+                reverse=True,
+            )
+            expired.extend(r.id for r in newest_first[self.limit :])
+        for call_id in expired:
+            del self._records[call_id]
+
+        if changed or expired:
+            self._summary = None
+            self.version += 1
+        self._mark_fetched(now, bump=False)
+        logger.info(
+            "Working set refreshed: %d new or updated, %d expired or over the limit",
+            changed,
+            len(expired),
+        )
+        return changed
+
+    def _window_start_day(self, now: datetime) -> date:
+        """Get the first day of the window in rollup mode."""
+        return (now - timedelta(days=self.days)).date()
+
+    def _stream_days(self, start_day: date, now: datetime) -> int:
+        """Stream records from midnight of start_day into per-day rollups."""
+        start_date = datetime.combine(start_day, datetime.min.time())
+        count = 0
+        for record in self.service.iter_call_records(
+            start_date=start_date, end_date=now
+        ):
+            day = record.start_time.date()
+            if day < start_day:
+                continue
+            rollup = self._days.get(day)
+            if rollup is None:
+                rollup = self._days[day] = CallRollup(sample_size=self.sample_size)
+                self._day_rows[day] = []
+            rollup.add(record)
+            self._day_rows[day].append(CallRow.from_record(record))
+            count += 1
+        return count
+
+    def _load_days(self, now: datetime) -> int:
+        """Stream the whole window into per-day rollups."""
+        self._days = {}
+        self._day_rows = {}
+        count = self._stream_days(self._window_start_day(now), now)
+        self._mark_fetched(now)
+        logger.info("Working set streamed %d records into daily rollups", count)
+        return count
+
+    def _refresh_days(self, now: datetime) -> int:
+        """Re-stream the days touched by the tail and drop expired days."""
+        assert self._fetched_until is not None
+        tail_start = self._fetched_until - timedelta(seconds=self.overlap_seconds)
+        window_start = self._window_start_day(now)
+        rebuild_from = max(tail_start.date(), window_start)
+
+        before = self.total_records
+        self._days = {
+            day: rollup
+            for day, rollup in self._days.items()
+            if window_start <= day < rebuild_from
+        }
+        self._day_rows = {day: self._day_rows[day] for day in self._days}
+        streamed = self._stream_days(rebuild_from, now)
+        self._mark_fetched(now)
+        logger.info(
+            "Working set re-streamed %d records from %s", streamed, rebuild_from
+        )
+        return max(0, self.total_records - before)
+
+    def _rollup(self) -> CallRollup:
+        """Get the combined rollup of all days in the window."""
+        if self._combined is None:
+            self._combined = CallRollup.combine(
+                self._days.values(), sample_size=self.sample_size
+            )
+        return self._combined
+
+    def _mark_fetched(self, now: datetime, bump: bool = True) -> None:
+        """Record a successful fetch."""
+        self._fetched_until = now
+        self._fetched_at = time.monotonic()
+        if bump:
+            self._summary = None
+            self._combined = None
+            self.version += 1
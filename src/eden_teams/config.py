@@ -10,6 +10,9 @@ from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Embedding providers, see eden_teams.models.embedding_providers
+EmbeddingProviderKind = Literal["chroma", "local", "openai", "hash"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -36,6 +39,7 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
+    openai_base_url: str = Field(default="", alias="OPENAI_BASE_URL")
 
     # Azure OpenAI Configuration (optional)
     azure_openai_api_key: str = Field(default="", alias="AZURE_OPENAI_API_KEY")
@@ -48,10 +52,95 @@ class Settings(BaseSettings):
     default_model: str = Field(default="gpt-4", alias="DEFAULT_MODEL")
     max_tokens: int = Field(default=4096, alias="MAX_TOKENS")
     temperature: float = Field(default=0.7, alias="TEMPERATURE")
+    llm_tool_calling: bool = Field(default=True, alias="LLM_TOOL_CALLING")
+    llm_max_tool_rounds: int = Field(default=4, alias="LLM_MAX_TOOL_ROUNDS")
+    llm_streaming: bool = Field(default=True, alias="LLM_STREAMING")
+    llm_max_concurrency: int = Field(default=8, alias="LLM_MAX_CONCURRENCY")
+    llm_requests_per_minute: int = Field(default=0, alias="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: int = Field(default=0, alias="LLM_TOKENS_PER_MINUTE")
+    llm_max_retries: int = Field(default=5, alias="LLM_MAX_RETRIES")
+    llm_retry_backoff: float = Field(default=1.0, alias="LLM_RETRY_BACKOFF")
+
+    # LLM Response Cache
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_max_entries: int = Field(default=256, alias="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: int = Field(default=3600, alias="LLM_CACHE_TTL_SECONDS")
+    llm_cache_path: str = Field(default="", alias="LLM_CACHE_PATH")
+    llm_cache_similarity: float = Field(default=0.0, alias="LLM_CACHE_SIMILARITY")
+    llm_cache_embedding_model: str = Field(
+        default="text-embedding-3-small", alias="LLM_CACHE_EMBEDDING_MODEL"
+    )
+
+    # Map-reduce Summarization
+    summary_chunk_tokens: int = Field(default=6000, alias="SUMMARY_CHUNK_TOKENS")
+    summary_partial_tokens: int = Field(default=500, alias="SUMMARY_PARTIAL_TOKENS")
+    summary_max_workers: int = Field(default=4, alias="SUMMARY_MAX_WORKERS")
+    summary_cache_entries: int = Field(default=4096, alias="SUMMARY_CACHE_ENTRIES")
+    summary_cache_path: str = Field(default="", alias="SUMMARY_CACHE_PATH")
+
+    # Vector Database
+    vector_db_path: str = Field(default="./chroma_db", alias="VECTOR_DB_PATH")
+    embeddings_batch_size: int = Field(default=256, alias="EMBEDDINGS_BATCH_SIZE")
+    vector_backend: Literal["auto", "chroma", "numpy"] = Field(
+        default="auto", alias="VECTOR_BACKEND"
+    )
+    vector_index_quantize: bool = Field(default=False, alias="VECTOR_INDEX_QUANTIZE")
+    embedding_provider: EmbeddingProviderKind = Field(
+        default="chroma", alias="EMBEDDING_PROVIDER"
+    )
+    embedding_model: str = Field(default="", alias="EMBEDDING_MODEL")
+    embedding_threads: int = Field(default=0, alias="EMBEDDING_THREADS")
+    embedding_max_batch: int = Field(default=64, alias="EMBEDDING_MAX_BATCH")
+    embedding_dimension: int = Field(default=384, alias="EMBEDDING_DIMENSION")
+    search_hybrid: bool = Field(default=True, alias="SEARCH_HYBRID")
+    search_keyword_candidates: int = Field(
+        default=200, alias="SEARCH_KEYWORD_CANDIDATES"
+    )
+    search_rrf_k: int = Field(default=60, alias="SEARCH_RRF_K")
+    indexer_enabled: bool = Field(default=True, alias="INDEXER_ENABLED")
+    indexer_queue_size: int = Field(default=2048, alias="INDEXER_QUEUE_SIZE")
+    indexer_batch_size: int = Field(default=256, alias="INDEXER_BATCH_SIZE")
+    indexer_workers: int = Field(default=2, alias="INDEXER_WORKERS")
+    indexer_sync_seconds: float = Field(default=120.0, alias="INDEXER_SYNC_SECONDS")
+    embedding_cache_dir: str = Field(default="", alias="EMBEDDING_CACHE_DIR")
+    embedding_cache_dtype: str = Field(default="float32", alias="EMBEDDING_CACHE_DTYPE")
 
     # Microsoft Graph Settings
     graph_api_version: str = Field(default="v1.0", alias="GRAPH_API_VERSION")
     call_records_page_size: int = Field(default=100, alias="CALL_RECORDS_PAGE_SIZE")
+    graph_stream_chunk_size: int = Field(default=65536, alias="GRAPH_STREAM_CHUNK_SIZE")
+    graph_max_retries: int = Field(default=3, alias="GRAPH_MAX_RETRIES")
+    graph_retry_backoff: float = Field(default=1.0, alias="GRAPH_RETRY_BACKOFF")
+
+    # Query window and context budget
+    query_days: int = Field(default=7, alias="QUERY_DAYS")
+    query_record_limit: int = Field(default=100, alias="QUERY_RECORD_LIMIT")
+    context_max_records: int = Field(default=100, alias="CONTEXT_MAX_RECORDS")
+    context_token_budget: int = Field(default=3000, alias="CONTEXT_TOKEN_BUDGET")
+    context_ranking: Literal["recency", "participant", "semantic"] = Field(
+        default="participant", alias="CONTEXT_RANKING"
+    )
+    context_retrieval: bool = Field(default=True, alias="CONTEXT_RETRIEVAL")
+    history_token_budget: int = Field(default=1000, alias="HISTORY_TOKEN_BUDGET")
+    rollup_threshold_days: int = Field(default=14, alias="ROLLUP_THRESHOLD_DAYS")
+
+    # Session working set
+    working_set_staleness_seconds: int = Field(
+        default=300, alias="WORKING_SET_STALENESS_SECONDS"
+    )
+    working_set_overlap_seconds: int = Field(
+        default=3600, alias="WORKING_SET_OVERLAP_SECONDS"
+    )
+
+    # Metrics
+    metrics_enabled: bool = Field(default=False, alias="METRICS_ENABLED")
+    metrics_port: int = Field(default=0, alias="METRICS_PORT")
+
+    # Tracing
+    tracing_exporter: Literal["none", "console", "json"] = Field(
+        default="none", alias="TRACING_EXPORTER"
+    )
+    tracing_file: str = Field(default="", alias="TRACING_FILE")
 
     @property
     def is_development(self) -> bool:
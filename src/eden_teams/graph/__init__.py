@@ -5,7 +5,21 @@ This package provides authentication and client utilities for
 interacting with the Microsoft Graph API.
 """
 
-from eden_teams.graph.auth import get_graph_credentials
-from eden_teams.graph.client import GraphClient
+from typing import TYPE_CHECKING
+
+from eden_teams.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from eden_teams.graph.auth import get_graph_credentials
+    from eden_teams.graph.client import GraphClient
 
 __all__ = ["GraphClient", "get_graph_credentials"]
+
+# Imported on first use: they load httpx and the Azure SDK
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GraphClient": "eden_teams.graph.client",
+        "get_graph_credentials": "eden_teams.graph.auth",
+    },
+)
@@ -6,16 +6,18 @@ for accessing the Microsoft Graph API.
 """
 
 import logging
-from typing import Optional
-
-from azure.identity import ClientSecretCredential
+from typing import TYPE_CHECKING, Optional
 
 from eden_teams.config import settings
 
+# The Azure SDK is slow to import; it is loaded when credentials are created
+if TYPE_CHECKING:
+    from azure.identity import ClientSecretCredential
+
 logger = logging.getLogger(__name__)
 
 
-def get_graph_credentials() -> Optional[ClientSecretCredential]:
+def get_graph_credentials() -> Optional["ClientSecretCredential"]:
     """
     Get Azure credentials for Microsoft Graph API.
 
@@ -26,6 +28,8 @@ def get_graph_credentials() -> Optional[ClientSecretCredential]:
         logger.warning("Microsoft Graph API credentials not configured")
         return None
 
+    from azure.identity import ClientSecretCredential
+
     try:
         credential = ClientSecretCredential(
             tenant_id=settings.azure_tenant_id,
@@ -49,11 +53,11 @@ class GraphAuthProvider:
 
     def __init__(self) -> None:
         """Initialize the authentication provider."""
-        self._credential: Optional[ClientSecretCredential] = None
+        self._credential: Optional["ClientSecretCredential"] = None
         self._scopes = ["https://graph.microsoft.com/.default"]
 
     @property
-    def credential(self) -> Optional[ClientSecretCredential]:
+    def credential(self) -> Optional["ClientSecretCredential"]:
         """Get or create the credential."""
         if self._credential is None:
             self._credential = get_graph_credentials()
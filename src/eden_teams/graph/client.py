@@ -6,13 +6,16 @@ Microsoft Graph API endpoints.
 """
 
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import httpx
 
 from eden_teams.config import settings
 from eden_teams.graph.auth import GraphAuthProvider
+from eden_teams.graph.streaming import JSONArrayStreamParser
+from eden_teams.utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,28 @@ class GraphClient:
 
     BASE_URL = "https://graph.microsoft.com"
 
-    def __init__(self) -> None:
-        """Initialize the Graph client."""
-        self._auth = GraphAuthProvider()
+    # Status codes that Graph documents as transient
+    RETRY_STATUS_CODES = frozenset({429, 503, 504})
+
+    # Requests Graph accepts in one $batch call
+    MAX_BATCH_SIZE = 20
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        auth_provider: Optional[GraphAuthProvider] = None,
+    ) -> None:
+        """
+        Initialize the Graph client.
+
+        Args:
+            base_url: Graph service root. Defaults to the public Graph endpoint.
+            auth_provider: Token provider. Creates a GraphAuthProvider if not provided.
+        """
+        self.base_url = base_url or self.BASE_URL
+        self._auth = auth_provider or GraphAuthProvider()
         self._http_client: Optional[httpx.Client] = None
+        self.retry_count = 0
         logger.info("GraphClient initialized")
 
     @property
@@ -38,7 +59,7 @@ class GraphClient:
         """Get or create the HTTP client."""
         if self._http_client is None:
             self._http_client = httpx.Client(
-                base_url=f"{self.BASE_URL}/{settings.graph_api_version}",
+                base_url=f"{self.base_url}/{settings.graph_api_version}",
                 timeout=30.0,
             )
         return self._http_client
@@ -70,32 +91,210 @@ class GraphClient:
         Raises:
             httpx.HTTPStatusError: If the request fails.
         """
-        response = self.http_client.get(
-            endpoint,
-            headers=self._get_headers(),
-            params=params,
-        )
+        response = self._send("GET", endpoint, params=params)
         response.raise_for_status()
-        return response.json()
+        result: Dict[str, Any] = response.json()
+        return result
 
-    def get_call_records(
+    def _send(
         self,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        top: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
         """
-        Get call records from Microsoft Graph API.
+        Send a request, retrying throttled and transient failures.
+
+        Retries honor the Retry-After header and otherwise back off
+        exponentially, up to ``settings.graph_max_retries`` times. The last
+        response is returned as-is once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            request = self.http_client.build_request(
+                method,
+                url,
+                headers=self._get_headers(),
+                params=params,
+                json=json,
+            )
+            metrics.adjust_gauge("graph_inflight_requests", 1)
+            try:
+                with (
+                    metrics.timer("graph_request_seconds", method=method),
+                    tracing.span(
+                        "graph.request",
+                        **{
+                            "http.method": method,
+                            "http.target": request.url.path,
+                            "graph.attempt": attempt,
+                        },
+                    ) as span,
+                ):
+                    response = self.http_client.send(request, stream=stream)
+                    span.set_attribute("http.status_code", response.status_code)
+            finally:
+                metrics.adjust_gauge("graph_inflight_requests", -1)
+            metrics.increment(
+                "graph_requests_total", method=method, status=response.status_code
+            )
+
+            if (
+                response.status_code not in self.RETRY_STATUS_CODES
+                or attempt >= settings.graph_max_retries
+            ):
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            response.close()
+            attempt += 1
+            self.retry_count += 1
+            metrics.increment("graph_retries_total", status=response.status_code)
+            logger.warning(
+                "Graph returned %d for %s, retrying in %.2fs (attempt %d)",
+                response.status_code,
+                url,
+                delay,
+                attempt,
+            )
+            time.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Get the delay before the next retry of a failed request."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return float(settings.graph_retry_backoff * (2**attempt))
+
+    def stream(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the items of a collection endpoint as they arrive.
+
+        The response body is parsed incrementally, so each element of
+        ``value`` is yielded as soon as it has been received instead of
+        after the whole page has been buffered. Pagination is followed
+        through ``@odata.nextLink``.
 
         Args:
-            start_date: Start of date range filter.
-            end_date: End of date range filter.
-            top: Maximum number of records to return.
+            endpoint: API endpoint path.
+            params: Optional query parameters for the first page.
+
+        Yields:
+            Items of the collection, in response order.
+
+        Raises:
+            httpx.HTTPStatusError: If a request fails.
+            JSONStreamError: If a response body is malformed.
+        """
+        url: Optional[str] = endpoint
+        page_params = params
+
+        pages = 0
+        while url:
+            parser = JSONArrayStreamParser()
+            response = self._send("GET", url, params=page_params, stream=True)
+            try:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(settings.graph_stream_chunk_size):
+                    yield from parser.feed(chunk)
+            finally:
+                response.close()
+            parser.close()
+            pages += 1
+            tracing.current_span().set_attribute("graph.page_count", pages)
+
+            # nextLink is an absolute URL that already carries the query
+            url = parser.metadata.get("@odata.nextLink")
+            page_params = None
+
+    def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send requests with JSON batching.
+
+        Requests are sent in ``$batch`` calls of up to MAX_BATCH_SIZE.
+        Sub-requests that are throttled or fail transiently are resent in a
+        later batch, like single requests, up to
+        ``settings.graph_max_retries`` times.
+
+        Args:
+            requests: Sub-requests, each with a "url" relative to the API
+                version and optionally "method" (default GET), "headers"
+                and "body".
 
         Returns:
-            List of call record dictionaries.
+            One response per request, in request order, each with
+            "status", "headers" and "body". Requests Graph did not answer
+            have status 0.
+
+        Raises:
+            httpx.HTTPStatusError: If a $batch call itself fails.
         """
-        endpoint = "/communications/callRecords"
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending = list(range(len(requests)))
+        attempt = 0
+        while pending:
+            retry: List[int] = []
+            delay = 0.0
+            for offset in range(0, len(pending), self.MAX_BATCH_SIZE):
+                chunk = pending[offset : offset + self.MAX_BATCH_SIZE]
+                body = {
+                    "requests": [
+                        {"id": str(i), "method": "GET", **requests[i]} for i in chunk
+                    ]
+                }
+                with tracing.span("graph.batch", **{"graph.batch_size": len(chunk)}):
+                    response = self._send("POST", "/$batch", json=body)
+                    response.raise_for_status()
+                for item in response.json().get("responses", []):
+                    index = int(item["id"])
+                    responses[index] = item
+                    status = item.get("status", 0)
+                    if (
+                        status in self.RETRY_STATUS_CODES
+                        and attempt < settings.graph_max_retries
+                    ):
+                        retry.append(index)
+                        metrics.increment("graph_retries_total", status=status)
+                        headers = httpx.Headers(item.get("headers") or {})
+                        delay = max(
+                            delay,
+                            self._retry_delay(
+                                httpx.Response(status, headers=headers), attempt
+                            ),
+                        )
+            if retry:
+                attempt += 1
+                self.retry_count += len(retry)
+                logger.warning(
+                    "Graph throttled %d batched requests, retrying in %.2fs "
+                    "(attempt %d)",
+                    len(retry),
+                    delay,
+                    attempt,
+                )
+                time.sleep(delay)
+            pending = sorted(retry)
+
+        return [
+            response if response is not None else {"status": 0, "body": None}
+            for response in responses
+        ]
+
+    def _call_records_params(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        top: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build query parameters for the callRecords endpoint."""
         params: Dict[str, Any] = {}
 
         if top:
@@ -111,17 +310,70 @@ class GraphClient:
         if filters:
             params["$filter"] = " and ".join(filters)
 
+        return params
+
+    def get_call_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        top: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get call records from Microsoft Graph API.
+
+        Args:
+            start_date: Start of date range filter.
+            end_date: End of date range filter.
+            top: Maximum number of records to return.
+
+        Returns:
+            List of call record dictionaries.
+        """
+        endpoint = "/communications/callRecords"
+        params = self._call_records_params(start_date, end_date, top)
+
         logger.info("Fetching call records with params: %s", params)
 
         try:
             response = self.get(endpoint, params)
-            records = response.get("value", [])
+            records: List[Dict[str, Any]] = response.get("value", [])
             logger.info("Retrieved %d call records", len(records))
             return records
         except httpx.HTTPStatusError as e:
             logger.error("Failed to fetch call records: %s", str(e))
             raise
 
+    def iter_call_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream call records from Microsoft Graph API across all pages.
+
+        Args:
+            start_date: Start of date range filter.
+            end_date: End of date range filter.
+            limit: Maximum number of records to yield. Unbounded if None.
+
+        Yields:
+            Call record dictionaries as they are received.
+        """
+        endpoint = "/communications/callRecords"
+        params = self._call_records_params(start_date, end_date, limit)
+
+        logger.info("Streaming call records with params: %s", params)
+
+        count = 0
+        for record in self.stream(endpoint, params):
+            yield record
+            count += 1
+            if limit is not None and count >= limit:
+                break
+
+        logger.info("Streamed %d call records", count)
+
     def get_call_record(self, call_id: str) -> Dict[str, Any]:
         """
         Get a specific call record by ID.
@@ -147,7 +399,8 @@ class GraphClient:
         """
         endpoint = f"/communications/callRecords/{call_id}/sessions"
         response = self.get(endpoint)
-        return response.get("value", [])
+        sessions: List[Dict[str, Any]] = response.get("value", [])
+        return sessions
 
     def get_user(self, user_id: str) -> Dict[str, Any]:
         """
@@ -185,7 +438,8 @@ class GraphClient:
             "$top": 10,
         }
         response = self.get(endpoint, params)
-        return response.get("value", [])
+        users: List[Dict[str, Any]] = response.get("value", [])
+        return users
 
     @staticmethod
     def _escape_odata_string(value: str) -> str:
@@ -0,0 +1,295 @@
+"""
+Incremental JSON parsing for Microsoft Graph responses.
+
+This module provides a streaming parser that extracts the elements of a
+collection response's ``value`` array as soon as each one is complete,
+without buffering the whole body or building the full document tree.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# A complete string token, a bracket, or an unterminated string opener.
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]"]', re.DOTALL)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR_END = re.compile(r"[,}\]\s]")
+_DECODER = json.JSONDecoder()
+
+# Parser states
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_EXPECT_COLON = 2
+_EXPECT_VALUE = 3
+_EXPECT_MEMBER_END = 4
+_EXPECT_ELEMENT = 5
+_EXPECT_ELEMENT_END = 6
+_DONE = 7
+
+# Sentinel returned while a value is still being received
+_INCOMPLETE = object()
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed JSON document is malformed or truncated."""
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a top-level JSON object holding an array member.
+
+    Bytes are fed in arbitrary chunks. Each element of the array named by
+    ``array_key`` is decoded and returned as soon as its closing byte
+    arrives. All other top-level members (such as ``@odata.nextLink``) are
+    decoded into :attr:`metadata`.
+
+    Example:
+        parser = JSONArrayStreamParser()
+        for chunk in response.iter_bytes():
+            for item in parser.feed(chunk):
+                handle(item)
+        parser.close()
+    """
+
+    def __init__(self, array_key: str = "value") -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            array_key: Name of the top-level member whose elements to stream.
+        """
+        self.array_key = array_key
+        self.metadata: Dict[str, Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _EXPECT_OBJECT
+        self._key: Optional[str] = None
+        # Scan state for a partially received composite value
+        self._value_start: Optional[int] = None
+        self._scan_pos = 0
+        self._depth = 0
+
+    @property
+    def done(self) -> bool:
+        """Check if the closing brace of the document has been parsed."""
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Feed a chunk of bytes into the parser.
+
+        Args:
+            chunk: Next chunk of the response body.
+
+        Returns:
+            Array elements completed by this chunk, in document order.
+
+        Raises:
+            JSONStreamError: If the document is malformed.
+        """
+        try:
+            self._buffer += self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise JSONStreamError(f"Invalid UTF-8 in JSON stream: {e}") from e
+        items: List[Any] = []
+
+        while self._step(items):
+            pass
+
+        self._compact()
+        return items
+
+    def close(self) -> None:
+        """
+        Signal the end of the input.
+
+        Raises:
+            JSONStreamError: If the document is incomplete.
+        """
+        try:
+            self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise JSONStreamError(f"Invalid UTF-8 in JSON stream: {e}") from e
+        if self._state != _DONE:
+            raise JSONStreamError("Unexpected end of JSON stream")
+
+    def _step(self, items: List[Any]) -> bool:
+        """Advance the state machine by one token. Returns False when starved."""
+        if self._state == _DONE:
+            return False
+
+        if self._value_start is None:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                return False
+
+        char = self._buffer[self._pos]
+        state = self._state
+
+        if state == _EXPECT_OBJECT:
+            if char != "{":
+                raise JSONStreamError("Expected a JSON object")
+            self._pos += 1
+            self._state = _EXPECT_KEY
+            return True
+
+        if state == _EXPECT_KEY:
+            if char == "}":
+                self._pos += 1
+                self._state = _DONE
+                return True
+            key = self._read_value()
+            if key is _INCOMPLETE:
+                return False
+            if not isinstance(key, str):
+                raise JSONStreamError("Expected an object key")
+            self._key = key
+            self._state = _EXPECT_COLON
+            return True
+
+        if state == _EXPECT_COLON:
+            if char != ":":
+                raise JSONStreamError("Expected ':' after object key")
+            self._pos += 1
+            self._state = _EXPECT_VALUE
+            return True
+
+        if state == _EXPECT_VALUE:
+            if self._key == self.array_key and self._value_start is None:
+                if char != "[":
+                    raise JSONStreamError(f"Expected '{self.array_key}' to be an array")
+                self._pos += 1
+                self._state = _EXPECT_ELEMENT
+                return True
+            value = self._read_value()
+            if value is _INCOMPLETE:
+                return False
+            self.metadata[self._key or ""] = value
+            self._state = _EXPECT_MEMBER_END
+            return True
+
+        if state == _EXPECT_MEMBER_END:
+            if char == ",":
+                self._pos += 1
+                self._state = _EXPECT_KEY
+            elif char == "}":
+                self._pos += 1
+                self._state = _DONE
+            else:
+                raise JSONStreamError("Expected ',' or '}' after object member")
+            return True
+
+        if state == _EXPECT_ELEMENT:
+            if char == "]" and self._value_start is None:
+                self._pos += 1
+                self._state = _EXPECT_MEMBER_END
+                return True
+            value = self._read_value()
+            if value is _INCOMPLETE:
+                return False
+            items.append(value)
+            self._state = _EXPECT_ELEMENT_END
+            return True
+
+        # _EXPECT_ELEMENT_END
+        if char == ",":
+            self._pos += 1
+            self._state = _EXPECT_ELEMENT
+        elif char == "]":
+            self._pos += 1
+            self._state = _EXPECT_MEMBER_END
+        else:
+            raise JSONStreamError("Expected ',' or ']' after array element")
+        return True
+
+    def _read_value(self) -> Any:
+        """Decode the value at the cursor, or return _INCOMPLETE if truncated."""
+        buffer = self._buffer
+
+        if self._value_start is None:
+            self._value_start = self._pos
+            self._scan_pos = self._pos
+            self._depth = 0
+
+        start = self._value_start
+        first = buffer[start]
+
+        # Where the value ends, or None if it is not fully buffered yet
+        end: Optional[int]
+        if first in "{[":
+            if self._scan_pos == start:
+                # Fast path: the whole value is usually already buffered
+                try:
+                    value, end = _DECODER.raw_decode(buffer, start)
+                except ValueError:
+                    pass
+                else:
+                    self._pos = end
+                    self._value_start = None
+                    return value
+            end = self._scan_composite()
+        elif first == '"':
+            match = _TOKEN.match(buffer, start)
+            end = match.end() if match and match.end() - start > 1 else None
+        else:
+            match = _SCALAR_END.search(buffer, start)
+            end = match.start() if match else None
+
+        if end is None:
+            return _INCOMPLETE
+
+        try:
+            value = json.loads(buffer[start:end])
+        except ValueError as e:
+            raise JSONStreamError(f"Invalid JSON value: {e}") from e
+
+        self._pos = end
+        self._value_start = None
+        return value
+
+    def _scan_composite(self) -> Optional[int]:
+        """Scan an object or array, resuming from the last position."""
+        buffer = self._buffer
+        pos = self._scan_pos
+        depth = self._depth
+
+        while True:
+            match = _TOKEN.search(buffer, pos)
+            if match is None:
+                self._scan_pos = len(buffer)
+                self._depth = depth
+                return None
+
+            token = match.group()
+            if token == '"':
+                # Unterminated string; resume from its opening quote
+                self._scan_pos = match.start()
+                self._depth = depth
+                return None
+
+            pos = match.end()
+            if token in ("{", "["):
+                depth += 1
+            elif token in ("}", "]"):
+                depth -= 1
+                if depth == 0:
+                    return pos
+
+    def _skip_whitespace(self) -> None:
+        """Move the cursor past insignificant whitespace."""
+        match = _WHITESPACE.match(self._buffer, self._pos)
+        if match:
+            self._pos = match.end()
+
+    def _compact(self) -> None:
+        """Drop consumed text so the buffer only holds unparsed input."""
+        offset = self._pos if self._value_start is None else self._value_start
+        if offset == 0:
+            return
+        self._buffer = self._buffer[offset:]
+        self._pos -= offset
+        if self._value_start is not None:
+            self._value_start -= offset
+            self._scan_pos -= offset
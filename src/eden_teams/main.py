@@ -8,16 +8,41 @@ with Microsoft Teams Call Detail Records.
 import argparse
 import logging
 import sys
-from datetime import datetime, timedelta
-from typing import List, Optional
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    get_args,
+)
 
 from dotenv import load_dotenv
 
-from eden_teams.cdr.models import CallRecord
-from eden_teams.cdr.service import CallRecordService
-from eden_teams.config import settings
-from eden_teams.models.llm_client import LLMClient
+from eden_teams.config import EmbeddingProviderKind, settings
+from eden_teams.utils import metrics, tracing
 from eden_teams.utils.logging_config import setup_logging
+from eden_teams.utils.profiling import Profiler
+
+# The CDR service, LLM client and vector index pull in httpx, the Azure SDK,
+# OpenAI and ChromaDB. They are imported where they are first used, so that
+# commands that need none of them (--help, shell completion) start quickly.
+if TYPE_CHECKING:
+    from eden_teams.cdr.models import CallRecord
+    from eden_teams.cdr.service import CallRecordService
+    from eden_teams.cdr.working_set import WorkingSet
+    from eden_teams.models.context import ContextBuilder
+    from eden_teams.models.embeddings import EmbeddingsClient
+    from eden_teams.models.indexer import BackgroundIndexer
+    from eden_teams.models.llm_client import LLMClient, StreamStats
 
 
 class CDRAssistant:
@@ -28,55 +53,291 @@ class CDRAssistant:
     language understanding and response generation.
     """
 
-    def __init__(self) -> None:
-        """Initialize the CDR assistant."""
-        self._cdr_service: Optional[CallRecordService] = None
-        self._llm_client: Optional[LLMClient] = None
+    def __init__(
+        self,
+        cdr_service: Optional["CallRecordService"] = None,
+        llm_client: Optional["LLMClient"] = None,
+        days: int = 7,
+        limit: int = 100,
+        context_records: int = 100,
+        context_tokens: int = 3000,
+        context_ranking: str = "participant",
+        embeddings: Optional["EmbeddingsClient"] = None,
+    ) -> None:
+        """
+        Initialize the CDR assistant.
+
+        Args:
+            cdr_service: Optional CallRecordService. Created lazily if not provided.
+            llm_client: Optional LLMClient. Created lazily if not provided.
+            days: Days of call history to analyze.
+            limit: Maximum records to fetch; 0 or less for no limit.
+            context_records: Maximum records listed in the LLM context.
+            context_tokens: Token budget for the call record context.
+            context_ranking: How records are chosen for the context:
+                "recency", "participant" or "semantic".
+            embeddings: Optional vector database client. Created lazily if
+                not provided.
+        """
+        self._cdr_service = cdr_service
+        self._llm_client = llm_client
+        self._embeddings = embeddings
+        self.indexer: Optional["BackgroundIndexer"] = None
+        self.days = days
+        self.limit: Optional[int] = limit if limit > 0 else None
+        self.context_records = context_records
+        self.context_tokens = context_tokens
+        self.context_ranking = context_ranking
+        self._context_builder: Optional["ContextBuilder"] = None
+        self._working_set: Optional["WorkingSet"] = None
+        self._context_cache: Optional[Tuple[Tuple[int, str], str]] = None
+        self._cache_watermark: Optional[str] = None
         self._conversation_history: List[dict] = []
+        self.last_llm_seconds = 0.0
+        self.last_stream_stats: Optional["StreamStats"] = None
+        self.last_cache_hit = False
         self.logger = logging.getLogger(__name__)
 
     @property
-    def cdr_service(self) -> CallRecordService:
+    def cdr_service(self) -> "CallRecordService":
         """Get or create the CDR service."""
         if self._cdr_service is None:
+            from eden_teams.cdr.service import CallRecordService
+
             self._cdr_service = CallRecordService()
         return self._cdr_service
 
     @property
-    def llm_client(self) -> LLMClient:
+    def working_set(self) -> "WorkingSet":
+        """Get or create the session working set of call records."""
+        if self._working_set is None:
+            from eden_teams.cdr.working_set import WorkingSet
+
+            self._working_set = WorkingSet(
+                self.cdr_service,
+                days=self.days,
+                limit=self.limit,
+                sample_size=self.context_records,
+            )
+        return self._working_set
+
+    @property
+    def llm_client(self) -> "LLMClient":
         """Get or create the LLM client."""
         if self._llm_client is None:
+            from eden_teams.models.llm_client import LLMClient
+
             self._llm_client = LLMClient()
         return self._llm_client
 
-    def _format_call_records(self, records: List[CallRecord]) -> str:
+    @property
+    def embeddings(self) -> "EmbeddingsClient":
+        """Get or create the vector database client."""
+        if self._embeddings is None:
+            from eden_teams.models.embeddings import EmbeddingsClient
+
+            self._embeddings = EmbeddingsClient()
+        return self._embeddings
+
+    def start_indexer(self) -> Optional["BackgroundIndexer"]:
+        """
+        Start indexing call records into the vector database in the background.
+
+        Returns:
+            The running indexer, or None if there is no vector database.
+        """
+        if self.indexer is None:
+            if self.embeddings.collection is None:
+                return None
+            from eden_teams.models.indexer import BackgroundIndexer
+
+            self.indexer = BackgroundIndexer(
+                self.embeddings, self.cdr_service, days=self.days
+            )
+        return self.indexer.start()
+
+    def stop_indexer(self) -> None:
+        """Stop the background indexer, if it is running."""
+        if self.indexer is not None:
+            self.indexer.stop(drain=False)
+
+    @property
+    def context_builder(self) -> "ContextBuilder":
+        """Get or create the token-budgeted context builder."""
+        if self._context_builder is None:
+            from eden_teams.models.context import ContextBuilder, TokenCounter
+
+            self._context_builder = ContextBuilder(
+                TokenCounter(self.llm_client.model),
+                budget_tokens=self.context_tokens,
+                ranking=self.context_ranking,
+                max_records=self.context_records,
+                embeddings=(
+                    self.embeddings if self.context_ranking == "semantic" else None
+                ),
+            )
+        return self._context_builder
+
+    def _format_call_records(
+        self, records: List["CallRecord"], total: Optional[int] = None
+    ) -> str:
         """Format call records as context for the LLM."""
-        if not records:
-            return "No call records found for the specified criteria."
+        return self.context_builder.build(records, total=total).text
 
-        lines = [f"Found {len(records)} call record(s):\n"]
-        for i, record in enumerate(records[:20], 1):  # Limit to 20 for context size
-            lines.append(f"{i}. {record.to_summary()}")
-            lines.append("")
+    @metrics.timed("context_build_seconds")
+    @tracing.traced("assistant.build_context")
+    def build_context(
+        self,
+        records: List["CallRecord"],
+        summary: Optional[Dict[str, Any]] = None,
+        total: Optional[int] = None,
+        query: str = "",
+    ) -> str:
+        """
+        Build the LLM context for a set of call records.
 
-        if len(records) > 20:
-            lines.append(f"... and {len(records) - 20} more records.")
+        The context holds the summary statistics and as many of the most
+        relevant records as fit the token budget, one table row each.
 
-        return "\n".join(lines)
+        Args:
+            records: Call records to include.
+            summary: Summary from CallRecordService.get_call_summary or
+                CallRollup.summary, if any.
+            total: Number of records in the window when ``records`` is
+                only a sample of them. Defaults to ``len(records)``.
+            query: User question used to rank records.
 
-    def process_query(self, query: str) -> str:
+        Returns:
+            Formatted context string.
         """
-        Process a natural language query about call records.
+        packed = self.context_builder.build(records, query, summary, total)
+        tracing.current_span().set_attributes(
+            **{
+                "context.tokens": packed.tokens,
+                "context.records_included": packed.records_included,
+            }
+        )
+        return packed.text
+
+    @metrics.timed("context_build_seconds")
+    @tracing.traced("assistant.build_context")
+    def build_retrieved_context(
+        self,
+        query: str,
+        index: "EmbeddingsClient",
+        records: List["CallRecord"],
+        summary: Optional[Dict[str, Any]] = None,
+        total: Optional[int] = None,
+    ) -> str:
+        """
+        Build the LLM context from the calls most relevant to a query.
+
+        The dates, call type and names stated in the query narrow a hybrid
+        search of the vector index; the calls it finds, best first, are
+        listed after the summary statistics of the whole window. Without
+        dates the search covers the assistant's window.
 
         Args:
-            query: Natural language question about Teams calls.
+            query: User question.
+            index: Vector index holding the call records.
+            records: Records in the window. Search results among them are
+                listed from these; others come from the index or, failing
+                that, Graph.
+            summary: Summary of the window, if any.
+            total: Number of records in the window.
 
         Returns:
-            Response to the query.
+            Formatted context string.
         """
-        self.logger.info("Processing query: %s", query)
+        from eden_teams.models.retrieval import hydrate_results, parse_query_filters
 
-        # Check if we have the necessary configuration
+        filters = parse_query_filters(query)
+        if filters.start_time is None and filters.end_time is None:
+            filters.start_time = datetime.utcnow() - timedelta(days=self.days)
+        rows = index.search_calls(
+            query,
+            n_results=self.context_records,
+            keywords=filters.keywords,
+            **filters.search_kwargs(),
+        )
+        retrieved = hydrate_results(rows, records, self.cdr_service, index)
+        packed = self.context_builder.build(
+            retrieved, query, summary, total, ranked=True
+        )
+        tracing.current_span().set_attributes(
+            **{
+                "context.tokens": packed.tokens,
+                "context.records_included": packed.records_included,
+                "context.records_retrieved": len(rows),
+            }
+        )
+        return f"Calls selected for the question: {filters.describe()}.\n{packed.text}"
+
+    def _retrieval_index(
+        self, records: List["CallRecord"]
+    ) -> Optional["EmbeddingsClient"]:
+        """
+        Get the vector index to select context from, if it is usable.
+
+        The index must hold records and be current: if the working set has
+        calls newer than the index's watermark (less the refresh overlap),
+        searching the index would miss them, so the working set is ranked
+        instead.
+
+        Args:
+            records: Records in the working set.
+
+        Returns:
+            The vector index, or None to rank the working set.
+        """
+        if not settings.context_retrieval or self._embeddings is None:
+            return None
+        manifest = self._embeddings.manifest
+        if manifest is None or not manifest.record_count:
+            return None
+        newest = max((_utc_naive(r.start_time) for r in records), default=None)
+        if newest is not None:
+            watermark = manifest.watermark
+            cutoff = newest - timedelta(seconds=settings.working_set_overlap_seconds)
+            if watermark is None or _utc_naive(watermark) < cutoff:
+                self.logger.info(
+                    "Vector index is behind the working set (indexed to %s, "
+                    "newest call %s); ranking the working set instead",
+                    watermark,
+                    newest,
+                )
+                return None
+        return self._embeddings
+
+    @tracing.traced("assistant.build_context")
+    def build_tool_context(self, summary: Dict[str, Any]) -> str:
+        """
+        Build the short LLM context used with tool calling.
+
+        Only an overview of the window is sent; the model calls tools for
+        anything more specific.
+
+        Args:
+            summary: Summary of every call in the window, from CallIndex.summary.
+
+        Returns:
+            Formatted context string.
+        """
+        if not summary["total_calls"]:
+            return "No call records found for the specified criteria."
+
+        date_range = summary["date_range"]
+        return (
+            f"{summary['total_calls']} call record(s) from the last {self.days} "
+            f"day(s), starting {date_range['start']} to {date_range['end']} (UTC).\n"
+            f"Call Types: {summary['call_types']}\n"
+            f"Unique Participants: {summary['participant_count']}\n"
+            "Use the tools to query these calls; they cover every record "
+            "in the window."
+        )
+
+    def _configuration_error(self) -> Optional[str]:
+        """Explain which required service is not configured, if any."""
         if not settings.graph_configured:
             return (
                 "Microsoft Graph API is not configured. "
@@ -90,46 +351,145 @@ class CDRAssistant:
                 "Please set OPENAI_API_KEY or configure Azure OpenAI "
                 "to use natural language processing."
             )
+        return None
+
+    def _prepare_query(
+        self, query: str, span: Any
+    ) -> Tuple["WorkingSet", str, bool, str]:
+        """
+        Load the working set and build the LLM context for a query.
+
+        Returns:
+            The working set, the context, whether to use tool calling and
+            the watermark of the call data.
+        """
+        # Reuse the session's records, refreshing the tail if stale
+        working_set = self.working_set
+        records = working_set.get_records()
+
+        # Format records and summary statistics as context, once per
+        # change to the working set. With tool calling only an
+        # overview is sent and the model queries the local index.
+        # When the vector index is populated and current, the calls most
+        # relevant to the question are retrieved from it: they make up the
+        # context without tool calling and follow the overview with it.
+        use_tools = settings.llm_tool_calling
+        index = self._retrieval_index(records)
+        query_key = (
+            query
+            if index is not None
+            or (not use_tools and self.context_builder.query_dependent)
+            else ""
+        )
+        cache_key = (working_set.version, query_key)
+        if self._context_cache is None or self._context_cache[0] != cache_key:
+            if use_tools:
+                summary = working_set.get_index().summary()
+                context = self.build_tool_context(summary)
+                if index is not None and summary["total_calls"]:
+                    retrieved = self.build_retrieved_context(
+                        query, index, records, total=working_set.total_records
+                    )
+                    context = f"{context}\n\n{retrieved}"
+            elif index is not None:
+                context = self.build_retrieved_context(
+                    query,
+                    index,
+                    records,
+                    working_set.get_summary(),
+                    total=working_set.total_records,
+                )
+            else:
+                context = self.build_context(
+                    records,
+                    working_set.get_summary(),
+                    total=working_set.total_records,
+                    query=query,
+                )
+            self._context_cache = (cache_key, context)
+        context = self._context_cache[1]
+
+        # Cached answers about data that has since changed can't be reused
+        watermark = working_set.get_watermark()
+        if watermark != self._cache_watermark:
+            cache = self.llm_client.response_cache
+            if cache is not None and self._cache_watermark is not None:
+                cache.invalidate(watermark)
+            self._cache_watermark = watermark
+
+        span.set_attributes(
+            **{
+                "cdr.record_count": working_set.total_records,
+                "assistant.context_chars": len(context),
+                "assistant.tool_calling": use_tools,
+            }
+        )
+        return working_set, context, use_tools, watermark
+
+    def _remember(self, query: str, response: str) -> None:
+        """Store an exchange in the conversation history."""
+        self._conversation_history.append({"role": "user", "content": query})
+        self._conversation_history.append({"role": "assistant", "content": response})
+
+    def process_query(self, query: str) -> str:
+        """
+        Process a natural language query about call records.
+
+        The calls most relevant to the question are retrieved from the
+        vector index only when CONTEXT_RETRIEVAL is on and the index holds
+        records up to the working set's newest call. A one-shot query
+        relies on an earlier ``reindex`` for that; the interactive session
+        also keeps the index current with its background indexer.
+
+        Args:
+            query: Natural language question about Teams calls.
+
+        Returns:
+            Response to the query.
+        """
+        self.logger.info("Processing query: %s", query)
+
+        # Check if we have the necessary configuration
+        error = self._configuration_error()
+        if error:
+            return error
 
         try:
-            # Fetch recent call records for context
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=7)
-
-            self.logger.info(
-                "Fetching call records from %s to %s",
-                start_date.isoformat(),
-                end_date.isoformat(),
-            )
+            with tracing.span(
+                "assistant.query", **{"assistant.query_length": len(query)}
+            ) as span:
+                working_set, context, use_tools, watermark = self._prepare_query(
+                    query, span
+                )
 
-            records = self.cdr_service.get_call_records(
-                start_date=start_date,
-                end_date=end_date,
-                limit=100,
-            )
+                # Send to LLM for natural language processing
+                llm_started = time.perf_counter()
+                self.last_stream_stats = None
+                if use_tools:
+                    from eden_teams.cdr.tools import CallTools
 
-            # Format records as context
-            context = self._format_call_records(records)
-
-            # Add summary statistics
-            if records:
-                summary = self.cdr_service.get_call_summary(records)
-                context += "\n\nSummary Statistics:\n"
-                context += f"- Total Calls: {summary['total_calls']}\n"
-                context += f"- Total Duration: {summary['total_duration_formatted']}\n"
-                context += f"- Unique Participants: {summary['participant_count']}\n"
-                context += f"- Call Types: {summary['call_types']}\n"
-
-            # Send to LLM for natural language processing
-            response = self.llm_client.query_calls(query, call_data=context)
-
-            # Store in conversation history
-            self._conversation_history.append({"role": "user", "content": query})
-            self._conversation_history.append(
-                {"role": "assistant", "content": response}
-            )
+                    tools = CallTools(working_set.get_index())
+                    response = self.llm_client.chat_with_tools(
+                        query,
+                        tools=tools.definitions,
+                        handler=tools.call,
+                        context=context,
+                        history=self._conversation_history,
+                        watermark=watermark,
+                    )
+                else:
+                    response = self.llm_client.query_calls(
+                        query,
+                        call_data=context,
+                        history=self._conversation_history,
+                        watermark=watermark,
+                    )
+                self.last_llm_seconds = time.perf_counter() - llm_started
+                self.last_cache_hit = self.llm_client.last_cache_hit is True
+                span.set_attribute("llm.cache_hit", self.last_cache_hit)
 
-            return response
+                self._remember(query, response)
+                return response
 
         except ConnectionError as e:
             self.logger.error("Connection error: %s", str(e))
@@ -138,13 +498,518 @@ class CDRAssistant:
             self.logger.error("Value error: %s", str(e))
             return f"Error processing request: {e}"
 
+    def process_query_stream(self, query: str) -> Iterator[str]:
+        """
+        Process a query, yielding the response as the LLM generates it.
+
+        Call records are loaded before the first fragment is yielded, so
+        errors fetching them are reported as the whole response. Consume
+        the iterator fully or close it.
+
+        Args:
+            query: Natural language question about Teams calls.
+
+        Yields:
+            Fragments of the response.
+        """
+        self.logger.info("Processing query (streaming): %s", query)
+
+        error = self._configuration_error()
+        if error:
+            yield error
+            return
+
+        try:
+            with tracing.span(
+                "assistant.query",
+                **{"assistant.query_length": len(query), "assistant.stream": True},
+            ) as span:
+                working_set, context, use_tools, watermark = self._prepare_query(
+                    query, span
+                )
+
+                llm_started = time.perf_counter()
+                if use_tools:
+                    from eden_teams.cdr.tools import CallTools
+
+                    tools = CallTools(working_set.get_index())
+                    stream = self.llm_client.chat_with_tools_stream(
+                        query,
+                        tools=tools.definitions,
+                        handler=tools.call,
+                        context=context,
+                        history=self._conversation_history,
+                        watermark=watermark,
+                    )
+                else:
+                    stream = self.llm_client.query_calls_stream(
+                        query,
+                        call_data=context,
+                        history=self._conversation_history,
+                        watermark=watermark,
+                    )
+
+                fragments: List[str] = []
+                for fragment in stream:
+                    fragments.append(fragment)
+                    yield fragment
+                self.last_llm_seconds = time.perf_counter() - llm_started
+
+                stats = self.last_stream_stats = self.llm_client.last_stream_stats
+                self.last_cache_hit = stats is not None and stats.cached
+                span.set_attribute("llm.cache_hit", self.last_cache_hit)
+                if stats is not None and stats.time_to_first_token is not None:
+                    span.set_attribute(
+                        "llm.time_to_first_token_ms",
+                        round(stats.time_to_first_token * 1000, 1),
+                    )
+                self._remember(query, "".join(fragments))
+
+        except ConnectionError as e:
+            self.logger.error("Connection error: %s", str(e))
+            yield f"Unable to connect to Microsoft Graph API: {e}"
+        except ValueError as e:
+            self.logger.error("Value error: %s", str(e))
+            yield f"Error processing request: {e}"
+
     def clear_history(self) -> None:
         """Clear the conversation history."""
         self._conversation_history = []
         self.logger.info("Conversation history cleared")
 
+    def clear_working_set(self) -> None:
+        """Drop cached call records so the next query refetches them."""
+        if self._working_set is not None:
+            self._working_set.clear()
+        self._context_cache = None
+
+    def format_last_timing(self) -> str:
+        """
+        Describe where the time of the last query went.
 
-def parse_args() -> argparse.Namespace:
+        Returns:
+            A one-line summary, or an empty string if no query has run.
+        """
+        stats = self._working_set.last_stats if self._working_set else None
+        if stats is None:
+            return ""
+
+        if stats.cache_hit:
+            source = f"cached {stats.records} records ({stats.age_seconds:.0f}s old)"
+        elif stats.result == "refresh":
+            source = f"refreshed tail (+{stats.new_records}, {stats.records} records)"
+        else:
+            source = f"loaded {stats.records} records"
+        llm = f"llm {self.last_llm_seconds:.2f}s"
+        stream = self.last_stream_stats
+        if self.last_cache_hit:
+            llm += " (cached answer)"
+        elif stream is not None and stream.time_to_first_token is not None:
+            llm += (
+                f" (first token {stream.time_to_first_token:.2f}s,"
+                f" {stream.tokens_per_second:.0f} tok/s)"
+            )
+        return f"[{source} | data {stats.seconds * 1000:.1f}ms | {llm}]"
+
+    def format_cache_stats(self) -> str:
+        """
+        Describe how well the response cache is doing.
+
+        Returns:
+            A one-line summary of the LLM response cache.
+        """
+        cache = self.llm_client.response_cache
+        if cache is None:
+            return "Response cache is disabled."
+        stats = cache.stats
+        return (
+            f"Response cache: {stats.entries} answers, "
+            f"{stats.hits} exact and {stats.semantic_hits} similar hits, "
+            f"{stats.misses} misses ({stats.hit_rate:.0%} hit rate), "
+            f"{stats.saved_seconds:.1f}s of LLM time saved"
+        )
+
+    def format_index_stats(self) -> str:
+        """
+        Describe the background indexer's progress.
+
+        Returns:
+            A one-line summary of the vector index and its indexer.
+        """
+        if self.indexer is None:
+            return "Background indexing is not running."
+        stats = self.indexer.stats
+        watermark = f"{stats.watermark:%Y-%m-%d %H:%M}" if stats.watermark else "none"
+        return (
+            f"Vector index: {stats.indexed} records indexed "
+            f"({stats.written} embedded, {stats.failed} failed), "
+            f"{stats.pending} pending, lag {stats.lag_seconds:.1f}s, "
+            f"{stats.records_per_second:.0f} records/s, newest call {watermark}"
+        )
+
+
+def run_pipeline(
+    assistant: CDRAssistant,
+    query: str,
+    profiler: Profiler,
+    start_date: datetime,
+    end_date: datetime,
+    limit: Optional[int] = 100,
+    call_llm: bool = True,
+    index: Optional["EmbeddingsClient"] = None,
+) -> Optional[str]:
+    """
+    Run the query pipeline with each stage in its own profiler phase.
+
+    The stages mirror CDRAssistant.process_query: Graph fetch, parse,
+    summarize, context build and (optionally) the LLM call. If an index is
+    given, the records are also added to it in an "embed index" phase.
+
+    Args:
+        assistant: Assistant whose services run the pipeline.
+        query: Natural language question for the LLM stage.
+        profiler: Profiler recording the phases.
+        start_date: Start of the call record window.
+        end_date: End of the call record window.
+        limit: Maximum number of records to fetch. Unbounded if None.
+        call_llm: Whether to run the LLM stage.
+        index: Vector database to index the records into.
+
+    Returns:
+        The LLM response, or None if the LLM stage was skipped.
+    """
+    service = assistant.cdr_service
+
+    with profiler.phase("graph fetch"):
+        raw_records = list(
+            service.graph.iter_call_records(
+                start_date=start_date, end_date=end_date, limit=limit
+            )
+        )
+    with profiler.phase("parse"):
+        records = service.parse_call_records(raw_records)
+    with profiler.phase("summarize"):
+        summary = service.get_call_summary(records)
+    with profiler.phase("context build"):
+        context = assistant.build_context(records, summary)
+    if index is not None:
+        with profiler.phase("embed index"):
+            index.add_call_records(records)
+
+    if not call_llm:
+        return None
+    with profiler.phase("llm call"):
+        return assistant.llm_client.query_calls(query, call_data=context)
+
+
+def _llm_configured() -> bool:
+    """Check if an LLM provider is configured."""
+    return bool(settings.openai_api_key or settings.use_azure_openai)
+
+
+@contextmanager
+def _offline_service(
+    records: int, seed: int
+) -> Iterator[Tuple["CallRecordService", datetime, datetime]]:
+    """Serve synthetic call records from a local fake Graph server."""
+    from eden_teams.cdr.service import CallRecordService
+    from eden_teams.graph.client import GraphClient
+    from eden_teams.testing import (
+        FakeGraphConfig,
+        FakeGraphServer,
+        StaticTokenProvider,
+    )
+
+    config = FakeGraphConfig(record_count=records, seed=seed)
+    with FakeGraphServer(config) as server:
+        graph = GraphClient(base_url=server.url, auth_provider=StaticTokenProvider())
+        try:
+            yield (
+                CallRecordService(graph_client=graph),
+                config.start_date,
+                config.start_date + timedelta(days=config.days),
+            )
+        finally:
+            graph.close()
+
+
+def _make_profiler(args: argparse.Namespace) -> Profiler:
+    """Create a Profiler from bench/profile command line options."""
+    return Profiler(
+        mode=args.profiler,
+        sample_interval=args.sample_interval,
+        trace_memory=not args.no_memory,
+        top_allocations=args.top_allocations,
+    )
+
+
+def _report_profile(profiler: Profiler, output: str) -> None:
+    """Print the phase report and write the profile files."""
+    print(profiler.format_report())
+    print()
+    for path in profiler.write(output):
+        print(f"Wrote {path}")
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    """
+    Profile the pipeline stages against synthetic data.
+
+    Args:
+        args: Parsed ``bench`` command line arguments.
+
+    Returns:
+        Exit code.
+    """
+    from eden_teams.models.embedding_providers import create_embedding_provider
+    from eden_teams.models.embeddings import EmbeddingsClient
+
+    call_llm = args.llm and _llm_configured()
+    if args.llm and not call_llm:
+        print("LLM provider not configured; skipping the llm call phase.")
+
+    index = None
+    indexed = 0
+    stack = ExitStack()
+    if args.index:
+        # A scratch directory, so the bench never touches the real index
+        index = EmbeddingsClient(
+            collection_name="eden_bench",
+            persist_directory=stack.enter_context(tempfile.TemporaryDirectory()),
+            embedding_function=create_embedding_provider(args.embedding_provider),
+        )
+
+    profiler = _make_profiler(args)
+    with stack, _offline_service(args.records, args.seed) as (service, start, end):
+        assistant = CDRAssistant(cdr_service=service)
+        with profiler:
+            for _ in range(args.repeat):
+                run_pipeline(
+                    assistant,
+                    args.query,
+                    profiler,
+                    start,
+                    end,
+                    limit=args.limit,
+                    call_llm=call_llm,
+                    index=index,
+                )
+                if index is not None and index.collection is not None:
+                    indexed += index.collection.count()
+                    # Start the next run empty so it embeds every record
+                    index.clear_collection()
+
+    _report_profile(profiler, args.output)
+    phase = profiler.phases.get("embed index")
+    if phase is not None and phase.wall_seconds > 0:
+        print(
+            f"Indexed {indexed} records at "
+            f"{indexed / phase.wall_seconds:.0f} records/s "
+            f"({args.embedding_provider or settings.embedding_provider} provider)"
+        )
+    return 0
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, as Graph filters expect."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _index_records(
+    index: "EmbeddingsClient",
+    service: "CallRecordService",
+    start: datetime,
+    end: datetime,
+    chunk_size: int,
+) -> Tuple[int, int]:
+    """Stream a window of call records into the index, a chunk at a time."""
+    records = service.iter_call_records(start_date=start, end_date=end)
+    fetched = written = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        fetched += len(chunk)
+        written += index.add_call_records(chunk)
+    return fetched, written
+
+
+def run_reindex(args: argparse.Namespace) -> int:
+    """
+    Bring the persisted vector index up to date.
+
+    Only calls that started after the index's watermark (less the working
+    set overlap, since Graph publishes records some time after a call ends)
+    are fetched, and of those only new or changed records are embedded.
+
+    Args:
+        args: Parsed ``reindex`` command line arguments.
+
+    Returns:
+        Exit code.
+    """
+    if not args.offline and not settings.graph_configured:
+        print(
+            "Microsoft Graph API is not configured. "
+            "Use --offline to index synthetic data."
+        )
+        return 1
+
+    from eden_teams.cdr.service import CallRecordService
+    from eden_teams.models.embedding_providers import create_embedding_provider
+    from eden_teams.models.embeddings import EmbeddingsClient
+
+    index = EmbeddingsClient(
+        persist_directory=args.path,
+        embedding_function=(
+            create_embedding_provider(args.embedding_provider)
+            if args.embedding_provider
+            else None
+        ),
+    )
+    if index.collection is None:
+        print("No vector database backend is available.")
+        return 1
+    index.warm()
+
+    with ExitStack() as stack:
+        if args.offline:
+            service, default_start, end = stack.enter_context(
+                _offline_service(args.records, args.seed)
+            )
+        else:
+            service = CallRecordService()
+            end = datetime.utcnow()
+            default_start = end - timedelta(days=args.days)
+
+        if args.since is not None:
+            start = _utc_naive(args.since)
+        elif index.watermark is not None:
+            start = _utc_naive(index.watermark) - timedelta(
+                seconds=settings.working_set_overlap_seconds
+            )
+        else:
+            start = default_start
+
+        began = time.perf_counter()
+        fetched, written = _index_records(
+            index, service, start, end, settings.embeddings_batch_size * 4
+        )
+        elapsed = time.perf_counter() - began
+
+    print(
+        f"Fetched {fetched} call records since {start:%Y-%m-%d %H:%M} UTC; "
+        f"embedded {written}, {fetched - written} unchanged, in {elapsed:.1f}s"
+    )
+    manifest = index.manifest
+    if manifest is not None:
+        watermark = (
+            f"{manifest.watermark:%Y-%m-%d %H:%M}" if manifest.watermark else "none"
+        )
+        print(
+            f"Index holds {manifest.record_count} records "
+            f"({manifest.embedding_model}), watermark {watermark}"
+        )
+    return 0
+
+
+def run_profile(args: argparse.Namespace) -> int:
+    """
+    Profile a single query end to end.
+
+    Args:
+        args: Parsed ``profile`` command line arguments.
+
+    Returns:
+        Exit code.
+    """
+    if not args.offline and not settings.graph_configured:
+        print(
+            "Microsoft Graph API is not configured. "
+            "Use --offline to profile against synthetic data."
+        )
+        return 1
+
+    call_llm = _llm_configured()
+    if not call_llm:
+        print("LLM provider not configured; skipping the llm call phase.")
+
+    profiler = _make_profiler(args)
+    if args.offline:
+        with _offline_service(args.records, args.seed) as (service, start, end):
+            with profiler:
+                response = run_pipeline(
+                    CDRAssistant(cdr_service=service),
+                    args.query,
+                    profiler,
+                    start,
+                    end,
+                    limit=args.limit or None,
+                    call_llm=call_llm,
+                )
+    else:
+        end = datetime.utcnow()
+        start = end - timedelta(days=args.days)
+        with profiler:
+            response = run_pipeline(
+                CDRAssistant(),
+                args.query,
+                profiler,
+                start,
+                end,
+                limit=args.limit or None,
+                call_llm=call_llm,
+            )
+
+    if response is not None:
+        print(f"\n{response}\n")
+    _report_profile(profiler, args.output)
+    return 0
+
+
+def _add_profiler_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add options shared by the bench and profile commands."""
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=f"eden-profile-{datetime.now():%Y%m%d-%H%M%S}",
+        help="Directory for pstats, collapsed stacks and the report",
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=["cprofile", "sample", "all"],
+        default="all",
+        help="CPU profiler to run (default: all)",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.001,
+        help="Seconds between stack samples (default: 0.001)",
+    )
+    parser.add_argument(
+        "--top-allocations",
+        type=int,
+        default=10,
+        help="Allocation sites to report per phase (default: 10)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Disable tracemalloc allocation tracing",
+    )
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=5000,
+        help="Synthetic call records to serve offline (default: 5000)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Eden Teams - Microsoft Teams CDR Assistant",
@@ -154,6 +1019,11 @@ Examples:
   eden-teams                          # Start interactive mode
   eden-teams -q "Show calls from today"  # Single query mode
   eden-teams --days 14                # Use 14-day date range
+  eden-teams --days 90 -q "Monthly call volume"  # Wide window, streamed
+  eden-teams bench --records 20000    # Profile pipeline stages offline
+  eden-teams bench --index --embedding-provider hash  # Indexing throughput
+  eden-teams profile -q "Top callers" # Profile one query end to end
+  eden-teams reindex                  # Embed calls newer than the index
         """,
     )
     parser.add_argument(
@@ -165,8 +1035,36 @@ Examples:
     parser.add_argument(
         "--days",
         type=int,
-        default=7,
-        help="Number of days of call history to analyze (default: 7)",
+        default=settings.query_days,
+        help="Number of days of call history to analyze "
+        f"(default: {settings.query_days})",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=settings.query_record_limit,
+        help="Maximum call records to fetch, 0 for no limit "
+        f"(default: {settings.query_record_limit}). Windows longer than "
+        f"{settings.rollup_threshold_days} days stream every record into rollups",
+    )
+    parser.add_argument(
+        "--context-records",
+        type=int,
+        default=settings.context_max_records,
+        help="Maximum call records listed in the LLM context "
+        f"(default: {settings.context_max_records})",
+    )
+    parser.add_argument(
+        "--context-tokens",
+        type=int,
+        default=settings.context_token_budget,
+        help="Token budget for call records in the LLM context "
+        f"(default: {settings.context_token_budget})",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print answers only once they are complete",
     )
     parser.add_argument(
         "-v",
@@ -174,7 +1072,149 @@ Examples:
         action="store_true",
         help="Enable verbose (debug) logging",
     )
-    return parser.parse_args()
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    bench = subparsers.add_parser(
+        "bench",
+        help="Profile the query pipeline stages against synthetic data",
+        description="Profile Graph fetch, parse, summarize and context build "
+        "against a local fake Graph server.",
+    )
+    _add_profiler_arguments(bench)
+    bench.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Pipeline runs to profile (default: 3)",
+    )
+    bench.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum records per run (default: all)",
+    )
+    bench.add_argument(
+        "-q",
+        "--query",
+        default="Summarize call activity",
+        help="Question used for the llm call phase",
+    )
+    bench.add_argument(
+        "--llm",
+        action="store_true",
+        help="Include the llm call phase (requires a configured provider)",
+    )
+    bench.add_argument(
+        "--index",
+        action="store_true",
+        help="Include an embed index phase that adds the records to a "
+        "scratch vector database collection",
+    )
+    bench.add_argument(
+        "--embedding-provider",
+        choices=get_args(EmbeddingProviderKind),
+        default=None,
+        help="Embedding provider for --index (default: EMBEDDING_PROVIDER)",
+    )
+
+    reindex = subparsers.add_parser(
+        "reindex",
+        help="Embed new call records into the persisted vector index",
+        description="Fetch the call records started since the index's "
+        "watermark and embed the new or changed ones.",
+    )
+    reindex.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Fetch calls started at or after this UTC date or time, e.g. "
+        "2024-01-15 (default: the index's watermark)",
+    )
+    reindex.add_argument(
+        "--days",
+        type=int,
+        default=settings.query_days,
+        help="Days to fetch when the index is empty "
+        f"(default: {settings.query_days})",
+    )
+    reindex.add_argument(
+        "--path",
+        default=None,
+        help="Vector database directory (default: VECTOR_DB_PATH)",
+    )
+    reindex.add_argument(
+        "--embedding-provider",
+        choices=get_args(EmbeddingProviderKind),
+        default=None,
+        help="Embedding provider (default: EMBEDDING_PROVIDER)",
+    )
+    reindex.add_argument(
+        "--offline",
+        action="store_true",
+        help="Fetch from a local fake Graph server with synthetic records",
+    )
+    reindex.add_argument(
+        "--records",
+        type=int,
+        default=5000,
+        help="Synthetic call records to serve offline (default: 5000)",
+    )
+    reindex.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+
+    profile = subparsers.add_parser(
+        "profile",
+        help="Profile a single query end to end",
+        description="Run one query with each pipeline phase profiled.",
+    )
+    _add_profiler_arguments(profile)
+    profile.add_argument("-q", "--query", required=True, help="Query to profile")
+    profile.add_argument(
+        "--days",
+        type=int,
+        default=settings.query_days,
+        help="Number of days of call history to fetch "
+        f"(default: {settings.query_days})",
+    )
+    profile.add_argument(
+        "--limit",
+        type=int,
+        default=settings.query_record_limit,
+        help="Maximum records to fetch, 0 for no limit "
+        f"(default: {settings.query_record_limit})",
+    )
+    profile.add_argument(
+        "--offline",
+        action="store_true",
+        help="Fetch from a local fake Graph server with synthetic records",
+    )
+
+    return parser.parse_args(argv)
+
+
+def answer_query(assistant: CDRAssistant, query: str, stream: bool = True) -> str:
+    """
+    Answer a query, printing the response as it is generated.
+
+    Args:
+        assistant: Assistant answering the query.
+        query: Natural language question.
+        stream: Whether to print fragments as they arrive.
+
+    Returns:
+        The full response.
+    """
+    if not stream:
+        response = assistant.process_query(query)
+        print(response)
+        return response
+
+    fragments = []
+    for fragment in assistant.process_query_stream(query):
+        fragments.append(fragment)
+        print(fragment, end="", flush=True)
+    print()
+    return "".join(fragments)
 
 
 def main(query: Optional[str] = None) -> int:
@@ -201,6 +1241,16 @@ def main(query: Optional[str] = None) -> int:
     logger.info("Starting Eden Teams v%s", settings.app_version)
     logger.info("Environment: %s", settings.app_env)
 
+    metrics.configure(settings.metrics_enabled, settings.metrics_port)
+    tracing.configure(settings.tracing_exporter, settings.tracing_file)
+
+    if args.command == "bench":
+        return run_bench(args)
+    if args.command == "profile":
+        return run_profile(args)
+    if args.command == "reindex":
+        return run_reindex(args)
+
     # Check configuration and show status
     print("\n" + "=" * 60)
     print("Eden Teams - Microsoft Teams CDR Assistant")
@@ -226,7 +1276,17 @@ def main(query: Optional[str] = None) -> int:
     print("-" * 60)
 
     # Create assistant
-    assistant = CDRAssistant()
+    from eden_teams.models.embeddings import EmbeddingsClient
+
+    assistant = CDRAssistant(
+        days=args.days,
+        limit=args.limit,
+        context_records=args.context_records,
+        context_tokens=args.context_tokens,
+        context_ranking=settings.context_ranking,
+        embeddings=EmbeddingsClient(),
+    )
+    stream = settings.llm_streaming and not args.no_stream
 
     try:
         # Use query from args if not passed directly
@@ -237,19 +1297,24 @@ def main(query: Optional[str] = None) -> int:
             logger.info("Processing query: %s", effective_query)
             print(f"\nQuery: {effective_query}\n")
 
-            response = assistant.process_query(effective_query)
-            print(response)
+            answer_query(assistant, effective_query, stream)
 
         else:
             # Interactive mode
             logger.info("Entering interactive mode")
+            if settings.indexer_enabled and settings.graph_configured:
+                assistant.start_indexer()
             print("\nAsk questions about Teams call records in natural language.")
             print("Examples:")
             print("  - Show me calls from last week")
             print("  - How many calls did john@company.com make yesterday?")
             print("  - What's the average call duration?")
             print("  - Summarize call activity for the team")
-            print("\nCommands: 'quit' to exit, 'clear' to reset conversation")
+            print(
+                "\nCommands: 'quit' to exit, 'clear' to reset conversation, "
+                "'cache' for response cache statistics, "
+                "'index' for vector index progress"
+            )
             print("-" * 60)
 
             while True:
@@ -262,15 +1327,24 @@ def main(query: Optional[str] = None) -> int:
                         break
                     if user_input.lower() == "clear":
                         assistant.clear_history()
-                        print("Conversation cleared.")
+                        assistant.clear_working_set()
+                        print("Conversation and cached call records cleared.")
+                        continue
+                    if user_input.lower() == "cache":
+                        print(assistant.format_cache_stats())
+                        continue
+                    if user_input.lower() == "index":
+                        print(assistant.format_index_stats())
                         continue
                     if not user_input:
                         continue
 
                     # Process the query
                     print("\nAssistant: ", end="")
-                    response = assistant.process_query(user_input)
-                    print(response)
+                    answer_query(assistant, user_input, stream)
+                    timing = assistant.format_last_timing()
+                    if timing:
+                        print(f"\n{timing}")
 
                 except KeyboardInterrupt:
                     print("\nGoodbye!")
@@ -284,6 +1358,8 @@ def main(query: Optional[str] = None) -> int:
     except (OSError, RuntimeError) as e:
         logger.exception("An error occurred: %s", str(e))
         return 1
+    finally:
+        assistant.stop_indexer()
 
 
 if __name__ == "__main__":
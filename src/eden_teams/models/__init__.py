@@ -5,7 +5,35 @@ This package provides LLM integration for processing and querying
 Microsoft Teams call records using natural language.
 """
 
-from eden_teams.models.embeddings import EmbeddingsClient
-from eden_teams.models.llm_client import LLMClient
+from typing import TYPE_CHECKING
 
-__all__ = ["LLMClient", "EmbeddingsClient"]
+from eden_teams.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from eden_teams.models.async_llm_client import AsyncLLMClient
+    from eden_teams.models.context import ContextBuilder, TokenCounter
+    from eden_teams.models.embeddings import EmbeddingsClient
+    from eden_teams.models.llm_client import LLMClient
+    from eden_teams.models.response_cache import ResponseCache
+
+__all__ = [
+    "LLMClient",
+    "AsyncLLMClient",
+    "EmbeddingsClient",
+    "ContextBuilder",
+    "TokenCounter",
+    "ResponseCache",
+]
+
+# Imported on first use: the embeddings client loads ChromaDB and NumPy
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "LLMClient": "eden_teams.models.llm_client",
+        "AsyncLLMClient": "eden_teams.models.async_llm_client",
+        "EmbeddingsClient": "eden_teams.models.embeddings",
+        "ContextBuilder": "eden_teams.models.context",
+        "TokenCounter": "eden_teams.models.context",
+        "ResponseCache": "eden_teams.models.response_cache",
+    },
+)
@@ -0,0 +1,530 @@
+"""
+Asynchronous LLM client for Eden Teams.
+
+This module provides AsyncLLMClient, built on the OpenAI and Azure OpenAI
+async clients, for batch jobs that run many completions at once. Requests
+are limited by a concurrency semaphore and by request-per-minute and
+token-per-minute budgets, and throttled or transient failures are retried
+with backoff that honors the rate-limit headers returned by the API.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from eden_teams.config import settings
+from eden_teams.models.context import TokenCounter, trim_history
+from eden_teams.models.llm_client import LLMClient
+from eden_teams.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a rate-limit reset duration such as "1s", "6m0s" or "20ms".
+
+    Args:
+        value: Duration from an ``x-ratelimit-reset-*`` header.
+
+    Returns:
+        Duration in seconds, or None if the value is not a duration.
+    """
+    parts = _DURATION_PART.findall(value.strip())
+    if not parts or "".join(n + u for n, u in parts) != value.strip():
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def retry_after(headers: Any) -> Optional[float]:
+    """
+    Get how long the API asked the client to wait before retrying.
+
+    Checks ``retry-after-ms``, ``retry-after`` (seconds) and the
+    ``x-ratelimit-reset-requests``/``x-ratelimit-reset-tokens`` headers, in
+    that order of precedence; for the reset headers the longer wait wins.
+
+    Args:
+        headers: Response headers.
+
+    Returns:
+        Seconds to wait, or None if the headers don't say.
+    """
+    if headers is None:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return max(0.0, float(value) * scale)
+            except ValueError:
+                pass
+    resets = [
+        parse_duration(headers.get(name) or "")
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    waits = [wait for wait in resets if wait is not None]
+    return max(waits) if waits else None
+
+
+class RateLimiter:
+    """
+    Request-per-minute and token-per-minute budgets for asyncio tasks.
+
+    Each budget is a token bucket holding up to one minute's allowance and
+    refilling continuously. ``acquire`` waits until both buckets can pay
+    for a request. When the API throttles anyway, ``pause`` holds every
+    caller until the time it asked for has passed.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget. Unlimited if zero.
+            tokens_per_minute: Token budget. Unlimited if zero.
+            clock: Returns monotonic time in seconds.
+            sleep: Coroutine that waits for a number of seconds.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the allowance accrued since the last update."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(
+                float(self.requests_per_minute),
+                self._requests + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _wait_time(self, tokens: int) -> float:
+        """Get how long until a request of this size can be paid for."""
+        wait = max(0.0, self._paused_until - self._clock())
+        if self.requests_per_minute and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request fits both budgets, then charge it.
+
+        Callers are served in arrival order, so a large request is not
+        starved by smaller ones.
+
+        Args:
+            tokens: Estimated tokens the request will use. Requests larger
+                than the whole budget are charged the whole budget.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                await self._sleep(wait)
+                waited += wait
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+        return waited
+
+    def adjust(self, estimated: int, actual: int) -> None:
+        """
+        Correct the token charge once the API reports actual usage.
+
+        Args:
+            estimated: Tokens charged by acquire().
+            actual: Tokens the request used.
+        """
+        if self.tokens_per_minute:
+            self._refill()
+            self._tokens = min(
+                float(self.tokens_per_minute), self._tokens + estimated - actual
+            )
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold all callers for a while, e.g. after a 429 response.
+
+        Args:
+            seconds: Time to hold callers for.
+        """
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class AsyncLLMClient:
+    """
+    Async client for running many LLM completions concurrently.
+
+    Concurrency is bounded by a semaphore, and every request first waits
+    for the request and token budgets. Throttled (429) and transient
+    failures are retried up to ``max_retries`` times; a 429 also pauses the
+    shared limiter, so other in-flight tasks back off too.
+
+    Example:
+        async with AsyncLLMClient() as client:
+            answers = await client.map(prompts, context=data)
+    """
+
+    DEFAULT_SYSTEM_PROMPT = LLMClient.DEFAULT_SYSTEM_PROMPT
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        use_azure: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """
+        Initialize the async LLM client.
+
+        Args:
+            model: Model name to use for completions.
+            system_prompt: Custom system prompt. Uses default if None.
+            use_azure: Whether to use Azure OpenAI. If None, uses config setting.
+            max_concurrency: Maximum requests in flight. Uses
+                settings.llm_max_concurrency if None.
+            requests_per_minute: Request budget, zero for unlimited. Uses
+                settings.llm_requests_per_minute if None.
+            tokens_per_minute: Token budget, zero for unlimited. Uses
+                settings.llm_tokens_per_minute if None.
+            max_retries: Retries of a throttled or failed request. Uses
+                settings.llm_max_retries if None.
+            limiter: Shared rate limiter. Created from the budgets if None.
+        """
+        self.model = model or settings.default_model
+        self.system_prompt = system_prompt or self.DEFAULT_SYSTEM_PROMPT
+        self.use_azure = (
+            use_azure if use_azure is not None else settings.use_azure_openai
+        )
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.max_retries = (
+            max_retries if max_retries is not None else settings.llm_max_retries
+        )
+        self.limiter = limiter or RateLimiter(
+            requests_per_minute=(
+                requests_per_minute
+                if requests_per_minute is not None
+                else settings.llm_requests_per_minute
+            ),
+            tokens_per_minute=(
+                tokens_per_minute
+                if tokens_per_minute is not None
+                else settings.llm_tokens_per_minute
+            ),
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[Any] = None
+        self._token_counter: Optional[TokenCounter] = None
+        self.retry_count = 0
+        logger.info(
+            "AsyncLLMClient initialized: model=%s, azure=%s, concurrency=%d",
+            self.model,
+            self.use_azure,
+            self.max_concurrency,
+        )
+
+    def _get_client(self) -> Any:
+        """Get or create the async API client."""
+        if self._client is None:
+            # Retries are handled here so they share the rate limiter
+            if self.use_azure:
+                from openai import AsyncAzureOpenAI
+
+                if (
+                    not settings.azure_openai_api_key
+                    or not settings.azure_openai_endpoint
+                ):
+                    raise ValueError(
+                        "Azure OpenAI is enabled but credentials are missing"
+                    )
+                self._client = AsyncAzureOpenAI(
+                    api_key=settings.azure_openai_api_key,
+                    api_version=settings.azure_openai_api_version,
+                    azure_endpoint=settings.azure_openai_endpoint,
+                    max_retries=0,
+                )
+            else:
+                from openai import AsyncOpenAI
+
+                self._client = AsyncOpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url or None,
+                    max_retries=0,
+                )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get or create the semaphore bounding requests in flight."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @property
+    def token_counter(self) -> TokenCounter:
+        """Get or create the token counter for the model."""
+        if self._token_counter is None:
+            self._token_counter = TokenCounter(self.model)
+        return self._token_counter
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.aclose()
+
+    def _build_messages(
+        self,
+        message: str,
+        context: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> List[Dict[str, str]]:
+        """Build the messages list for the API call."""
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": self.system_prompt}
+        ]
+        if history:
+            messages.extend(
+                trim_history(history, self.token_counter, settings.history_token_budget)
+            )
+        user_content = message
+        if context:
+            user_content = f"Call Record Data:\n{context}\n\nQuestion: {message}"
+        messages.append({"role": "user", "content": user_content})
+        return messages
+
+    async def chat(
+        self,
+        message: str,
+        context: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Send a chat message and get a response.
+
+        Args:
+            message: User message to send.
+            context: Additional context (e.g., call record data).
+            history: Previous conversation history.
+            temperature: Sampling temperature (0-2). Uses config default if None.
+            max_tokens: Maximum response tokens. Uses config default if None.
+
+        Returns:
+            Model's response text.
+
+        Raises:
+            openai.APIError: If the request fails after all retries.
+        """
+        messages = self._build_messages(message, context, history)
+        response = await self._complete(messages, temperature, max_tokens)
+        return response.choices[0].message.content or ""
+
+    async def query_calls(
+        self,
+        question: str,
+        call_data: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
+        """
+        Answer a question about call records.
+
+        Args:
+            question: Natural language question about calls.
+            call_data: Formatted call record data as context.
+            history: Previous conversation history.
+
+        Returns:
+            Answer to the question.
+        """
+        return await self.chat(question, context=call_data, history=history)
+
+    async def map(
+        self,
+        prompts: Sequence[str],
+        context: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Run many prompts concurrently within the concurrency and rate limits.
+
+        Args:
+            prompts: Messages to send, e.g. one per-user summary request each.
+            context: Context sent with every prompt.
+            temperature: Sampling temperature (0-2). Uses config default if None.
+            max_tokens: Maximum response tokens. Uses config default if None.
+            return_exceptions: Whether to return a failed prompt's exception
+                in its place instead of raising it.
+
+        Returns:
+            Responses in the same order as the prompts.
+        """
+        with tracing.span("llm.map", **{"llm.prompt_count": len(prompts)}):
+            return await asyncio.gather(
+                *(
+                    self.chat(
+                        prompt,
+                        context=context,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+                    for prompt in prompts
+                ),
+                return_exceptions=return_exceptions,
+            )
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Send one completion request within the limits, retrying failures.
+
+        The token budget is charged the prompt tokens plus ``max_tokens``,
+        which is how the API counts requests against the limit, and then
+        corrected with the reported usage.
+        """
+        import openai
+
+        max_tokens = max_tokens or settings.max_tokens
+        estimate = self.token_counter.count_messages(messages) + max_tokens
+        client = self._get_client()
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                waited = await self.limiter.acquire(estimate)
+                if waited:
+                    metrics.observe("llm_rate_limit_wait_seconds", waited)
+                metrics.adjust_gauge("llm_inflight_requests", 1)
+                try:
+                    with (
+                        metrics.timer("llm_request_seconds", model=self.model),
+                        tracing.span(
+                            "llm.chat",
+                            **{
+                                "llm.model": self.model,
+                                "llm.message_count": len(messages),
+                                "llm.attempt": attempt,
+                            },
+                        ),
+                    ):
+                        response = await client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=temperature or settings.temperature,
+                            max_tokens=max_tokens,
+                            **options,
+                        )
+                    error: Optional[Exception] = None
+                except (openai.APIStatusError, openai.APIConnectionError) as e:
+                    error = e
+                finally:
+                    metrics.adjust_gauge("llm_inflight_requests", -1)
+
+            if error is None:
+                metrics.increment("llm_requests_total", model=self.model)
+                usage = getattr(response, "usage", None)
+                if usage is not None and usage.total_tokens:
+                    self.limiter.adjust(estimate, usage.total_tokens)
+                    metrics.increment(
+                        "llm_tokens_total",
+                        usage.prompt_tokens or 0,
+                        model=self.model,
+                        kind="prompt",
+                    )
+                    metrics.increment(
+                        "llm_tokens_total",
+                        usage.completion_tokens or 0,
+                        model=self.model,
+                        kind="completion",
+                    )
+                return response
+
+            status = getattr(error, "status_code", None)
+            if (
+                status is not None and status not in RETRY_STATUS_CODES
+            ) or attempt >= self.max_retries:
+                raise error
+
+            delay = self._retry_delay(error, attempt)
+            if status == 429:
+                self.limiter.pause(delay)
+            attempt += 1
+            self.retry_count += 1
+            metrics.increment("llm_retries_total", status=status or "connection")
+            logger.warning(
+                "LLM request failed (%s), retrying in %.2fs (attempt %d)",
+                status or type(error).__name__,
+                delay,
+                attempt,
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Get the delay before retrying, preferring the API's own hint."""
+        response = getattr(error, "response", None)
+        hinted = retry_after(getattr(response, "headers", None))
+        if hinted is not None:
+            return hinted
+        # Full jitter keeps concurrent tasks from retrying in lockstep
+        return random.uniform(0, settings.llm_retry_backoff * (2**attempt))
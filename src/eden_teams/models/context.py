@@ -0,0 +1,410 @@
+"""
+Token-budgeted LLM context for Eden Teams.
+
+This module counts tokens with the model's tiktoken encoding and packs call
+records into a fixed token budget: the most relevant records first, each
+compressed to one row of a pipe-separated table. It also trims conversation
+history to a budget so long sessions cannot overflow the context window.
+"""
+
+import logging
+import math
+import re
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from eden_teams.cdr.models import CallRecord, CallType
+
+logger = logging.getLogger(__name__)
+
+# Overhead of the chat message format, per OpenAI's token counting guide
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+RANKINGS = ("recency", "participant", "semantic")
+
+_CALL_TYPE_CODES = {
+    CallType.PEER_TO_PEER: "p2p",
+    CallType.GROUP_CALL: "group",
+    CallType.MEETING: "meeting",
+    CallType.UNKNOWN: "?",
+}
+_WORD = re.compile(r"[\w.@+-]+")
+TABLE_HEADER = "start (UTC)|type|duration|organizer|participants"
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(model: str) -> Any:
+    """Load the tiktoken encoding for a model, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception as e:  # noqa: BLE001 - encodings are downloaded on first use
+        logger.warning("Could not load tiktoken encoding for %s: %s", model, e)
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Could not load tiktoken encoding cl100k_base: %s", e)
+        return None
+
+
+class TokenCounter:
+    """
+    Count tokens with a model's encoding.
+
+    Falls back to an estimate of four characters per token when tiktoken or
+    the encoding file is unavailable (tiktoken downloads encodings on first
+    use), so budgets still hold approximately offline.
+    """
+
+    def __init__(self, model: str = "gpt-4") -> None:
+        """
+        Initialize the counter.
+
+        Args:
+            model: Model whose encoding is used.
+        """
+        self.model = model
+        self._encoding = _load_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        """Check if counts come from the model's encoding."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Text to count.
+
+        Returns:
+            Number of tokens.
+        """
+        if not text:
+            return 0
+        if self._encoding is None:
+            return math.ceil(len(text) / 4)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_messages(self, messages: Sequence[Dict[str, Any]]) -> int:
+        """
+        Count the tokens a list of chat messages uses in a request.
+
+        Args:
+            messages: Chat messages with "role" and "content".
+
+        Returns:
+            Number of prompt tokens, including message overhead.
+        """
+        total = TOKENS_PER_REPLY
+        for message in messages:
+            total += self.count_message(message)
+        return total
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """Count the tokens of one chat message, including overhead."""
+        total = TOKENS_PER_MESSAGE
+        for key in ("role", "content", "name"):
+            value = message.get(key)
+            if isinstance(value, str):
+                total += self.count(value)
+        return total
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut a text to at most max_tokens tokens.
+
+        Args:
+            text: Text to cut.
+            max_tokens: Maximum tokens to keep.
+
+        Returns:
+            The text, shortened if needed.
+        """
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is None:
+            return text[: max_tokens * 4]
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        shortened: str = self._encoding.decode(tokens[:max_tokens])
+        return shortened
+
+
+def trim_history(
+    history: Sequence[Dict[str, Any]], counter: TokenCounter, budget: int
+) -> List[Dict[str, Any]]:
+    """
+    Keep the most recent history messages that fit a token budget.
+
+    Whole user/assistant exchanges are dropped from the oldest end, so the
+    model never sees an answer without its question.
+
+    Args:
+        history: Conversation history, oldest first.
+        counter: Token counter for the model.
+        budget: Maximum tokens for the kept messages.
+
+    Returns:
+        The most recent messages within the budget, oldest first.
+    """
+    kept: List[Dict[str, Any]] = []
+    used = 0
+    for message in reversed(history):
+        used += counter.count_message(message)
+        if used > budget:
+            break
+        kept.append(message)
+    kept.reverse()
+
+    # Don't start on an orphaned assistant reply
+    while kept and kept[0].get("role") == "assistant":
+        kept.pop(0)
+
+    if len(kept) < len(history):
+        logger.debug(
+            "Trimmed history from %d to %d messages (%d token budget)",
+            len(history),
+            len(kept),
+            budget,
+        )
+    return kept
+
+
+class PackedContext(BaseModel):
+    """Call record context packed into a token budget."""
+
+    text: str = Field(description="Context to send to the model")
+    tokens: int = Field(description="Tokens used by the text")
+    records_included: int = Field(description="Records listed in the table")
+    records_total: int = Field(description="Records in the window")
+
+
+class ContextBuilder:
+    """
+    Pack call records into a token budget.
+
+    Records are ranked by the configured strategy, compressed to one table
+    row each, and added until the budget is spent. Summary statistics are
+    placed first so they survive even when few rows fit.
+    """
+
+    def __init__(
+        self,
+        counter: TokenCounter,
+        budget_tokens: int = 3000,
+        ranking: str = "participant",
+        max_records: Optional[int] = None,
+        embeddings: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize the builder.
+
+        Args:
+            counter: Token counter for the model.
+            budget_tokens: Maximum tokens for the whole context.
+            ranking: "recency" (newest first), "participant" (records with
+                participants named in the query first, then newest) or
+                "semantic" (closest matches from ``embeddings`` first).
+            max_records: Maximum rows regardless of budget. Unbounded if None.
+            embeddings: EmbeddingsClient used by the "semantic" ranking.
+
+        Raises:
+            ValueError: If the ranking is unknown.
+        """
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown context ranking: {ranking}")
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+        self.ranking = ranking
+        self.max_records = max_records
+        self.embeddings = embeddings
+
+    @property
+    def query_dependent(self) -> bool:
+        """Check if the packed context depends on the query text."""
+        return self.ranking != "recency"
+
+    @staticmethod
+    def format_row(record: CallRecord, max_participants: int = 5) -> str:
+        """
+        Compress a record to one table row.
+
+        Args:
+            record: Call record.
+            max_participants: Participants listed before "+N more".
+
+        Returns:
+            Pipe-separated row matching TABLE_HEADER.
+        """
+        names = record.get_participant_names()
+        shown = ",".join(names[:max_participants])
+        if len(names) > max_participants:
+            shown += f",+{len(names) - max_participants}"
+        duration = record.duration_formatted.replace(" ", "")
+        organizer = record.organizer.identifier if record.organizer else "-"
+        return (
+            f"{record.start_time:%Y-%m-%d %H:%M}|"
+            f"{_CALL_TYPE_CODES.get(record.call_type, record.call_type.value)}|"
+            f"{duration}|{organizer}|{shown}"
+        )
+
+    def rank(self, records: Sequence[CallRecord], query: str = "") -> List[CallRecord]:
+        """
+        Order records from most to least relevant.
+
+        Args:
+            records: Candidate records.
+            query: User question used by query-dependent rankings.
+
+        Returns:
+            Records, most relevant first.
+        """
+        newest = sorted(records, key=lambda r: r.start_time, reverse=True)
+        if self.ranking == "recency" or not query:
+            return newest
+
+        if self.ranking == "semantic" and self.embeddings is not None:
+            # Only search the window being ranked; the end bound is exclusive
+            # and compared in whole seconds
+            matches = self.embeddings.search_calls(
+                query,
+                n_results=len(records),
+                start_time=newest[-1].start_time,
+                end_time=newest[0].start_time + timedelta(seconds=1),
+            )
+            order = {match["id"]: i for i, match in enumerate(matches)}
+        else:
+            order = self._participant_order(newest, query)
+
+        # Python's sort is stable, so unmatched records keep recency order
+        return sorted(newest, key=lambda r: order.get(r.id, len(order)))
+
+    @staticmethod
+    def _participant_order(records: Sequence[CallRecord], query: str) -> Dict[str, int]:
+        """Rank records whose participants are named in the query first."""
+        words = {w.lower() for w in _WORD.findall(query) if len(w) > 2}
+        if not words:
+            return {}
+
+        order: Dict[str, int] = {}
+        for record in records:
+            for participant in record.participants:
+                names = {
+                    part.lower()
+                    for name in (participant.email, participant.display_name)
+                    if name
+                    for part in [name, *name.split(), name.split("@")[0]]
+                }
+                if names & words:
+                    order[record.id] = len(order)
+                    break
+        return order
+
+    def build(
+        self,
+        records: Sequence[CallRecord],
+        query: str = "",
+        summary: Optional[Dict[str, Any]] = None,
+        total: Optional[int] = None,
+        ranked: bool = False,
+    ) -> PackedContext:
+        """
+        Pack records and summary statistics into the token budget.
+
+        Args:
+            records: Candidate records.
+            query: User question used to rank records.
+            summary: Summary statistics to place first, if any.
+            total: Records in the window when ``records`` is only a sample.
+            ranked: Whether records are already most relevant first, e.g.
+                retrieved by search. They are then packed in that order.
+
+        Returns:
+            The packed context.
+        """
+        total = len(records) if total is None else total
+        if not records and not (summary and summary.get("total_calls")):
+            text = "No call records found for the specified criteria."
+            return PackedContext(
+                text=text,
+                tokens=self.counter.count(text),
+                records_included=0,
+                records_total=total,
+            )
+
+        head = [f"Found {total} call record(s)."]
+        if summary:
+            head.append(self.format_summary(summary))
+        head.extend(["", "Most relevant calls:", TABLE_HEADER])
+        text = "\n".join(head)
+        used = self.counter.count(text)
+
+        # Reserve room for the "omitted" footer
+        budget = self.budget_tokens - 16
+        rows: List[str] = []
+        limit = self.max_records if self.max_records is not None else len(records)
+        ordered = list(records) if ranked else self.rank(records, query)
+        for record in ordered[:limit]:
+            row = self.format_row(record)
+            cost = self.counter.count(row) + 1  # newline
+            if used + cost > budget:
+                break
+            rows.append(row)
+            used += cost
+
+        if rows:
+            text += "\n" + "\n".join(rows)
+        if total > len(rows):
+            text += f"\n... {total - len(rows)} more records not listed."
+
+        return PackedContext(
+            text=text,
+            tokens=self.counter.count(text),
+            records_included=len(rows),
+            records_total=total,
+        )
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Any]) -> str:
+        """
+        Format summary statistics as compact lines.
+
+        Args:
+            summary: Summary from CallRecordService.get_call_summary or
+                CallRollup.summary.
+
+        Returns:
+            Summary lines.
+        """
+        lines = [
+            "Summary Statistics:",
+            f"- Total Calls: {summary['total_calls']}",
+            f"- Total Duration: {summary['total_duration_formatted']}",
+            f"- Unique Participants: {summary['participant_count']}",
+            f"- Call Types: {summary['call_types']}",
+        ]
+        if summary.get("top_organizers"):
+            organizers = ", ".join(
+                f"{name} ({count})" for name, count in summary["top_organizers"]
+            )
+            lines.append(f"- Top Organizers: {organizers}")
+        if summary.get("daily_counts"):
+            days = ", ".join(
+                f"{day}: {count}" for day, count in summary["daily_counts"].items()
+            )
+            lines.append(f"- Calls per Day: {days}")
+        return "\n".join(lines)
@@ -0,0 +1,254 @@
+"""
+Persistent cache of document embeddings.
+
+This module provides EmbeddingCache, which stores one vector per distinct
+document text so that re-indexing, rebuilding a collection or indexing the
+same call into several collections never embeds the same text twice.
+Vectors are keyed by the SHA-256 of the document, kept per embedding model,
+and stored as float32 or float16 rows in a memory-mapped file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from eden_teams.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+DTYPES = ("float32", "float16")
+_DIGEST_SIZE = 32
+
+
+def document_key(document: str) -> bytes:
+    """
+    Get the cache key of a document.
+
+    Args:
+        document: Document text.
+
+    Returns:
+        SHA-256 digest of the UTF-8 text.
+    """
+    return hashlib.sha256(document.encode()).digest()
+
+
+class EmbeddingCache:
+    """
+    Memory-mapped store of embeddings keyed by document hash.
+
+    Each model gets three files in the cache directory: ``<model>.vectors``
+    (rows of ``dim`` floats), ``<model>.keys`` (one 32-byte SHA-256 digest
+    per row) and ``<model>.json`` (dimension and dtype). Rows are only ever
+    appended, vectors before keys, so a crash mid-write leaves at worst an
+    unreferenced row. The key file is read into a dictionary on open; the
+    vectors are memory-mapped and read on demand.
+
+    The cache is safe to use from several threads in one process.
+    """
+
+    def __init__(self, directory: str, model: str, dtype: str = "float32") -> None:
+        """
+        Open or create the cache for a model.
+
+        Args:
+            directory: Directory holding the cache files.
+            model: Embedding model name. Each model has its own files.
+            dtype: "float32" or "float16" storage. float16 halves the size
+                at a small loss of precision.
+
+        Raises:
+            ValueError: If the dtype is not supported.
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.directory = directory
+        self.model = model
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        slug = re.sub(r"[^\w.-]+", "_", model)
+        self._vectors_path = os.path.join(directory, f"{slug}.vectors")
+        self._keys_path = os.path.join(directory, f"{slug}.keys")
+        self._meta_path = os.path.join(directory, f"{slug}.json")
+        self._rows: Dict[bytes, int] = {}
+        self._map: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self) -> int:
+        """Get the number of cached vectors."""
+        return len(self._rows)
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of looked-up documents found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_many(self, documents: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the vectors of documents.
+
+        Args:
+            documents: Document texts.
+
+        Returns:
+            A float32 vector per document, or None where it is not cached.
+        """
+        with self._lock:
+            rows = [self._rows.get(document_key(d)) for d in documents]
+            found = [row for row in rows if row is not None]
+            if found and (self._map is None or max(found) >= len(self._map)):
+                self._remap()
+            table = self._map
+            vectors = [
+                (
+                    None
+                    if row is None or table is None
+                    else np.asarray(table[row], dtype=np.float32)
+                )
+                for row in rows
+            ]
+        hits = len(found)
+        self.hits += hits
+        self.misses += len(documents) - hits
+        metrics.increment("embedding_cache_lookups_total", hits, result="hit")
+        metrics.increment(
+            "embedding_cache_lookups_total", len(documents) - hits, result="miss"
+        )
+        return vectors
+
+    def put_many(
+        self, documents: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """
+        Store the vectors of documents. Documents already cached are ignored.
+
+        Args:
+            documents: Document texts.
+            vectors: One embedding per document.
+
+        Raises:
+            ValueError: If the vectors' dimension differs from the cache's.
+        """
+        with self._lock:
+            keys: List[bytes] = []
+            rows: List[np.ndarray] = []
+            for document, vector in zip(documents, vectors):
+                key = document_key(document)
+                if key in self._rows or key in keys:
+                    continue
+                keys.append(key)
+                rows.append(np.asarray(vector, dtype=self.dtype))
+            if not rows:
+                return
+
+            matrix = np.vstack(rows)
+            if self.dim is None:
+                self._write_meta(matrix.shape[1])
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match "
+                    f"cache dimension {self.dim}"
+                )
+
+            # Vectors first, so every key written refers to a complete row
+            with open(self._vectors_path, "ab") as f:
+                f.write(matrix.tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(keys))
+            start = len(self._rows)
+            for offset, key in enumerate(keys):
+                self._rows[key] = start + offset
+
+    def embed(
+        self,
+        documents: Sequence[str],
+        embed: Callable[[List[str]], Sequence[Sequence[float]]],
+    ) -> List[List[float]]:
+        """
+        Get embeddings for documents, computing only the uncached ones.
+
+        Args:
+            documents: Document texts.
+            embed: Embeds a list of documents.
+
+        Returns:
+            One embedding per document, in order.
+        """
+        cached = self.get_many(documents)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            # Embed each distinct text once
+            texts = list(dict.fromkeys(documents[i] for i in missing))
+            computed = embed(texts)
+            self.put_many(texts, computed)
+            by_text = dict(zip(texts, computed))
+            for i in missing:
+                cached[i] = np.asarray(by_text[documents[i]], dtype=np.float32)
+        return [vector.tolist() for vector in cached]  # type: ignore[union-attr]
+
+    def _open(self) -> None:
+        """Load the metadata and key index, discarding incomplete rows."""
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("dtype") != self.dtype.name:
+            logger.warning(
+                "Embedding cache %s uses %s, not %s; starting a new cache",
+                self._meta_path,
+                meta.get("dtype"),
+                self.dtype.name,
+            )
+            for path in (self._vectors_path, self._keys_path, self._meta_path):
+                if os.path.exists(path):
+                    os.unlink(path)
+            return
+        self.dim = int(meta["dim"])
+
+        keys = b""
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, "rb") as f:
+                keys = f.read()
+        row_size = self.dim * self.dtype.itemsize
+        vector_bytes = (
+            os.path.getsize(self._vectors_path)
+            if os.path.exists(self._vectors_path)
+            else 0
+        )
+        count = min(len(keys) // _DIGEST_SIZE, vector_bytes // row_size)
+        self._rows = {
+            keys[i * _DIGEST_SIZE : (i + 1) * _DIGEST_SIZE]: i for i in range(count)
+        }
+        # Trim a torn write so new rows line up with their keys
+        if len(keys) != count * _DIGEST_SIZE:
+            os.truncate(self._keys_path, count * _DIGEST_SIZE)
+        if vector_bytes != count * row_size:
+            os.truncate(self._vectors_path, count * row_size)
+        logger.info("Opened embedding cache for %s: %d vectors", self.model, count)
+
+    def _write_meta(self, dim: int) -> None:
+        """Record the dimension and dtype of a new cache."""
+        self.dim = dim
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": dim, "dtype": self.dtype.name}, f)
+
+    def _remap(self) -> None:
+        """Map the vector file again after rows were appended."""
+        assert self.dim is not None
+        self._map = np.memmap(
+            self._vectors_path,
+            dtype=self.dtype,
+            mode="r",
+            shape=(len(self._rows), self.dim),
+        )
@@ -0,0 +1,328 @@
+"""
+Embedding providers for the vector database.
+
+This module provides the embedding functions EmbeddingsClient can use in
+place of ChromaDB's implicit default, selected with EMBEDDING_PROVIDER:
+
+- "local": a sentence-transformer model run on the CPU with ONNX Runtime,
+  with a configurable thread count and batch size.
+- "openai": the OpenAI or Azure OpenAI embeddings API, batching documents
+  into as few requests as possible.
+- "hash": deterministic feature hashing, with no model or network. Useful
+  for tests and for benchmarking the rest of the indexing pipeline.
+
+Every provider splits its input into batches of at most ``max_batch``
+documents and records ``embedding_documents_total`` and
+``embedding_batch_seconds`` per provider, so indexing throughput can be
+measured and tuned per deployment.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Sequence, get_args
+
+import numpy as np
+
+from eden_teams.config import EmbeddingProviderKind, settings
+from eden_teams.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = get_args(EmbeddingProviderKind)
+
+DEFAULT_LOCAL_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_OPENAI_MODEL = "text-embedding-3-small"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class EmbeddingProvider(ABC):
+    """
+    Base class for embedding providers.
+
+    Providers are callables from a list of documents to one vector per
+    document, so they can be passed wherever an embedding function is
+    expected. Subclasses implement ``_embed_batch``.
+    """
+
+    #: Provider type, used as the metrics label
+    kind = "base"
+
+    def __init__(self, model: str, max_batch: int) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            model: Model name.
+            max_batch: Maximum documents per model call or request.
+        """
+        self.model = model
+        self.max_batch = max(1, max_batch)
+
+    @property
+    def name(self) -> str:
+        """Get a name identifying the vectors this provider produces."""
+        return f"{self.kind}-{self.model}"
+
+    def __call__(self, documents: Sequence[str]) -> List[List[float]]:
+        """Embed documents, in batches of at most max_batch."""
+        vectors: List[List[float]] = []
+        with tracing.span(
+            "embeddings.provider",
+            **{
+                "embeddings.provider": self.kind,
+                "embeddings.document_count": len(documents),
+            },
+        ):
+            for start in range(0, len(documents), self.max_batch):
+                batch = list(documents[start : start + self.max_batch])
+                with metrics.timer("embedding_batch_seconds", provider=self.kind):
+                    vectors.extend(self._embed_batch(batch))
+                metrics.increment(
+                    "embedding_documents_total", len(batch), provider=self.kind
+                )
+        return vectors
+
+    @abstractmethod
+    def _embed_batch(self, documents: List[str]) -> List[List[float]]:
+        """Embed one batch of documents."""
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic embeddings from hashed words and word pairs.
+
+    Each word and pair of adjacent words is hashed to a signed position in a
+    fixed-size vector, which is then L2-normalized. Texts sharing words get
+    similar vectors, which is enough for tests and benchmarks, and the same
+    text always gets the same vector on every machine.
+    """
+
+    kind = "hash"
+
+    def __init__(self, dimension: int = 384, max_batch: int = 1024) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            dimension: Length of the vectors.
+            max_batch: Maximum documents per batch.
+        """
+        super().__init__(model=str(dimension), max_batch=max_batch)
+        self.dimension = dimension
+
+    def _embed_batch(self, documents: List[str]) -> List[List[float]]:
+        """Hash each document's features into a normalized vector."""
+        return [self._embed_one(document) for document in documents]
+
+    def _embed_one(self, document: str) -> List[float]:
+        """Hash one document's features into a normalized vector."""
+        words = _TOKEN_PATTERN.findall(document.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not features:
+            return [0.0] * self.dimension
+        hashes = np.array(
+            [
+                int.from_bytes(
+                    hashlib.blake2b(f.encode(), digest_size=8).digest(), "big"
+                )
+                for f in features
+            ],
+            dtype=np.uint64,
+        )
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        vector = np.bincount(
+            (hashes % np.uint64(self.dimension)).astype(np.int64),
+            weights=signs,
+            minlength=self.dimension,
+        )
+        norm = np.linalg.norm(vector)
+        values: List[float] = (vector / norm if norm else vector).tolist()
+        return values
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Sentence-transformer embeddings computed on the CPU.
+
+    Runs ChromaDB's bundled ONNX export of all-MiniLM-L6-v2, the model
+    ChromaDB uses by default, so vectors match collections created without
+    an explicit provider. The model is downloaded on first use. Unlike the
+    implicit default, the ONNX Runtime thread count and the inference batch
+    size are configurable.
+    """
+
+    kind = "local"
+
+    def __init__(
+        self,
+        model: str = DEFAULT_LOCAL_MODEL,
+        threads: int = 0,
+        max_batch: int = 64,
+    ) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            model: Model name. Only all-MiniLM-L6-v2 is bundled.
+            threads: ONNX Runtime intra-op threads. Uses ONNX Runtime's
+                default (one per physical core) if 0.
+            max_batch: Documents per inference call. Larger batches use
+                the cores better at the cost of memory.
+
+        Raises:
+            ValueError: If the model is not available locally.
+            ImportError: If ONNX Runtime or the tokenizer is not installed.
+        """
+        if model != DEFAULT_LOCAL_MODEL:
+            raise ValueError(f"Unsupported local embedding model: {model}")
+        super().__init__(model=model, max_batch=max_batch)
+        self.threads = threads
+        self._function: Optional[Any] = None
+
+    def _load(self) -> Any:
+        """Download the model if needed and open an inference session."""
+        if self._function is None:
+            import onnxruntime
+            from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+            function = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+            function._download_model_if_not_exists()
+            options = onnxruntime.SessionOptions()
+            options.log_severity_level = 3
+            options.graph_optimization_level = (
+                onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            )
+            if self.threads > 0:
+                options.intra_op_num_threads = self.threads
+            # Replaces the session ChromaDB would open with default options
+            function.model = onnxruntime.InferenceSession(
+                os.path.join(
+                    function.DOWNLOAD_PATH, function.EXTRACTED_FOLDER_NAME, "model.onnx"
+                ),
+                providers=["CPUExecutionProvider"],
+                sess_options=options,
+            )
+            self._function = function
+            logger.info(
+                "Loaded local embedding model %s (threads=%s, batch=%d)",
+                self.model,
+                self.threads or "default",
+                self.max_batch,
+            )
+        return self._function
+
+    def _embed_batch(self, documents: List[str]) -> List[List[float]]:
+        """Run the model over one batch of documents."""
+        vectors = self._load()._forward(documents, batch_size=self.max_batch)
+        return [vector.tolist() for vector in vectors]
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeddings from the OpenAI or Azure OpenAI API.
+
+    Each batch of documents is sent as one request, and the vectors are
+    returned in the order of the documents.
+    """
+
+    kind = "openai"
+
+    def __init__(
+        self,
+        model: str = DEFAULT_OPENAI_MODEL,
+        use_azure: Optional[bool] = None,
+        max_batch: int = 256,
+        client: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            model: Embedding model, or deployment name on Azure.
+            use_azure: Whether to use Azure OpenAI. Auto-detected if None.
+            max_batch: Documents per request. The API accepts up to 2048.
+            client: OpenAI client to use. Created from settings if None.
+        """
+        super().__init__(model=model, max_batch=min(max_batch, 2048))
+        self.use_azure = (
+            use_azure if use_azure is not None else settings.use_azure_openai
+        )
+        self._client = client
+
+    def _get_client(self) -> Any:
+        """Get or create the API client."""
+        if self._client is None:
+            if self.use_azure:
+                from openai import AzureOpenAI
+
+                if (
+                    not settings.azure_openai_api_key
+                    or not settings.azure_openai_endpoint
+                ):
+                    raise ValueError(
+                        "Azure OpenAI is enabled but credentials are missing"
+                    )
+                self._client = AzureOpenAI(
+                    api_key=settings.azure_openai_api_key,
+                    api_version=settings.azure_openai_api_version,
+                    azure_endpoint=settings.azure_openai_endpoint,
+                )
+            else:
+                from openai import OpenAI
+
+                self._client = OpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url or None,
+                )
+        return self._client
+
+    def _embed_batch(self, documents: List[str]) -> List[List[float]]:
+        """Embed one batch of documents in a single request."""
+        response = self._get_client().embeddings.create(
+            model=self.model, input=documents
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return [list(item.embedding) for item in data]
+
+
+def create_embedding_provider(
+    provider: Optional[str] = None,
+) -> Optional[EmbeddingProvider]:
+    """
+    Create the embedding provider selected in the settings.
+
+    Args:
+        provider: Provider type, one of PROVIDERS. Uses
+            settings.embedding_provider if None.
+
+    Returns:
+        The provider, or None for "chroma" (ChromaDB embeds documents
+        itself with its default function).
+
+    Raises:
+        ValueError: If the provider type is unknown.
+    """
+    provider = provider or settings.embedding_provider
+    if provider == "chroma":
+        return None
+    if provider == "local":
+        return LocalEmbeddingProvider(
+            model=settings.embedding_model or DEFAULT_LOCAL_MODEL,
+            threads=settings.embedding_threads,
+            max_batch=settings.embedding_max_batch,
+        )
+    if provider == "openai":
+        return OpenAIEmbeddingProvider(
+            model=settings.embedding_model or DEFAULT_OPENAI_MODEL,
+            max_batch=settings.embedding_max_batch,
+        )
+    if provider == "hash":
+        return HashingEmbeddingProvider(
+            dimension=settings.embedding_dimension,
+            max_batch=settings.embedding_max_batch,
+        )
+    raise ValueError(f"Unknown embedding provider: {provider}")
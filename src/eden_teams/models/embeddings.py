@@ -5,34 +5,88 @@ This module provides functionality for creating embeddings from call records
 and performing semantic search over call data.
 """
 
+import contextvars
+import hashlib
+import importlib.util
+import inspect
+import json
 import logging
-from typing import Any, Dict, List, Optional
-
-try:
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    cast,
+)
+
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.config import settings
+from eden_teams.models.embedding_cache import EmbeddingCache
+from eden_teams.models.embedding_providers import (
+    DEFAULT_LOCAL_MODEL,
+    EmbeddingProvider,
+    LocalEmbeddingProvider,
+    create_embedding_provider,
+)
+from eden_teams.models.hybrid_search import (
+    BM25Index,
+    build_where,
+    reciprocal_rank_fusion,
+    timestamp,
+)
+from eden_teams.models.index_manifest import IndexManifest
+from eden_teams.models.record_store import RecordStore
+from eden_teams.models.vector_index import VectorIndex
+from eden_teams.utils import metrics, tracing
+
+if TYPE_CHECKING:
     import chromadb
-    from chromadb.config import Settings as ChromaSettings
-
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
 
-from eden_teams.cdr.models import CallRecord
+# ChromaDB is slow to import, so it is only imported when a client is opened
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
 
 logger = logging.getLogger(__name__)
 
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class _Batch(NamedTuple):
+    """A chunk of records prepared for upserting."""
+
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+    embeddings: Optional[List[List[float]]]
+    records: List[CallRecord]
+    skipped: int
+
 
 class EmbeddingsClient:
     """
     Client for generating embeddings and performing vector search.
 
     This class provides methods for creating embeddings from call records
-    and searching for similar calls using semantic search.
+    and searching for similar calls using semantic search. Records are
+    stored in ChromaDB, or in the built-in VectorIndex when ChromaDB is not
+    installed or settings.vector_backend is "numpy".
     """
 
     def __init__(
         self,
         collection_name: str = "call_records",
-        persist_directory: str = "./chroma_db",
+        persist_directory: Optional[str] = None,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_model: str = "custom",
     ) -> None:
         """
         Initialize the embeddings client.
@@ -40,114 +94,606 @@ class EmbeddingsClient:
         Args:
             collection_name: Name of the ChromaDB collection.
             persist_directory: Directory to persist the vector database.
+                Uses settings.vector_db_path if None. The built-in index is
+                kept in its vector_index subdirectory. Each collection has a
+                manifest, <collection_name>.manifest.json, beside it.
+            embedding_function: Embeds a list of documents, and queries.
+                Created from settings.embedding_provider if None. If there
+                is one, documents are embedded here, overlapping with
+                writes; otherwise ("chroma") ChromaDB embeds them during
+                the upsert. The built-in index needs one, and falls back to
+                the "local" provider, or "hash" without ChromaDB's model.
+            embedding_cache: Cache of embeddings by document hash. Created
+                in settings.embedding_cache_dir if None and that is set.
+                Cached vectors are passed to ChromaDB instead of being
+                recomputed. With the "chroma" provider, documents are then
+                embedded by the "local" provider, which runs the same model.
+            embedding_model: Name of embedding_function's model, which keys
+                the cache and is recorded in the manifest. Ignored unless
+                embedding_function is a plain function rather than an
+                EmbeddingProvider.
         """
-        if not CHROMADB_AVAILABLE:
+        self.backend = settings.vector_backend
+        if self.backend == "auto":
+            self.backend = "chroma" if CHROMADB_AVAILABLE else "numpy"
+        if self.backend == "chroma" and not CHROMADB_AVAILABLE:
             logger.warning(
                 "ChromaDB not available. Install chromadb to use embeddings."
             )
 
         self.collection_name = collection_name
-        self.persist_directory = persist_directory
-        self._client: Optional[chromadb.Client] = None
-        self._collection: Optional[chromadb.Collection] = None
-
-        if CHROMADB_AVAILABLE:
+        self.persist_directory = persist_directory or settings.vector_db_path
+        if embedding_function is None:
+            provider = settings.embedding_provider
+            if provider == "chroma" and self.backend == "numpy":
+                # The built-in index cannot embed; use ChromaDB's model if
+                # its package is installed
+                provider = "local" if CHROMADB_AVAILABLE else "hash"
+                if provider == "hash":
+                    logger.warning(
+                        "ChromaDB not available. Using the built-in vector "
+                        "index with hash embeddings; set EMBEDDING_PROVIDER "
+                        "for semantic search."
+                    )
+            elif provider == "chroma" and (
+                embedding_cache is not None or settings.embedding_cache_dir
+            ):
+                # Cached vectors must be computed here; use the model
+                # ChromaDB would have used
+                provider = "local"
+            embedding_function = create_embedding_provider(provider)
+        if isinstance(embedding_function, EmbeddingProvider):
+            embedding_model = embedding_function.name
+        elif embedding_function is None:
+            # ChromaDB's default function runs the bundled local model
+            embedding_model = f"{LocalEmbeddingProvider.kind}-{DEFAULT_LOCAL_MODEL}"
+        if (
+            embedding_cache is None
+            and settings.embedding_cache_dir
+            and embedding_function is not None
+        ):
+            embedding_cache = EmbeddingCache(
+                settings.embedding_cache_dir,
+                embedding_model,
+                dtype=settings.embedding_cache_dtype,
+            )
+        self.embedding_function = embedding_function
+        self.embedding_model = embedding_model
+        self.embedding_cache = embedding_cache
+        # Document hashes known to be stored, by call ID
+        self._hashes: Dict[str, str] = {}
+        # Participants of every stored record, loaded on the first search
+        self._keywords = BM25Index()
+        # Whether _hashes and _keywords cover every stored record
+        self._warm = False
+        self._manifest: Optional[IndexManifest] = None
+        # Serializes writes and the in-memory indexes for concurrent callers
+        self._lock = threading.RLock()
+        self._client: Optional["chromadb.ClientAPI"] = None
+        self._collection: Optional[Any] = None
+        self._record_store: Optional[RecordStore] = None
+
+        if self.backend == "numpy" or CHROMADB_AVAILABLE:
             logger.info(
-                "EmbeddingsClient initialized: collection=%s, persist_dir=%s",
+                "EmbeddingsClient initialized: collection=%s, persist_dir=%s, "
+                "backend=%s",
                 collection_name,
-                persist_directory,
+                self.persist_directory,
+                self.backend,
             )
 
     @property
-    def client(self) -> Optional[chromadb.Client]:
-        """Get or create the ChromaDB client."""
-        if not CHROMADB_AVAILABLE:
+    def client(self) -> Optional["chromadb.ClientAPI"]:
+        """Get or create the persistent ChromaDB client."""
+        if not CHROMADB_AVAILABLE or self.backend != "chroma":
             return None
 
         if self._client is None:
-            self._client = chromadb.Client(
-                ChromaSettings(
-                    persist_directory=self.persist_directory,
-                    anonymized_telemetry=False,
-                )
+            import chromadb
+            from chromadb.config import Settings as ChromaSettings
+
+            self._client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=ChromaSettings(anonymized_telemetry=False),
             )
         return self._client
 
     @property
-    def collection(self) -> Optional[chromadb.Collection]:
-        """Get or create the ChromaDB collection."""
-        if not CHROMADB_AVAILABLE or self.client is None:
-            return None
-
-        if self._collection is None:
+    def collection(self) -> Optional[Any]:
+        """Get or create the ChromaDB collection, or the built-in index."""
+        if self._collection is not None:
+            return self._collection
+        with self._lock:
+            if self._collection is None:
+                self._open_collection()
+            return self._collection
+
+    def _open_collection(self) -> None:
+        """Open the collection, rebuilding it if its model has changed."""
+        if self.backend == "numpy":
+            self._collection = VectorIndex(
+                os.path.join(self._backend_directory, self.collection_name),
+                quantize=settings.vector_index_quantize,
+            )
+        elif not CHROMADB_AVAILABLE or self.client is None:
+            return
+        else:
             self._collection = self.client.get_or_create_collection(
                 name=self.collection_name
             )
-        return self._collection
 
-    def add_call_records(self, records: List[CallRecord]) -> None:
+        manifest = self.manifest
+        if manifest is not None and manifest.embedding_model != self.embedding_model:
+            logger.warning(
+                "Collection %s was indexed with %s; rebuilding it for %s",
+                self.collection_name,
+                manifest.embedding_model,
+                self.embedding_model,
+            )
+            self.clear_collection()
+            self._open_collection()
+
+    @property
+    def record_store(self) -> RecordStore:
+        """Get the store of full records kept next to the collection."""
+        if self._record_store is None:
+            self._record_store = RecordStore(
+                os.path.join(
+                    self._backend_directory, f"{self.collection_name}.records.db"
+                )
+            )
+        return self._record_store
+
+    @property
+    def _backend_directory(self) -> str:
+        """Get the directory the backend stores collections in."""
+        if self.backend == "numpy":
+            return os.path.join(self.persist_directory, "vector_index")
+        return self.persist_directory
+
+    @property
+    def manifest_path(self) -> str:
+        """Get the path of the collection's manifest file."""
+        return os.path.join(
+            self._backend_directory, f"{self.collection_name}.manifest.json"
+        )
+
+    @property
+    def manifest(self) -> Optional[IndexManifest]:
+        """Get the manifest of the stored collection, if it has one."""
+        if self._manifest is None:
+            self._manifest = IndexManifest.load(self.manifest_path)
+        return self._manifest
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Get the start time of the newest indexed call, if known."""
+        manifest = self.manifest
+        return manifest.watermark if manifest is not None else None
+
+    def _update_manifest(self, records: List[CallRecord]) -> None:
+        """Record the indexed records' watermark and the collection size."""
+        with self._lock:
+            self._save_manifest(records)
+
+    def _save_manifest(self, records: List[CallRecord]) -> None:
+        """Write the manifest after indexing records. Needs the lock."""
+        assert self.collection is not None
+        watermark = self.watermark
+        newest = max((record.start_time for record in records), default=None)
+        if newest is not None and (
+            watermark is None or timestamp(newest) > timestamp(watermark)
+        ):
+            watermark = newest
+        self._manifest = IndexManifest(
+            collection=self.collection_name,
+            backend=self.backend,
+            embedding_model=self.embedding_model,
+            watermark=watermark,
+            record_count=self.collection.count(),
+            updated_at=datetime.now(timezone.utc),
+        )
+        self._manifest.save(self.manifest_path)
+
+    def warm(self) -> int:
+        """
+        Open the stored collection and load what searches and writes need.
+
+        Reads the metadata of every stored record once, to build the keyword
+        index and learn the stored document hashes. Nothing is embedded:
+        the stored vectors are used as they are, so a restarted process is
+        ready in the time it takes to read the metadata. Calling this is
+        optional; the first search or write does it otherwise.
+
+        Returns:
+            Number of stored records.
+        """
+        if self.collection is None:
+            return 0
+        with (
+            metrics.timer("embeddings_seconds", operation="warm"),
+            tracing.span("embeddings.warm") as span,
+        ):
+            self._load_stored()
+            span.set_attributes(**{"embeddings.record_count": len(self._hashes)})
+        return len(self._hashes)
+
+    def add_call_records(
+        self, records: List[CallRecord], batch_size: Optional[int] = None
+    ) -> int:
         """
-        Add call records to the vector database.
+        Add or update call records in the vector database.
+
+        Records are upserted in batches, so re-adding an ID updates it
+        instead of failing. Records whose document and metadata are
+        unchanged since they were stored (their hash is kept in the
+        metadata) are skipped, so re-indexing a window only pays for new
+        and changed records. The next batch is prepared and embedded on a
+        worker thread while the current one is written. The full records
+        written are kept in the record store, for stored_records. Afterwards
+        the manifest's watermark is advanced to the newest record's start
+        time.
 
         Args:
             records: List of CallRecord objects to add.
+            batch_size: Records per upsert. Uses settings.embeddings_batch_size
+                if None, capped at ChromaDB's maximum batch size.
+
+        Returns:
+            Number of records written.
         """
-        if not CHROMADB_AVAILABLE or self.collection is None:
+        if self.collection is None:
             logger.warning("ChromaDB not available. Cannot add call records.")
-            return
+            return 0
+
+        # The last occurrence of an ID wins, as it would with sequential upserts
+        unique = list({record.id: record for record in records}.values())
+        size = batch_size or settings.embeddings_batch_size
+        max_size = self._max_batch_size()
+        if max_size is not None:
+            size = min(size, max_size)
+        chunks = [unique[i : i + size] for i in range(0, len(unique), size)]
+
+        written = skipped = 0
+        with (
+            metrics.timer("embeddings_seconds", operation="add"),
+            tracing.span(
+                "embeddings.add",
+                **{
+                    "embeddings.document_count": len(unique),
+                    "embeddings.batch_count": len(chunks),
+                },
+            ) as span,
+            ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="embeddings"
+            ) as executor,
+        ):
+            pending: Optional[Future] = None
+            if chunks:
+                pending = self._submit(executor, chunks[0])
+            for position in range(len(chunks)):
+                assert pending is not None
+                batch: _Batch = pending.result()
+                if position + 1 < len(chunks):
+                    pending = self._submit(executor, chunks[position + 1])
+                skipped += batch.skipped
+                if batch.ids:
+                    self._write_batch(batch)
+                    written += len(batch.ids)
+            span.set_attributes(
+                **{"embeddings.written": written, "embeddings.skipped": skipped}
+            )
 
-        documents = []
-        metadatas = []
-        ids = []
+        if unique:
+            self._update_manifest(unique)
+        metrics.increment("embeddings_documents_total", written)
+        metrics.increment("embeddings_skipped_total", skipped)
+        logger.info(
+            "Upserted %d call records to vector database (%d unchanged)",
+            written,
+            skipped,
+        )
+        return written
+
+    def _submit(
+        self, executor: ThreadPoolExecutor, records: List[CallRecord]
+    ) -> Future:
+        """Prepare a batch on the worker, inside the caller's tracing context."""
+        return executor.submit(
+            contextvars.copy_context().run, self._prepare_batch, records
+        )
 
+    def _max_batch_size(self) -> Optional[int]:
+        """Get ChromaDB's maximum batch size, if the client reports one."""
+        get_max = getattr(self.client, "get_max_batch_size", None)
+        if get_max is None:
+            return None
+        size = get_max()
+        return size if isinstance(size, int) and size > 0 else None
+
+    def _prepare_batch(self, records: List[CallRecord]) -> _Batch:
+        """Build documents and metadata, drop unchanged records and embed."""
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
         for record in records:
-            # Create a text representation of the call record
-            doc_text = self._record_to_document(record)
-            documents.append(doc_text)
-
-            # Create metadata
+            document = self._record_to_document(record)
             metadata = self._record_to_metadata(record)
+            metadata["doc_hash"] = self._document_hash(document, metadata)
+            ids.append(record.id)
+            documents.append(document)
             metadatas.append(metadata)
 
-            # Use call ID as the unique identifier
-            ids.append(record.id)
+        stored = self._stored_hashes(ids)
+        keep = [
+            i
+            for i, (call_id, metadata) in enumerate(zip(ids, metadatas))
+            if stored.get(call_id) != metadata["doc_hash"]
+        ]
+        ids = [ids[i] for i in keep]
+        documents = [documents[i] for i in keep]
+        metadatas = [metadatas[i] for i in keep]
+        kept = [records[i] for i in keep]
+
+        embeddings: Optional[List[List[float]]] = None
+        if documents and self.embedding_function is not None:
+            with tracing.span(
+                "embeddings.embed", **{"embeddings.document_count": len(documents)}
+            ):
+                if self.embedding_cache is not None:
+                    embeddings = self.embedding_cache.embed(
+                        documents, self.embedding_function
+                    )
+                else:
+                    embeddings = [
+                        list(map(float, row))
+                        for row in self.embedding_function(documents)
+                    ]
+        return _Batch(
+            ids, documents, metadatas, embeddings, kept, len(records) - len(keep)
+        )
 
-        if documents:
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids,
+    def _stored_hashes(self, ids: List[str]) -> Dict[str, str]:
+        """Get the stored document hashes of the given IDs."""
+        hashes = {i: self._hashes[i] for i in ids if i in self._hashes}
+        unknown = [i for i in ids if i not in hashes]
+        if unknown and not self._warm and self.collection is not None:
+            existing = self.collection.get(ids=unknown, include=["metadatas"])
+            for call_id, metadata in zip(
+                existing.get("ids") or [], existing.get("metadatas") or []
+            ):
+                if metadata and metadata.get("doc_hash"):
+                    hashes[call_id] = metadata["doc_hash"]
+        return hashes
+
+    def _write_batch(self, batch: _Batch) -> None:
+        """Upsert a prepared batch."""
+        assert self.collection is not None
+        with (
+            self._lock,
+            tracing.span(
+                "embeddings.upsert", **{"embeddings.document_count": len(batch.ids)}
+            ),
+        ):
+            self.collection.upsert(
+                ids=batch.ids,
+                documents=batch.documents,
+                metadatas=batch.metadatas,  # type: ignore[arg-type]
+                embeddings=batch.embeddings,  # type: ignore[arg-type]
             )
-            logger.info("Added %d call records to vector database", len(documents))
+            for call_id, metadata in zip(batch.ids, batch.metadatas):
+                self._hashes[call_id] = metadata["doc_hash"]
+                self._keywords.add(call_id, metadata.get("participants", ""))
+            try:
+                self.record_store.put_many(batch.records)
+            except sqlite3.Error as e:
+                # Hits without a stored record are fetched from Graph instead
+                logger.warning("Could not store %d call records: %s", len(batch.ids), e)
+
+    @staticmethod
+    def _document_hash(document: str, metadata: Dict[str, Any]) -> str:
+        """Hash what is stored for a record, to detect changes."""
+        payload = document + "\n" + json.dumps(metadata, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
 
     def search_calls(
         self,
         query: str,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        call_type: Optional[str] = None,
+        organizer: Optional[str] = None,
+        min_duration: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        hybrid: Optional[bool] = None,
+        keywords: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Search for call records using semantic search.
+        Search for call records.
+
+        Structured constraints are applied first, as a metadata filter. In
+        hybrid mode, the remaining records are then scored with BM25 over
+        their participants' names and email addresses. If few records match
+        the query's names, only those are ranked by vector similarity;
+        otherwise the vector search runs over every filtered record. The
+        keyword and vector rankings are combined with reciprocal-rank
+        fusion. Without keyword matches, results are ranked by vector
+        similarity alone.
 
         Args:
-            query: Natural language search query.
+            query: Natural language search query. Embedded with
+                embedding_function if there is one, so that it matches the
+                stored vectors.
             n_results: Number of results to return.
             where: Optional metadata filter.
+            start_time: Earliest call start, inclusive.
+            end_time: Latest call start, exclusive.
+            call_type: Call type value, e.g. "groupCall".
+            organizer: Organizer identifier.
+            min_duration: Minimum duration in seconds.
+            max_duration: Maximum duration in seconds.
+            hybrid: Whether to use keyword scoring. Uses
+                settings.search_hybrid if None.
+            keywords: Text scored against participants, e.g. the names in
+                the query. Uses the query if None.
 
         Returns:
-            List of matching call record dictionaries with metadata.
+            List of matching call record dictionaries with metadata, best
+            first. Records found only by keyword have no distance.
         """
-        if not CHROMADB_AVAILABLE or self.collection is None:
+        if self.collection is None:
             logger.warning("ChromaDB not available. Cannot search call records.")
             return []
 
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
+        where = build_where(
+            start_time=start_time,
+            end_time=end_time,
+            call_type=call_type,
+            organizer=organizer,
+            min_duration=min_duration,
+            max_duration=max_duration,
             where=where,
         )
+        hybrid = settings.search_hybrid if hybrid is None else hybrid
+        limit = max(n_results, settings.search_keyword_candidates)
+
+        with (
+            metrics.timer("embeddings_seconds", operation="search"),
+            tracing.span(
+                "embeddings.search",
+                **{"embeddings.n_results": n_results, "embeddings.hybrid": hybrid},
+            ) as span,
+        ):
+            keyword = self._keyword_search(keywords or query, where) if hybrid else []
+            if keyword and len(keyword) <= limit and self._query_accepts_ids():
+                # The names are selective: only rerank their calls
+                results = self._vector_search(query, len(keyword), where, ids=keyword)
+            else:
+                keyword = keyword[:limit]
+                results = self._vector_search(
+                    query, limit if keyword else n_results, where
+                )
+            rows = self._format_results(results)
+
+            if keyword:
+                by_id = {row["id"]: row for row in rows}
+                fused = reciprocal_rank_fusion(
+                    [keyword, [row["id"] for row in rows]],
+                    k=settings.search_rrf_k,
+                )
+                ranked = [call_id for call_id, _ in fused[:n_results]]
+                by_id.update(self._fetch_rows([i for i in ranked if i not in by_id]))
+                rows = [by_id[call_id] for call_id in ranked if call_id in by_id]
+            rows = rows[:n_results]
+
+            span.set_attributes(
+                **{
+                    "embeddings.keyword_matches": len(keyword),
+                    "embeddings.result_count": len(rows),
+                }
+            )
+
+        return rows
+
+    def _vector_search(
+        self,
+        query: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Query the collection by vector similarity."""
+        assert self.collection is not None
+        options: Dict[str, Any] = {"n_results": n_results, "where": where}
+        if ids is not None:
+            options["ids"] = ids
+        if self.embedding_function is not None:
+            results = self.collection.query(
+                query_embeddings=list(self.embedding_function([query])), **options
+            )
+        else:
+            results = self.collection.query(query_texts=[query], **options)
+        return cast(Dict[str, Any], results)
+
+    def _query_accepts_ids(self) -> bool:
+        """Check whether the collection can restrict a query to given IDs."""
+        # Collection.query only takes ids= in newer ChromaDB releases; older
+        # ones fall back to fusing the keyword and vector rankings
+        assert self.collection is not None
+        return "ids" in inspect.signature(self.collection.query).parameters
+
+    def _keyword_search(self, query: str, where: Optional[Dict[str, Any]]) -> List[str]:
+        """Rank the records matching a filter by BM25 over participants."""
+        self._load_stored()
+        if not len(self._keywords):
+            return []
+        candidates = None
+        if where:
+            assert self.collection is not None
+            matched = self.collection.get(where=where, include=[])
+            candidates = set(matched.get("ids") or [])
+        with self._lock:
+            ranked = self._keywords.search(query, candidates=candidates)
+        return [call_id for call_id, _ in ranked]
+
+    def _load_stored(self) -> None:
+        """Learn the hash and participants of every stored record, once."""
+        if self._warm or self.collection is None:
+            return
+        with self._lock:
+            if not self._warm:
+                self._load_pages()
+
+    def _load_pages(self) -> None:
+        """Read the stored metadata page by page. Needs the lock."""
+        assert self.collection is not None
+        page_size = settings.embeddings_batch_size
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["metadatas"], limit=page_size, offset=offset
+            )
+            ids = page.get("ids") or []
+            for call_id, metadata in zip(ids, page.get("metadatas") or []):
+                if not metadata:
+                    continue
+                if metadata.get("doc_hash"):
+                    self._hashes[call_id] = metadata["doc_hash"]
+                if metadata.get("participants"):
+                    self._keywords.add(call_id, metadata["participants"])
+            if len(ids) < page_size:
+                break
+            offset += page_size
+        self._warm = True
+        logger.info(
+            "Loaded %d stored call records from collection %s",
+            len(self._hashes),
+            self.collection_name,
+        )
+
+    def _fetch_rows(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get result rows for records found only by keyword."""
+        if not ids:
+            return {}
+        assert self.collection is not None
+        found = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        documents = found.get("documents") or []
+        metadatas = found.get("metadatas") or []
+        return {
+            call_id: {
+                "id": call_id,
+                "document": documents[i] if i < len(documents) else None,
+                "metadata": metadatas[i] if i < len(metadatas) else None,
+                "distance": None,
+            }
+            for i, call_id in enumerate(found.get("ids") or [])
+        }
 
-        # Format results
+    @staticmethod
+    def _format_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a collection query result to result rows."""
         formatted_results = []
         if results and results.get("ids"):
             for i, call_id in enumerate(results["ids"][0]):
@@ -164,7 +710,6 @@ class EmbeddingsClient:
                     ),
                 }
                 formatted_results.append(result)
-
         return formatted_results
 
     def delete_call_record(self, call_id: str) -> None:
@@ -174,21 +719,37 @@ class EmbeddingsClient:
         Args:
             call_id: ID of the call record to delete.
         """
-        if not CHROMADB_AVAILABLE or self.collection is None:
+        if self.collection is None:
             logger.warning("ChromaDB not available. Cannot delete call record.")
             return
 
-        self.collection.delete(ids=[call_id])
+        with self._lock:
+            self.collection.delete(ids=[call_id])
+            self._hashes.pop(call_id, None)
+            self._keywords.remove(call_id)
+            self.record_store.delete([call_id])
         logger.info("Deleted call record %s from vector database", call_id)
 
     def clear_collection(self) -> None:
         """Clear all call records from the collection."""
-        if not CHROMADB_AVAILABLE or self.client is None:
+        if self.backend != "numpy" and (not CHROMADB_AVAILABLE or self.client is None):
             logger.warning("ChromaDB not available. Cannot clear collection.")
             return
-
-        self.client.delete_collection(name=self.collection_name)
-        self._collection = None
+        with self._lock:
+            if self.backend == "numpy":
+                self.collection.clear()  # type: ignore[union-attr]
+            else:
+                self.client.delete_collection(  # type: ignore[union-attr]
+                    name=self.collection_name
+                )
+            self._collection = None
+            self._hashes.clear()
+            self._keywords.clear()
+            self.record_store.clear()
+            self._warm = False
+            self._manifest = None
+            if os.path.exists(self.manifest_path):
+                os.unlink(self.manifest_path)
         logger.info("Cleared collection %s", self.collection_name)
 
     def _record_to_document(self, record: CallRecord) -> str:
@@ -216,6 +777,68 @@ class EmbeddingsClient:
 
         return " | ".join(parts)
 
+    def stored_records(self, ids: List[str]) -> Dict[str, CallRecord]:
+        """
+        Get the full call records stored for search results.
+
+        Args:
+            ids: IDs of search results.
+
+        Returns:
+            The stored records, by ID. Records indexed before full records
+            were stored, or whose store could not be read, are left out.
+        """
+        if not ids:
+            return {}
+        try:
+            return self.record_store.get_many(ids)
+        except sqlite3.Error as e:
+            logger.warning("Could not read stored call records: %s", e)
+            return {}
+
+    @staticmethod
+    def result_to_record(result: Dict[str, Any]) -> Optional[CallRecord]:
+        """
+        Rebuild a call record from a search result's document and metadata.
+
+        Only what they keep is restored: the type, times, organizer and
+        participant identifiers. Use stored_records for the full record.
+
+        Args:
+            result: Row from search_calls.
+
+        Returns:
+            The call record, or None if the metadata has no valid start time.
+        """
+        metadata = result.get("metadata") or {}
+        try:
+            start_time = datetime.fromisoformat(metadata.get("start_time") or "")
+        except (TypeError, ValueError):
+            logger.warning("Cannot rebuild call record %s: no start time", result["id"])
+            return None
+        fields = dict(
+            part.split(": ", 1)
+            for part in (result.get("document") or "").split(" | ")
+            if ": " in part
+        )
+
+        def person(identifier: str) -> Participant:
+            if "@" in identifier:
+                return Participant(email=identifier)
+            return Participant(display_name=identifier)
+
+        names = fields.get("Participants", "")
+        end_time = metadata.get("end_time")
+        organizer = metadata.get("organizer")
+        return CallRecord(
+            id=result["id"],
+            call_type=metadata.get("call_type", CallType.UNKNOWN),
+            start_time=start_time,
+            end_time=datetime.fromisoformat(end_time) if end_time else None,
+            organizer=person(organizer) if organizer else None,
+            participants=[person(name) for name in names.split(", ") if name],
+        )
+
     def _record_to_metadata(self, record: CallRecord) -> Dict[str, Any]:
         """
         Extract metadata from a call record.
@@ -229,6 +852,7 @@ class EmbeddingsClient:
         metadata: Dict[str, Any] = {
             "call_type": record.call_type.value,
             "start_time": record.start_time.isoformat(),
+            "start_ts": timestamp(record.start_time),
             "participant_count": record.participant_count,
         }
 
@@ -241,4 +865,17 @@ class EmbeddingsClient:
         if record.organizer:
             metadata["organizer"] = record.organizer.identifier
 
+        # Names and addresses for keyword search
+        people = list(record.participants)
+        if record.organizer:
+            people.append(record.organizer)
+        names = {
+            value: None
+            for person in people
+            for value in (person.display_name, person.email)
+            if value
+        }
+        if names:
+            metadata["participants"] = "; ".join(names)
+
         return metadata
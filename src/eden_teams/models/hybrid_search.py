@@ -0,0 +1,224 @@
+"""
+Hybrid retrieval over indexed call records.
+
+This module provides the pieces EmbeddingsClient combines for hybrid
+search: structured metadata filters, a BM25 keyword index over participant
+names and email addresses, and reciprocal-rank fusion of the keyword and
+vector rankings. Vector similarity alone is poor at exact names ("calls
+with alice.smith@contoso.com" ranks any call with similar-looking text);
+BM25 over the participant field finds the right calls, and the vector step
+then only reorders those candidates.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Email addresses are kept whole as well as split into their parts, so a
+# full UPN matches exactly and a first name still matches loosely
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Args:
+        text: Text to split.
+
+    Returns:
+        Words, plus each email address as a single term.
+    """
+    lowered = text.lower()
+    return _EMAIL_PATTERN.findall(lowered) + _WORD_PATTERN.findall(lowered)
+
+
+def timestamp(value: datetime) -> int:
+    """
+    Convert a datetime to whole seconds since the epoch.
+
+    Args:
+        value: Datetime. Naive values are taken to be UTC, as Graph reports.
+
+    Returns:
+        Unix timestamp, which ChromaDB can compare in range filters.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def build_where(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    call_type: Optional[str] = None,
+    organizer: Optional[str] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a ChromaDB metadata filter from structured search constraints.
+
+    Args:
+        start_time: Earliest call start, inclusive.
+        end_time: Latest call start, exclusive.
+        call_type: Call type value, e.g. "groupCall".
+        organizer: Organizer identifier (email, name or ID).
+        min_duration: Minimum duration in seconds, inclusive.
+        max_duration: Maximum duration in seconds, inclusive.
+        where: Additional filter to combine with the constraints.
+
+    Returns:
+        The filter, or None if there are no constraints.
+    """
+    clauses: List[Dict[str, Any]] = []
+    if start_time is not None:
+        clauses.append({"start_ts": {"$gte": timestamp(start_time)}})
+    if end_time is not None:
+        clauses.append({"start_ts": {"$lt": timestamp(end_time)}})
+    if call_type is not None:
+        clauses.append({"call_type": call_type})
+    if organizer is not None:
+        clauses.append({"organizer": organizer})
+    if min_duration is not None:
+        clauses.append({"duration_seconds": {"$gte": min_duration}})
+    if max_duration is not None:
+        clauses.append({"duration_seconds": {"$lte": max_duration}})
+    if where:
+        clauses.append(where)
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """
+    Fuse rankings by summing 1 / (k + rank) for each item.
+
+    Args:
+        rankings: Item IDs in rank order, best first, one list per ranker.
+        k: Damping constant. Larger values flatten the difference between
+            top and lower ranks.
+
+    Returns:
+        (ID, fused score) pairs, best first.
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring.
+
+    Documents are short (the participants of one call), so the postings fit
+    in memory for millions of calls. The index is rebuilt from the stored
+    metadata when a client starts and kept in step with its writes.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation.
+            b: Document length normalization, from 0 (none) to 1 (full).
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        """Check if a document is indexed."""
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """
+        Index a document, replacing any previous version.
+
+        Args:
+            doc_id: Document ID.
+            text: Text to index.
+        """
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        for term, count in terms.items():
+            self._postings[term][doc_id] = count
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._terms[doc_id] = tuple(terms)
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        """
+        Remove a document. Unknown IDs are ignored.
+
+        Args:
+            doc_id: Document ID.
+        """
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._postings.clear()
+        self._lengths.clear()
+        self._terms.clear()
+        self._total_length = 0
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        candidates: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Score documents containing any query term.
+
+        Args:
+            query: Query text.
+            limit: Maximum results. Unbounded if None.
+            candidates: Only score these document IDs, if given.
+
+        Returns:
+            (ID, score) pairs, best first.
+        """
+        count = len(self._lengths)
+        if not count:
+            return []
+        average = self._total_length / count
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        ranked = sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked[:limit] if limit is not None else ranked
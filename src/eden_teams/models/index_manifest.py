@@ -0,0 +1,79 @@
+"""
+Manifest of a persisted vector index.
+
+A small JSON file kept next to each collection records what the collection
+holds: the embedding model its vectors came from, the start time of the
+newest indexed call (the watermark) and the record count. A process that
+opens the collection can then trust the stored vectors instead of
+re-embedding everything, rebuild only when the model has changed, and fetch
+just the calls newer than the watermark.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class IndexManifest(BaseModel):
+    """What a persisted collection holds."""
+
+    version: int = MANIFEST_VERSION
+    collection: str
+    backend: str
+    embedding_model: str
+    watermark: Optional[datetime] = None
+    record_count: int = 0
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def load(cls, path: str) -> Optional["IndexManifest"]:
+        """
+        Read a manifest file.
+
+        Args:
+            path: Manifest file path.
+
+        Returns:
+            The manifest, or None if the file is missing, unreadable or
+            from another manifest version.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = cls.model_validate(json.load(f))
+        except (OSError, ValueError, ValidationError) as e:
+            logger.warning("Ignoring unreadable index manifest %s: %s", path, e)
+            return None
+        if manifest.version != MANIFEST_VERSION:
+            logger.info("Ignoring index manifest %s from another version", path)
+            return None
+        return manifest
+
+    def save(self, path: str) -> None:
+        """
+        Write the manifest, replacing the file atomically.
+
+        Args:
+            path: Manifest file path.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.model_dump_json(indent=2))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not save index manifest to %s: %s", path, e)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
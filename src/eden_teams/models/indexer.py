@@ -0,0 +1,442 @@
+"""
+Background indexing of call records into the vector database.
+
+BackgroundIndexer keeps an EmbeddingsClient in step with Graph without
+blocking queries. It is a producer/consumer pipeline:
+
+- A sync thread periodically fetches the calls that started since its last
+  sync (less an overlap, since Graph publishes records once calls end) and
+  puts them on a bounded queue. Other code can feed the queue too, with
+  ``submit``.
+- Worker threads take up to ``batch_size`` queued records at a time and
+  pass them to ``EmbeddingsClient.add_call_records``, which builds the
+  documents, skips unchanged records, embeds the rest and upserts them.
+
+The queue bound is the backpressure: when the embedder falls behind, the
+producer waits for room instead of buffering without limit, and since the
+producer is a background thread, queries never wait on it. Progress, lag
+and throughput are available from ``stats`` and as metrics.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.config import settings
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+# Seconds of completed batches averaged into the throughput
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+_STOP = object()
+
+
+class IndexerStats(BaseModel):
+    """Progress of a BackgroundIndexer."""
+
+    submitted: int = Field(description="Records accepted into the queue")
+    indexed: int = Field(description="Records processed by the workers")
+    written: int = Field(description="Records embedded and upserted")
+    failed: int = Field(description="Records whose batch failed")
+    pending: int = Field(description="Records queued or being indexed")
+    lag_seconds: float = Field(
+        description="How long the oldest pending record has waited"
+    )
+    records_per_second: float = Field(description="Recent indexing throughput")
+    last_sync: Optional[datetime] = Field(
+        default=None, description="When the sync thread last caught up with Graph"
+    )
+    watermark: Optional[datetime] = Field(
+        default=None, description="Start time of the newest indexed call"
+    )
+
+
+class BackgroundIndexer:
+    """
+    Index call records into the vector database on background threads.
+
+    Several workers can embed at once; EmbeddingsClient serializes their
+    writes. Records are indexed in roughly the order they were queued.
+    """
+
+    def __init__(
+        self,
+        embeddings: EmbeddingsClient,
+        cdr_service: Optional[CallRecordService] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        sync_interval: Optional[float] = None,
+        days: Optional[int] = None,
+        overlap_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the indexer.
+
+        Args:
+            embeddings: Vector database to index into.
+            cdr_service: Service the sync thread fetches from. Without one
+                there is no sync thread, and records only arrive through
+                ``submit``.
+            queue_size: Maximum queued records. Uses
+                settings.indexer_queue_size if None.
+            batch_size: Maximum records per add_call_records call. Uses
+                settings.indexer_batch_size if None.
+            workers: Worker threads. Uses settings.indexer_workers if None.
+            sync_interval: Seconds between syncs. Uses
+                settings.indexer_sync_seconds if None.
+            days: Days of history the first sync fetches when the index
+                has no watermark. Uses settings.query_days if None.
+            overlap_seconds: How far before the last sync to refetch. Uses
+                settings.working_set_overlap_seconds if None.
+        """
+        self.embeddings = embeddings
+        self.cdr_service = cdr_service
+        self.batch_size = max(1, batch_size or settings.indexer_batch_size)
+        self.workers = max(1, workers or settings.indexer_workers)
+        self.sync_interval = (
+            sync_interval
+            if sync_interval is not None
+            else settings.indexer_sync_seconds
+        )
+        self.days = days if days is not None else settings.query_days
+        self.overlap_seconds = (
+            overlap_seconds
+            if overlap_seconds is not None
+            else settings.working_set_overlap_seconds
+        )
+        self._queue: "queue.Queue[Any]" = queue.Queue(
+            maxsize=max(1, queue_size or settings.indexer_queue_size)
+        )
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # Submission time of every pending record, oldest first
+        self._pending: Dict[int, float] = {}
+        self._sequence = 0
+        self._idle = threading.Condition(self._lock)
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._started_at = 0.0
+        self._sync_from: Optional[datetime] = None
+        # Start time of the earliest call in a failed batch, to refetch
+        self._retry_from: Optional[datetime] = None
+        self._last_sync: Optional[datetime] = None
+        self._submitted = 0
+        self._indexed = 0
+        self._written = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        """Check if the background threads are running."""
+        return bool(self._threads)
+
+    def start(self, sync: bool = True) -> "BackgroundIndexer":
+        """
+        Start the worker threads, and the sync thread if there is a service.
+
+        Args:
+            sync: Whether to start the sync thread. Without it, records
+                only arrive through ``submit`` and explicit ``sync`` calls.
+
+        Returns:
+            The indexer, for chaining.
+        """
+        if self._threads:
+            return self
+        self._stopping.clear()
+        self._started_at = time.monotonic()
+        for number in range(self.workers):
+            self._spawn(self._work, f"indexer-worker-{number}")
+        if sync and self.cdr_service is not None:
+            self._spawn(self._sync_loop, "indexer-sync")
+        logger.info(
+            "Background indexer started (%d workers, batch %d, queue %d)",
+            self.workers,
+            self.batch_size,
+            self._queue.maxsize,
+        )
+        return self
+
+    def _spawn(self, target: Any, name: str) -> None:
+        """Start a daemon thread in the caller's tracing context."""
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(target,),
+            name=name,
+            daemon=True,
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None, drain: bool = True) -> None:
+        """
+        Stop the background threads.
+
+        The sync thread stops without queuing more records.
+
+        Args:
+            timeout: Seconds to wait for each thread. Unbounded if None.
+            drain: Whether the workers index the records already queued
+                before stopping. If False they are dropped, and left for a
+                later sync or ``reindex`` to fetch again.
+        """
+        if not self._threads:
+            return
+        self._stopping.set()
+        workers = [t for t in self._threads if t.name != "indexer-sync"]
+        for thread in self._threads:
+            if thread.name == "indexer-sync":
+                thread.join(timeout)
+        if not drain:
+            self._discard_queued()
+        for _ in workers:
+            self._queue.put(_STOP)
+        for thread in workers:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("Background indexer stopped")
+
+    def _discard_queued(self) -> None:
+        """Drop every queued record."""
+        dropped = 0
+        while True:
+            try:
+                sequence, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._pending.pop(sequence, None)
+            dropped += 1
+        with self._lock:
+            self._idle.notify_all()
+        if dropped:
+            logger.info("Dropped %d queued call records", dropped)
+
+    def __enter__(self) -> "BackgroundIndexer":
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit."""
+        self.stop()
+
+    def submit(
+        self, records: Iterable[CallRecord], timeout: Optional[float] = None
+    ) -> int:
+        """
+        Queue records for indexing.
+
+        Blocks while the queue is full, which slows the producer down to
+        the pace of the embedder.
+
+        Args:
+            records: Records to index.
+            timeout: Seconds to wait for room for each record. Waits as
+                long as needed if None.
+
+        Returns:
+            Number of records queued. Fewer than given if the timeout
+            expired or the indexer is stopping; the rest are not queued.
+        """
+        accepted = 0
+        for record in records:
+            with self._lock:
+                sequence = self._sequence
+                self._sequence += 1
+                self._pending[sequence] = time.monotonic()
+            if not self._put((sequence, record), timeout):
+                with self._lock:
+                    del self._pending[sequence]
+                    self._idle.notify_all()
+                break
+            accepted += 1
+        with self._lock:
+            self._submitted += accepted
+        metrics.increment("indexer_records_submitted_total", accepted)
+        metrics.set_gauge("indexer_queue_depth", self._queue.qsize())
+        return accepted
+
+    def _put(self, item: Tuple[int, CallRecord], timeout: Optional[float]) -> bool:
+        """Queue an item, giving up after timeout or when stopping."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stopping.is_set():
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            try:
+                self._queue.put(item, timeout=wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def sync(self, end: Optional[datetime] = None) -> int:
+        """
+        Queue the calls that started since the last sync.
+
+        The first sync starts from the index's watermark, or ``days`` ago
+        if the index is empty. Later syncs start from the previous one, and
+        never after a call whose batch failed, so it is retried. Each start
+        is moved back by the overlap, since Graph publishes a record only
+        once its call has ended.
+
+        Args:
+            end: End of the window. Defaults to now.
+
+        Returns:
+            Number of records queued.
+
+        Raises:
+            ValueError: If the indexer has no CDR service.
+        """
+        if self.cdr_service is None:
+            raise ValueError("BackgroundIndexer has no CDR service to sync from")
+        end = end or datetime.utcnow()
+        start = self._sync_start(end)
+        with tracing.span("indexer.sync") as span:
+            queued = self.submit(
+                self.cdr_service.iter_call_records(start_date=start, end_date=end)
+            )
+            span.set_attributes(**{"indexer.queued": queued})
+        if self._stopping.is_set():
+            # Interrupted; the next run starts from the same place
+            return queued
+        with self._lock:
+            self._sync_from = end
+            self._last_sync = datetime.utcnow()
+        logger.debug("Indexer sync queued %d records since %s", queued, start)
+        return queued
+
+    def _sync_start(self, end: datetime) -> datetime:
+        """Get the start of the next sync window."""
+        with self._lock:
+            start = self._sync_from
+            retry, self._retry_from = self._retry_from, None
+        if start is None:
+            watermark = self.embeddings.watermark
+            if watermark is None:
+                return end - timedelta(days=self.days)
+            if watermark.tzinfo is not None:
+                watermark = watermark.astimezone(timezone.utc).replace(tzinfo=None)
+            start = watermark
+        if retry is not None and retry < start:
+            start = retry
+        return start - timedelta(seconds=self.overlap_seconds)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record has been indexed.
+
+        Args:
+            timeout: Seconds to wait. Unbounded if None.
+
+        Returns:
+            True if nothing is pending, False if the timeout expired.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    @property
+    def stats(self) -> IndexerStats:
+        """Get the indexer's progress."""
+        now = time.monotonic()
+        with self._lock:
+            oldest = next(iter(self._pending.values()), None)
+            self._trim_recent(now)
+            span = min(THROUGHPUT_WINDOW_SECONDS, now - self._started_at)
+            recent = sum(count for _, count in self._recent)
+            stats = IndexerStats(
+                submitted=self._submitted,
+                indexed=self._indexed,
+                written=self._written,
+                failed=self._failed,
+                pending=len(self._pending),
+                lag_seconds=now - oldest if oldest is not None else 0.0,
+                records_per_second=recent / span if span > 0 else 0.0,
+                last_sync=self._last_sync,
+                watermark=self.embeddings.watermark,
+            )
+        metrics.set_gauge("indexer_lag_seconds", stats.lag_seconds)
+        return stats
+
+    def _trim_recent(self, now: float) -> None:
+        """Forget batches older than the throughput window."""
+        while self._recent and now - self._recent[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self._recent.popleft()
+
+    def _sync_loop(self) -> None:
+        """Sync every sync_interval seconds until stopped."""
+        while not self._stopping.is_set():
+            try:
+                self.sync()
+            except Exception:  # noqa: BLE001 - keep syncing after Graph errors
+                logger.exception("Indexer sync failed; retrying next interval")
+            self._stopping.wait(self.sync_interval)
+
+    def _work(self) -> None:
+        """Index batches from the queue until a stop marker arrives."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    # Leave it for this worker's next get
+                    self._queue.put(_STOP)
+                    break
+                batch.append(item)
+            metrics.set_gauge("indexer_queue_depth", self._queue.qsize())
+            self._index_batch(batch)
+
+    def _index_batch(self, batch: List[Tuple[int, CallRecord]]) -> None:
+        """Index one batch and account for it."""
+        records = [record for _, record in batch]
+        written = 0
+        failed = False
+        try:
+            with metrics.timer("indexer_batch_seconds"):
+                written = self.embeddings.add_call_records(records)
+        except Exception:  # noqa: BLE001 - one bad batch must not stop the worker
+            failed = True
+            logger.exception("Failed to index %d call records", len(records))
+
+        with self._lock:
+            for sequence, _ in batch:
+                self._pending.pop(sequence, None)
+            self._indexed += len(batch)
+            if failed:
+                self._failed += len(batch)
+                # The next sync starts no later than the failed calls
+                earliest = min(record.start_time for record in records)
+                if self._retry_from is None or earliest < self._retry_from:
+                    self._retry_from = earliest
+            else:
+                self._written += written
+                self._recent.append((time.monotonic(), len(batch)))
+            self._idle.notify_all()
+
+        if failed:
+            metrics.increment("indexer_records_total", len(batch), result="failed")
+        else:
+            metrics.increment("indexer_records_total", written, result="written")
+            metrics.increment(
+                "indexer_records_total", len(batch) - written, result="skipped"
+            )
@@ -5,14 +5,55 @@ This module provides a client for interacting with Large Language Models
 to analyze and query Microsoft Teams call records.
 """
 
+import json
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pydantic import BaseModel, Field
 
 from eden_teams.config import settings
+from eden_teams.models.context import TokenCounter, trim_history
+from eden_teams.models.response_cache import ResponseCache, fingerprint
+from eden_teams.models.summarizer import MapReduceSummarizer
+from eden_teams.utils import metrics, tracing
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
+class StreamStats(BaseModel):
+    """Timing of a streamed response."""
+
+    time_to_first_token: Optional[float] = Field(
+        default=None, description="Seconds until the first text token arrived"
+    )
+    seconds: float = Field(default=0.0, description="Total seconds to the last token")
+    completion_tokens: int = Field(default=0, description="Tokens generated")
+    tool_rounds: int = Field(default=0, description="Rounds spent on tool calls")
+    cached: bool = Field(default=False, description="Answer came from the cache")
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Get the generation rate after the first token."""
+        if self.time_to_first_token is None:
+            return 0.0
+        elapsed = self.seconds - self.time_to_first_token
+        return self.completion_tokens / elapsed if elapsed > 0 else 0.0
+
+
 class LLMClient:
     """
     Client for interacting with Large Language Models.
@@ -41,6 +82,7 @@ When analyzing call data:
         model: Optional[str] = None,
         system_prompt: Optional[str] = None,
         use_azure: Optional[bool] = None,
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         """
         Initialize the LLM client.
@@ -49,27 +91,39 @@ When analyzing call data:
             model: Model name to use for completions.
             system_prompt: Custom system prompt. Uses default if None.
             use_azure: Whether to use Azure OpenAI. If None, uses config setting.
+            response_cache: Cache of previous answers. Created from the
+                LLM_CACHE_* settings if None and the cache is enabled.
         """
         self.model = model or settings.default_model
         self.system_prompt = system_prompt or self.DEFAULT_SYSTEM_PROMPT
         self.use_azure = (
             use_azure if use_azure is not None else settings.use_azure_openai
         )
-        self._client: Optional[object] = None
+        self._client: Optional["OpenAI"] = None
+        self._token_counter: Optional[TokenCounter] = None
+        self._summarizer: Optional[MapReduceSummarizer] = None
+        self._response_cache = response_cache
+        self.last_stream_stats: Optional[StreamStats] = None
+        self.last_cache_hit = False
         logger.info(
             "LLMClient initialized: model=%s, azure=%s",
             self.model,
             self.use_azure,
         )
 
-    def _get_client(self) -> object:
+    def _get_client(self) -> "OpenAI":
         """Get or create the API client."""
         if self._client is None:
             if self.use_azure:
                 from openai import AzureOpenAI
 
-                if not settings.azure_openai_api_key or not settings.azure_openai_endpoint:
-                    raise ValueError("Azure OpenAI is enabled but credentials are missing")
+                if (
+                    not settings.azure_openai_api_key
+                    or not settings.azure_openai_endpoint
+                ):
+                    raise ValueError(
+                        "Azure OpenAI is enabled but credentials are missing"
+                    )
                 self._client = AzureOpenAI(
                     api_key=settings.azure_openai_api_key,
                     api_version=settings.azure_openai_api_version,
@@ -78,9 +132,94 @@ When analyzing call data:
             else:
                 from openai import OpenAI
 
-                self._client = OpenAI(api_key=settings.openai_api_key)
+                self._client = OpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url or None,
+                )
         return self._client
 
+    @property
+    def token_counter(self) -> TokenCounter:
+        """Get or create the token counter for the model."""
+        if self._token_counter is None:
+            self._token_counter = TokenCounter(self.model)
+        return self._token_counter
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Get or create the response cache, or None if caching is disabled."""
+        if self._response_cache is None and settings.llm_cache_enabled:
+            self._response_cache = ResponseCache(
+                max_entries=settings.llm_cache_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds or None,
+                path=settings.llm_cache_path or None,
+                similarity_threshold=settings.llm_cache_similarity,
+                embed=self._embed if settings.llm_cache_similarity > 0 else None,
+            )
+        return self._response_cache
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed a question for the semantic response cache."""
+        client = self._get_client()
+        with metrics.timer(
+            "llm_request_seconds", model=settings.llm_cache_embedding_model
+        ):
+            response = client.embeddings.create(
+                model=settings.llm_cache_embedding_model, input=[text]
+            )
+        return list(response.data[0].embedding)
+
+    def _cache_lookup(
+        self,
+        messages: List[Dict[str, Any]],
+        question: str,
+        context: Optional[str],
+        watermark: Optional[str],
+        **options: Any,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look a request up in the response cache.
+
+        The exact key covers the model, system prompt, question with its
+        context, request options and watermark. Earlier turns are left out,
+        so a question repeated within a session can still hit, and only
+        whether there was any history is keyed. Paraphrases are only matched
+        within the same model, system prompt, tools and call data,
+        identified by the watermark or, without one, by the context itself.
+
+        Returns:
+            The cached answer or None, and the arguments for _cache_store
+            (None if caching is disabled).
+        """
+        self.last_cache_hit = False
+        cache = self.response_cache
+        if cache is None:
+            return None, None
+
+        data = watermark if watermark is not None else context
+        system, user = messages[0]["content"], messages[-1]["content"]
+        has_history = len(messages) > 2
+        request = {
+            "key": fingerprint(
+                self.model, system, user, has_history, options, watermark
+            ),
+            "scope": fingerprint(self.model, system, has_history, options, data),
+            "question": question,
+            "watermark": watermark or "",
+        }
+        entry = cache.lookup(request["key"], request["scope"], question)
+        if entry is None:
+            return None, request
+        self.last_cache_hit = True
+        return entry.answer, request
+
+    def _cache_store(
+        self, request: Optional[Dict[str, Any]], answer: str, seconds: float
+    ) -> None:
+        """Store a fresh answer under the key from _cache_lookup."""
+        if request is not None and self.response_cache is not None:
+            self.response_cache.store(answer=answer, seconds=seconds, **request)
+
     def chat(
         self,
         message: str,
@@ -88,6 +227,8 @@ When analyzing call data:
         history: Optional[List[Dict[str, str]]] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        watermark: Optional[str] = None,
+        cache: bool = True,
     ) -> str:
         """
         Send a chat message and get a response.
@@ -98,27 +239,444 @@ When analyzing call data:
             history: Previous conversation history.
             temperature: Sampling temperature (0-2). Uses config default if None.
             max_tokens: Maximum response tokens. Uses config default if None.
+            watermark: Identifies the call data behind the context, so cached
+                answers are only reused for the same data.
+            cache: Whether to use the response cache.
 
         Returns:
             Model's response text.
         """
         messages = self._build_messages(message, context, history)
+        cached, request = None, None
+        if cache:
+            cached, request = self._cache_lookup(
+                messages,
+                message,
+                context,
+                watermark,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        if cached is not None:
+            return cached
 
         logger.debug("Sending chat request with %d messages", len(messages))
 
-        client = self._get_client()
-        response = client.chat.completions.create(  # type: ignore[union-attr]
-            model=self.model,
-            messages=messages,
-            temperature=temperature or settings.temperature,
-            max_tokens=max_tokens or settings.max_tokens,
-        )
+        started = time.perf_counter()
+        response = self._complete(messages, temperature, max_tokens)
 
         result = response.choices[0].message.content or ""
         logger.debug("Received response: %d characters", len(result))
 
+        self._cache_store(request, result, time.perf_counter() - started)
         return result
 
+    def chat_stream(
+        self,
+        message: str,
+        context: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        watermark: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Send a chat message and yield the response as it is generated.
+
+        Timing is recorded in ``last_stream_stats`` once the stream ends.
+        Consume the iterator fully or close it, so the request span ends.
+
+        Args:
+            message: User message to send.
+            context: Additional context (e.g., call record data).
+            history: Previous conversation history.
+            temperature: Sampling temperature (0-2). Uses config default if None.
+            max_tokens: Maximum response tokens. Uses config default if None.
+            watermark: Identifies the call data behind the context, so cached
+                answers are only reused for the same data.
+
+        Yields:
+            Fragments of the response text.
+        """
+        messages = self._build_messages(message, context, history)
+        stats = StreamStats()
+        started = time.perf_counter()
+        cached, request = self._cache_lookup(
+            messages,
+            message,
+            context,
+            watermark,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        if cached is not None:
+            yield self._replay(cached, stats, started)
+            return
+
+        text: List[str] = []
+        yield from self._stream_round(
+            messages, stats, started, temperature, max_tokens, text=text
+        )
+        self._finish_stream(stats, started)
+        self._cache_store(request, "".join(text), stats.seconds)
+
+    def chat_with_tools_stream(
+        self,
+        message: str,
+        tools: List[Dict[str, Any]],
+        handler: Callable[[str, Dict[str, Any]], Any],
+        context: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        watermark: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Streaming variant of chat_with_tools.
+
+        Tool-call rounds are streamed too: tool calls are assembled from the
+        chunks, run, and the next round streamed, so the answer's first
+        token is yielded as soon as the model starts writing it.
+
+        Args:
+            message: User message to send.
+            tools: OpenAI function tool schemas.
+            handler: Runs a tool given its name and decoded arguments.
+            context: Additional context sent with the message.
+            history: Previous conversation history.
+            temperature: Sampling temperature (0-2). Uses config default if None.
+            max_tokens: Maximum response tokens. Uses config default if None.
+            max_rounds: Maximum tool-calling rounds. Uses
+                settings.llm_max_tool_rounds if None.
+            watermark: Identifies the data the tools answer from, so cached
+                answers are only reused for the same data.
+
+        Yields:
+            Fragments of the response text.
+        """
+        messages: List[Dict[str, Any]] = list(
+            self._build_messages(message, context, history)
+        )
+        rounds = max_rounds if max_rounds is not None else settings.llm_max_tool_rounds
+        stats = StreamStats()
+        started = time.perf_counter()
+        cached, request = self._cache_lookup(
+            messages,
+            message,
+            context,
+            watermark,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=[tool["function"]["name"] for tool in tools],
+        )
+        if cached is not None:
+            yield self._replay(cached, stats, started)
+            return
+
+        text: List[str] = []
+
+        for round_number in range(rounds + 1):
+            final = round_number == rounds
+            tool_calls = yield from self._stream_round(
+                messages,
+                stats,
+                started,
+                temperature,
+                max_tokens,
+                text=text,
+                tools=tools,
+                tool_choice="none" if final else "auto",
+            )
+            if final or not tool_calls:
+                break
+
+            stats.tool_rounds += 1
+            messages.append(
+                {"role": "assistant", "content": None, "tool_calls": tool_calls}
+            )
+            for call in tool_calls:
+                result = self._run_tool(
+                    call["function"]["name"], call["function"]["arguments"], handler
+                )
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": call["id"],
+                        "content": json.dumps(result, default=str),
+                    }
+                )
+
+        self._finish_stream(stats, started)
+        self._cache_store(request, "".join(text), stats.seconds)
+
+    def _stream_round(
+        self,
+        messages: List[Dict[str, Any]],
+        stats: StreamStats,
+        started: float,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        text: Optional[List[str]] = None,
+        **options: Any,
+    ) -> Generator[str, None, List[Dict[str, Any]]]:
+        """
+        Stream one completion request.
+
+        Yields text fragments, also appending them to ``text`` if given, and
+        returns the tool calls assembled from the chunks, if the model made
+        any.
+        """
+        client = self._get_client()
+        calls: Dict[int, Dict[str, Any]] = {}
+        with (
+            metrics.timer("llm_request_seconds", model=self.model),
+            tracing.span(
+                "llm.chat",
+                **{
+                    "llm.model": self.model,
+                    "llm.message_count": len(messages),
+                    "llm.stream": True,
+                },
+            ) as span,
+        ):
+            # Messages are plain dicts rather than the SDK's TypedDicts
+            stream = client.chat.completions.create(  # type: ignore[call-overload]
+                model=self.model,
+                messages=messages,
+                temperature=temperature or settings.temperature,
+                max_tokens=max_tokens or settings.max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+                **options,
+            )
+            metrics.increment("llm_requests_total", model=self.model)
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self._record_usage(chunk, span)
+                    stats.completion_tokens += chunk.usage.completion_tokens or 0
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    if stats.time_to_first_token is None:
+                        stats.time_to_first_token = time.perf_counter() - started
+                        span.add_event("first_token")
+                    if text is not None:
+                        text.append(delta.content)
+                    yield delta.content
+                for fragment in delta.tool_calls or []:
+                    call = calls.setdefault(
+                        fragment.index,
+                        {
+                            "id": "",
+                            "type": "function",
+                            "function": {"name": "", "arguments": ""},
+                        },
+                    )
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function is not None:
+                        call["function"]["name"] += fragment.function.name or ""
+                        call["function"]["arguments"] += (
+                            fragment.function.arguments or ""
+                        )
+        return [calls[index] for index in sorted(calls)]
+
+    def _replay(self, answer: str, stats: StreamStats, started: float) -> str:
+        """Record stream stats for a cached answer and return it."""
+        stats.cached = True
+        stats.time_to_first_token = stats.seconds = time.perf_counter() - started
+        self.last_stream_stats = stats
+        return answer
+
+    def _finish_stream(self, stats: StreamStats, started: float) -> None:
+        """Record timing for a completed stream."""
+        stats.seconds = time.perf_counter() - started
+        self.last_stream_stats = stats
+        if stats.time_to_first_token is not None:
+            metrics.observe(
+                "llm_time_to_first_token_seconds",
+                stats.time_to_first_token,
+                model=self.model,
+            )
+            metrics.set_gauge(
+                "llm_tokens_per_second", stats.tokens_per_second, model=self.model
+            )
+        logger.debug(
+            "Streamed %d tokens: first token %.3fs, %.1f tokens/s",
+            stats.completion_tokens,
+            stats.time_to_first_token or 0.0,
+            stats.tokens_per_second,
+        )
+
+    def chat_with_tools(
+        self,
+        message: str,
+        tools: List[Dict[str, Any]],
+        handler: Callable[[str, Dict[str, Any]], Any],
+        context: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        watermark: Optional[str] = None,
+    ) -> str:
+        """
+        Send a chat message, letting the model call tools to gather data.
+
+        Each round the model may request tool calls; they are run with
+        ``handler`` and their JSON results are sent back until the model
+        answers. After ``max_rounds`` rounds the model must answer without
+        tools.
+
+        Args:
+            message: User message to send.
+            tools: OpenAI function tool schemas.
+            handler: Runs a tool given its name and decoded arguments and
+                returns a JSON-serializable result.
+            context: Additional context sent with the message.
+            history: Previous conversation history.
+            temperature: Sampling temperature (0-2). Uses config default if None.
+            max_tokens: Maximum response tokens. Uses config default if None.
+            max_rounds: Maximum tool-calling rounds. Uses
+                settings.llm_max_tool_rounds if None.
+            watermark: Identifies the data the tools answer from, so cached
+                answers are only reused for the same data.
+
+        Returns:
+            Model's response text.
+        """
+        messages: List[Dict[str, Any]] = list(
+            self._build_messages(message, context, history)
+        )
+        rounds = max_rounds if max_rounds is not None else settings.llm_max_tool_rounds
+        cached, request = self._cache_lookup(
+            messages,
+            message,
+            context,
+            watermark,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=[tool["function"]["name"] for tool in tools],
+        )
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+
+        for round_number in range(rounds + 1):
+            final = round_number == rounds
+            response = self._complete(
+                messages,
+                temperature,
+                max_tokens,
+                tools=tools,
+                tool_choice="none" if final else "auto",
+            )
+            reply = response.choices[0].message
+            tool_calls = getattr(reply, "tool_calls", None)
+            if final or not tool_calls:
+                result = reply.content or ""
+                logger.debug(
+                    "Received response after %d tool round(s): %d characters",
+                    round_number,
+                    len(result),
+                )
+                self._cache_store(request, result, time.perf_counter() - started)
+                return result
+
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": reply.content,
+                    "tool_calls": [
+                        {
+                            "id": call.id,
+                            "type": "function",
+                            "function": {
+                                "name": call.function.name,
+                                "arguments": call.function.arguments,
+                            },
+                        }
+                        for call in tool_calls
+                    ],
+                }
+            )
+            for call in tool_calls:
+                result = self._run_tool(
+                    call.function.name, call.function.arguments, handler
+                )
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": call.id,
+                        "content": json.dumps(result, default=str),
+                    }
+                )
+
+        return ""  # pragma: no cover - the final round always returns
+
+    def _run_tool(
+        self,
+        name: str,
+        arguments: Optional[str],
+        handler: Callable[[str, Dict[str, Any]], Any],
+    ) -> Any:
+        """Decode a tool call's arguments and run it."""
+        with (
+            metrics.timer("llm_tool_seconds", tool=name),
+            tracing.span("llm.tool", **{"llm.tool_name": name}),
+        ):
+            metrics.increment("llm_tool_calls_total", tool=name)
+            try:
+                decoded = json.loads(arguments or "{}")
+            except json.JSONDecodeError as e:
+                return {"error": f"Invalid JSON arguments: {e}"}
+            logger.debug("Running tool %s(%s)", name, decoded)
+            return handler(name, decoded)
+
+    def _complete(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **options: Any,
+    ) -> Any:
+        """Send one chat completion request, recording metrics and a span."""
+        client = self._get_client()
+        with (
+            metrics.timer("llm_request_seconds", model=self.model),
+            tracing.span(
+                "llm.chat",
+                **{"llm.model": self.model, "llm.message_count": len(messages)},
+            ) as span,
+        ):
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=messages,  # type: ignore[arg-type]
+                temperature=temperature or settings.temperature,
+                max_tokens=max_tokens or settings.max_tokens,
+                **options,
+            )
+            metrics.increment("llm_requests_total", model=self.model)
+            self._record_usage(response, span)
+        return response
+
+    def _record_usage(self, response: object, span: Any) -> None:
+        """Record prompt and completion tokens reported by the API."""
+        if not metrics.is_enabled() and not span.is_recording:
+            return
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for kind in ("prompt", "completion"):
+            tokens = getattr(usage, f"{kind}_tokens", None)
+            if isinstance(tokens, int):
+                metrics.increment(
+                    "llm_tokens_total", tokens, model=self.model, kind=kind
+                )
+                span.set_attribute(f"llm.{kind}_tokens", tokens)
+
     def _build_messages(
         self,
         message: str,
@@ -130,9 +688,11 @@ When analyzing call data:
             {"role": "system", "content": self.system_prompt}
         ]
 
-        # Add conversation history
+        # Add as much recent conversation history as fits its token budget
         if history:
-            messages.extend(history)
+            messages.extend(
+                trim_history(history, self.token_counter, settings.history_token_budget)
+            )
 
         # Build user message with optional context
         user_content = message
@@ -147,6 +707,8 @@ When analyzing call data:
         self,
         question: str,
         call_data: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        watermark: Optional[str] = None,
     ) -> str:
         """
         Answer a question about call records.
@@ -154,11 +716,45 @@ When analyzing call data:
         Args:
             question: Natural language question about calls.
             call_data: Formatted call record data as context.
+            history: Previous conversation history.
+            watermark: Identifies the call data, for the response cache.
 
         Returns:
             Answer to the question.
         """
-        return self.chat(question, context=call_data)
+        return self.chat(
+            question, context=call_data, history=history, watermark=watermark
+        )
+
+    def query_calls_stream(
+        self,
+        question: str,
+        call_data: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        watermark: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Answer a question about call records, yielding text as it arrives.
+
+        Args:
+            question: Natural language question about calls.
+            call_data: Formatted call record data as context.
+            history: Previous conversation history.
+            watermark: Identifies the call data, for the response cache.
+
+        Yields:
+            Fragments of the answer.
+        """
+        return self.chat_stream(
+            question, context=call_data, history=history, watermark=watermark
+        )
+
+    @property
+    def summarizer(self) -> MapReduceSummarizer:
+        """Get or create the map-reduce summarizer."""
+        if self._summarizer is None:
+            self._summarizer = MapReduceSummarizer(self)
+        return self._summarizer
 
     def summarize_calls(
         self,
@@ -168,6 +764,10 @@ When analyzing call data:
         """
         Generate a summary of call activity.
 
+        Summaries that fit one request are summarized directly. Larger sets
+        are summarized in chunks and the partial summaries combined, see
+        MapReduceSummarizer.
+
         Args:
             call_summaries: List of call summary strings.
             time_period: Description of the time period (e.g., "last week").
@@ -175,22 +775,7 @@ When analyzing call data:
         Returns:
             Natural language summary of call activity.
         """
-        context = "\n\n".join(call_summaries)
-
-        period_text = f" for {time_period}" if time_period else ""
-        prompt = f"""Please provide a comprehensive summary of the following Teams call activity{period_text}.
-
-Include:
-1. Total number of calls
-2. Types of calls (meetings, peer-to-peer, etc.)
-3. Key participants
-4. Average call duration
-5. Any notable patterns or observations
-
-Call Records:
-{context}"""
-
-        return self.chat(prompt)
+        return self.summarizer.summarize(call_summaries, time_period)
 
     def analyze_call_quality(
         self,
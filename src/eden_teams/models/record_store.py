@@ -0,0 +1,137 @@
+"""
+Full call records kept next to a vector index.
+
+The index's metadata holds only what filters and keyword search need, so
+opening it reads a few fields per record. RecordStore keeps each indexed
+record's JSON in a SQLite file beside the collection instead, where search
+hits are looked up by ID without reading any other record.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Sequence
+
+from pydantic import ValidationError
+
+from eden_teams.cdr.models import CallRecord
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on the parameters of one statement is 999
+_MAX_PARAMS = 900
+
+
+class RecordStore:
+    """
+    SQLite table of call records keyed by ID.
+
+    The connection is opened on first use. The store is safe to use from
+    several threads in one process.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file. Created with its directory if missing.
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create its table if needed. Needs the lock."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY, json TEXT)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def __len__(self) -> int:
+        """Get the number of stored records."""
+        with self._lock:
+            row = self._connect().execute("SELECT COUNT(*) FROM records").fetchone()
+        return int(row[0])
+
+    def put_many(self, records: Iterable[CallRecord]) -> None:
+        """
+        Store records, replacing any stored with the same IDs.
+
+        Args:
+            records: Call records to store.
+        """
+        rows = [(r.id, r.model_dump_json(exclude_none=True)) for r in records]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO records (id, json) VALUES (?, ?)", rows
+                )
+
+    def get_many(self, ids: Sequence[str]) -> Dict[str, CallRecord]:
+        """
+        Look up records by ID.
+
+        Args:
+            ids: Call record IDs.
+
+        Returns:
+            The stored records, by ID. Unknown and unreadable records are
+            left out.
+        """
+        found: Dict[str, CallRecord] = {}
+        unique = list(dict.fromkeys(ids))
+        with self._lock:
+            connection = self._connect()
+            rows = []
+            for start in range(0, len(unique), _MAX_PARAMS):
+                chunk = unique[start : start + _MAX_PARAMS]
+                rows.extend(
+                    connection.execute(
+                        "SELECT id, json FROM records WHERE id IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                )
+        for call_id, stored in rows:
+            try:
+                found[call_id] = CallRecord.model_validate_json(stored)
+            except ValidationError as e:
+                logger.warning("Ignoring unreadable stored record %s: %s", call_id, e)
+        return found
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Remove records by ID.
+
+        Args:
+            ids: Call record IDs.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM records WHERE id = ?", [(i,) for i in ids]
+                )
+
+    def clear(self) -> None:
+        """Remove every record."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM records")
+
+    def close(self) -> None:
+        """Close the database connection. It is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,352 @@
+"""
+Response cache for LLM completions.
+
+This module provides ResponseCache, which reuses answers to repeated
+questions instead of paying for another completion. Entries are keyed
+exactly on everything that shapes the answer (model, system prompt,
+messages, options and a watermark of the call data), with an optional
+semantic layer that also reuses the answer to a paraphrased question asked
+against the same data. Entries are evicted least recently used first and
+after a time to live, and can be persisted to a JSON file between runs.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from eden_teams.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Hash JSON-serializable values into a stable cache key.
+
+    Args:
+        *parts: Values that identify a request.
+
+    Returns:
+        Hex SHA-256 digest of the values' canonical JSON.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    """Scale a vector to unit length so cosine similarity is a dot product."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class CacheEntry(BaseModel):
+    """A cached answer."""
+
+    answer: str = Field(description="Model's response text")
+    scope: str = Field(
+        default="", description="Requests whose paraphrases may share the answer"
+    )
+    watermark: str = Field(default="", description="Call data the answer is based on")
+    question: str = Field(default="", description="Question that was answered")
+    embedding: Optional[List[float]] = Field(
+        default=None, description="Unit-length embedding of the question"
+    )
+    seconds: float = Field(default=0.0, description="Time the completion took")
+    created_at: float = Field(description="Unix time the entry was stored")
+    hits: int = Field(default=0, description="Times the entry was reused")
+
+
+class CacheStats(BaseModel):
+    """Counters for a response cache."""
+
+    hits: int = Field(default=0, description="Exact matches served")
+    semantic_hits: int = Field(default=0, description="Paraphrase matches served")
+    misses: int = Field(default=0, description="Lookups that found nothing")
+    saved_seconds: float = Field(
+        default=0.0, description="Completion time avoided by hits"
+    )
+    entries: int = Field(default=0, description="Entries currently cached")
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups served from the cache."""
+        lookups = self.hits + self.semantic_hits + self.misses
+        return (self.hits + self.semantic_hits) / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    LRU cache of LLM answers with a time to live.
+
+    Exact lookups match the full request key. When an ``embed`` function
+    and a similarity threshold are given, a miss falls back to the most
+    similar cached question in the same scope (same model, system prompt,
+    history and data watermark), so "how many calls yesterday?" can reuse
+    the answer to "how many calls were there yesterday?".
+
+    The cache is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: Optional[float] = 3600.0,
+        path: Optional[str] = None,
+        similarity_threshold: float = 0.0,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted.
+            ttl_seconds: Age after which an entry expires. Never if None.
+            path: JSON file the cache is loaded from and saved to. In
+                memory only if None.
+            similarity_threshold: Minimum cosine similarity for a semantic
+                hit. Zero disables the semantic layer.
+            embed: Returns an embedding for a question. Required for the
+                semantic layer.
+            clock: Returns the current Unix time.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+        if path:
+            self.load()
+
+    @property
+    def semantic(self) -> bool:
+        """Check if paraphrased questions can be matched."""
+        return self.embed is not None and self.similarity_threshold > 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return self._stats.model_copy(update={"entries": len(self._entries)})
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return len(self._entries)
+
+    def lookup(
+        self, key: str, scope: str = "", question: str = ""
+    ) -> Optional[CacheEntry]:
+        """
+        Find a cached answer.
+
+        Args:
+            key: Exact request key, from fingerprint().
+            scope: Scope searched for paraphrases of the question.
+            question: The user's question, for the semantic layer.
+
+        Returns:
+            The cached entry, or None on a miss.
+        """
+        with self._lock:
+            entry = self._live(key)
+            result = "hit"
+            if entry is None and self.semantic and question:
+                entry = self._most_similar(scope, self._embedding(question))
+                result = "semantic_hit"
+            if entry is None:
+                self._stats.misses += 1
+                metrics.increment("llm_cache_requests_total", result="miss")
+                return None
+
+            entry.hits += 1
+            if result == "hit":
+                self._stats.hits += 1
+            else:
+                self._stats.semantic_hits += 1
+            self._stats.saved_seconds += entry.seconds
+        metrics.increment("llm_cache_requests_total", result=result)
+        metrics.increment("llm_cache_saved_seconds_total", entry.seconds)
+        logger.debug("Response cache %s (saved %.2fs)", result, entry.seconds)
+        return entry
+
+    def store(
+        self,
+        key: str,
+        answer: str,
+        scope: str = "",
+        question: str = "",
+        watermark: str = "",
+        seconds: float = 0.0,
+    ) -> None:
+        """
+        Cache an answer.
+
+        Args:
+            key: Exact request key, from fingerprint().
+            answer: Model's response text.
+            scope: Scope searched for paraphrases of the question.
+            question: The user's question, for the semantic layer.
+            watermark: Call data the answer is based on.
+            seconds: Time the completion took, counted as saved on each hit.
+        """
+        if not answer:
+            return
+        with self._lock:
+            embedding = (
+                self._embedding(question) if self.semantic and question else None
+            )
+            self._entries[key] = CacheEntry(
+                answer=answer,
+                scope=scope,
+                watermark=watermark,
+                question=question,
+                embedding=embedding,
+                seconds=seconds,
+                created_at=self._clock(),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self.save()
+
+    def invalidate(self, watermark: Optional[str] = None) -> int:
+        """
+        Drop answers based on outdated call data.
+
+        Args:
+            watermark: Watermark of the current data. Entries with a
+                different, non-empty watermark are dropped. Drops every
+                entry if None.
+
+        Returns:
+            Number of entries dropped.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if watermark is None
+                or (entry.watermark and entry.watermark != watermark)
+            ]
+            for key in stale:
+                del self._entries[key]
+            if stale and self.path:
+                self.save()
+        if stale:
+            logger.info("Response cache invalidated %d entries", len(stale))
+        return len(stale)
+
+    def load(self) -> None:
+        """Load unexpired entries from ``path``, if the file exists."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable response cache %s: %s", self.path, e)
+            return
+        if data.get("version") != CACHE_FILE_VERSION:
+            logger.info("Ignoring response cache %s from another version", self.path)
+            return
+
+        with self._lock:
+            for key, raw in data.get("entries", {}).items():
+                entry = CacheEntry.model_validate(raw)
+                if not self._expired(entry):
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info("Loaded %d cached responses from %s", len(self._entries), self.path)
+
+    def save(self) -> None:
+        """Write the entries to ``path``, replacing the file atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "version": CACHE_FILE_VERSION,
+                "entries": {
+                    key: entry.model_dump() for key, entry in self._entries.items()
+                },
+            }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save response cache to %s: %s", self.path, e)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._embeddings.clear()
+            self._stats = CacheStats()
+            if self.path:
+                self.save()
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        """Check if an entry has outlived the time to live."""
+        return (
+            self.ttl_seconds is not None
+            and self._clock() - entry.created_at >= self.ttl_seconds
+        )
+
+    def _live(self, key: str) -> Optional[CacheEntry]:
+        """Get an unexpired entry and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _most_similar(self, scope: str, embedding: List[float]) -> Optional[CacheEntry]:
+        """Find the closest cached question in a scope above the threshold."""
+        best_key, best_score = None, self.similarity_threshold
+        for key, entry in list(self._entries.items()):
+            if entry.scope != scope or entry.embedding is None:
+                continue
+            score = sum(a * b for a, b in zip(embedding, entry.embedding))
+            if score >= best_score and self._live(key) is not None:
+                best_key, best_score = key, score
+        if best_key is None:
+            return None
+        logger.debug("Semantic cache match with similarity %.3f", best_score)
+        return self._entries[best_key]
+
+    def _embedding(self, question: str) -> List[float]:
+        """Embed a question, reusing the result for the following store."""
+        embedding = self._embeddings.get(question)
+        if embedding is None:
+            assert self.embed is not None
+            embedding = _normalize(self.embed(question))
+            self._embeddings[question] = embedding
+            while len(self._embeddings) > 32:
+                self._embeddings.popitem(last=False)
+        return embedding
@@ -0,0 +1,314 @@
+"""
+Structured filters parsed from natural language questions, and hydration
+of search results into call records.
+
+Retrieval-augmented context selection combines two signals: the question's
+meaning, matched by hybrid search over the vector index, and the explicit
+constraints it states. This module extracts the constraints: a date range
+("yesterday", "last week", "since 2024-01-15", "last 3 days"), a call type
+("meetings", "1:1 calls") and the people named ("with Alice Smith",
+"bob@contoso.com"). The date range and call type become metadata filters;
+the names are the keyword query.
+
+Parsing is deliberately conservative. Anything it does not recognize is
+left to the vector and keyword search, which see the whole question.
+
+Search hits are turned back into full records locally where possible:
+from records already in memory, then from the records the index stores
+beside its vectors. Only the rest are fetched from Graph, in batched
+requests.
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel, Field
+
+from eden_teams.cdr.models import CallRecord, CallType
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+_WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+_MONTHS = (
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+)
+_UNITS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+_RELATIVE = re.compile(r"\b(?:last|past|previous)\s+(\d+)\s+(hour|day|week)s?\b")
+_WEEKDAY = re.compile(r"\b(" + "|".join(_WEEKDAYS) + r")\b")
+_DATE = re.compile(
+    r"(?:\b(since|after|from|before|until|to|and|on)\s+)?\b(\d{4}-\d{2}-\d{2})\b"
+)
+_CALL_TYPES = (
+    (re.compile(r"\bgroup\s+calls?\b"), CallType.GROUP_CALL),
+    (
+        re.compile(
+            r"(?:\bpeer[\s-]to[\s-]peer\b|\bp2p\b|\b1:1|\bone[\s-]on[\s-]one\b)"
+        ),
+        CallType.PEER_TO_PEER,
+    ),
+    # Graph records scheduled meetings as group calls; it has no meeting type
+    (re.compile(r"\bmeetings?\b"), CallType.GROUP_CALL),
+)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Capitalized words after a word that introduces a person
+_NAME = re.compile(
+    r"\b(?:with|by|from|between|and|for|organi[sz]ed by)\s+"
+    r"((?:[A-Z][\w'-]*)(?:\s+[A-Z][\w'-]*)*)"
+)
+_NOT_NAMES = {"I", "Teams", "UTC", "PSTN"} | {
+    word.capitalize() for word in _WEEKDAYS + _MONTHS
+}
+
+
+class QueryFilters(BaseModel):
+    """Constraints stated in a question."""
+
+    start_time: Optional[datetime] = Field(
+        default=None, description="Earliest call start (UTC), inclusive"
+    )
+    end_time: Optional[datetime] = Field(
+        default=None, description="Latest call start (UTC), exclusive"
+    )
+    call_type: Optional[CallType] = Field(default=None, description="Call type")
+    names: List[str] = Field(
+        default_factory=list, description="People named, or their email addresses"
+    )
+
+    @property
+    def keywords(self) -> Optional[str]:
+        """Get the names as a keyword query, or None if there are none."""
+        return " ".join(self.names) or None
+
+    def search_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the metadata filters as EmbeddingsClient.search_calls arguments.
+
+        Returns:
+            start_time, end_time and call_type, for those that are set.
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.start_time is not None:
+            kwargs["start_time"] = self.start_time
+        if self.end_time is not None:
+            kwargs["end_time"] = self.end_time
+        if self.call_type is not None:
+            kwargs["call_type"] = self.call_type.value
+        return kwargs
+
+    def describe(self) -> str:
+        """
+        Describe the filters in one line, for the LLM context.
+
+        Returns:
+            The description, or an empty string if there are no filters.
+        """
+        parts = []
+        if self.start_time is not None and self.end_time is not None:
+            parts.append(
+                f"started {self.start_time:%Y-%m-%d %H:%M} to "
+                f"{self.end_time:%Y-%m-%d %H:%M} UTC"
+            )
+        elif self.start_time is not None:
+            parts.append(f"started since {self.start_time:%Y-%m-%d %H:%M} UTC")
+        elif self.end_time is not None:
+            parts.append(f"started before {self.end_time:%Y-%m-%d %H:%M} UTC")
+        if self.call_type is not None:
+            parts.append(f"type {self.call_type.value}")
+        if self.names:
+            parts.append(f"involving {', '.join(self.names)}")
+        return "; ".join(parts)
+
+
+def _midnight(value: datetime) -> datetime:
+    """Get the start of a datetime's day."""
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _month_start(value: datetime, months_back: int = 0) -> datetime:
+    """Get the start of the month, or of an earlier month."""
+    month = value.month - 1 - months_back
+    return _midnight(value).replace(
+        year=value.year + month // 12, month=month % 12 + 1, day=1
+    )
+
+
+def _date_range(
+    text: str, now: datetime
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Find the date range a lowercase question refers to."""
+    today = _midnight(now)
+    day = timedelta(days=1)
+
+    dates = _DATE.findall(text)
+    if dates:
+        start: Optional[datetime] = None
+        end: Optional[datetime] = None
+        for word, value in dates:
+            date = datetime.fromisoformat(value)
+            if word in ("before", "until"):
+                end = date
+            elif word in ("to", "and") and start is not None:
+                end = date + day
+            elif word in ("since", "after", "from"):
+                start = date
+            else:
+                start, end = date, date + day
+        return start, end
+
+    match = _RELATIVE.search(text)
+    if match:
+        return now - int(match.group(1)) * _UNITS[match.group(2)], None
+    if re.search(r"\btoday\b", text):
+        return today, today + day
+    if re.search(r"\byesterday\b", text):
+        return today - day, today
+    monday = today - timedelta(days=today.weekday())
+    if re.search(r"\b(?:last|previous) week\b", text):
+        return monday - timedelta(days=7), monday
+    if re.search(r"\b(?:this|current) week\b", text):
+        return monday, None
+    if re.search(r"\b(?:last|previous) month\b", text):
+        return _month_start(now, 1), _month_start(now)
+    if re.search(r"\b(?:this|current) month\b", text):
+        return _month_start(now), None
+    match = _WEEKDAY.search(text)
+    if match:
+        # The most recent such day, today included
+        back = (today.weekday() - _WEEKDAYS.index(match.group(1))) % 7
+        return today - timedelta(days=back), today - timedelta(days=back) + day
+    return None, None
+
+
+def _names(query: str) -> List[str]:
+    """Find the email addresses and capitalized names in a question."""
+    names = _EMAIL.findall(query)
+    for match in _NAME.finditer(query):
+        words = [w for w in match.group(1).split() if w not in _NOT_NAMES]
+        if words:
+            names.append(" ".join(words))
+    return list(dict.fromkeys(names))
+
+
+def parse_query_filters(query: str, now: Optional[datetime] = None) -> QueryFilters:
+    """
+    Extract the date range, call type and names stated in a question.
+
+    Args:
+        query: Natural language question.
+        now: Current time (naive UTC) that relative dates count from.
+            Defaults to now.
+
+    Returns:
+        The filters found. Unrecognized constraints are left unset.
+    """
+    now = now or datetime.utcnow()
+    text = query.lower()
+    start, end = _date_range(text, now)
+    call_type = next(
+        (value for pattern, value in _CALL_TYPES if pattern.search(text)), None
+    )
+    return QueryFilters(
+        start_time=start, end_time=end, call_type=call_type, names=_names(query)
+    )
+
+
+def hydrate_results(
+    results: List[Dict[str, Any]],
+    records: Iterable[CallRecord] = (),
+    service: Optional[CallRecordService] = None,
+    index: Optional[EmbeddingsClient] = None,
+) -> List[CallRecord]:
+    """
+    Resolve search results to full call records, keeping their order.
+
+    Each result is looked up in ``records``, then among the full records
+    the index stores. The remaining results are fetched together with
+    batched Graph requests. Results that cannot be fetched are rebuilt from
+    their document and metadata, and left out if even that fails.
+
+    Args:
+        results: Rows from EmbeddingsClient.search_calls.
+        records: Call records already in memory, e.g. the working set.
+        service: Service to fetch missing records with. Without one they
+            are rebuilt from the index.
+        index: Client the results came from, whose stored records are
+            used before Graph.
+
+    Returns:
+        The call records, in result order.
+    """
+    known = {record.id: record for record in records}
+    sources: Dict[str, int] = {"memory": 0, "index": 0, "graph": 0, "partial": 0}
+    unknown = [r["id"] for r in results if r["id"] not in known]
+    stored = index.stored_records(unknown) if index is not None and unknown else {}
+    hydrated: List[Optional[CallRecord]] = []
+    for result in results:
+        record = known.get(result["id"])
+        if record is not None:
+            sources["memory"] += 1
+        else:
+            record = stored.get(result["id"])
+            if record is not None:
+                sources["index"] += 1
+        hydrated.append(record)
+
+    missing = [r["id"] for r, record in zip(results, hydrated) if record is None]
+    with tracing.span(
+        "retrieval.hydrate", **{"retrieval.results": len(results)}
+    ) as span:
+        fetched: Dict[str, CallRecord] = {}
+        if missing and service is not None:
+            try:
+                fetched = service.get_call_records_by_id(missing)
+            except (httpx.HTTPError, RuntimeError) as e:
+                logger.warning(
+                    "Could not fetch %d call records from Graph: %s", len(missing), e
+                )
+        for i, result in enumerate(results):
+            if hydrated[i] is None:
+                record = fetched.get(result["id"])
+                if record is not None:
+                    sources["graph"] += 1
+                else:
+                    record = EmbeddingsClient.result_to_record(result)
+                    if record is not None:
+                        sources["partial"] += 1
+                hydrated[i] = record
+        span.set_attributes(
+            **{f"retrieval.{source}": count for source, count in sources.items()}
+        )
+
+    for source, count in sources.items():
+        if count:
+            metrics.increment("retrieval_hydrated_total", count, source=source)
+    return [record for record in hydrated if record is not None]
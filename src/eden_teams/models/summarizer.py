@@ -0,0 +1,316 @@
+"""
+Map-reduce summarization of call activity.
+
+This module provides MapReduceSummarizer, which summarizes any number of
+call summaries in bounded time and cost. Summaries are split into chunks
+that fit a token budget and summarized concurrently (map). The partial
+summaries are then combined in a tree of further requests until one
+summary remains (reduce). Each request's answer is cached by the hash of
+its prompt, so re-running over mostly unchanged data only pays for the
+chunks that changed.
+"""
+
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from eden_teams.config import settings
+from eden_teams.models.context import TokenCounter
+from eden_teams.models.response_cache import ResponseCache, fingerprint
+from eden_teams.utils import metrics, tracing
+
+if TYPE_CHECKING:
+    from eden_teams.models.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+MAP_PROMPT = """Summarize the following Teams call records{period}.
+
+Keep exact figures so that this summary can later be combined with others:
+1. Number of calls
+2. Number of calls of each type (meetings, peer-to-peer, etc.)
+3. Total call duration
+4. Most active participants and their number of calls
+5. Notable patterns (busy days or hours, long or poor-quality calls)
+
+Be concise. Do not estimate anything that is not in the records.
+
+Call Records:
+{text}"""
+
+REDUCE_PROMPT = """Combine the following partial summaries of Teams call \
+activity{period} into one summary.
+
+Add up the counts and durations across the partial summaries rather than
+averaging them, merge the participant lists, and keep the notable patterns.
+Keep exact figures so that this summary can be combined with others.
+
+Partial Summaries:
+{text}"""
+
+FINAL_PROMPT = """Please provide a comprehensive summary of the following \
+Teams call activity{period}.
+
+Include:
+1. Total number of calls
+2. Types of calls (meetings, peer-to-peer, etc.)
+3. Key participants
+4. Average call duration
+5. Any notable patterns or observations
+
+{label}:
+{text}"""
+
+SEPARATOR = "\n\n"
+
+
+class SummaryStats(BaseModel):
+    """How a summary was produced."""
+
+    summaries: int = Field(default=0, description="Call summaries given")
+    chunks: int = Field(default=0, description="Chunks in the map step")
+    levels: int = Field(
+        default=0, description="Levels of requests, from the map step to the final"
+    )
+    requests: int = Field(default=0, description="LLM requests made")
+    cached: int = Field(default=0, description="Requests answered from the cache")
+    seconds: float = Field(default=0.0, description="Wall-clock time")
+
+
+def _boundary(text: str, spacing: int) -> bool:
+    """Check if a chunk may end after this text, based on its content only."""
+    digest = hashlib.sha1(text.encode(), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:4], "big") % spacing == 0
+
+
+def chunk_texts(
+    texts: Sequence[str], counter: TokenCounter, budget: int
+) -> List[List[str]]:
+    """
+    Split texts into consecutive chunks that fit a token budget.
+
+    Texts that fit the budget together form a single chunk. Otherwise chunks
+    end where a text's hash picks a boundary, aiming for chunks of
+    about half the budget, or where the next text would exceed the budget.
+    Because boundaries depend on content rather than position, adding or
+    changing a few texts only changes the chunks around them, which keeps
+    the other chunks' cached summaries valid.
+
+    Args:
+        texts: Texts to split, in order.
+        counter: Token counter for the model.
+        budget: Maximum tokens per chunk. Longer texts are truncated.
+
+    Returns:
+        Chunks of texts, in order.
+    """
+    if not texts:
+        return []
+    separator = counter.count(SEPARATOR)
+    costs = [counter.count(text) + separator for text in texts]
+    if sum(costs) <= budget:
+        return [list(texts)]
+    average = max(1, sum(costs) // len(costs))
+    # A power of two, so small changes in the average keep the boundaries
+    spacing = 1 << max(0, (budget // (2 * average)).bit_length() - 1)
+
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for text, cost in zip(texts, costs):
+        if cost > budget:
+            text = counter.truncate(text, budget - separator)
+            cost = budget
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+        if _boundary(text, spacing):
+            chunks.append(current)
+            current, used = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class MapReduceSummarizer:
+    """
+    Hierarchical summarizer for large sets of call summaries.
+
+    Requests within a level run concurrently on a bounded thread pool. The
+    tracing context is copied into each worker so their spans nest under
+    the caller's ``llm.summarize`` span.
+    """
+
+    def __init__(
+        self,
+        client: "LLMClient",
+        chunk_tokens: Optional[int] = None,
+        partial_tokens: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        Initialize the summarizer.
+
+        Args:
+            client: LLM client that sends the requests.
+            chunk_tokens: Token budget of the text in each request. Uses
+                settings.summary_chunk_tokens if None.
+            partial_tokens: Maximum tokens of each partial summary. Uses
+                settings.summary_partial_tokens if None.
+            max_workers: Maximum concurrent requests. Uses
+                settings.summary_max_workers if None.
+            cache: Cache of answers by prompt. Created from the SUMMARY_*
+                settings if None.
+        """
+        self.client = client
+        self.chunk_tokens = chunk_tokens or settings.summary_chunk_tokens
+        self.partial_tokens = partial_tokens or settings.summary_partial_tokens
+        self.max_workers = max_workers or settings.summary_max_workers
+        self.cache = cache or ResponseCache(
+            max_entries=settings.summary_cache_entries,
+            ttl_seconds=None,
+            path=settings.summary_cache_path or None,
+        )
+        self.last_stats: Optional[SummaryStats] = None
+        self._lock = threading.Lock()
+
+    def summarize(
+        self, call_summaries: Sequence[str], time_period: Optional[str] = None
+    ) -> str:
+        """
+        Summarize call activity.
+
+        Args:
+            call_summaries: Call summary strings.
+            time_period: Description of the time period (e.g., "last week").
+
+        Returns:
+            Natural language summary of call activity.
+        """
+        period = f" for {time_period}" if time_period else ""
+        counter = self.client.token_counter
+        stats = SummaryStats(summaries=len(call_summaries))
+        started = time.perf_counter()
+
+        with tracing.span(
+            "llm.summarize", **{"llm.summary_count": len(call_summaries)}
+        ) as span:
+            chunks = chunk_texts(call_summaries, counter, self.chunk_tokens)
+            stats.chunks = len(chunks)
+            stats.levels = 1
+            if len(chunks) <= 1:
+                result = self._request(
+                    FINAL_PROMPT,
+                    period,
+                    "Call Records",
+                    chunks[0] if chunks else [],
+                    stats,
+                )
+            else:
+                partials = self._run_level(MAP_PROMPT, period, chunks, stats)
+                while True:
+                    groups = self._group(partials, counter)
+                    if len(groups) == 1:
+                        break
+                    stats.levels += 1
+                    partials = self._run_level(REDUCE_PROMPT, period, groups, stats)
+                stats.levels += 1
+                result = self._request(
+                    FINAL_PROMPT, period, "Partial Summaries", partials, stats
+                )
+            span.set_attributes(
+                **{
+                    "llm.summary_chunks": stats.chunks,
+                    "llm.summary_levels": stats.levels,
+                    "llm.summary_requests": stats.requests,
+                    "llm.summary_cached": stats.cached,
+                }
+            )
+
+        stats.seconds = time.perf_counter() - started
+        self.last_stats = stats
+        logger.info(
+            "Summarized %d call summaries in %d chunk(s) and %d level(s): "
+            "%d request(s), %d cached, %.1fs",
+            stats.summaries,
+            stats.chunks,
+            stats.levels,
+            stats.requests,
+            stats.cached,
+            stats.seconds,
+        )
+        return result
+
+    def _group(self, partials: List[str], counter: TokenCounter) -> List[List[str]]:
+        """Group partial summaries for the next reduce level, two or more each."""
+        groups = chunk_texts(partials, counter, self.chunk_tokens)
+        if len(groups) > 1 and len(groups) == len(partials):
+            # Every partial fills a request on its own; pair them so the
+            # tree still shrinks
+            groups = [partials[i : i + 2] for i in range(0, len(partials), 2)]
+        return groups
+
+    def _run_level(
+        self,
+        template: str,
+        period: str,
+        groups: List[List[str]],
+        stats: SummaryStats,
+    ) -> List[str]:
+        """Summarize each group concurrently, keeping their order."""
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(groups)),
+            thread_name_prefix="summarize",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._request,
+                    template,
+                    period,
+                    "",
+                    group,
+                    stats,
+                    self.partial_tokens,
+                )
+                for group in groups
+            ]
+            return [future.result() for future in futures]
+
+    def _request(
+        self,
+        template: str,
+        period: str,
+        label: str,
+        texts: List[str],
+        stats: SummaryStats,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Send one summarization request, or answer it from the cache."""
+        prompt = template.format(period=period, label=label, text=SEPARATOR.join(texts))
+        key = fingerprint(
+            self.client.model, self.client.system_prompt, prompt, max_tokens
+        )
+        entry = self.cache.lookup(key)
+        if entry is not None:
+            with self._lock:
+                stats.cached += 1
+            metrics.increment("summary_requests_total", result="cached")
+            return entry.answer
+
+        started = time.perf_counter()
+        answer = self.client.chat(prompt, max_tokens=max_tokens, cache=False)
+        with self._lock:
+            stats.requests += 1
+        metrics.increment("summary_requests_total", result="fresh")
+        self.cache.store(key, answer, seconds=time.perf_counter() - started)
+        return answer
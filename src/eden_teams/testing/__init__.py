@@ -0,0 +1,53 @@
+"""
+Offline test harnesses for Eden Teams.
+
+This package provides local stand-ins for external services and load-test
+drivers so that the Graph, CDR and LLM paths can be exercised at scale
+without network access.
+"""
+
+from typing import TYPE_CHECKING
+
+from eden_teams.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from eden_teams.testing.graph_server import (
+        FakeGraphConfig,
+        FakeGraphServer,
+        StaticTokenProvider,
+    )
+    from eden_teams.testing.llm_server import (
+        FakeLLMConfig,
+        FakeLLMServer,
+        FakeToolCall,
+    )
+    from eden_teams.testing.synthetic import (
+        SyntheticCDRConfig,
+        SyntheticCDRGenerator,
+    )
+
+__all__ = [
+    "FakeGraphConfig",
+    "FakeGraphServer",
+    "FakeLLMConfig",
+    "FakeLLMServer",
+    "FakeToolCall",
+    "StaticTokenProvider",
+    "SyntheticCDRConfig",
+    "SyntheticCDRGenerator",
+]
+
+# Imported on first use, like the application packages
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "FakeGraphConfig": "eden_teams.testing.graph_server",
+        "FakeGraphServer": "eden_teams.testing.graph_server",
+        "StaticTokenProvider": "eden_teams.testing.graph_server",
+        "FakeLLMConfig": "eden_teams.testing.llm_server",
+        "FakeLLMServer": "eden_teams.testing.llm_server",
+        "FakeToolCall": "eden_teams.testing.llm_server",
+        "SyntheticCDRConfig": "eden_teams.testing.synthetic",
+        "SyntheticCDRGenerator": "eden_teams.testing.synthetic",
+    },
+)
@@ -0,0 +1,465 @@
+"""
+Local stand-in for the Microsoft Graph API.
+
+This module provides an in-process HTTP server that serves synthetic call
+records with the same shapes, pagination, ETags, ``$batch`` semantics and
+throttling behavior as Microsoft Graph, so that GraphClient and
+CallRecordService can be exercised offline.
+"""
+
+import bisect
+import json
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from pydantic import BaseModel, Field
+
+from eden_teams.graph.auth import GraphAuthProvider
+from eden_teams.testing.synthetic import SyntheticCDRConfig, SyntheticCDRGenerator
+
+logger = logging.getLogger(__name__)
+
+# (status, headers, body)
+RouteResult = Tuple[int, Dict[str, str], Optional[Any]]
+
+_FILTER_CLAUSE = re.compile(r"startDateTime (ge|le) (\S+)")
+_STARTSWITH_CLAUSE = re.compile(r"startswith\(\w+, '((?:[^']|'')*)'\)")
+
+
+class FakeGraphConfig(BaseModel):
+    """Behavior of the fake Graph server."""
+
+    record_count: int = Field(default=1000, description="Call records served")
+    user_count: int = Field(default=50, description="Users in the directory")
+    page_size: int = Field(default=100, description="Maximum records per page")
+    start_date: datetime = Field(
+        default=datetime(2024, 1, 1), description="Start of the record time range"
+    )
+    days: int = Field(default=7, description="Days spanned by the records")
+    latency_ms: float = Field(default=0.0, description="Delay added per request")
+    error_rate: float = Field(default=0.0, description="Fraction of 500 responses")
+    throttle_rate: float = Field(default=0.0, description="Fraction of 429 responses")
+    retry_after_seconds: float = Field(
+        default=0.0, description="Retry-After value sent with 429 responses"
+    )
+    max_batch_size: int = Field(default=20, description="Requests allowed in $batch")
+    seed: int = Field(default=0, description="Random seed for data and faults")
+
+
+class StaticTokenProvider(GraphAuthProvider):
+    """Auth provider that returns a fixed token without contacting Entra ID."""
+
+    def __init__(self, token: str = "fake-token") -> None:
+        """Initialize with the token to return."""
+        super().__init__()
+        self._token = token
+
+    def get_token(self) -> Optional[str]:
+        """Return the static token."""
+        return self._token
+
+    @property
+    def is_authenticated(self) -> bool:
+        """Static tokens are always available."""
+        return True
+
+
+class FakeGraphServer:
+    """
+    In-process fake of the Microsoft Graph API.
+
+    Serves ``/communications/callRecords`` (with ``$filter``, ``$top``,
+    ``$skiptoken`` pagination and ``$expand=sessions``), individual records
+    with ETags, record sessions, ``/users`` and ``/$batch``. Latency, server
+    errors and 429 throttling are injected according to the config.
+
+    Example:
+        with FakeGraphServer(FakeGraphConfig(record_count=500)) as server:
+            client = GraphClient(base_url=server.url,
+                                 auth_provider=StaticTokenProvider())
+            records = list(client.iter_call_records())
+    """
+
+    API_VERSION = "v1.0"
+
+    def __init__(
+        self,
+        config: Optional[FakeGraphConfig] = None,
+        records: Optional[List[Dict[str, Any]]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Initialize the fake server.
+
+        Args:
+            config: Server behavior. Uses defaults if None.
+            records: Call records to serve. Synthesized from the config if None.
+            host: Interface to bind.
+            port: Port to bind. Zero picks a free port.
+        """
+        self.config = config or FakeGraphConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._users: List[Dict[str, Any]] = []
+        if records is None:
+            records = self._build_records()
+        else:
+            self._users = self._users_from_records(records)
+        self._records = records
+        self._records.sort(key=lambda r: r.get("startDateTime", ""))
+        self._records_by_id = {r["id"]: r for r in self._records}
+        self._start_times = [r.get("startDateTime", "") for r in self._records]
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "throttled": 0,
+            "errors": 0,
+            "not_modified": 0,
+            "batch_requests": 0,
+        }
+        self._server = _QuietHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Get the service root to pass to GraphClient as base_url."""
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Get the call records served, ordered by start time."""
+        return self._records
+
+    @property
+    def users(self) -> List[Dict[str, Any]]:
+        """Get the users in the fake directory."""
+        return self._users
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get a snapshot of request counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> "FakeGraphServer":
+        """Start serving on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="fake-graph-server",
+                daemon=True,
+            )
+            self._thread.start()
+            logger.info("Fake Graph server listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGraphServer":
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit."""
+        self.stop()
+
+    def _build_records(self) -> List[Dict[str, Any]]:
+        """Synthesize call records with the shared CDR generator."""
+        generator = SyntheticCDRGenerator(
+            SyntheticCDRConfig(
+                seed=self.config.seed,
+                user_count=self.config.user_count,
+                start_date=self.config.start_date,
+                days=self.config.days,
+            )
+        )
+        self._users = generator.users
+        return list(generator.iter_call_records(self.config.record_count))
+
+    @staticmethod
+    def _users_from_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the user directory from the participants of supplied records."""
+        users: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            identities = list(record.get("participants") or [])
+            identities.append(record.get("organizer") or {})
+            for identity_set in identities:
+                identity = identity_set.get("identity", identity_set)
+                user = identity.get("user") or {}
+                user_id = user.get("id")
+                if not user_id or user_id in users:
+                    continue
+                upn = identity.get("userPrincipalName") or ""
+                users[user_id] = {
+                    "id": user_id,
+                    "displayName": user.get("displayName") or "",
+                    "mail": upn.lower(),
+                    "userPrincipalName": upn,
+                }
+        return list(users.values())
+
+    def _count(self, stat: str) -> None:
+        """Increment a request counter."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _inject_fault(self) -> Optional[RouteResult]:
+        """Decide whether the current request is throttled or fails."""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.config.throttle_rate:
+            self._count("throttled")
+            return (
+                429,
+                {"Retry-After": f"{self.config.retry_after_seconds:g}"},
+                _error_body("TooManyRequests", "Too many requests"),
+            )
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self._count("errors")
+            return 500, {}, _error_body("InternalServerError", "Injected failure")
+        return None
+
+    def dispatch(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: Optional[Any] = None,
+    ) -> RouteResult:
+        """
+        Route a request to its handler.
+
+        Args:
+            method: HTTP method.
+            target: Request path and query string relative to the host.
+            headers: Request headers.
+            body: Decoded JSON request body, if any.
+
+        Returns:
+            Tuple of status code, response headers and JSON body.
+        """
+        self._count("requests")
+        fault = self._inject_fault()
+        if fault is not None:
+            return fault
+
+        parts = urlsplit(target)
+        prefix = f"/{self.API_VERSION}"
+        path = parts.path[len(prefix) :] if parts.path.startswith(prefix) else ""
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        segments = [s for s in path.split("/") if s]
+
+        if method == "POST" and segments == ["$batch"]:
+            return self._handle_batch(body)
+        if method != "GET":
+            return 405, {}, _error_body("MethodNotAllowed", "Method not allowed")
+
+        if segments[:2] == ["communications", "callRecords"]:
+            if len(segments) == 2:
+                return self._handle_list_records(query)
+            record = self._records_by_id.get(segments[2])
+            if record is None:
+                return 404, {}, _error_body("NotFound", "Call record not found")
+            if len(segments) == 3:
+                return self._handle_record(record, headers, query)
+            if segments[3:] == ["sessions"]:
+                return 200, {}, {"value": record.get("sessions", [])}
+        elif segments == ["users"]:
+            return self._handle_search_users(query)
+        elif len(segments) == 2 and segments[0] == "users":
+            for user in self._users:
+                if segments[1] in (user["id"], user["userPrincipalName"]):
+                    return 200, {}, user
+            return 404, {}, _error_body("Request_ResourceNotFound", "User not found")
+
+        return 404, {}, _error_body("NotFound", f"No route for {parts.path}")
+
+    def _handle_list_records(self, query: Dict[str, str]) -> RouteResult:
+        """Serve a page of call records."""
+        # Records are sorted by start time, so filters are index ranges
+        low, high = 0, len(self._records)
+        for op, value in _FILTER_CLAUSE.findall(query.get("$filter", "")):
+            bound = _normalize_timestamp(value)
+            if op == "ge":
+                low = max(low, bisect.bisect_left(self._start_times, bound))
+            else:
+                high = min(high, bisect.bisect_right(self._start_times, bound))
+        records = self._records[low:high]
+
+        page_size = min(int(query.get("$top", self.config.page_size)), 999)
+        page_size = min(page_size, self.config.page_size)
+        offset = int(query.get("$skiptoken", 0))
+        page = records[offset : offset + page_size]
+
+        if query.get("$expand") != "sessions":
+            page = [{k: v for k, v in r.items() if k != "sessions"} for r in page]
+
+        body: Dict[str, Any] = {
+            "@odata.context": (
+                f"{self.url}/{self.API_VERSION}/$metadata#communications/callRecords"
+            ),
+            "value": page,
+        }
+        if offset + page_size < len(records):
+            next_query = dict(query, **{"$skiptoken": str(offset + page_size)})
+            body["@odata.nextLink"] = (
+                f"{self.url}/{self.API_VERSION}/communications/callRecords?"
+                + urlencode(next_query)
+            )
+        return 200, {}, body
+
+    def _handle_record(
+        self,
+        record: Dict[str, Any],
+        headers: Dict[str, str],
+        query: Dict[str, str],
+    ) -> RouteResult:
+        """Serve a single call record with an ETag."""
+        etag = f'W/"{record["id"]}-{record.get("version", 1)}"'
+        if headers.get("if-none-match") == etag:
+            self._count("not_modified")
+            return 304, {"ETag": etag}, None
+
+        if query.get("$expand") != "sessions":
+            record = {k: v for k, v in record.items() if k != "sessions"}
+        return 200, {"ETag": etag}, record
+
+    def _handle_search_users(self, query: Dict[str, str]) -> RouteResult:
+        """Serve a user search using startswith() filters."""
+        prefixes = [
+            p.replace("''", "'").lower()
+            for p in _STARTSWITH_CLAUSE.findall(query.get("$filter", ""))
+        ]
+        users = [
+            u
+            for u in self._users
+            if not prefixes
+            or any(
+                u["displayName"].lower().startswith(p) or u["mail"].startswith(p)
+                for p in prefixes
+            )
+        ]
+        top = int(query.get("$top", 100))
+        return 200, {}, {"value": users[:top]}
+
+    def _handle_batch(self, body: Optional[Any]) -> RouteResult:
+        """Serve a JSON $batch request."""
+        self._count("batch_requests")
+        requests = (body or {}).get("requests", [])
+        if len(requests) > self.config.max_batch_size:
+            return (
+                400,
+                {},
+                _error_body(
+                    "BadRequest",
+                    f"Batch size exceeds {self.config.max_batch_size} requests",
+                ),
+            )
+
+        responses = []
+        for item in requests:
+            url = item.get("url", "")
+            if not url.startswith("/"):
+                url = "/" + url
+            status, headers, result = self.dispatch(
+                item.get("method", "GET").upper(),
+                f"/{self.API_VERSION}{url}",
+                {k.lower(): v for k, v in item.get("headers", {}).items()},
+                item.get("body"),
+            )
+            responses.append(
+                {
+                    "id": item.get("id"),
+                    "status": status,
+                    "headers": headers,
+                    "body": result,
+                }
+            )
+        return 200, {}, {"responses": responses}
+
+    def _handler_class(self) -> type:
+        """Build the request handler class bound to this server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """HTTP handler delegating to FakeGraphServer.dispatch."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                """Handle GET requests."""
+                self._respond(None)
+
+            def do_POST(self) -> None:  # noqa: N802
+                """Handle POST requests."""
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b""
+                self._respond(json.loads(raw) if raw else None)
+
+            def _respond(self, body: Optional[Any]) -> None:
+                """Dispatch the request and write the response."""
+                if server.config.latency_ms:
+                    time.sleep(server.config.latency_ms / 1000)
+
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                status, response_headers, result = server.dispatch(
+                    self.command, self.path, headers, body
+                )
+                payload = b"" if result is None else json.dumps(result).encode()
+
+                self.send_response(status)
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                if payload:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                """Route access logs to the module logger."""
+                logger.debug(format, *args)
+
+        return Handler
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that logs client disconnects instead of printing."""
+
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """Log errors such as clients closing throttled streams early."""
+        logger.debug("Error handling request from %s", client_address, exc_info=True)
+
+
+def _isoformat(value: datetime) -> str:
+    """Format a datetime the way Graph does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond:06d}Z"
+
+
+def _normalize_timestamp(value: str) -> str:
+    """Normalize a filter timestamp for comparison with record timestamps."""
+    parsed = datetime.fromisoformat(value.rstrip("Z"))
+    return _isoformat(parsed)
+
+
+def _error_body(code: str, message: str) -> Dict[str, Any]:
+    """Build a Graph error payload."""
+    return {"error": {"code": code, "message": message}}
@@ -0,0 +1,365 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+This module provides an in-process HTTP server that answers
+``POST /v1/chat/completions`` with the same JSON and server-sent event
+shapes as OpenAI, including streamed tool calls and usage chunks, so that
+LLMClient's blocking, streaming and tool-calling paths can be exercised
+offline with the real SDK.
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from eden_teams.testing.graph_server import _QuietHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+class FakeToolCall(BaseModel):
+    """A tool call the fake model makes before answering."""
+
+    name: str = Field(description="Tool to call")
+    arguments: Dict[str, Any] = Field(
+        default_factory=dict, description="Arguments to pass"
+    )
+
+
+class FakeLLMConfig(BaseModel):
+    """Behavior of the fake completion server."""
+
+    reply: str = Field(
+        default="There were 42 calls last week, averaging 18 minutes.",
+        description="Text of every answer",
+    )
+    tool_calls: List[FakeToolCall] = Field(
+        default_factory=list,
+        description="Tool calls made when tools are offered and no tool "
+        "results have been sent yet",
+    )
+    first_token_ms: float = Field(
+        default=0.0, description="Delay before the first chunk"
+    )
+    token_interval_ms: float = Field(default=0.0, description="Delay between chunks")
+    model: str = Field(default="gpt-4", description="Model name in responses")
+    rate_limited_requests: int = Field(
+        default=0, description="Leading requests answered with 429"
+    )
+    retry_after_ms: float = Field(
+        default=100.0, description="Wait advertised in 429 responses"
+    )
+
+
+class FakeLLMServer:
+    """
+    In-process fake of the OpenAI chat completions endpoint.
+
+    Answers are split into word tokens and, for ``stream=True`` requests,
+    sent one per server-sent event with the configured delays. The first
+    ``rate_limited_requests`` requests are throttled with a 429 carrying
+    OpenAI's rate-limit headers. Requests are recorded in ``requests`` and
+    the most requests seen in progress at once in ``max_in_flight``.
+
+    Example:
+        with FakeLLMServer(FakeLLMConfig(first_token_ms=300)) as server:
+            client = OpenAI(api_key="test", base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeLLMConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Initialize the fake server.
+
+        Args:
+            config: Server behavior. Uses defaults if None.
+            host: Interface to bind.
+            port: Port to bind. Zero picks a free port.
+        """
+        self.config = config or FakeLLMConfig()
+        self.requests: List[Dict[str, Any]] = []
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _QuietHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Get the API root to pass to OpenAI as base_url."""
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        """Start serving on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="fake-llm-server",
+                daemon=True,
+            )
+            self._thread.start()
+            logger.info("Fake LLM server listening on %s", self.base_url)
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit."""
+        self.stop()
+
+    def _wants_tools(self, body: Dict[str, Any]) -> bool:
+        """Decide whether to answer with tool calls instead of text."""
+        if not self.config.tool_calls or not body.get("tools"):
+            return False
+        if body.get("tool_choice") == "none":
+            return False
+        return not any(m.get("role") == "tool" for m in body.get("messages", []))
+
+    def _tokens(self) -> List[str]:
+        """Split the reply into word tokens, keeping the spaces."""
+        words = self.config.reply.split(" ")
+        return [w + " " for w in words[:-1]] + words[-1:]
+
+    def _usage(self, body: Dict[str, Any], completion_tokens: int) -> Dict[str, int]:
+        """Estimate token usage from word counts."""
+        prompt_tokens = sum(
+            len(str(m.get("content") or "").split()) + 3
+            for m in body.get("messages", [])
+        )
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _tool_call_payloads(self) -> List[Dict[str, Any]]:
+        """Build the configured tool calls in the OpenAI message shape."""
+        return [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {
+                    "name": call.name,
+                    "arguments": json.dumps(call.arguments),
+                },
+            }
+            for i, call in enumerate(self.config.tool_calls)
+        ]
+
+    def complete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a blocking chat completion response.
+
+        Args:
+            body: Decoded request body.
+
+        Returns:
+            Chat completion object.
+        """
+        if self._wants_tools(body):
+            message: Dict[str, Any] = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": self._tool_call_payloads(),
+            }
+            finish_reason = "tool_calls"
+            completion_tokens = len(self.config.tool_calls) * 10
+        else:
+            message = {"role": "assistant", "content": self.config.reply}
+            finish_reason = "stop"
+            completion_tokens = len(self._tokens())
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.config.model,
+            "choices": [
+                {"index": 0, "message": message, "finish_reason": finish_reason}
+            ],
+            "usage": self._usage(body, completion_tokens),
+        }
+
+    def stream(self, body: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield chat completion chunks for a streaming request.
+
+        Args:
+            body: Decoded request body.
+
+        Yields:
+            Chat completion chunk objects, before the delays between them.
+        """
+
+        def chunk(
+            delta: Dict[str, Any], finish_reason: Optional[str] = None
+        ) -> Dict[str, Any]:
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": self.config.model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+
+        yield chunk({"role": "assistant", "content": ""})
+        if self._wants_tools(body):
+            payloads = self._tool_call_payloads()
+            for index, call in enumerate(payloads):
+                arguments = call["function"]["arguments"]
+                yield chunk(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": index,
+                                "id": call["id"],
+                                "type": "function",
+                                "function": {"name": call["function"]["name"]},
+                            }
+                        ]
+                    }
+                )
+                # Arguments arrive in fragments, as they do from OpenAI
+                half = len(arguments) // 2
+                for part in (arguments[:half], arguments[half:]):
+                    yield chunk(
+                        {
+                            "tool_calls": [
+                                {"index": index, "function": {"arguments": part}}
+                            ]
+                        }
+                    )
+            yield chunk({}, "tool_calls")
+            completion_tokens = len(payloads) * 10
+        else:
+            tokens = self._tokens()
+            for token in tokens:
+                yield chunk({"content": token})
+            yield chunk({}, "stop")
+            completion_tokens = len(tokens)
+
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = chunk({})
+            usage["choices"] = []
+            usage["usage"] = self._usage(body, completion_tokens)
+            yield usage
+
+    def _handler_class(self) -> type:
+        """Build the request handler class bound to this server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """HTTP handler for the chat completions endpoint."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                """Handle POST requests."""
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length)) if length else {}
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "Not found"}})
+                    return
+
+                with server._lock:
+                    throttle = server.throttled < server.config.rate_limited_requests
+                    if throttle:
+                        server.throttled += 1
+                    else:
+                        server.requests.append(body)
+                        server.in_flight += 1
+                        server.max_in_flight = max(
+                            server.max_in_flight, server.in_flight
+                        )
+                if throttle:
+                    self._send_rate_limited()
+                    return
+
+                try:
+                    if server.config.first_token_ms:
+                        time.sleep(server.config.first_token_ms / 1000)
+                    if body.get("stream"):
+                        self._send_stream(body)
+                    else:
+                        self._send_json(200, server.complete(body))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _send_rate_limited(self) -> None:
+                """Write a 429 with OpenAI's rate-limit headers."""
+                wait_ms = server.config.retry_after_ms
+                data = json.dumps(
+                    {
+                        "error": {
+                            "message": "Rate limit reached",
+                            "type": "requests",
+                            "code": "rate_limit_exceeded",
+                        }
+                    }
+                ).encode()
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("retry-after-ms", f"{wait_ms:g}")
+                self.send_header("x-ratelimit-reset-requests", f"{wait_ms:g}ms")
+                self.send_header("x-ratelimit-remaining-requests", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                """Write a JSON response."""
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body: Dict[str, Any]) -> None:
+                """Write server-sent events, closing the connection at the end."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                interval = server.config.token_interval_ms / 1000
+                for index, event in enumerate(server.stream(body)):
+                    if index and interval:
+                        time.sleep(interval)
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                """Route access logs to the module logger."""
+                logger.debug(format, *args)
+
+        return Handler
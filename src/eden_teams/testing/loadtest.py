@@ -0,0 +1,293 @@
+"""
+Load-test driver for the Graph and CDR layers.
+
+This module runs GraphClient and CallRecordService concurrently against a
+Graph endpoint (normally FakeGraphServer) and reports throughput, latency
+percentiles, retries and errors.
+
+Usage:
+    python -m eden_teams.testing.loadtest --records 5000 --concurrency 8
+"""
+
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+from pydantic import BaseModel, Field
+
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.graph.client import GraphClient
+from eden_teams.graph.streaming import JSONStreamError
+from eden_teams.testing.graph_server import (
+    FakeGraphConfig,
+    FakeGraphServer,
+    StaticTokenProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("list", "stream", "record", "sessions", "user")
+
+
+class OperationStats(BaseModel):
+    """Latency statistics for one operation type."""
+
+    count: int = 0
+    errors: int = 0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class LoadTestResult(BaseModel):
+    """Outcome of a load-test run."""
+
+    operations: int = Field(description="Operations completed, including failures")
+    errors: int = Field(description="Operations that raised")
+    records: int = Field(description="Call records parsed")
+    retries: int = Field(description="Requests retried by GraphClient")
+    duration_seconds: float = Field(description="Wall-clock duration")
+    throughput: float = Field(description="Operations per second")
+    records_per_second: float = Field(description="Parsed records per second")
+    latency: Dict[str, OperationStats] = Field(default_factory=dict)
+    server: Dict[str, int] = Field(default_factory=dict)
+
+    def format_report(self) -> str:
+        """Format the result as a human-readable report."""
+        lines = [
+            f"Operations: {self.operations} ({self.errors} errors)",
+            f"Duration:   {self.duration_seconds:.2f}s",
+            f"Throughput: {self.throughput:.1f} ops/s, "
+            f"{self.records_per_second:.0f} records/s",
+            f"Retries:    {self.retries}",
+            "",
+            f"{'operation':<10} {'count':>7} {'errors':>7} {'p50':>9} "
+            f"{'p90':>9} {'p99':>9} {'max':>9}",
+        ]
+        for name, stats in self.latency.items():
+            lines.append(
+                f"{name:<10} {stats.count:>7} {stats.errors:>7} "
+                f"{stats.p50_ms:>7.1f}ms {stats.p90_ms:>7.1f}ms "
+                f"{stats.p99_ms:>7.1f}ms {stats.max_ms:>7.1f}ms"
+            )
+        if self.server:
+            lines.append("")
+            lines.append(
+                "Server: " + ", ".join(f"{k}={v}" for k, v in self.server.items())
+            )
+        return "\n".join(lines)
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """
+    Get a nearest-rank percentile.
+
+    Args:
+        samples: Sorted samples.
+        fraction: Percentile as a fraction (0-1).
+
+    Returns:
+        The percentile value, or 0.0 for no samples.
+    """
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+
+def run_load_test(
+    base_url: str,
+    concurrency: int = 8,
+    iterations: int = 20,
+    operations: Sequence[str] = OPERATIONS,
+    call_ids: Optional[Sequence[str]] = None,
+    user_ids: Optional[Sequence[str]] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    seed: int = 0,
+) -> LoadTestResult:
+    """
+    Run concurrent workers against a Graph endpoint.
+
+    Each worker owns a GraphClient and CallRecordService and runs every
+    operation in ``operations`` once per iteration.
+
+    Args:
+        base_url: Graph service root.
+        concurrency: Number of worker threads.
+        iterations: Iterations per worker.
+        operations: Operations to run, from OPERATIONS.
+        call_ids: Call IDs used by the record and sessions operations.
+        user_ids: User IDs used by the user operation.
+        start_date: Start of the window for list and stream operations.
+        end_date: End of the window for list and stream operations.
+        seed: Random seed for picking IDs.
+
+    Returns:
+        Aggregated LoadTestResult.
+    """
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = {op: [] for op in operations}
+    errors: Dict[str, int] = {op: 0 for op in operations}
+    totals = {"records": 0, "retries": 0}
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        graph = GraphClient(base_url=base_url, auth_provider=StaticTokenProvider())
+        service = CallRecordService(graph_client=graph)
+
+        def pick(values: Optional[Sequence[str]]) -> str:
+            return rng.choice(values) if values else "unknown"
+
+        def run_record() -> int:
+            service.get_call_record(pick(call_ids))
+            return 1
+
+        def run_sessions() -> int:
+            record = service.get_call_record(pick(call_ids), include_sessions=True)
+            return len(record.sessions)
+
+        def run_user() -> int:
+            graph.get_user(pick(user_ids))
+            return 1
+
+        runners: Dict[str, Callable[[], int]] = {
+            "list": lambda: len(service.get_call_records(start_date, end_date)),
+            "stream": lambda: sum(
+                1 for _ in service.iter_call_records(start_date, end_date)
+            ),
+            "record": run_record,
+            "sessions": run_sessions,
+            "user": run_user,
+        }
+
+        try:
+            for _ in range(iterations):
+                for op in operations:
+                    started = time.perf_counter()
+                    try:
+                        parsed = runners[op]()
+                        failed = False
+                    except (httpx.HTTPError, JSONStreamError) as e:
+                        logger.debug("Operation %s failed: %s", op, e)
+                        parsed = 0
+                        failed = True
+                    elapsed = (time.perf_counter() - started) * 1000
+
+                    with lock:
+                        latencies[op].append(elapsed)
+                        errors[op] += failed
+                        if op in ("list", "stream"):
+                            totals["records"] += parsed
+        finally:
+            with lock:
+                totals["retries"] += graph.retry_count
+            graph.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latency_stats = {}
+    for op, samples in latencies.items():
+        samples.sort()
+        latency_stats[op] = OperationStats(
+            count=len(samples),
+            errors=errors[op],
+            p50_ms=percentile(samples, 0.50),
+            p90_ms=percentile(samples, 0.90),
+            p99_ms=percentile(samples, 0.99),
+            max_ms=samples[-1] if samples else 0.0,
+        )
+
+    total_operations = sum(len(s) for s in latencies.values())
+    return LoadTestResult(
+        operations=total_operations,
+        errors=sum(errors.values()),
+        records=totals["records"],
+        retries=totals["retries"],
+        duration_seconds=duration,
+        throughput=total_operations / duration if duration else 0.0,
+        records_per_second=totals["records"] / duration if duration else 0.0,
+        latency=latency_stats,
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load-test GraphClient and CallRecordService offline",
+    )
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument(
+        "--operations",
+        default=",".join(OPERATIONS),
+        help=f"Comma-separated subset of: {', '.join(OPERATIONS)}",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run a load test against a freshly started FakeGraphServer.
+
+    Args:
+        argv: Command line arguments. Uses sys.argv if None.
+
+    Returns:
+        Exit code (0 for success, 1 if any operation failed).
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    config = FakeGraphConfig(
+        record_count=args.records,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+
+    with FakeGraphServer(config) as server:
+        result = run_load_test(
+            server.url,
+            concurrency=args.concurrency,
+            iterations=args.iterations,
+            operations=[op.strip() for op in args.operations.split(",") if op],
+            call_ids=[r["id"] for r in server.records],
+            user_ids=[u["id"] for u in server.users],
+            start_date=config.start_date,
+            end_date=config.start_date + timedelta(days=config.days),
+            seed=args.seed,
+        )
+        result.server = server.stats
+
+    print(result.format_report())
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
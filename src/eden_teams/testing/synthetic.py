@@ -0,0 +1,541 @@
+"""
+Synthetic Call Detail Record generator.
+
+This module produces seeded, Graph-shaped callRecords (with sessions,
+segments and media-quality streams) following configurable distributions,
+for benchmarks, load tests and the fake Graph server.
+
+Usage:
+    python -m eden_teams.testing.synthetic --count 1000000 --out calls.jsonl
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+_FIRST_NAMES = [
+    "Ada", "Alan", "Amara", "Ben", "Chen", "Diego", "Elena", "Farah", "Grace",
+    "Hiro", "Ines", "Jamal", "Kai", "Lena", "Mateo", "Nadia", "Omar", "Priya",
+    "Quinn", "Rosa", "Sven", "Tara", "Uma", "Victor", "Wei", "Yara", "Zoe",
+]  # fmt: skip
+_LAST_NAMES = [
+    "Adams", "Brown", "Costa", "Dubois", "Evans", "Fischer", "Garcia", "Haddad",
+    "Ito", "Jensen", "Kowalski", "Lopez", "Murphy", "Nakamura", "Okafor",
+    "Patel", "Rossi", "Schmidt", "Tanaka", "Usman", "Varga", "Wong", "Young",
+]  # fmt: skip
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Relative call volume per hour of day (UTC), peaking mid-morning and mid-afternoon
+_DEFAULT_HOURLY_WEIGHTS = [
+    0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 1.0, 2.5, 5.0, 7.5, 8.0, 7.0,
+    5.0, 6.0, 7.5, 7.5, 6.0, 4.0, 2.0, 1.2, 0.8, 0.5, 0.4, 0.3,
+]  # fmt: skip
+
+
+class SyntheticCDRConfig(BaseModel):
+    """Distributions used by the synthetic CDR generator."""
+
+    seed: int = Field(default=0, description="Random seed")
+    user_count: int = Field(default=500, description="Users in the tenant")
+    domain: str = Field(default="contoso.com", description="Tenant mail domain")
+    start_date: datetime = Field(
+        default=datetime(2024, 1, 1), description="Start of the generated range"
+    )
+    days: int = Field(default=7, description="Days spanned by generated calls")
+    call_type_weights: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "peerToPeer": 0.55,
+            "groupCall": 0.15,
+            "meeting": 0.30,
+        },
+        description="Relative frequency of each call type",
+    )
+    organizer_zipf_exponent: float = Field(
+        default=1.1, description="Zipf exponent of organizer popularity"
+    )
+    group_size_alpha: float = Field(
+        default=1.8, description="Pareto shape of group call and meeting sizes"
+    )
+    max_participants: int = Field(default=250, description="Largest call size")
+    hourly_weights: List[float] = Field(
+        default_factory=lambda: list(_DEFAULT_HOURLY_WEIGHTS),
+        description="Relative call volume for each hour of the day",
+    )
+    weekend_factor: float = Field(
+        default=0.15, description="Weekend volume relative to weekdays"
+    )
+    median_duration_seconds: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "peerToPeer": 240.0,
+            "groupCall": 900.0,
+            "meeting": 1800.0,
+        },
+        description="Median call duration per call type",
+    )
+    duration_sigma: float = Field(
+        default=0.9, description="Log-normal sigma of call durations"
+    )
+    packet_loss_mean: float = Field(
+        default=0.01, description="Mean stream packet loss rate"
+    )
+    jitter_median_ms: float = Field(default=8.0, description="Median stream jitter")
+    jitter_sigma: float = Field(default=0.8, description="Log-normal sigma of jitter")
+    round_trip_median_ms: float = Field(default=45.0, description="Median RTT")
+    video_rate: float = Field(default=0.45, description="Share of calls with video")
+    pstn_rate: float = Field(default=0.04, description="Share of PSTN participants")
+    include_sessions: bool = Field(
+        default=True, description="Emit sessions, segments and media streams"
+    )
+    max_sessions_per_call: int = Field(
+        default=16, description="Cap on sessions emitted for one call"
+    )
+
+
+class SyntheticCDRGenerator:
+    """
+    Seeded generator of Graph-shaped call records.
+
+    The tenant directory depends only on the config seed. Records come
+    from an independent random stream selected by ``stream``, so large
+    datasets can be generated in parallel chunks that are identical to a
+    sequential run.
+
+    Example:
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=42))
+        for record in generator.iter_call_records(1000):
+            ...
+    """
+
+    def __init__(
+        self, config: Optional[SyntheticCDRConfig] = None, stream: int = 0
+    ) -> None:
+        """
+        Initialize the generator.
+
+        Args:
+            config: Distributions to sample from. Uses defaults if None.
+            stream: Index of the record stream to draw from.
+        """
+        self.config = config or SyntheticCDRConfig()
+        directory_random = random.Random(self.config.seed)
+        self.users = self._build_users(directory_random)
+        self._identities = [self._identity(u) for u in self.users]
+
+        # Organizer popularity follows a Zipf law over a shuffled user order
+        ranks = list(range(len(self.users)))
+        directory_random.shuffle(ranks)
+        weights = [0.0] * len(self.users)
+        for rank, index in enumerate(ranks, 1):
+            weights[index] = 1.0 / rank**self.config.organizer_zipf_exponent
+        self._organizer_weights = list(itertools.accumulate(weights))
+
+        types = self.config.call_type_weights
+        self._call_types = list(types)
+        self._call_type_weights = list(itertools.accumulate(types.values()))
+
+        self._day_weights = list(
+            itertools.accumulate(
+                (
+                    self.config.weekend_factor
+                    if (self.config.start_date + timedelta(days=d)).weekday() >= 5
+                    else 1.0
+                )
+                for d in range(self.config.days)
+            )
+        )
+        self._hour_weights = list(itertools.accumulate(self.config.hourly_weights))
+        self._jitter_mu = math.log(self.config.jitter_median_ms / 1000)
+        self._rtt_mu = math.log(self.config.round_trip_median_ms / 1000)
+        self._hour_prefixes: Dict[int, str] = {}
+
+        self._random = random.Random(f"{self.config.seed}/{stream}")
+
+    def _build_users(self, rng: random.Random) -> List[Dict[str, Any]]:
+        """Build the tenant directory."""
+        users = []
+        for i in range(self.config.user_count):
+            first = rng.choice(_FIRST_NAMES)
+            last = rng.choice(_LAST_NAMES)
+            upn = f"{first}.{last}{i}@{self.config.domain}".lower()
+            users.append(
+                {
+                    "id": _guid(rng.getrandbits(128)),
+                    "displayName": f"{first} {last}",
+                    "mail": upn,
+                    "userPrincipalName": upn,
+                }
+            )
+        return users
+
+    @staticmethod
+    def _identity(user: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a Graph identitySet for a user."""
+        return {
+            "identity": {
+                "user": {"id": user["id"], "displayName": user["displayName"]},
+                "userPrincipalName": user["userPrincipalName"],
+            }
+        }
+
+    def _pick(self, cum_weights: List[float]) -> int:
+        """Sample an index from cumulative weights."""
+        index = bisect.bisect_right(
+            cum_weights, self._random.random() * cum_weights[-1]
+        )
+        return min(index, len(cum_weights) - 1)
+
+    def _format_time(self, offset: float) -> str:
+        """Format seconds after start_date the way Graph does."""
+        hour, millis = divmod(int(offset * 1000), 3_600_000)
+        prefix = self._hour_prefixes.get(hour)
+        if prefix is None:
+            moment = self.config.start_date + timedelta(hours=hour)
+            prefix = self._hour_prefixes[hour] = moment.strftime("%Y-%m-%dT%H:")
+        minutes, millis = divmod(millis, 60_000)
+        seconds, millis = divmod(millis, 1000)
+        return f"{prefix}{minutes:02d}:{seconds:02d}.{millis:03d}Z"
+
+    def _participants(self, call_type: str, organizer: int) -> List[Dict[str, Any]]:
+        """Sample the participants of a call, organizer first."""
+        rng = self._random
+        user_count = len(self.users)
+        if call_type == "peerToPeer":
+            count = min(2, user_count)
+        else:
+            size = int(3 * rng.paretovariate(self.config.group_size_alpha))
+            count = min(max(size, 3), self.config.max_participants, user_count)
+
+        chosen = {organizer}
+        while len(chosen) < count:
+            chosen.add(int(rng.random() * user_count))
+        chosen.discard(organizer)
+
+        participants = [self._identities[organizer]]
+        pstn_rate = self.config.pstn_rate
+        for index in chosen:
+            if rng.random() < pstn_rate:
+                number = 10**9 + int(rng.random() * 9 * 10**9)
+                participants.append({"identity": {"phone": {"id": f"+1{number}"}}})
+            else:
+                participants.append(self._identities[index])
+        return participants
+
+    def _streams(self, video: bool) -> List[Dict[str, Any]]:
+        """Sample media-quality metrics for both directions of a stream."""
+        rng = self._random
+        loss_mean = self.config.packet_loss_mean
+        jitter_sigma = self.config.jitter_sigma
+        streams = []
+        for direction in ("callerToCallee", "calleeToCaller"):
+            jitter = rng.lognormvariate(self._jitter_mu, jitter_sigma)
+            # Packet loss is mostly near zero with an exponential tail
+            loss = min(1.0, rng.expovariate(1.0 / loss_mean))
+            stream: Dict[str, Any] = {
+                "streamDirection": direction,
+                "averageJitter": f"PT{jitter:.3f}S",
+                "maxJitter": f"PT{jitter * (1.5 + rng.random()):.3f}S",
+                "averagePacketLossRate": round(loss, 4),
+                "maxPacketLossRate": round(min(1.0, loss * (1.5 + rng.random())), 4),
+                "averageRoundTripTime": (
+                    f"PT{rng.lognormvariate(self._rtt_mu, 0.5):.3f}S"
+                ),
+                "averageAudioDegradation": round(loss * 10 + jitter * 10, 3),
+            }
+            if video:
+                stream["averageVideoFrameRate"] = round(30 - loss * 200, 1)
+            streams.append(stream)
+        return streams
+
+    def _session(
+        self,
+        caller: Dict[str, Any],
+        callee: Dict[str, Any],
+        start_text: str,
+        end_text: str,
+        video: bool,
+    ) -> Dict[str, Any]:
+        """Build a session with one segment and its media streams."""
+        media = [{"label": "main-audio", "streams": self._streams(False)}]
+        if video:
+            media.append({"label": "main-video", "streams": self._streams(True)})
+        return {
+            "id": _guid(self._random.getrandbits(128)),
+            "modalities": ["audio", "video"] if video else ["audio"],
+            "startDateTime": start_text,
+            "endDateTime": end_text,
+            "caller": caller,
+            "callee": callee,
+            "segments": [
+                {
+                    "id": _guid(self._random.getrandbits(128)),
+                    "startDateTime": start_text,
+                    "endDateTime": end_text,
+                    "caller": caller,
+                    "callee": callee,
+                    "media": media,
+                }
+            ],
+        }
+
+    def generate_call_record(self) -> Dict[str, Any]:
+        """
+        Generate a single Graph-shaped call record.
+
+        Returns:
+            Call record dictionary in the Graph callRecord shape.
+        """
+        rng = self._random
+        config = self.config
+
+        call_type = self._call_types[self._pick(self._call_type_weights)]
+        organizer = self._pick(self._organizer_weights)
+        participants = self._participants(call_type, organizer)
+
+        start = (
+            self._pick(self._day_weights) * 86400
+            + self._pick(self._hour_weights) * 3600
+            + rng.random() * 3600
+        )
+        median = config.median_duration_seconds.get(call_type, 600)
+        duration = max(5.0, rng.lognormvariate(math.log(median), config.duration_sigma))
+        start_text = self._format_time(start)
+        end_text = self._format_time(start + duration)
+        video = rng.random() < config.video_rate
+        call_id = _guid(rng.getrandbits(128))
+
+        record: Dict[str, Any] = {
+            "id": call_id,
+            "version": 2 if rng.random() < 0.1 else 1,
+            "type": call_type,
+            "modalities": ["audio", "video"] if video else ["audio"],
+            "lastModifiedDateTime": self._format_time(start + duration + 900),
+            "startDateTime": start_text,
+            "endDateTime": end_text,
+            "organizer": participants[0],
+            "participants": participants,
+        }
+        if call_type == "meeting":
+            record["joinWebUrl"] = (
+                f"https://teams.microsoft.com/l/meetup-join/{call_id}"
+            )
+
+        if config.include_sessions:
+            if call_type == "peerToPeer" and len(participants) == 2:
+                pairs = [(participants[0], participants[1])]
+            else:
+                # Each participant joins the conference focus in its own session
+                pairs = [(p, participants[0]) for p in participants]
+            record["sessions"] = [
+                self._session(caller, callee, start_text, end_text, video)
+                for caller, callee in pairs[: config.max_sessions_per_call]
+            ]
+
+        return record
+
+    def iter_call_records(self, count: int) -> Iterator[Dict[str, Any]]:
+        """
+        Generate call records lazily from this generator's stream.
+
+        Args:
+            count: Number of records to generate.
+
+        Yields:
+            Graph-shaped call record dictionaries.
+        """
+        for _ in range(count):
+            yield self.generate_call_record()
+
+    def write_jsonl(
+        self,
+        path: Path,
+        count: int,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Stream records to a JSON Lines file.
+
+        Chunk ``i`` is drawn from record stream ``i``, so the output is the
+        same for any number of workers.
+
+        Args:
+            path: Output file path.
+            count: Number of records to write.
+            workers: Worker processes used to generate chunks.
+            chunk_size: Records per chunk.
+
+        Returns:
+            Number of records written.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with path.open("w", encoding="utf-8") as handle:
+            for lines in self._iter_chunks(count, workers, chunk_size):
+                handle.writelines(lines)
+                written += len(lines)
+        return written
+
+    def write_partitions(
+        self,
+        directory: Path,
+        count: int,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Path]:
+        """
+        Stream records into JSON Lines partitions by start date.
+
+        Files are laid out as ``date=YYYY-MM-DD/part-00000.jsonl``.
+
+        Args:
+            directory: Root directory of the partitioned dataset.
+            count: Number of records to write.
+            workers: Worker processes used to generate chunks.
+            chunk_size: Records per chunk.
+
+        Returns:
+            Paths of the partition files written.
+        """
+        directory = Path(directory)
+        handles: Dict[str, IO[str]] = {}
+        try:
+            for lines in self._iter_chunks(count, workers, chunk_size):
+                for line in lines:
+                    # Lines are compact JSON, so the date can be sliced out
+                    day = line[line.index('"startDateTime":"') + 17 :][:10]
+                    handle = handles.get(day)
+                    if handle is None:
+                        path = directory / f"date={day}" / "part-00000.jsonl"
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        handle = handles[day] = path.open("w", encoding="utf-8")
+                    handle.write(line)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return sorted(Path(h.name) for h in handles.values())
+
+    def _iter_chunks(
+        self, count: int, workers: int, chunk_size: int
+    ) -> Iterator[List[str]]:
+        """Generate encoded record lines chunk by chunk, in chunk order."""
+        tasks = [
+            (self.config, index, min(chunk_size, count - start))
+            for index, start in enumerate(range(0, count, chunk_size))
+        ]
+        if workers <= 1 or len(tasks) <= 1:
+            yield from map(_generate_chunk, tasks)
+            return
+
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            yield from pool.imap(_generate_chunk, tasks)
+
+
+def _generate_chunk(task: Tuple[SyntheticCDRConfig, int, int]) -> List[str]:
+    """Generate one chunk of encoded records from its own stream."""
+    config, stream, count = task
+    generator = SyntheticCDRGenerator(config, stream=stream)
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    return [encode(r) + "\n" for r in generator.iter_call_records(count)]
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Read records back from a JSON Lines file or partitioned directory.
+
+    Args:
+        path: A .jsonl file or a directory written by write_partitions.
+
+    Yields:
+        Call record dictionaries.
+    """
+    path = Path(path)
+    files = sorted(path.glob("date=*/*.jsonl")) if path.is_dir() else [path]
+    for file in files:
+        with file.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _guid(bits: int) -> str:
+    """Format 128 random bits as a GUID string."""
+    h = f"{bits:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate synthetic Teams CDRs")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Write date=YYYY-MM-DD partitions under --out instead of one file",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument(
+        "--no-sessions",
+        action="store_true",
+        help="Omit sessions, segments and media streams",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Generate a synthetic dataset from the command line.
+
+    Args:
+        argv: Command line arguments. Uses sys.argv if None.
+
+    Returns:
+        Exit code.
+    """
+    args = parse_args(argv)
+    generator = SyntheticCDRGenerator(
+        SyntheticCDRConfig(
+            seed=args.seed,
+            user_count=args.users,
+            days=args.days,
+            include_sessions=not args.no_sessions,
+        )
+    )
+
+    started = time.perf_counter()
+    if args.partitioned:
+        files = generator.write_partitions(args.out, args.count, args.workers)
+        target = f"{len(files)} partitions under {args.out}"
+    else:
+        generator.write_jsonl(args.out, args.count, args.workers)
+        target = str(args.out)
+    elapsed = time.perf_counter() - started
+
+    rate = args.count / elapsed * 60 if elapsed else 0.0
+    print(f"Wrote {args.count} records to {target} in {elapsed:.1f}s ({rate:,.0f}/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
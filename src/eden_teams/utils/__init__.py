@@ -4,6 +4,8 @@ Utility modules for Eden Teams.
 This package provides common utilities used throughout the application.
 """
 
+from eden_teams.utils import metrics, tracing
 from eden_teams.utils.logging_config import setup_logging
+from eden_teams.utils.profiling import Profiler
 
-__all__ = ["setup_logging"]
+__all__ = ["Profiler", "metrics", "setup_logging", "tracing"]
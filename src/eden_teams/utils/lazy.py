@@ -0,0 +1,49 @@
+"""
+Lazy package exports.
+
+The packages re-export their main classes, but importing every submodule up
+front would pull in ChromaDB, the Azure SDK and httpx for commands that never
+use them, such as ``eden-teams --help``. lazy_exports builds a module-level
+``__getattr__`` (PEP 562) that imports each export from its submodule on
+first access instead.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the ``__getattr__`` and ``__dir__`` of a package with lazy exports.
+
+    An export is imported once, then cached in the package's namespace.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: The submodule that defines each exported name, by name.
+
+    Returns:
+        The package's ``__getattr__`` and ``__dir__`` functions.
+
+    Example:
+        >>> __getattr__, __dir__ = lazy_exports(
+        ...     __name__, {"GraphClient": "eden_teams.graph.client"}
+        ... )
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
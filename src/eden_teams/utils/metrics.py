@@ -0,0 +1,472 @@
+"""
+Lightweight in-process metrics for Eden Teams.
+
+This module provides latency histograms, counters and gauges, an in-process
+snapshot API and a Prometheus text exposition endpoint. Metrics are disabled
+by default; while disabled every recording call returns immediately, so the
+instrumentation left in hot paths costs a function call and a flag check.
+
+Example:
+    from eden_teams.utils import metrics
+
+    metrics.enable()
+    with metrics.timer("graph_request_seconds", method="GET"):
+        response = client.get(url)
+    metrics.increment("graph_requests_total", status="200")
+    print(metrics.snapshot())
+"""
+
+import logging
+import math
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+NAMESPACE = "eden"
+
+# Histogram values are recorded in integer microseconds. Each power of two is
+# split into 2**SUB_BUCKET_BITS linear sub-buckets, giving ~3% relative error
+# across the whole range (the HDR histogram layout) with sparse storage.
+SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_EXACT_LIMIT = _SUB_BUCKET_COUNT << 1
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+_enabled = False
+
+
+def _bucket_index(value: int) -> int:
+    """Map a non-negative integer to its log-linear bucket."""
+    if value < _EXACT_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Get the largest integer that maps to a bucket."""
+    if index < _EXACT_LIMIT:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    top = index - (shift << SUB_BUCKET_BITS)
+    return ((top + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Latency histogram with bounded relative error.
+
+    Values are seconds; they are stored in sparse microsecond buckets so
+    memory grows with the spread of values rather than the number recorded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            seconds: Observed value in seconds. Negative values count as 0.
+        """
+        seconds = max(seconds, 0.0)
+        index = _bucket_index(int(seconds * 1_000_000))
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Get a percentile.
+
+        Args:
+            fraction: Percentile as a fraction (0-1).
+
+        Returns:
+            Upper bound of the bucket holding the percentile, in seconds,
+            clamped to the observed maximum. 0.0 if nothing was recorded.
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(fraction * self.count))
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= rank:
+                    return min(_bucket_upper(index) / 1_000_000, self.max)
+            return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get count, sum, min, max, mean and summary quantiles."""
+        values: Dict[str, float] = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else 0.0,
+        }
+        for quantile in SUMMARY_QUANTILES:
+            values[f"p{quantile * 100:g}"] = self.percentile(quantile)
+        return values
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self) -> None:
+        """Initialize the counter at zero."""
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    def __init__(self) -> None:
+        """Initialize the gauge at zero."""
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """Named, labelled metric families."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._families: Dict[str, Tuple[str, Dict[LabelKey, Any]]] = {}
+
+    def _get(self, kind: str, name: str, labels: Dict[str, Any]) -> Any:
+        """Get or create a metric of the given kind."""
+        key: LabelKey = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        family = self._families.get(name)
+        if family is None or family[0] != kind or key not in family[1]:
+            with self._lock:
+                family = self._families.setdefault(name, (kind, {}))
+                if family[0] != kind:
+                    raise ValueError(f"Metric {name} is a {family[0]}, not a {kind}")
+                if key not in family[1]:
+                    family[1][key] = {
+                        "histogram": Histogram,
+                        "counter": Counter,
+                        "gauge": Gauge,
+                    }[kind]()
+        return family[1][key]
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        """Get or create a histogram."""
+        return cast(Histogram, self._get("histogram", name, labels))
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        """Get or create a counter."""
+        return cast(Counter, self._get("counter", name, labels))
+
+    def gauge(self, name: str, **labels: Any) -> Gauge:
+        """Get or create a gauge."""
+        return cast(Gauge, self._get("gauge", name, labels))
+
+    def reset(self) -> None:
+        """Drop all metrics."""
+        with self._lock:
+            self._families.clear()
+
+    def _items(self) -> Iterator[Tuple[str, str, LabelKey, Any]]:
+        """Iterate over (name, kind, labels, metric) in name order."""
+        with self._lock:
+            families = sorted(
+                (name, kind, list(metrics.items()))
+                for name, (kind, metrics) in self._families.items()
+            )
+        for name, kind, metrics in families:
+            for key, metric in metrics:
+                yield name, kind, key, metric
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the current value of every metric.
+
+        Returns:
+            Mapping of metric name to a list of ``{"labels": ..., ...}``
+            entries. Histograms carry count, sum, min, max, mean and
+            p50/p90/p99 (seconds); counters and gauges carry ``value``.
+        """
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for name, kind, key, metric in self._items():
+            entry: Dict[str, Any] = {"labels": dict(key)}
+            if kind == "histogram":
+                entry.update(metric.snapshot())
+            else:
+                entry["value"] = metric.value
+            result.setdefault(name, []).append(entry)
+        return result
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Histograms are exposed as summaries with p50/p90/p99 quantiles.
+
+        Returns:
+            Exposition text.
+        """
+        lines: List[str] = []
+        declared = set()
+        for name, kind, key, metric in self._items():
+            full_name = f"{NAMESPACE}_{name}"
+            if name not in declared:
+                declared.add(name)
+                exposed = "summary" if kind == "histogram" else kind
+                lines.append(f"# TYPE {full_name} {exposed}")
+
+            if kind == "histogram":
+                for quantile in SUMMARY_QUANTILES:
+                    labels = _format_labels(key + (("quantile", f"{quantile:g}"),))
+                    lines.append(
+                        f"{full_name}{labels} {metric.percentile(quantile):.6g}"
+                    )
+                labels = _format_labels(key)
+                lines.append(f"{full_name}_sum{labels} {metric.sum:.6g}")
+                lines.append(f"{full_name}_count{labels} {metric.count}")
+            else:
+                lines.append(f"{full_name}{_format_labels(key)} {metric.value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: LabelKey) -> str:
+    """Format a label set as ``{a="1",b="2"}``."""
+    if not key:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in key
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+registry = MetricsRegistry()
+
+
+def enable() -> None:
+    """Start recording metrics."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording metrics. Recorded values are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if metrics are being recorded."""
+    return _enabled
+
+
+class _Timer:
+    """Context manager recording its duration into a histogram."""
+
+    __slots__ = ("_name", "_labels", "_started")
+
+    def __init__(self, name: str, labels: Dict[str, Any]) -> None:
+        """Initialize the timer for a histogram."""
+        self._name = name
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        """Start timing."""
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Record the elapsed time."""
+        registry.histogram(self._name, **self._labels).record(
+            time.perf_counter() - self._started
+        )
+
+
+class _NullTimer:
+    """Context manager that does nothing, used while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Do nothing."""
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, **labels: Any) -> Any:
+    """
+    Time a block into a latency histogram.
+
+    Args:
+        name: Histogram name, e.g. "graph_request_seconds".
+        **labels: Label values.
+
+    Returns:
+        A context manager.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name: str, **labels: Any) -> Callable[[F], F]:
+    """
+    Decorate a function to time each call into a latency histogram.
+
+    Args:
+        name: Histogram name.
+        **labels: Label values.
+
+    Returns:
+        Decorator.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(name, labels):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """Record a value into a latency histogram."""
+    if _enabled:
+        registry.histogram(name, **labels).record(seconds)
+
+
+def increment(name: str, amount: float = 1.0, **labels: Any) -> None:
+    """Increase a counter."""
+    if _enabled:
+        registry.counter(name, **labels).inc(amount)
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    """Set a gauge."""
+    if _enabled:
+        registry.gauge(name, **labels).set(value)
+
+
+def adjust_gauge(name: str, amount: float, **labels: Any) -> None:
+    """Increase or decrease a gauge."""
+    if _enabled:
+        registry.gauge(name, **labels).inc(amount)
+
+
+def snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    """Get the current value of every metric in the default registry."""
+    return registry.snapshot()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the default registry at /metrics."""
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        """Handle a scrape request."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Route access logs to the module logger."""
+        logger.debug("metrics %s", format % args)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the default registry on a background thread.
+
+    Args:
+        port: TCP port. Use 0 to pick a free port.
+        host: Interface to bind. Defaults to loopback only.
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="eden-metrics", daemon=True
+    )
+    thread.start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, server.server_port)
+    return server
+
+
+def configure(
+    enabled: bool, port: Optional[int] = None
+) -> Optional[ThreadingHTTPServer]:
+    """
+    Configure metrics from application settings.
+
+    Args:
+        enabled: Whether to record metrics.
+        port: Port for the /metrics endpoint. Not served if None or 0.
+
+    Returns:
+        The metrics server if one was started.
+    """
+    if not enabled:
+        disable()
+        return None
+    enable()
+    if port:
+        return start_metrics_server(port)
+    return None
@@ -0,0 +1,340 @@
+"""
+In-process profiling for Eden Teams.
+
+This module profiles named pipeline phases (Graph fetch, parse, summarize,
+context build, LLM call) with cProfile, a sampling profiler and tracemalloc,
+and writes the results as pstats files, flamegraph-compatible collapsed
+stacks and a plain-text report. No external tools are required.
+"""
+
+import cProfile
+import logging
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterator, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+ProfilerMode = Literal["cprofile", "sample", "all"]
+
+# Allocation sites in these files are profiler overhead, not application work
+_IGNORED_FILES = (tracemalloc.__file__, __file__)
+
+
+class Allocation(BaseModel):
+    """Memory allocated by one source line during a phase and still alive."""
+
+    location: str = Field(description="Source file and line number")
+    size_bytes: int = Field(description="Retained bytes")
+    blocks: int = Field(description="Retained memory blocks")
+
+
+class PhaseStats(BaseModel):
+    """Timing and memory statistics for one profiled phase."""
+
+    name: str
+    calls: int = 0
+    wall_seconds: float = 0.0
+    samples: int = 0
+    retained_bytes: int = 0
+    peak_bytes: int = 0
+    top_allocations: List[Allocation] = Field(default_factory=list)
+
+
+class Profiler:
+    """
+    Profile named phases of a pipeline.
+
+    Example:
+        profiler = Profiler()
+        with profiler:
+            with profiler.phase("parse"):
+                parse()
+        profiler.write("profile-output")
+    """
+
+    def __init__(
+        self,
+        mode: ProfilerMode = "all",
+        sample_interval: float = 0.001,
+        trace_memory: bool = True,
+        top_allocations: int = 10,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            mode: Which CPU profiler to run: cProfile, sampling or both.
+            sample_interval: Seconds between stack samples.
+            trace_memory: Whether to trace allocations with tracemalloc.
+            top_allocations: Allocation sites to keep per phase.
+        """
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self.top_allocations = top_allocations
+        self.phases: Dict[str, PhaseStats] = {}
+        self.stacks: Counter = Counter()
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._current: Optional[str] = None
+        self._target_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._started_tracemalloc = False
+        self._frame_names: Dict[CodeType, str] = {}
+
+    @property
+    def uses_cprofile(self) -> bool:
+        """Check if cProfile is enabled for phases."""
+        return self.mode in ("cprofile", "all")
+
+    @property
+    def uses_sampling(self) -> bool:
+        """Check if the sampling profiler is enabled."""
+        return self.mode in ("sample", "all")
+
+    def start(self) -> None:
+        """Start the sampler and memory tracing for the calling thread."""
+        self._target_thread = threading.get_ident()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.uses_sampling:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="eden-profiler", daemon=True
+            )
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop the sampler and memory tracing."""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        """Start profiling."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop profiling."""
+        self.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """
+        Profile a named phase.
+
+        Entering the same phase name again accumulates into its statistics.
+
+        Args:
+            name: Phase name, e.g. "graph fetch".
+
+        Yields:
+            The PhaseStats being accumulated.
+
+        Raises:
+            RuntimeError: If another phase is already active.
+        """
+        if self._current is not None:
+            raise RuntimeError(
+                f"Cannot start phase '{name}' inside phase '{self._current}'"
+            )
+
+        stats = self.phases.setdefault(name, PhaseStats(name=name))
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # Only this phase's allocations are traced, which keeps the
+            # end-of-phase snapshot small and makes it a retained-memory view
+            tracemalloc.clear_traces()
+
+        profile = None
+        if self.uses_cprofile:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+
+        self._current = name
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield stats
+        finally:
+            if profile is not None:
+                profile.disable()
+            stats.wall_seconds += time.perf_counter() - started
+            stats.calls += 1
+            self._current = None
+
+            if tracing:
+                stats.peak_bytes = max(
+                    stats.peak_bytes, tracemalloc.get_traced_memory()[1]
+                )
+                snapshot = tracemalloc.take_snapshot()
+                self._record_allocations(stats, snapshot.statistics("lineno"))
+
+    def _record_allocations(
+        self, stats: PhaseStats, statistics: List[tracemalloc.Statistic]
+    ) -> None:
+        """Merge allocations still alive at the end of a phase into its report."""
+        merged = {a.location: a for a in stats.top_allocations}
+        for statistic in statistics:
+            frame = statistic.traceback[0]
+            if frame.filename in _IGNORED_FILES:
+                continue
+            stats.retained_bytes += statistic.size
+            location = f"{frame.filename}:{frame.lineno}"
+            existing = merged.get(location)
+            if existing is None:
+                merged[location] = Allocation(
+                    location=location,
+                    size_bytes=statistic.size,
+                    blocks=statistic.count,
+                )
+            else:
+                existing.size_bytes += statistic.size
+                existing.blocks += statistic.count
+
+        stats.top_allocations = sorted(
+            merged.values(), key=lambda a: a.size_bytes, reverse=True
+        )[: self.top_allocations]
+
+    def _sample_loop(self) -> None:
+        """Record the target thread's stack every sample interval."""
+        while not self._stop_sampling.wait(self.sample_interval):
+            phase = self._current
+            if phase is None:
+                continue
+            frame = sys._current_frames().get(self._target_thread or 0)
+            if frame is None:
+                continue
+            self.stacks[self._collapse(phase, frame)] += 1
+            self.phases[phase].samples += 1
+
+    def _collapse(self, phase: str, frame: Optional[FrameType]) -> str:
+        """Format a stack root-first in collapsed flamegraph format."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            name = self._frame_names.get(code)
+            if name is None:
+                module = frame.f_globals.get("__name__", "?")
+                name = f"{module}:{code.co_qualname}".replace(";", ":")
+                self._frame_names[code] = name
+            names.append(name)
+            frame = frame.f_back
+        names.append(phase)
+        names.reverse()
+        return ";".join(names)
+
+    def write(self, output_dir: Union[str, Path]) -> List[Path]:
+        """
+        Write profiling results to a directory.
+
+        Produces ``profile.pstats`` (all phases) and ``<phase>.pstats`` per
+        phase when cProfile is enabled, ``stacks.collapsed`` when sampling is
+        enabled, and ``report.txt`` with phase timings and top allocations.
+
+        Args:
+            output_dir: Directory to write into. Created if missing.
+
+        Returns:
+            Paths of the files written.
+        """
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+
+        profiles = [(name, p) for name, p in self._profiles.items() if p.getstats()]
+        if profiles:
+            combined = pstats.Stats(profiles[0][1])
+            for _, profile in profiles[1:]:
+                combined.add(profile)
+            path = directory / "profile.pstats"
+            combined.dump_stats(path)
+            written.append(path)
+            for name, profile in profiles:
+                path = directory / f"{_slug(name)}.pstats"
+                profile.dump_stats(path)
+                written.append(path)
+
+        if self.uses_sampling:
+            path = directory / "stacks.collapsed"
+            path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self.stacks.items()),
+                encoding="utf-8",
+            )
+            written.append(path)
+
+        path = directory / "report.txt"
+        path.write_text(self.format_report(allocations=True) + "\n", encoding="utf-8")
+        written.append(path)
+
+        logger.info("Wrote %d profile files to %s", len(written), directory)
+        return written
+
+    def format_report(self, allocations: bool = False) -> str:
+        """
+        Format phase statistics as a human-readable table.
+
+        Args:
+            allocations: Whether to list top allocation sites per phase.
+
+        Returns:
+            Report text.
+        """
+        total = sum(s.wall_seconds for s in self.phases.values()) or 1.0
+        lines = [
+            f"{'phase':<16} {'calls':>5} {'wall':>10} {'share':>6} "
+            f"{'samples':>8} {'peak mem':>10} {'retained':>10}"
+        ]
+        for stats in self.phases.values():
+            lines.append(
+                f"{stats.name:<16} {stats.calls:>5} "
+                f"{stats.wall_seconds * 1000:>8.1f}ms "
+                f"{stats.wall_seconds / total:>6.0%} {stats.samples:>8} "
+                f"{_format_bytes(stats.peak_bytes):>10} "
+                f"{_format_bytes(stats.retained_bytes):>10}"
+            )
+
+        if allocations:
+            for stats in self.phases.values():
+                if not stats.top_allocations:
+                    continue
+                lines.append("")
+                lines.append(f"Top allocations: {stats.name}")
+                for allocation in stats.top_allocations:
+                    lines.append(
+                        f"  {_format_bytes(allocation.size_bytes):>10} "
+                        f"{allocation.blocks:>8} blocks  {allocation.location}"
+                    )
+        return "\n".join(lines)
+
+
+def _slug(name: str) -> str:
+    """Convert a phase name into a file-name-safe slug."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "phase"
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count with a binary unit."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
@@ -0,0 +1,429 @@
+"""
+Request tracing for Eden Teams.
+
+This module provides OpenTelemetry-shaped spans propagated through a
+context variable, so one assistant query can be followed through Graph
+paging, parsing, context building and the LLM call. Spans carry 128-bit
+trace IDs, 64-bit span IDs and OTLP field names, so exported JSON can be
+loaded by OTLP tooling.
+
+Tracing is disabled by default: until an exporter is configured, span()
+returns a shared no-op span and nothing is allocated or recorded.
+
+Example:
+    from eden_teams.utils import tracing
+
+    tracing.configure("console")
+    with tracing.span("graph.request", endpoint="/users") as span:
+        response = send()
+        span.set_attribute("http.status_code", response.status_code)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+STATUS_UNSET = "STATUS_CODE_UNSET"
+STATUS_OK = "STATUS_CODE_OK"
+STATUS_ERROR = "STATUS_CODE_ERROR"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "eden_current_span", default=None
+)
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Spans are context managers: entering makes the span current for the
+    calling context, exiting ends it, records any exception and exports it.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "start_time_ns",
+        "end_time_ns",
+        "attributes",
+        "events",
+        "status",
+        "status_message",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Initialize a span.
+
+        Args:
+            name: Operation name, e.g. "graph.request".
+            parent: Parent span. Starts a new trace if None.
+            attributes: Initial attributes.
+        """
+        self.name = name
+        self.trace_id: str = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id: str = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self._token: Optional[Token] = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Check if the span records data."""
+        return True
+
+    @property
+    def duration_ms(self) -> float:
+        """Get the span duration in milliseconds (so far, if still open)."""
+        end = self.end_time_ns or time.time_ns()
+        return (end - self.start_time_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Set several attributes."""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        """Record a timestamped event."""
+        self.events.append(
+            {"name": name, "timeUnixNano": time.time_ns(), "attributes": attributes}
+        )
+
+    def set_status(self, status: str, message: str = "") -> None:
+        """Set the span status (STATUS_OK or STATUS_ERROR)."""
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Record an exception event and mark the span as failed."""
+        self.add_event(
+            "exception",
+            **{"exception.type": type(exc).__name__, "exception.message": str(exc)},
+        )
+        self.set_status(STATUS_ERROR, str(exc))
+
+    def end(self) -> None:
+        """End the span and hand it to the exporter."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        exporter = _exporter
+        if exporter is not None:
+            try:
+                exporter.export(self)
+            except Exception:  # noqa: BLE001 - tracing must never break requests
+                logger.exception("Failed to export span %s", self.name)
+
+    def __enter__(self) -> "Span":
+        """Make the span current."""
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """End the span, recording an exception if one was raised."""
+        if exc_val is not None:
+            self.record_exception(exc_val)
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to an OTLP/JSON-shaped dictionary."""
+        data: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_time_ns,
+            "endTimeUnixNano": self.end_time_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        if self.events:
+            data["events"] = self.events
+        return data
+
+
+class _NoopSpan:
+    """Span stand-in used while tracing is disabled."""
+
+    __slots__ = ()
+
+    is_recording = False
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Do nothing."""
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Do nothing."""
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        """Do nothing."""
+
+    def set_status(self, status: str, message: str = "") -> None:
+        """Do nothing."""
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Do nothing."""
+
+    def end(self) -> None:
+        """Do nothing."""
+
+    def __enter__(self) -> "_NoopSpan":
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Do nothing."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """Base class for span exporters."""
+
+    def export(self, span: Span) -> None:
+        """Export a finished span."""
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """Flush and release resources."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep finished spans in a list, mainly for tests."""
+
+    def __init__(self) -> None:
+        """Initialize the exporter."""
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        """Store a finished span."""
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        """Drop stored spans."""
+        self.spans.clear()
+
+
+class JsonSpanExporter(SpanExporter):
+    """Write each finished span as one JSON line."""
+
+    def __init__(self, stream: Optional[IO[str]] = None, path: str = "") -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            stream: Text stream to write to. Defaults to stderr.
+            path: File to append to instead of a stream.
+        """
+        self._owns_stream = bool(path)
+        self._stream = open(path, "a", encoding="utf-8") if path else stream
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write a finished span."""
+        line = json.dumps(span.to_dict(), default=str)
+        stream = self._stream or sys.stderr
+        with self._lock:
+            stream.write(line + "\n")
+            stream.flush()
+
+    def shutdown(self) -> None:
+        """Close the output file if the exporter opened it."""
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Print each finished trace as an indented tree of spans."""
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            stream: Text stream to write to. Defaults to stderr.
+        """
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Span]] = {}
+
+    def export(self, span: Span) -> None:
+        """Buffer a span and print its trace once the root span ends."""
+        with self._lock:
+            spans = self._pending.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_span_id is not None:
+                return
+            del self._pending[span.trace_id]
+
+        text = self.format_trace(spans)
+        stream = self._stream or sys.stderr
+        with self._lock:
+            stream.write(text + "\n")
+            stream.flush()
+
+    @staticmethod
+    def format_trace(spans: List[Span]) -> str:
+        """
+        Format the spans of one trace as a tree.
+
+        Args:
+            spans: Finished spans belonging to one trace.
+
+        Returns:
+            One line per span, children indented under their parents.
+        """
+        children: Dict[Optional[str], List[Span]] = {}
+        for item in spans:
+            children.setdefault(item.parent_span_id, []).append(item)
+
+        lines = [f"trace {spans[0].trace_id}"]
+
+        def walk(parent_id: Optional[str], depth: int) -> None:
+            for item in sorted(
+                children.get(parent_id, []), key=lambda s: s.start_time_ns
+            ):
+                attributes = " ".join(f"{k}={v}" for k, v in item.attributes.items())
+                failed = " ERROR" if item.status == STATUS_ERROR else ""
+                lines.append(
+                    f"{'  ' * depth}{item.name} {item.duration_ms:.1f}ms"
+                    f"{failed} {attributes}".rstrip()
+                )
+                walk(item.span_id, depth + 1)
+
+        walk(None, 1)
+        return "\n".join(lines)
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """
+    Install a span exporter, enabling tracing. None disables tracing.
+
+    Args:
+        exporter: Exporter receiving finished spans.
+    """
+    global _exporter
+    previous = _exporter
+    _exporter = exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+
+
+def configure(
+    exporter: Union[str, SpanExporter, None], path: str = ""
+) -> Optional[SpanExporter]:
+    """
+    Configure tracing from application settings.
+
+    Args:
+        exporter: "console", "json", "none", an exporter instance or None.
+        path: File for the JSON exporter. Writes to stderr if empty.
+
+    Returns:
+        The installed exporter, or None if tracing is disabled.
+
+    Raises:
+        ValueError: If the exporter name is unknown.
+    """
+    if isinstance(exporter, SpanExporter):
+        instance: Optional[SpanExporter] = exporter
+    elif exporter in (None, "", "none"):
+        instance = None
+    elif exporter == "console":
+        instance = ConsoleSpanExporter()
+    elif exporter == "json":
+        instance = JsonSpanExporter(path=path)
+    else:
+        raise ValueError(f"Unknown tracing exporter: {exporter}")
+
+    set_exporter(instance)
+    return instance
+
+
+def is_enabled() -> bool:
+    """Check if tracing is enabled."""
+    return _exporter is not None
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """Get the active span, or the no-op span if there is none."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def span(name: str, **attributes: Any) -> Union[Span, _NoopSpan]:
+    """
+    Start a span as a child of the current span.
+
+    Args:
+        name: Operation name.
+        **attributes: Initial attributes.
+
+    Returns:
+        A span to use as a context manager; the no-op span while disabled.
+    """
+    if _exporter is None:
+        return NOOP_SPAN
+    return Span(name, parent=_current_span.get(), attributes=attributes)
+
+
+def traced(name: str, **attributes: Any) -> Callable[[F], F]:
+    """
+    Decorate a function to run inside a span.
+
+    Args:
+        name: Operation name.
+        **attributes: Initial attributes.
+
+    Returns:
+        Decorator.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _exporter is None:
+                return func(*args, **kwargs)
+            with Span(name, parent=_current_span.get(), attributes=attributes):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
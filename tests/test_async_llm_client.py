@@ -0,0 +1,170 @@
+"""
+Tests for the async LLM client.
+"""
+
+from typing import List
+from unittest.mock import patch
+
+import openai
+import pytest
+
+from eden_teams.models.async_llm_client import (
+    AsyncLLMClient,
+    RateLimiter,
+    parse_duration,
+    retry_after,
+)
+from eden_teams.testing.llm_server import FakeLLMConfig, FakeLLMServer
+
+
+class FakeTime:
+    """Clock and sleep that advance virtual time instantly."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def clock(self) -> float:
+        """Get the virtual time."""
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        """Advance the virtual time."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _client(server: FakeLLMServer, **kwargs: int) -> AsyncLLMClient:
+    """Create an AsyncLLMClient pointed at the fake server."""
+    with patch("eden_teams.models.async_llm_client.settings") as mock_settings:
+        mock_settings.openai_api_key = "test-key"
+        mock_settings.openai_base_url = server.base_url
+        mock_settings.llm_max_concurrency = 8
+        mock_settings.llm_requests_per_minute = 0
+        mock_settings.llm_tokens_per_minute = 0
+        mock_settings.llm_max_retries = 3
+        client = AsyncLLMClient(model="gpt-4", use_azure=False, **kwargs)
+        client._get_client()
+    return client
+
+
+class TestRetryHeaders:
+    """Tests for rate-limit header parsing."""
+
+    def test_parse_duration(self) -> None:
+        """Test the duration formats used by x-ratelimit-reset headers."""
+        assert parse_duration("1s") == 1.0
+        assert parse_duration("6m0s") == 360.0
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("1.5s") == 1.5
+        assert parse_duration("soon") is None
+
+    def test_retry_after_precedence(self) -> None:
+        """Test that explicit retry-after headers win over reset headers."""
+        assert retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+        assert retry_after({"retry-after": "2"}) == 2.0
+        assert (
+            retry_after(
+                {"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "3s"}
+            )
+            == 3.0
+        )
+        assert retry_after({}) is None
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter class."""
+
+    async def test_request_budget(self) -> None:
+        """Test that requests beyond the per-minute budget wait for refill."""
+        fake = FakeTime()
+        limiter = RateLimiter(
+            requests_per_minute=60, clock=fake.clock, sleep=fake.sleep
+        )
+
+        for _ in range(60):
+            assert await limiter.acquire() == 0.0
+        waited = await limiter.acquire()
+
+        assert waited == pytest.approx(1.0)
+
+    async def test_token_budget_and_adjust(self) -> None:
+        """Test that token charges are corrected with actual usage."""
+        fake = FakeTime()
+        limiter = RateLimiter(tokens_per_minute=600, clock=fake.clock, sleep=fake.sleep)
+
+        await limiter.acquire(500)
+        limiter.adjust(500, 100)
+
+        assert await limiter.acquire(500) == 0.0
+        # 0 tokens left; 300 more refill in 30 seconds
+        assert await limiter.acquire(300) == pytest.approx(30.0)
+
+    async def test_pause_holds_callers(self) -> None:
+        """Test that a pause delays the next acquire."""
+        fake = FakeTime()
+        limiter = RateLimiter(clock=fake.clock, sleep=fake.sleep)
+
+        limiter.pause(2.5)
+
+        assert await limiter.acquire() == pytest.approx(2.5)
+
+
+class TestAsyncLLMClient:
+    """Tests for AsyncLLMClient class."""
+
+    async def test_chat(self) -> None:
+        """Test a completion through the async SDK."""
+        with FakeLLMServer(FakeLLMConfig(reply="Five calls.")) as server:
+            async with _client(server) as client:
+                answer = await client.chat("How many calls?", context="data")
+
+        assert answer == "Five calls."
+        assert (
+            "Call Record Data:\ndata" in server.requests[0]["messages"][-1]["content"]
+        )
+
+    async def test_throttled_requests_are_retried(self) -> None:
+        """Test that 429 responses are retried after the advertised wait."""
+        config = FakeLLMConfig(rate_limited_requests=2, retry_after_ms=20)
+        with FakeLLMServer(config) as server:
+            async with _client(server) as client:
+                answer = await client.chat("How many calls?")
+
+        assert answer == config.reply
+        assert client.retry_count == 2
+        assert server.throttled == 2
+        assert len(server.requests) == 1
+
+    async def test_retries_are_bounded(self) -> None:
+        """Test that the error is raised once retries are exhausted."""
+        config = FakeLLMConfig(rate_limited_requests=5, retry_after_ms=1)
+        with FakeLLMServer(config) as server:
+            async with _client(server, max_retries=1) as client:
+                with pytest.raises(openai.RateLimitError):
+                    await client.chat("How many calls?")
+
+        assert server.throttled == 2
+
+    async def test_map_bounds_concurrency(self) -> None:
+        """Test that map runs prompts concurrently, at most max_concurrency."""
+        config = FakeLLMConfig(reply="ok", first_token_ms=50)
+        with FakeLLMServer(config) as server:
+            async with _client(server, max_concurrency=3) as client:
+                answers = await client.map([f"user{i}" for i in range(9)])
+
+        assert answers == ["ok"] * 9
+        assert server.max_in_flight == 3
+        asked = sorted(r["messages"][-1]["content"] for r in server.requests)
+        assert asked == [f"user{i}" for i in range(9)]
+
+    async def test_map_can_return_exceptions(self) -> None:
+        """Test that failures can be returned in place of answers."""
+        config = FakeLLMConfig(rate_limited_requests=1, retry_after_ms=1)
+        with FakeLLMServer(config) as server:
+            async with _client(server, max_retries=0, max_concurrency=1) as client:
+                answers = await client.map(["a", "b"], return_exceptions=True)
+
+        assert isinstance(answers[0], openai.RateLimitError)
+        assert answers[1] == config.reply
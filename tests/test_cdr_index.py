@@ -0,0 +1,161 @@
+"""
+Tests for the call index.
+"""
+
+from datetime import datetime, timedelta
+
+from eden_teams.cdr.index import CallIndex, CallRow
+from eden_teams.cdr.models import (
+    CallQuality,
+    CallRecord,
+    CallSession,
+    CallType,
+    Participant,
+)
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.testing.synthetic import SyntheticCDRConfig, SyntheticCDRGenerator
+
+START = datetime(2024, 1, 15, 9, 0, 0)
+ALICE = Participant(email="alice@company.com", display_name="Alice")
+BOB = Participant(email="bob@company.com", display_name="Bob")
+CAROL = Participant(email="carol@company.com", display_name="Carol")
+
+
+def _call(
+    call_id: str,
+    minutes: int,
+    length: int,
+    participants: list,
+    call_type: CallType = CallType.PEER_TO_PEER,
+    packet_loss: float = 0.0,
+) -> CallRecord:
+    """Create a call starting the given number of minutes after START."""
+    start = START + timedelta(minutes=minutes)
+    return CallRecord(
+        id=call_id,
+        call_type=call_type,
+        start_time=start,
+        end_time=start + timedelta(minutes=length),
+        organizer=participants[0],
+        participants=participants,
+        sessions=[
+            CallSession(
+                id=f"{call_id}-s",
+                quality=CallQuality(average_packet_loss_rate=packet_loss),
+            )
+        ],
+    )
+
+
+def _index() -> CallIndex:
+    """Build an index over a small set of overlapping calls."""
+    return CallIndex.from_records(
+        [
+            _call("1", 0, 30, [ALICE, BOB]),
+            _call("2", 10, 15, [CAROL, ALICE], packet_loss=0.1),
+            _call("3", 20, 60, [ALICE, BOB, CAROL], CallType.MEETING),
+            _call("4", 24 * 60, 5, [CAROL, ALICE]),
+        ]
+    )
+
+
+class TestCallIndex:
+    """Tests for CallIndex class."""
+
+    def test_summary_matches_service(self) -> None:
+        """Test that the index summary agrees with get_call_summary."""
+        service = CallRecordService.__new__(CallRecordService)
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=5))
+        records = service.parse_call_records(list(generator.iter_call_records(150)))
+
+        assert CallIndex.from_records(records).summary() == service.get_call_summary(
+            records
+        )
+
+    def test_select_filters(self) -> None:
+        """Test filtering by date range, call type and user."""
+        index = _index()
+
+        assert [r.id for r in index.select(user="CAROL@company.com")] == [
+            "2",
+            "3",
+            "4",
+        ]
+        assert [r.id for r in index.select(end=START + timedelta(days=1))] == [
+            "1",
+            "2",
+            "3",
+        ]
+        assert [
+            r.id for r in index.select(start=START + timedelta(minutes=5), user="Bob")
+        ] == ["3"]
+        assert [r.id for r in index.select(call_type="meeting")] == ["3"]
+        assert index.select(user="nobody") == []
+
+    def test_user_calls(self) -> None:
+        """Test one user's totals and most recent calls."""
+        result = _index().user_calls("alice@company.com", limit=2)
+
+        assert result["total_calls"] == 4
+        assert result["organized"] == 2
+        assert result["total_duration_formatted"] == "1h 50m 0s"
+        assert [c["id"] for c in result["recent_calls"]] == ["4", "3"]
+
+    def test_top_callers(self) -> None:
+        """Test ranking participants by calls and by duration."""
+        index = _index()
+
+        by_calls = index.top_callers(k=1)
+        by_duration = index.top_callers(k=3, by="duration")
+
+        assert by_calls == [
+            {"user": "alice@company.com", "calls": 4, "total_duration": "1h 50m 0s"}
+        ]
+        assert [c["user"] for c in by_duration] == [
+            "alice@company.com",
+            "bob@company.com",
+            "carol@company.com",
+        ]
+
+    def test_quality_stats(self) -> None:
+        """Test aggregating packet loss and poor-quality calls."""
+        stats = _index().quality_stats(worst=1)
+
+        assert stats["calls_with_quality_data"] == 4
+        assert stats["poor_quality_calls"] == 1
+        assert stats["average_packet_loss_rate"] == 0.025
+        assert stats["worst_calls"][0]["id"] == "2"
+
+    def test_quality_stats_without_sessions(self) -> None:
+        """Test that calls listed without sessions report no quality data."""
+        record = _call("1", 0, 30, [ALICE, BOB])
+        record.sessions = []
+        stats = CallIndex.from_records([record]).quality_stats()
+
+        assert stats["calls_with_quality_data"] == 0
+        assert "not loaded" in stats["note"]
+        assert "average_packet_loss_rate" not in stats
+
+    def test_peak_concurrency(self) -> None:
+        """Test finding the most calls in progress at once."""
+        result = _index().peak_concurrency()
+
+        assert result["peak_concurrent_calls"] == 3
+        assert result["peak_at"] == (START + timedelta(minutes=20)).isoformat()
+        assert result["busiest_hours"][0] == {"hour": 9, "calls": 4}
+
+    def test_back_to_back_calls_do_not_overlap(self) -> None:
+        """Test that a call ending as another starts is not concurrent."""
+        index = CallIndex.from_records(
+            [_call("1", 0, 10, [ALICE]), _call("2", 10, 10, [ALICE])]
+        )
+        assert index.peak_concurrency()["peak_concurrent_calls"] == 1
+
+    def test_row_without_quality(self) -> None:
+        """Test rows for records fetched without sessions."""
+        row = CallRow.from_record(
+            CallRecord(id="x", start_time=START, participants=[ALICE])
+        )
+        assert row.packet_loss is None
+        assert row.poor_quality is False
+        assert row.aliases == frozenset({"alice@company.com", "alice"})
@@ -2,7 +2,10 @@
 Tests for CDR service.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
 
 from eden_teams.cdr.models import CallRecord, CallType
 from eden_teams.cdr.service import CallRecordService
@@ -74,3 +77,73 @@ class TestCallRecordService:
         assert summary["total_duration_seconds"] == 5400  # 30min + 60min
         assert summary["call_types"]["peerToPeer"] == 1
         assert summary["call_types"]["meeting"] == 1
+
+    def test_iter_call_records(self, mock_graph_response: list) -> None:
+        """Test streaming call records through the parser."""
+        graph = MagicMock()
+        graph.iter_call_records.return_value = iter(mock_graph_response)
+        service = CallRecordService(graph_client=graph)
+
+        records = list(service.iter_call_records(limit=10))
+
+        assert [r.id for r in records] == ["call-1", "call-2"]
+        assert records[1].call_type == CallType.GROUP_CALL
+        assert graph.iter_call_records.call_args[1]["limit"] == 10
+
+    def test_get_call_records_by_id(self, mock_graph_response: list) -> None:
+        """Test fetching records in one batch, skipping the ones not found."""
+        graph = MagicMock()
+        graph.batch.return_value = [
+            {"status": 200, "body": mock_graph_response[1]},
+            {"status": 404, "body": {"error": {"code": "NotFound"}}},
+            {"status": 200, "body": mock_graph_response[0]},
+        ]
+        service = CallRecordService(graph_client=graph)
+
+        records = service.get_call_records_by_id(["call-2", "gone", "call-1"])
+
+        assert list(records) == ["call-2", "call-1"]
+        assert records["call-2"].call_type == CallType.GROUP_CALL
+        urls = [r["url"] for r in graph.batch.call_args[0][0]]
+        assert urls == [
+            "/communications/callRecords/call-2",
+            "/communications/callRecords/gone",
+            "/communications/callRecords/call-1",
+        ]
+
+    def test_parse_session_quality(self, sample_session_data: dict) -> None:
+        """Test aggregating media stream metrics into session quality."""
+        stream = {
+            "averageJitter": "PT0.010S",
+            "maxJitter": "PT0.040S",
+            "averagePacketLossRate": 0.02,
+            "maxPacketLossRate": 0.08,
+            "averageRoundTripTime": "PT0.050S",
+        }
+        sample_session_data["segments"] = [
+            {
+                "media": [
+                    {
+                        "streams": [
+                            stream,
+                            dict(stream, averagePacketLossRate=0.1),
+                        ]
+                    }
+                ]
+            }
+        ]
+        service = CallRecordService.__new__(CallRecordService)
+
+        session = service._parse_session(sample_session_data)
+
+        assert session.quality is not None
+        assert session.quality.average_packet_loss_rate == pytest.approx(0.06)
+        assert session.quality.average_jitter == timedelta(milliseconds=10)
+        assert session.quality.jitter_max == timedelta(milliseconds=40)
+        assert session.quality.packet_loss_max == 0.08
+        assert session.quality.is_good_quality is False
+
+    def test_parse_session_without_segments(self, sample_session_data: dict) -> None:
+        """Test that sessions without media streams have no quality."""
+        service = CallRecordService.__new__(CallRecordService)
+        assert service._parse_session(sample_session_data).quality is None
@@ -0,0 +1,85 @@
+"""
+Tests for the LLM call tools.
+"""
+
+from datetime import datetime, timedelta
+
+from eden_teams.cdr.index import CallIndex
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.cdr.tools import TOOL_DEFINITIONS, CallTools
+
+ALICE = Participant(email="alice@company.com")
+
+
+def _tools() -> CallTools:
+    """Create tools over one call per day for a week."""
+    start = datetime(2024, 1, 10, 12, 0, 0)
+    records = [
+        CallRecord(
+            id=str(day),
+            call_type=CallType.MEETING if day % 2 else CallType.PEER_TO_PEER,
+            start_time=start + timedelta(days=day),
+            end_time=start + timedelta(days=day, minutes=30),
+            participants=[ALICE],
+        )
+        for day in range(7)
+    ]
+    return CallTools(CallIndex.from_records(records))
+
+
+class TestCallTools:
+    """Tests for CallTools class."""
+
+    def test_definitions_cover_handlers(self) -> None:
+        """Test that every advertised tool can be called."""
+        tools = _tools()
+        names = [t["function"]["name"] for t in TOOL_DEFINITIONS]
+
+        for name in names:
+            arguments = {"user": "alice@company.com"} if "user" in name else {}
+            assert "error" not in tools.call(name, arguments), name
+
+    def test_date_range_end_is_inclusive(self) -> None:
+        """Test that a whole end date includes calls on that day."""
+        result = _tools().call(
+            "get_call_summary",
+            {"start_date": "2024-01-11", "end_date": "2024-01-12T00:00:00Z"},
+        )
+        assert result["total_calls"] == 1
+
+        result = _tools().call(
+            "get_call_summary",
+            {
+                "start_date": "2024-01-11",
+                "end_date": "2024-01-12",
+                "call_type": "meeting",
+            },
+        )
+        assert result["total_calls"] == 1
+        assert result["call_types"] == {"meeting": 1}
+
+    def test_date_range_offsets_are_converted(self) -> None:
+        """Test that bounds with a UTC offset are compared in UTC."""
+        result = _tools().call(
+            "get_call_summary",
+            {
+                "start_date": "2024-01-11T13:30:00+02:00",
+                "end_date": "2024-01-11T14:30:00+02:00",
+            },
+        )
+        assert result["total_calls"] == 1
+
+    def test_top_callers_result(self) -> None:
+        """Test that ranked lists are wrapped in an object."""
+        result = _tools().call("get_top_callers", {"k": 1, "by": "duration"})
+        assert result["top_callers"][0]["user"] == "alice@company.com"
+        assert result["top_callers"][0]["total_duration"] == "3h 30m 0s"
+
+    def test_errors_are_returned(self) -> None:
+        """Test that bad tool calls produce error results."""
+        tools = _tools()
+
+        assert "Unknown tool" in tools.call("drop_tables", {})["error"]
+        assert "error" in tools.call("get_call_summary", {"start_date": "soon"})
+        assert "error" in tools.call("get_top_callers", {"by": "volume"})
+        assert "error" in tools.call("get_call_summary", {"color": "red"})
@@ -0,0 +1,179 @@
+"""
+Tests for token-budgeted context packing.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.models.context import (
+    TABLE_HEADER,
+    ContextBuilder,
+    TokenCounter,
+    trim_history,
+)
+
+START = datetime(2024, 1, 15, 9, 0, 0)
+
+
+class _WordEncoding:
+    """Stand-in encoding with one token per whitespace-separated word."""
+
+    def encode(self, text: str, disallowed_special: tuple = ()) -> List[str]:
+        return text.split()
+
+    def decode(self, tokens: List[str]) -> str:
+        return " ".join(tokens)
+
+
+def _counter() -> TokenCounter:
+    """Create a counter using the approximate character-based fallback."""
+    with patch("eden_teams.models.context._load_encoding", return_value=None):
+        return TokenCounter("gpt-4")
+
+
+def _records(count: int) -> List[CallRecord]:
+    """Create one call per hour; every third call includes Jane."""
+    alice = Participant(email="alice@company.com", display_name="Alice Smith")
+    jane = Participant(email="jane@company.com", display_name="Jane Doe")
+    return [
+        CallRecord(
+            id=str(i),
+            call_type=CallType.PEER_TO_PEER,
+            start_time=START + timedelta(hours=i),
+            end_time=START + timedelta(hours=i, minutes=15),
+            organizer=alice,
+            participants=[alice, jane] if i % 3 == 0 else [alice],
+        )
+        for i in range(count)
+    ]
+
+
+class TestTokenCounter:
+    """Tests for TokenCounter class."""
+
+    def test_fallback_estimate(self) -> None:
+        """Test the four-characters-per-token estimate."""
+        counter = _counter()
+        assert counter.exact is False
+        assert counter.count("") == 0
+        assert counter.count("a" * 9) == 3
+        assert counter.truncate("abcdefghij", 2) == "abcdefgh"
+
+    def test_encoding(self) -> None:
+        """Test counting and truncating with the model's encoding."""
+        with patch(
+            "eden_teams.models.context._load_encoding", return_value=_WordEncoding()
+        ):
+            counter = TokenCounter("gpt-4")
+
+        assert counter.exact is True
+        assert counter.count("one two three") == 3
+        assert counter.truncate("one two three", 2) == "one two"
+        assert counter.truncate("one", 5) == "one"
+        # 3 per message + role + content, plus 3 to prime the reply
+        assert counter.count_messages([{"role": "user", "content": "hi there"}]) == 9
+
+
+class TestTrimHistory:
+    """Tests for trim_history."""
+
+    def test_keeps_most_recent(self) -> None:
+        """Test that the oldest messages are dropped to fit the budget."""
+        history = []
+        for i in range(10):
+            history.append({"role": "user", "content": f"question {i} " * 10})
+            history.append({"role": "assistant", "content": f"answer {i} " * 10})
+        counter = _counter()
+
+        kept = trim_history(history, counter, budget=100)
+
+        assert kept == history[-len(kept) :]
+        assert kept[0]["role"] == "user"
+        assert sum(counter.count_message(m) for m in kept) <= 100
+        assert trim_history(history, counter, budget=10_000) == history
+        assert trim_history(history, counter, budget=0) == []
+
+
+class TestContextBuilder:
+    """Tests for ContextBuilder class."""
+
+    def test_budget_is_respected(self) -> None:
+        """Test that rows are added until the token budget is spent."""
+        counter = _counter()
+        builder = ContextBuilder(counter, budget_tokens=200, ranking="recency")
+
+        packed = builder.build(_records(50), summary=None, total=500)
+
+        assert packed.tokens <= 200
+        assert 0 < packed.records_included < 50
+        assert packed.records_total == 500
+        assert TABLE_HEADER in packed.text
+        assert packed.text.endswith(
+            f"... {500 - packed.records_included} more records not listed."
+        )
+        # Newest first
+        first_row = packed.text.split(TABLE_HEADER + "\n")[1].splitlines()[0]
+        assert first_row.startswith("2024-01-17 10:00|p2p|15m0s|alice@company.com")
+
+    def test_max_records(self) -> None:
+        """Test the hard cap on rows."""
+        builder = ContextBuilder(_counter(), budget_tokens=10_000, max_records=3)
+        assert builder.build(_records(10)).records_included == 3
+
+    def test_participant_ranking(self) -> None:
+        """Test that calls with people named in the query come first."""
+        builder = ContextBuilder(_counter(), ranking="participant")
+
+        ranked = builder.rank(_records(9), "How long did jane talk?")
+
+        assert [r.id for r in ranked[:3]] == ["6", "3", "0"]
+        assert [r.id for r in ranked[3:5]] == ["8", "7"]
+
+    def test_semantic_ranking(self) -> None:
+        """Test ordering by embedding search results."""
+        embeddings = MagicMock()
+        embeddings.search_calls.return_value = [{"id": "2"}, {"id": "5"}]
+        builder = ContextBuilder(_counter(), ranking="semantic", embeddings=embeddings)
+
+        ranked = builder.rank(_records(6), "calls about the launch")
+
+        assert [r.id for r in ranked] == ["2", "5", "4", "3", "1", "0"]
+        embeddings.search_calls.assert_called_once_with(
+            "calls about the launch",
+            n_results=6,
+            start_time=START,
+            end_time=START + timedelta(hours=5, seconds=1),
+        )
+
+    def test_summary_placed_first(self) -> None:
+        """Test that summary statistics precede the table."""
+        summary = {
+            "total_calls": 2,
+            "total_duration_formatted": "30m 0s",
+            "participant_count": 2,
+            "call_types": {"peerToPeer": 2},
+            "top_organizers": [("alice@company.com", 2)],
+        }
+        text = ContextBuilder(_counter()).build(_records(2), summary=summary).text
+
+        assert text.index("Top Organizers: alice@company.com (2)") < text.index(
+            TABLE_HEADER
+        )
+
+    def test_format_row_caps_participants(self) -> None:
+        """Test that long participant lists are abbreviated."""
+        record = _records(1)[0]
+        record.participants = [Participant(email=f"u{i}@x.com") for i in range(8)]
+
+        row = ContextBuilder.format_row(record, max_participants=2)
+
+        assert row.endswith("|u0@x.com,u1@x.com,+6")
+
+    def test_unknown_ranking(self) -> None:
+        """Test that unknown rankings are rejected."""
+        with pytest.raises(ValueError, match="Unknown context ranking"):
+            ContextBuilder(_counter(), ranking="random")
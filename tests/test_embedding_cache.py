@@ -0,0 +1,97 @@
+"""
+Tests for the embedding cache.
+"""
+
+import os
+from pathlib import Path
+from typing import List, Sequence
+from unittest.mock import MagicMock
+
+import pytest
+
+from eden_teams.models.embedding_cache import EmbeddingCache
+
+
+def _embed(documents: Sequence[str]) -> List[List[float]]:
+    """Embed documents as their length and first character code."""
+    return [[float(len(d)), float(ord(d[0]))] for d in documents]
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache class."""
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """Test that stored vectors are returned and others are missing."""
+        cache = EmbeddingCache(str(tmp_path), "model")
+
+        cache.put_many(["a", "bb"], [[1.0, 2.0], [3.0, 4.0]])
+        vectors = cache.get_many(["bb", "c", "a"])
+
+        assert vectors[0] is not None and vectors[0].tolist() == [3.0, 4.0]
+        assert vectors[1] is None
+        assert vectors[2] is not None and vectors[2].tolist() == [1.0, 2.0]
+        assert len(cache) == 2
+        assert cache.hits == 2 and cache.misses == 1
+
+    def test_persists_between_instances(self, tmp_path: Path) -> None:
+        """Test that a new instance reads the vectors written before."""
+        EmbeddingCache(str(tmp_path), "model").put_many(["a"], [[1.0, 2.0]])
+
+        cache = EmbeddingCache(str(tmp_path), "model")
+        cache.put_many(["b"], [[5.0, 6.0]])
+
+        assert len(cache) == 2
+        vectors = cache.get_many(["a", "b"])
+        assert [v.tolist() for v in vectors] == [  # type: ignore[union-attr]
+            [1.0, 2.0],
+            [5.0, 6.0],
+        ]
+
+    def test_models_are_separate(self, tmp_path: Path) -> None:
+        """Test that each model has its own vectors."""
+        EmbeddingCache(str(tmp_path), "text-embedding-3-small").put_many(["a"], [[1.0]])
+
+        assert EmbeddingCache(str(tmp_path), "other/model").get_many(["a"]) == [None]
+
+    def test_float16(self, tmp_path: Path) -> None:
+        """Test that float16 storage halves the file size."""
+        cache = EmbeddingCache(str(tmp_path), "model", dtype="float16")
+        cache.put_many(["a"], [[0.5] * 8])
+
+        assert os.path.getsize(tmp_path / "model.vectors") == 16
+        vector = cache.get_many(["a"])[0]
+        assert vector is not None and vector.dtype.name == "float32"
+        with pytest.raises(ValueError):
+            EmbeddingCache(str(tmp_path), "model", dtype="int8")
+
+    def test_torn_write_is_discarded(self, tmp_path: Path) -> None:
+        """Test that a row without its key is dropped on open."""
+        EmbeddingCache(str(tmp_path), "model").put_many(["a"], [[1.0, 2.0]])
+        with open(tmp_path / "model.vectors", "ab") as f:
+            f.write(b"\0" * 6)
+
+        cache = EmbeddingCache(str(tmp_path), "model")
+        cache.put_many(["b"], [[3.0, 4.0]])
+
+        vector = cache.get_many(["b"])[0]
+        assert vector is not None
+        assert vector.tolist() == [3.0, 4.0]
+
+    def test_dimension_mismatch(self, tmp_path: Path) -> None:
+        """Test that vectors of another dimension are rejected."""
+        cache = EmbeddingCache(str(tmp_path), "model")
+        cache.put_many(["a"], [[1.0, 2.0]])
+
+        with pytest.raises(ValueError):
+            cache.put_many(["b"], [[1.0, 2.0, 3.0]])
+
+    def test_embed_computes_only_misses(self, tmp_path: Path) -> None:
+        """Test that only uncached, distinct documents are embedded."""
+        cache = EmbeddingCache(str(tmp_path), "model")
+        embed = MagicMock(side_effect=_embed)
+        cache.embed(["ab", "c"], embed)
+
+        vectors = cache.embed(["c", "ddd", "ddd", "ab"], embed)
+
+        assert vectors == [[1.0, 99.0], [3.0, 100.0], [3.0, 100.0], [2.0, 97.0]]
+        assert embed.call_args_list[-1].args == (["ddd"],)
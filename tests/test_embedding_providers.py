@@ -0,0 +1,177 @@
+"""
+Tests for the embedding providers.
+"""
+
+import os
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from eden_teams.models.embedding_providers import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    LocalEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    create_embedding_provider,
+)
+
+try:
+    import onnxruntime  # noqa: F401
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    LOCAL_AVAILABLE = True
+    MODEL_DOWNLOADED = os.path.exists(
+        os.path.join(
+            ONNXMiniLM_L6_V2.DOWNLOAD_PATH,
+            ONNXMiniLM_L6_V2.EXTRACTED_FOLDER_NAME,
+            "model.onnx",
+        )
+    )
+except ImportError:
+    LOCAL_AVAILABLE = False
+    MODEL_DOWNLOADED = False
+
+
+class RecordingProvider(EmbeddingProvider):
+    """Provider that records its batches."""
+
+    kind = "recording"
+
+    def __init__(self, max_batch: int) -> None:
+        """Initialize the provider."""
+        super().__init__(model="test", max_batch=max_batch)
+        self.batches: List[List[str]] = []
+
+    def _embed_batch(self, documents: List[str]) -> List[List[float]]:
+        """Embed documents as their length."""
+        self.batches.append(documents)
+        return [[float(len(d))] for d in documents]
+
+
+class TestEmbeddingProvider:
+    """Tests for the EmbeddingProvider base class."""
+
+    @patch("eden_teams.models.embedding_providers.metrics")
+    def test_batches_and_metrics(self, mock_metrics: MagicMock) -> None:
+        """Test that documents are embedded in order, max_batch at a time."""
+        provider = RecordingProvider(max_batch=2)
+
+        vectors = provider(["a", "bb", "ccc", "dddd", "e"])
+
+        assert vectors == [[1.0], [2.0], [3.0], [4.0], [1.0]]
+        assert [len(b) for b in provider.batches] == [2, 2, 1]
+        assert provider.name == "recording-test"
+        mock_metrics.increment.assert_called_with(
+            "embedding_documents_total", 1, provider="recording"
+        )
+        assert mock_metrics.timer.call_count == 3
+
+
+class TestHashingEmbeddingProvider:
+    """Tests for HashingEmbeddingProvider class."""
+
+    def test_deterministic_and_normalized(self) -> None:
+        """Test that vectors are repeatable, sized and unit length."""
+        provider = HashingEmbeddingProvider(dimension=64)
+
+        first, empty = provider(["Meeting with Alice", ""])
+
+        assert provider(["Meeting with Alice"])[0] == first
+        assert len(first) == 64
+        assert np.linalg.norm(first) == pytest.approx(1.0)
+        assert empty == [0.0] * 64
+
+    def test_shared_words_are_similar(self) -> None:
+        """Test that texts sharing words are closer than unrelated texts."""
+        provider = HashingEmbeddingProvider()
+        query, near, far = provider(
+            [
+                "peer to peer call with alice",
+                "peer to peer call with alice and bob",
+                "group meeting organized by carol",
+            ]
+        )
+
+        assert np.dot(query, near) > np.dot(query, far)
+
+
+@pytest.mark.skipif(
+    not LOCAL_AVAILABLE, reason="ChromaDB or ONNX Runtime not installed"
+)
+class TestLocalEmbeddingProvider:
+    """Tests for LocalEmbeddingProvider class."""
+
+    def test_chromadb_internals(self) -> None:
+        """Test that the ChromaDB internals the provider relies on exist."""
+        for name in (
+            "DOWNLOAD_PATH",
+            "EXTRACTED_FOLDER_NAME",
+            "_download_model_if_not_exists",
+            "_forward",
+        ):
+            assert hasattr(ONNXMiniLM_L6_V2, name), name
+
+    @pytest.mark.skipif(not MODEL_DOWNLOADED, reason="Model not downloaded")
+    def test_matches_chromadb_default(self) -> None:
+        """Test that vectors match ChromaDB's default embedding function."""
+        documents = ["Call with Alice", "Weekly planning meeting"]
+
+        vectors = LocalEmbeddingProvider(threads=1, max_batch=1)(documents)
+        expected = ONNXMiniLM_L6_V2()(documents)
+
+        assert len(vectors) == 2 and len(vectors[0]) == 384
+        np.testing.assert_allclose(vectors, np.asarray(expected), atol=1e-5)
+
+
+class TestOpenAIEmbeddingProvider:
+    """Tests for OpenAIEmbeddingProvider class."""
+
+    def test_one_request_per_batch(self) -> None:
+        """Test that batches are sent as single requests, in order."""
+        client = MagicMock()
+        client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text))])
+                for i, text in reversed(list(enumerate(input)))
+            ]
+        )
+        provider = OpenAIEmbeddingProvider(
+            model="text-embedding-3-small", max_batch=3, client=client
+        )
+
+        vectors = provider(["a", "bb", "ccc", "dddd"])
+
+        assert vectors == [[1.0], [2.0], [3.0], [4.0]]
+        assert client.embeddings.create.call_count == 2
+        assert client.embeddings.create.call_args_list[0].kwargs == {
+            "model": "text-embedding-3-small",
+            "input": ["a", "bb", "ccc"],
+        }
+
+
+class TestCreateEmbeddingProvider:
+    """Tests for create_embedding_provider function."""
+
+    @patch("eden_teams.models.embedding_providers.settings")
+    def test_providers_from_settings(self, mock_settings: MagicMock) -> None:
+        """Test that each provider type is created with its settings."""
+        mock_settings.embedding_provider = "hash"
+        mock_settings.embedding_model = ""
+        mock_settings.embedding_threads = 2
+        mock_settings.embedding_max_batch = 16
+        mock_settings.embedding_dimension = 32
+
+        hashing = create_embedding_provider()
+        local = create_embedding_provider("local")
+
+        assert isinstance(hashing, HashingEmbeddingProvider)
+        assert hashing.dimension == 32 and hashing.max_batch == 16
+        assert isinstance(local, LocalEmbeddingProvider)
+        assert local.threads == 2
+        assert local.name == "local-all-MiniLM-L6-v2"
+        assert create_embedding_provider("chroma") is None
+        with pytest.raises(ValueError):
+            create_embedding_provider("word2vec")
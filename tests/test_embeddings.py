@@ -2,23 +2,36 @@
 Tests for the embeddings module.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.config import settings
+from eden_teams.models.embedding_cache import EmbeddingCache
+from eden_teams.models.embedding_providers import HashingEmbeddingProvider
 from eden_teams.models.embeddings import CHROMADB_AVAILABLE, EmbeddingsClient
 
 
+@pytest.fixture(autouse=True)
+def vector_db_path(tmp_path: Path) -> Iterator[Path]:
+    """Keep every client's database and manifest in a temporary directory."""
+    path = tmp_path / "vectors"
+    with patch.object(settings, "vector_db_path", str(path)):
+        yield path
+
+
 class TestEmbeddingsClient:
     """Tests for EmbeddingsClient class."""
 
-    def test_client_initialization(self) -> None:
+    def test_client_initialization(self, vector_db_path: Path) -> None:
         """Test embeddings client can be initialized."""
         client = EmbeddingsClient()
         assert client.collection_name == "call_records"
-        assert client.persist_directory == "./chroma_db"
+        assert client.persist_directory == str(vector_db_path)
 
     def test_client_initialization_custom_params(self) -> None:
         """Test embeddings client with custom parameters."""
@@ -80,11 +93,13 @@ class TestEmbeddingsClient:
         assert metadata["participant_count"] == 1
         assert metadata["duration_seconds"] == 900  # 15 minutes
         assert metadata["organizer"] == "john@example.com"
+        assert metadata["start_ts"] == 1705314600
+        assert metadata["participants"] == "John Doe; john@example.com"
 
     @pytest.mark.skipif(
         not CHROMADB_AVAILABLE, reason="ChromaDB not available in test environment"
     )
-    @patch("eden_teams.models.embeddings.chromadb.Client")
+    @patch("chromadb.PersistentClient")
     def test_add_call_records(self, mock_client_class: MagicMock) -> None:
         """Test adding call records to vector database."""
         # Setup mock
@@ -102,11 +117,12 @@ class TestEmbeddingsClient:
             start_time=datetime(2024, 1, 15, 10, 30),
         )
 
-        client.add_call_records([record])
+        written = client.add_call_records([record])
 
-        # Verify collection.add was called
-        mock_collection.add.assert_called_once()
-        call_args = mock_collection.add.call_args
+        # Verify collection.upsert was called
+        assert written == 1
+        mock_collection.upsert.assert_called_once()
+        call_args = mock_collection.upsert.call_args
         assert call_args[1]["ids"] == ["test-call-1"]
         assert len(call_args[1]["documents"]) == 1
         assert len(call_args[1]["metadatas"]) == 1
@@ -114,7 +130,7 @@ class TestEmbeddingsClient:
     @pytest.mark.skipif(
         not CHROMADB_AVAILABLE, reason="ChromaDB not available in test environment"
     )
-    @patch("eden_teams.models.embeddings.chromadb.Client")
+    @patch("chromadb.PersistentClient")
     def test_search_calls(self, mock_client_class: MagicMock) -> None:
         """Test searching for calls using semantic search."""
         # Setup mock
@@ -149,7 +165,7 @@ class TestEmbeddingsClient:
     @pytest.mark.skipif(
         not CHROMADB_AVAILABLE, reason="ChromaDB not available in test environment"
     )
-    @patch("eden_teams.models.embeddings.chromadb.Client")
+    @patch("chromadb.PersistentClient")
     def test_delete_call_record(self, mock_client_class: MagicMock) -> None:
         """Test deleting a call record."""
         # Setup mock
@@ -167,7 +183,7 @@ class TestEmbeddingsClient:
     @pytest.mark.skipif(
         not CHROMADB_AVAILABLE, reason="ChromaDB not available in test environment"
     )
-    @patch("eden_teams.models.embeddings.chromadb.Client")
+    @patch("chromadb.PersistentClient")
     def test_clear_collection(self, mock_client_class: MagicMock) -> None:
         """Test clearing the collection."""
         # Setup mock
@@ -183,8 +199,11 @@ class TestEmbeddingsClient:
         mock_client.delete_collection.assert_called_once_with(name="call_records")
 
     def test_chromadb_not_available(self) -> None:
-        """Test behavior when ChromaDB is not available."""
-        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", False):
+        """Test behavior when ChromaDB is required but not available."""
+        with (
+            patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", False),
+            patch.object(settings, "vector_backend", "chroma"),
+        ):
             client = EmbeddingsClient()
 
             # These should not raise errors but log warnings
@@ -194,3 +213,251 @@ class TestEmbeddingsClient:
 
             client.delete_call_record("test-id")
             client.clear_collection()
+
+
+class FakeCollection:
+    """In-memory stand-in for a ChromaDB collection."""
+
+    def __init__(self) -> None:
+        """Initialize an empty collection."""
+        self.metadatas: Dict[str, Dict[str, Any]] = {}
+        self.upserts: List[List[str]] = []
+        self.embeddings: List[Optional[List[Any]]] = []
+
+    def count(self) -> int:
+        """Get the number of stored records."""
+        return len(self.metadatas)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Get stored metadata by ID, or a page of every record."""
+        if ids is None:
+            found = list(self.metadatas)[offset:]
+            found = found[:limit] if limit is not None else found
+        else:
+            found = [i for i in ids if i in self.metadatas]
+        return {"ids": found, "metadatas": [self.metadatas[i] for i in found]}
+
+    def upsert(self, ids: List[str], **kwargs: Any) -> None:
+        """Store metadata by ID, failing on duplicate IDs like ChromaDB."""
+        assert len(set(ids)) == len(ids)
+        self.upserts.append(ids)
+        self.embeddings.append(kwargs["embeddings"])
+        self.metadatas.update(zip(ids, kwargs["metadatas"]))
+
+
+def _records(count: int, version: int = 1) -> List[CallRecord]:
+    """Create call records with distinct IDs."""
+    start = datetime(2024, 1, 15, 10, 0)
+    return [
+        CallRecord(
+            id=f"call-{i}",
+            call_type=CallType.MEETING,
+            start_time=start + timedelta(minutes=i),
+            end_time=start + timedelta(minutes=i + 5 * version),
+            version=version,
+        )
+        for i in range(count)
+    ]
+
+
+class TestBatchedUpserts:
+    """Tests for EmbeddingsClient.add_call_records batching and skipping."""
+
+    def _client(self, **kwargs: Any) -> Tuple[EmbeddingsClient, "FakeCollection"]:
+        """Create a client backed by a fake collection."""
+        client = EmbeddingsClient(**kwargs)
+        collection = FakeCollection()
+        client._collection = collection  # type: ignore[assignment]
+        client._client = MagicMock(spec=[])
+        return client, collection
+
+    def test_records_are_upserted_in_batches(self) -> None:
+        """Test that large lists are split into batches of batch_size."""
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client, collection = self._client()
+            written = client.add_call_records(_records(5), batch_size=2)
+
+        assert written == 5
+        assert [len(ids) for ids in collection.upserts] == [2, 2, 1]
+
+    def test_unchanged_records_are_skipped(self) -> None:
+        """Test that re-adding the same records writes nothing."""
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client, collection = self._client()
+            client.add_call_records(_records(4))
+            assert client.add_call_records(_records(4)) == 0
+
+            # A fresh client finds the hashes in the stored metadata
+            other = EmbeddingsClient()
+            other._collection = collection  # type: ignore[assignment]
+            other._client = MagicMock(spec=[])
+            assert other.add_call_records(_records(4)) == 0
+
+        assert len(collection.upserts) == 1
+
+    def test_changed_and_duplicate_records(self) -> None:
+        """Test that only changed records are rewritten, once each."""
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client, collection = self._client()
+            client.add_call_records(_records(3))
+            changed = _records(3)[:2] + _records(3, version=2)[2:]
+            written = client.add_call_records(changed + changed[2:])
+
+        assert written == 1
+        assert collection.upserts[-1] == ["call-2"]
+
+    def test_embedding_function_embeds_batches(self) -> None:
+        """Test that documents are embedded client-side when configured."""
+        embed = MagicMock(side_effect=lambda docs: [[0.1, 0.2] for _ in docs])
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client, collection = self._client(embedding_function=embed)
+            client.add_call_records(_records(3), batch_size=2)
+
+        assert embed.call_count == 2
+        assert collection.embeddings == [[[0.1, 0.2]] * 2, [[0.1, 0.2]]]
+
+    def test_cached_embeddings_are_reused(self, tmp_path: Any) -> None:
+        """Test that cached vectors are passed to ChromaDB without embedding."""
+        embed = MagicMock(side_effect=lambda docs: [[0.5, 0.25] for _ in docs])
+        cache = EmbeddingCache(str(tmp_path), "model")
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client, _ = self._client(embedding_function=embed, embedding_cache=cache)
+            client.add_call_records(_records(3))
+
+            # A rebuilt collection needs every record again, but not its vector
+            other, collection = self._client(
+                embedding_function=embed, embedding_cache=cache
+            )
+            written = other.add_call_records(_records(3))
+
+        assert written == 3
+        assert embed.call_count == 1
+        assert collection.embeddings == [[[0.5, 0.25]] * 3]
+
+    def test_search_embeds_query_with_provider(self) -> None:
+        """Test that queries are embedded by the same provider as documents."""
+        provider = HashingEmbeddingProvider(dimension=8)
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client = EmbeddingsClient(embedding_function=provider)
+            client._collection = MagicMock()
+            client._collection.query.return_value = {"ids": [[]]}
+            client.search_calls("meetings with alice", n_results=3)
+
+        kwargs = client._collection.query.call_args.kwargs
+        assert kwargs["query_embeddings"] == provider(["meetings with alice"])
+        assert "query_texts" not in kwargs
+
+
+@pytest.mark.skipif(
+    not CHROMADB_AVAILABLE, reason="ChromaDB not available in test environment"
+)
+class TestPersistence:
+    """Tests for the persisted collection, its manifest and warm start."""
+
+    def test_restart_reuses_stored_vectors(self, vector_db_path: Path) -> None:
+        """Test that a new client searches the stored records unembedded."""
+        provider = HashingEmbeddingProvider(dimension=16)
+        client = EmbeddingsClient(embedding_function=provider)
+        client.add_call_records(_records(5))
+
+        embed = MagicMock(side_effect=provider)
+        restarted = EmbeddingsClient(
+            embedding_function=embed, embedding_model=provider.name
+        )
+
+        assert restarted.warm() == 5
+        assert restarted.add_call_records(_records(5)) == 0
+        assert len(restarted.search_calls("meeting", n_results=3)) == 3
+        # Only the query was embedded
+        embed.assert_called_once_with(["meeting"])
+
+    def test_manifest_records_watermark_and_model(self) -> None:
+        """Test that the manifest tracks the newest call and the model."""
+        client = EmbeddingsClient(embedding_function=HashingEmbeddingProvider(16))
+        assert client.watermark is None
+        client.add_call_records(_records(3))
+        client.add_call_records(_records(1))
+
+        manifest = EmbeddingsClient().manifest
+        assert manifest is not None
+        assert manifest.embedding_model == "hash-16"
+        assert manifest.record_count == 3
+        assert manifest.watermark == datetime(2024, 1, 15, 10, 2)
+
+    def test_model_change_rebuilds_collection(self) -> None:
+        """Test that vectors from another model are dropped on open."""
+        client = EmbeddingsClient(embedding_function=HashingEmbeddingProvider(16))
+        client.add_call_records(_records(3))
+
+        other = EmbeddingsClient(embedding_function=HashingEmbeddingProvider(32))
+        assert other.collection is not None
+        assert other.collection.count() == 0
+        assert other.manifest is None
+        assert other.add_call_records(_records(3)) == 3
+
+    def test_warm_client_skips_hash_lookups(self) -> None:
+        """Test that a warmed client knows every stored hash."""
+        with patch("eden_teams.models.embeddings.CHROMADB_AVAILABLE", True):
+            client = EmbeddingsClient()
+            collection = FakeCollection()
+            client._collection = collection  # type: ignore[assignment]
+            client.add_call_records(_records(2))
+
+            restarted = EmbeddingsClient()
+            restarted._collection = MagicMock(wraps=collection)
+            assert restarted.warm() == 2
+            assert restarted.add_call_records(_records(2)) == 0
+
+        calls = restarted._collection.get.call_args_list
+        assert all("ids" not in call.kwargs for call in calls)
+
+    def test_full_records_are_stored_beside_the_index(self) -> None:
+        """Test that full records are kept out of the metadata but stored."""
+        records = _records(3)
+        client = EmbeddingsClient(embedding_function=HashingEmbeddingProvider(16))
+        client.add_call_records(records)
+
+        assert "record" not in client._record_to_metadata(records[0])
+        stored = client.stored_records(["call-0", "call-2", "missing"])
+        assert stored == {"call-0": records[0], "call-2": records[2]}
+
+        client.delete_call_record("call-0")
+        assert set(client.stored_records(["call-0", "call-2"])) == {"call-2"}
+        client.clear_collection()
+        assert client.stored_records(["call-2"]) == {}
+
+    def test_search_result_rebuilds_record(self) -> None:
+        """Test that a search result restores the record it was indexed from."""
+        record = CallRecord(
+            id="call-1",
+            call_type=CallType.GROUP_CALL,
+            start_time=datetime(2024, 1, 15, 10),
+            end_time=datetime(2024, 1, 15, 10, 30),
+            organizer=Participant(email="alice@contoso.com"),
+            participants=[
+                Participant(email="alice@contoso.com"),
+                Participant(display_name="Bob Jones"),
+            ],
+        )
+        client = EmbeddingsClient(embedding_function=HashingEmbeddingProvider(16))
+        client.add_call_records([record])
+
+        result = client.search_calls("Bob", n_results=1)[0]
+        rebuilt = EmbeddingsClient.result_to_record(result)
+
+        assert rebuilt.id == "call-1"
+        assert rebuilt.call_type == CallType.GROUP_CALL
+        assert rebuilt.start_time == record.start_time
+        assert rebuilt.duration_seconds == 1800
+        assert rebuilt.organizer is not None
+        assert rebuilt.organizer.identifier == "alice@contoso.com"
+        assert [p.identifier for p in rebuilt.participants] == [
+            "alice@contoso.com",
+            "Bob Jones",
+        ]
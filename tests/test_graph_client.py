@@ -2,14 +2,21 @@
 Tests for the Graph API client module.
 """
 
+import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 import respx
 from httpx import Response
 
 from eden_teams.graph.client import GraphClient
+from eden_teams.testing.graph_server import (
+    FakeGraphConfig,
+    FakeGraphServer,
+    StaticTokenProvider,
+)
 
 
 class TestGraphClient:
@@ -250,3 +257,175 @@ class TestGraphClient:
         client.close()
 
         assert client._http_client is None
+
+    @respx.mock
+    @patch("eden_teams.graph.client.GraphAuthProvider")
+    def test_iter_call_records_follows_next_link(
+        self, mock_auth_provider: MagicMock
+    ) -> None:
+        """Test streaming call records across pages."""
+        mock_auth = MagicMock()
+        mock_auth.get_token.return_value = "test-token"
+        mock_auth_provider.return_value = mock_auth
+
+        next_link = "https://graph.microsoft.com/v1.0/communications/callRecords?page=2"
+        route = respx.get(
+            "https://graph.microsoft.com/v1.0/communications/callRecords"
+        ).mock(
+            side_effect=[
+                Response(
+                    200,
+                    json={"value": [{"id": "call-1"}], "@odata.nextLink": next_link},
+                ),
+                Response(200, json={"value": [{"id": "call-2"}, {"id": "call-3"}]}),
+            ]
+        )
+
+        client = GraphClient()
+        records = list(client.iter_call_records())
+
+        assert [r["id"] for r in records] == ["call-1", "call-2", "call-3"]
+        assert route.call_count == 2
+        assert "page=2" in str(route.calls[1].request.url)
+
+    @respx.mock
+    @patch("eden_teams.graph.client.GraphAuthProvider")
+    def test_iter_call_records_limit(self, mock_auth_provider: MagicMock) -> None:
+        """Test that streaming stops once the limit is reached."""
+        mock_auth = MagicMock()
+        mock_auth.get_token.return_value = "test-token"
+        mock_auth_provider.return_value = mock_auth
+
+        route = respx.get(
+            "https://graph.microsoft.com/v1.0/communications/callRecords"
+        ).mock(
+            return_value=Response(
+                200,
+                json={
+                    "value": [{"id": f"call-{i}"} for i in range(5)],
+                    "@odata.nextLink": "https://graph.microsoft.com/v1.0/next",
+                },
+            )
+        )
+
+        client = GraphClient()
+        records = list(client.iter_call_records(limit=2))
+
+        assert len(records) == 2
+        assert route.call_count == 1
+
+    @respx.mock
+    @patch("eden_teams.graph.client.time.sleep")
+    @patch("eden_teams.graph.client.GraphAuthProvider")
+    def test_get_retries_throttled_requests(
+        self, mock_auth_provider: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        """Test that 429 responses are retried honoring Retry-After."""
+        mock_auth = MagicMock()
+        mock_auth.get_token.return_value = "test-token"
+        mock_auth_provider.return_value = mock_auth
+
+        route = respx.get("https://graph.microsoft.com/v1.0/users/u1").mock(
+            side_effect=[
+                Response(429, headers={"Retry-After": "2"}),
+                Response(503),
+                Response(200, json={"id": "u1"}),
+            ]
+        )
+
+        client = GraphClient()
+        user = client.get_user("u1")
+
+        assert user["id"] == "u1"
+        assert route.call_count == 3
+        assert client.retry_count == 2
+        assert mock_sleep.call_args_list[0][0][0] == 2.0
+
+    @respx.mock
+    @patch("eden_teams.graph.client.time.sleep")
+    @patch("eden_teams.graph.client.GraphAuthProvider")
+    def test_get_gives_up_after_max_retries(
+        self, mock_auth_provider: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        """Test that the last throttled response is raised."""
+        mock_auth = MagicMock()
+        mock_auth.get_token.return_value = "test-token"
+        mock_auth_provider.return_value = mock_auth
+
+        route = respx.get("https://graph.microsoft.com/v1.0/users/u1").mock(
+            return_value=Response(429)
+        )
+
+        client = GraphClient()
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_user("u1")
+
+        assert route.call_count == 4  # initial attempt + 3 retries
+        assert mock_sleep.call_count == 3
+
+    def test_custom_base_url(self) -> None:
+        """Test pointing the client at a different service root."""
+        client = GraphClient(base_url="http://127.0.0.1:8080")
+        assert str(client.http_client.base_url) == "http://127.0.0.1:8080/v1.0/"
+
+    def test_batch_against_fake_server(self) -> None:
+        """Test that batches are split at the size limit and keep their order."""
+        with FakeGraphServer(FakeGraphConfig(record_count=30)) as server:
+            ids = [r["id"] for r in server.records[:25]] + ["missing"]
+            with GraphClient(
+                base_url=server.url, auth_provider=StaticTokenProvider()
+            ) as client:
+                responses = client.batch(
+                    [{"url": f"/communications/callRecords/{i}"} for i in ids]
+                )
+            stats = server.stats
+
+        assert [r["body"]["id"] for r in responses[:-1]] == ids[:-1]
+        assert responses[-1]["status"] == 404
+        assert stats["batch_requests"] == 2
+
+    @respx.mock
+    @patch("eden_teams.graph.client.time.sleep")
+    @patch("eden_teams.graph.client.GraphAuthProvider")
+    def test_batch_retries_throttled_sub_requests(
+        self, mock_auth_provider: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        """Test that only the throttled requests of a batch are resent."""
+        mock_auth = MagicMock()
+        mock_auth.get_token.return_value = "test-token"
+        mock_auth_provider.return_value = mock_auth
+
+        route = respx.post("https://graph.microsoft.com/v1.0/$batch").mock(
+            side_effect=[
+                Response(
+                    200,
+                    json={
+                        "responses": [
+                            {"id": "0", "status": 200, "body": {"id": "a"}},
+                            {
+                                "id": "1",
+                                "status": 429,
+                                "headers": {"Retry-After": "3"},
+                                "body": {},
+                            },
+                        ]
+                    },
+                ),
+                Response(
+                    200,
+                    json={
+                        "responses": [{"id": "1", "status": 200, "body": {"id": "b"}}]
+                    },
+                ),
+            ]
+        )
+
+        client = GraphClient()
+        responses = client.batch([{"url": "/users/a"}, {"url": "/users/b"}])
+
+        assert [r["body"]["id"] for r in responses] == ["a", "b"]
+        assert route.call_count == 2
+        resent = json.loads(route.calls[1].request.content)["requests"]
+        assert [r["url"] for r in resent] == ["/users/b"]
+        assert client.retry_count == 1
+        mock_sleep.assert_called_once_with(3.0)
@@ -0,0 +1,184 @@
+"""
+Tests for the fake Graph server.
+"""
+
+from typing import Iterator
+
+import httpx
+import pytest
+
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.graph.client import GraphClient
+from eden_teams.testing.graph_server import (
+    FakeGraphConfig,
+    FakeGraphServer,
+    StaticTokenProvider,
+)
+from eden_teams.testing.synthetic import SyntheticCDRConfig, SyntheticCDRGenerator
+
+
+@pytest.fixture
+def server() -> Iterator[FakeGraphServer]:
+    """Provide a running fake Graph server."""
+    with FakeGraphServer(FakeGraphConfig(record_count=250, page_size=40)) as srv:
+        yield srv
+
+
+@pytest.fixture
+def graph(server: FakeGraphServer) -> Iterator[GraphClient]:
+    """Provide a GraphClient pointed at the fake server."""
+    with GraphClient(
+        base_url=server.url, auth_provider=StaticTokenProvider()
+    ) as client:
+        yield client
+
+
+class TestFakeGraphServer:
+    """Tests for FakeGraphServer class."""
+
+    def test_stream_all_pages(
+        self, server: FakeGraphServer, graph: GraphClient
+    ) -> None:
+        """Test that pagination returns every record exactly once."""
+        records = list(graph.stream("/communications/callRecords"))
+
+        assert len(records) == 250
+        assert len({r["id"] for r in records}) == 250
+        assert server.stats["requests"] == 7  # ceil(250 / 40)
+        assert "sessions" not in records[0]
+
+    def test_date_filter(self, server: FakeGraphServer, graph: GraphClient) -> None:
+        """Test that startDateTime filters select the matching range."""
+        config = server.config
+        records = list(
+            graph.iter_call_records(
+                start_date=config.start_date,
+                end_date=config.start_date.replace(day=config.start_date.day + 1),
+            )
+        )
+        expected = [
+            r for r in server.records if r["startDateTime"] < "2024-01-02T00:00:00"
+        ]
+        assert len(records) == len(expected)
+        assert 0 < len(records) < 250
+
+    def test_records_parse(self, server: FakeGraphServer, graph: GraphClient) -> None:
+        """Test that served records parse into CallRecord models."""
+        service = CallRecordService(graph_client=graph)
+        call_id = server.records[0]["id"]
+
+        record = service.get_call_record(call_id, include_sessions=True)
+
+        assert record.id == call_id
+        assert record.participant_count >= 2
+        assert len(record.sessions) >= 1
+        assert record.sessions[0].start_time == record.start_time
+
+    def test_etag_not_modified(self, server: FakeGraphServer) -> None:
+        """Test conditional requests with If-None-Match."""
+        call_id = server.records[0]["id"]
+        url = f"{server.url}/v1.0/communications/callRecords/{call_id}"
+
+        first = httpx.get(url)
+        etag = first.headers["ETag"]
+        second = httpx.get(url, headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert server.stats["not_modified"] == 1
+
+    def test_users(self, server: FakeGraphServer, graph: GraphClient) -> None:
+        """Test user lookup and search."""
+        user = server.users[3]
+        first_name = user["displayName"].split()[0]
+
+        assert graph.get_user(user["userPrincipalName"])["id"] == user["id"]
+        matches = graph.search_users(first_name)
+        assert matches
+        assert all(u["displayName"].startswith(first_name) for u in matches)
+
+    def test_users_from_supplied_records(self) -> None:
+        """Test that supplied records populate the user directory."""
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=5))
+        records = list(generator.iter_call_records(20))
+
+        with FakeGraphServer(records=records) as server:
+            ids = {u["id"] for u in server.users}
+            participants = {
+                p["identity"]["user"]["id"]
+                for r in records
+                for p in r["participants"]
+                if "user" in p["identity"]
+            }
+            assert ids == participants
+
+            with GraphClient(
+                base_url=server.url, auth_provider=StaticTokenProvider()
+            ) as client:
+                user = server.users[0]
+                found = client.get_user(user["userPrincipalName"])
+                assert found["id"] == user["id"]
+
+    def test_batch(self, server: FakeGraphServer) -> None:
+        """Test JSON batching of sub-requests."""
+        ids = [r["id"] for r in server.records[:3]]
+        body = {
+            "requests": [
+                {
+                    "id": str(i),
+                    "method": "GET",
+                    "url": f"/communications/callRecords/{c}",
+                }
+                for i, c in enumerate(ids)
+            ]
+            + [
+                {
+                    "id": "missing",
+                    "method": "GET",
+                    "url": "/communications/callRecords/x",
+                }
+            ]
+        }
+
+        response = httpx.post(f"{server.url}/v1.0/$batch", json=body)
+        responses = {r["id"]: r for r in response.json()["responses"]}
+
+        assert response.status_code == 200
+        assert [responses[str(i)]["body"]["id"] for i in range(3)] == ids
+        assert responses["missing"]["status"] == 404
+
+    def test_batch_size_limit(self, server: FakeGraphServer) -> None:
+        """Test that oversized batches are rejected."""
+        body = {
+            "requests": [
+                {"id": str(i), "method": "GET", "url": "/users"} for i in range(21)
+            ]
+        }
+        response = httpx.post(f"{server.url}/v1.0/$batch", json=body)
+        assert response.status_code == 400
+
+    def test_throttling_is_retried(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that GraphClient retries injected 429 responses."""
+        monkeypatch.setattr("eden_teams.graph.client.settings.graph_max_retries", 20)
+        config = FakeGraphConfig(record_count=100, page_size=10, throttle_rate=0.3)
+
+        with FakeGraphServer(config) as srv:
+            with GraphClient(
+                base_url=srv.url, auth_provider=StaticTokenProvider()
+            ) as client:
+                records = list(client.stream("/communications/callRecords"))
+                retries = client.retry_count
+            stats = srv.stats
+
+        assert len(records) == 100
+        assert stats["throttled"] > 0
+        assert retries == stats["throttled"]
+
+    def test_injected_errors(self) -> None:
+        """Test that injected server errors surface as HTTP errors."""
+        with FakeGraphServer(FakeGraphConfig(error_rate=1.0)) as srv:
+            with GraphClient(
+                base_url=srv.url, auth_provider=StaticTokenProvider()
+            ) as client:
+                with pytest.raises(httpx.HTTPStatusError):
+                    client.get("/users")
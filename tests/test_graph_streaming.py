@@ -0,0 +1,110 @@
+"""
+Tests for the incremental JSON stream parser.
+"""
+
+import json
+
+import pytest
+
+from eden_teams.graph.streaming import JSONArrayStreamParser, JSONStreamError
+
+
+def _parse_in_chunks(payload: bytes, chunk_size: int) -> tuple:
+    """Feed a payload to a parser in fixed-size chunks."""
+    parser = JSONArrayStreamParser()
+    items = []
+    for i in range(0, len(payload), chunk_size):
+        items.extend(parser.feed(payload[i : i + chunk_size]))
+    parser.close()
+    return items, parser.metadata
+
+
+class TestJSONArrayStreamParser:
+    """Tests for JSONArrayStreamParser class."""
+
+    def test_parse_whole_document(self) -> None:
+        """Test parsing a document fed in a single chunk."""
+        document = {
+            "@odata.context": "https://graph.microsoft.com/v1.0/$metadata",
+            "value": [{"id": "call-1"}, {"id": "call-2"}],
+            "@odata.nextLink": "https://graph.microsoft.com/v1.0/next",
+        }
+        items, metadata = _parse_in_chunks(json.dumps(document).encode(), 1 << 20)
+
+        assert items == document["value"]
+        assert metadata["@odata.nextLink"] == document["@odata.nextLink"]
+        assert "value" not in metadata
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+    def test_parse_split_at_any_boundary(self, chunk_size: int) -> None:
+        """Test that chunk boundaries inside tokens are handled."""
+        document = {
+            "value": [
+                {
+                    "id": "call-1",
+                    "note": 'quote " brace } bracket ] backslash \\ unicode é',
+                    "nested": {"list": [1, 2.5, True, None, {"deep": []}]},
+                },
+                {"id": "call-2", "count": 12345, "flag": False},
+            ],
+            "@odata.count": 2,
+        }
+        payload = json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+        items, metadata = _parse_in_chunks(payload, chunk_size)
+
+        assert items == document["value"]
+        assert metadata["@odata.count"] == 2
+
+    def test_items_yielded_before_document_ends(self) -> None:
+        """Test that completed elements are returned before the array closes."""
+        parser = JSONArrayStreamParser()
+
+        first = parser.feed(b'{"value": [{"id": "a"}, {"id": ')
+        assert first == [{"id": "a"}]
+        assert parser.done is False
+
+        second = parser.feed(b'"b"}]}')
+        assert second == [{"id": "b"}]
+        assert parser.done is True
+
+    def test_whitespace_and_empty_array(self) -> None:
+        """Test pretty-printed documents and empty collections."""
+        payload = b'\n{\n  "value" : [ ]\n ,\n  "x": "y"\n}\n'
+        items, metadata = _parse_in_chunks(payload, 3)
+        assert items == []
+        assert metadata == {"x": "y"}
+
+    def test_buffer_compaction(self) -> None:
+        """Test that consumed bytes are released from the buffer."""
+        parser = JSONArrayStreamParser()
+        parser.feed(b'{"value": [')
+        for i in range(100):
+            parser.feed(json.dumps({"id": i, "pad": "x" * 100}).encode() + b",")
+        assert len(parser._buffer) < 200
+
+    def test_truncated_document(self) -> None:
+        """Test that close() rejects a truncated document."""
+        parser = JSONArrayStreamParser()
+        parser.feed(b'{"value": [{"id": "a"}')
+        with pytest.raises(JSONStreamError, match="Unexpected end"):
+            parser.close()
+
+    def test_value_not_array(self) -> None:
+        """Test that a non-array value member is rejected."""
+        parser = JSONArrayStreamParser()
+        with pytest.raises(JSONStreamError, match="array"):
+            parser.feed(b'{"value": {"id": "a"}}')
+
+    def test_not_an_object(self) -> None:
+        """Test that a non-object document is rejected."""
+        parser = JSONArrayStreamParser()
+        with pytest.raises(JSONStreamError, match="object"):
+            parser.feed(b"[1, 2]")
+
+    def test_custom_array_key(self) -> None:
+        """Test streaming a differently named array member."""
+        parser = JSONArrayStreamParser(array_key="responses")
+        items = parser.feed(b'{"value": 1, "responses": [{"id": "1"}]}')
+        assert items == [{"id": "1"}]
+        assert parser.metadata == {"value": 1}
@@ -0,0 +1,208 @@
+"""
+Tests for hybrid search.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.config import settings
+from eden_teams.models.embedding_providers import HashingEmbeddingProvider
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.models.hybrid_search import (
+    BM25Index,
+    build_where,
+    reciprocal_rank_fusion,
+    timestamp,
+    tokenize,
+)
+
+PEOPLE = ["Alice Smith", "Bob Jones", "Carol White", "Dan Brown"]
+
+
+def _person(name: str) -> Participant:
+    """Create a participant with a contoso address."""
+    return Participant(
+        display_name=name, email=f"{name.split()[0].lower()}@contoso.com"
+    )
+
+
+def _records() -> List[CallRecord]:
+    """Create calls between pairs of people, alternating call types."""
+    start = datetime(2024, 1, 1)
+    records = []
+    for i in range(40):
+        pair = [_person(PEOPLE[i % 4]), _person(PEOPLE[(i + 1) % 4])]
+        records.append(
+            CallRecord(
+                id=f"call-{i}",
+                call_type=CallType.GROUP_CALL if i % 2 else CallType.PEER_TO_PEER,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i, minutes=i),
+                participants=pair,
+                organizer=pair[0],
+            )
+        )
+    return records
+
+
+class TestHelpers:
+    """Tests for tokenize, timestamp, build_where and fusion."""
+
+    def test_tokenize_keeps_addresses(self) -> None:
+        """Test that email addresses are kept whole and split into words."""
+        assert tokenize("Calls with Alice.Smith@Contoso.com") == [
+            "alice.smith@contoso.com",
+            "calls",
+            "with",
+            "alice",
+            "smith",
+            "contoso",
+            "com",
+        ]
+
+    def test_build_where(self) -> None:
+        """Test that constraints become one ChromaDB filter."""
+        start = datetime(2024, 1, 1)
+        assert build_where() is None
+        assert build_where(call_type="groupCall") == {"call_type": "groupCall"}
+        assert build_where(
+            start_time=start, min_duration=60, where={"organizer": "a@b.com"}
+        ) == {
+            "$and": [
+                {"start_ts": {"$gte": timestamp(start)}},
+                {"duration_seconds": {"$gte": 60}},
+                {"organizer": "a@b.com"},
+            ]
+        }
+        assert timestamp(start) == 1704067200
+
+    def test_reciprocal_rank_fusion(self) -> None:
+        """Test that items ranked well by both rankers come first."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]], k=1)
+
+        assert [item for item, _ in fused] == ["b", "a", "c"]
+
+
+class TestBM25Index:
+    """Tests for BM25Index class."""
+
+    def test_rare_terms_score_higher(self) -> None:
+        """Test that documents matching rarer and more terms rank first."""
+        index = BM25Index()
+        index.add("1", "Alice Smith; alice@contoso.com")
+        index.add("2", "Bob Jones; bob@contoso.com")
+        index.add("3", "Alice Jones; alicej@contoso.com")
+
+        ranked = [doc for doc, _ in index.search("alice smith")]
+
+        assert ranked == ["1", "3"]
+        assert index.search("carol") == []
+        assert [d for d, _ in index.search("jones", candidates={"3"})] == ["3"]
+
+    def test_replace_and_remove(self) -> None:
+        """Test that re-added documents replace and removed ones vanish."""
+        index = BM25Index()
+        index.add("1", "Alice")
+        index.add("1", "Bob")
+        index.add("2", "Bob")
+        index.remove("2")
+        index.remove("missing")
+
+        assert index.search("alice") == []
+        assert [d for d, _ in index.search("bob")] == ["1"]
+        assert len(index) == 1
+
+
+class TestHybridSearch:
+    """Tests for EmbeddingsClient.search_calls in hybrid mode."""
+
+    def _client(self, tmp_path: Path) -> EmbeddingsClient:
+        """Create a client over the built-in index with hash embeddings."""
+        with patch.object(settings, "vector_backend", "numpy"):
+            client = EmbeddingsClient(
+                persist_directory=str(tmp_path),
+                embedding_function=HashingEmbeddingProvider(),
+            )
+        client.add_call_records(_records())
+        return client
+
+    def test_name_queries_return_that_persons_calls(self, tmp_path: Path) -> None:
+        """Test that every result includes the named participant."""
+        client = self._client(tmp_path)
+
+        results = client.search_calls("calls with carol@contoso.com", n_results=10)
+
+        assert len(results) == 10
+        assert all(
+            "carol@contoso.com" in r["metadata"]["participants"] for r in results
+        )
+        assert all(r["distance"] is not None for r in results)
+
+    def test_structured_filters_apply_first(self, tmp_path: Path) -> None:
+        """Test that time, type and duration constraints bound the results."""
+        client = self._client(tmp_path)
+
+        results = client.search_calls(
+            "carol",
+            n_results=40,
+            start_time=datetime(2024, 1, 1, 12),
+            call_type="groupCall",
+            min_duration=20 * 60,
+        )
+
+        assert results
+        for r in results:
+            assert r["metadata"]["call_type"] == "groupCall"
+            assert r["metadata"]["duration_seconds"] >= 20 * 60
+            assert r["metadata"]["start_time"] >= "2024-01-01T12:00:00"
+            assert "carol" in r["metadata"]["participants"].lower()
+
+    def test_collection_without_id_filter(self, tmp_path: Path) -> None:
+        """Test name queries on collections whose query() takes no ids."""
+        client = self._client(tmp_path)
+        index = client.collection
+        assert index is not None
+        unfiltered = index.query
+
+        def query(
+            query_embeddings: List[List[float]],
+            n_results: int = 10,
+            where: Optional[Dict[str, Any]] = None,
+        ) -> Dict[str, Any]:
+            return unfiltered(query_embeddings, n_results, where)
+
+        with patch.object(index, "query", query):
+            assert not client._query_accepts_ids()
+            results = client.search_calls("calls with carol@contoso.com", n_results=5)
+
+        assert len(results) == 5
+        assert all(
+            "carol@contoso.com" in r["metadata"]["participants"] for r in results
+        )
+
+    def test_keyword_index_is_rebuilt(self, tmp_path: Path) -> None:
+        """Test that a new client indexes the participants already stored."""
+        self._client(tmp_path)
+        with patch.object(settings, "vector_backend", "numpy"):
+            client = EmbeddingsClient(
+                persist_directory=str(tmp_path),
+                embedding_function=HashingEmbeddingProvider(),
+            )
+
+        results = client.search_calls("dan brown", n_results=3)
+
+        assert len(results) == 3
+        assert all("Dan Brown" in r["metadata"]["participants"] for r in results)
+
+    def test_vector_only(self, tmp_path: Path) -> None:
+        """Test that hybrid=False skips keyword scoring."""
+        client = self._client(tmp_path)
+
+        with patch.object(client, "_keyword_search") as keyword_search:
+            results = client.search_calls("carol", n_results=5, hybrid=False)
+
+        keyword_search.assert_not_called()
+        assert len(results) == 5
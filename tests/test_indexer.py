@@ -0,0 +1,187 @@
+"""
+Tests for the background indexer.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import MagicMock
+
+from eden_teams.cdr.models import CallRecord, CallType
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.graph.client import GraphClient
+from eden_teams.models.embedding_providers import HashingEmbeddingProvider
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.models.indexer import BackgroundIndexer
+from eden_teams.testing.graph_server import (
+    FakeGraphConfig,
+    FakeGraphServer,
+    StaticTokenProvider,
+)
+
+
+def _records(count: int, start: int = 0) -> List[CallRecord]:
+    """Create call records an hour apart."""
+    base = datetime(2024, 1, 15)
+    return [
+        CallRecord(
+            id=f"call-{i}",
+            call_type=CallType.GROUP_CALL,
+            start_time=base + timedelta(hours=i),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _embeddings(**kwargs: Any) -> MagicMock:
+    """Create a stand-in EmbeddingsClient that writes every record."""
+    embeddings = MagicMock(**kwargs)
+    embeddings.watermark = None
+    if "add_call_records" not in kwargs:
+        embeddings.add_call_records.side_effect = len
+    return embeddings
+
+
+class TestBackgroundIndexer:
+    """Tests for BackgroundIndexer class."""
+
+    def test_submitted_records_are_indexed_in_batches(self) -> None:
+        """Test that workers index queued records in bounded batches."""
+        embeddings = _embeddings()
+        with BackgroundIndexer(embeddings, batch_size=4, workers=1) as indexer:
+            assert indexer.submit(_records(10)) == 10
+            assert indexer.wait(timeout=5)
+            stats = indexer.stats
+
+        batches = [call.args[0] for call in embeddings.add_call_records.call_args_list]
+        assert sum(len(batch) for batch in batches) == 10
+        assert max(len(batch) for batch in batches) <= 4
+        assert stats.submitted == stats.indexed == stats.written == 10
+        assert stats.pending == 0
+        assert stats.lag_seconds == 0.0
+        assert stats.records_per_second > 0
+
+    def test_full_queue_applies_backpressure(self) -> None:
+        """Test that submit waits for room, and gives up after its timeout."""
+        release = threading.Event()
+
+        def slow(records: List[CallRecord]) -> int:
+            release.wait(5)
+            return len(records)
+
+        embeddings = _embeddings()
+        embeddings.add_call_records.side_effect = slow
+        indexer = BackgroundIndexer(
+            embeddings, queue_size=2, batch_size=1, workers=1
+        ).start()
+        try:
+            # One record is taken by the blocked worker, two fill the queue
+            accepted = indexer.submit(_records(5), timeout=0.2)
+            assert accepted == 3
+            stats = indexer.stats
+            assert stats.pending == 3
+            assert stats.lag_seconds > 0
+            release.set()
+            assert indexer.wait(timeout=5)
+        finally:
+            release.set()
+            indexer.stop()
+        assert indexer.stats.written == 3
+
+    def test_failed_batch_is_refetched(self) -> None:
+        """Test that a failed batch is counted and the next sync covers it."""
+        embeddings = _embeddings()
+        embeddings.add_call_records.side_effect = RuntimeError("store down")
+        service = MagicMock(spec=CallRecordService)
+        service.iter_call_records.return_value = iter(_records(2, start=5))
+        indexer = BackgroundIndexer(
+            embeddings, service, workers=1, overlap_seconds=0, days=1
+        )
+        end = datetime(2024, 1, 16)
+
+        indexer.start(sync=False)
+        try:
+            indexer.sync(end=end)
+            assert indexer.wait(timeout=5)
+            service.iter_call_records.return_value = iter([])
+            indexer.sync(end=end + timedelta(hours=1))
+        finally:
+            indexer.stop()
+
+        assert indexer.stats.failed == 2
+        second = service.iter_call_records.call_args_list[1].kwargs
+        assert second["start_date"] == datetime(2024, 1, 15, 5)
+
+    def test_first_sync_starts_at_watermark(self) -> None:
+        """Test that a restarted indexer only fetches past the watermark."""
+        embeddings = _embeddings()
+        embeddings.watermark = datetime(2024, 1, 15, 12)
+        service = MagicMock(spec=CallRecordService)
+        service.iter_call_records.return_value = iter([])
+        indexer = BackgroundIndexer(embeddings, service, overlap_seconds=3600)
+
+        indexer.sync(end=datetime(2024, 1, 16))
+        indexer.sync(end=datetime(2024, 1, 17))
+
+        starts = [
+            call.kwargs["start_date"]
+            for call in service.iter_call_records.call_args_list
+        ]
+        assert starts == [datetime(2024, 1, 15, 11), datetime(2024, 1, 15, 23)]
+
+    def test_stop_without_drain_drops_queue(self) -> None:
+        """Test that stopping can abandon queued records."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(records: List[CallRecord]) -> int:
+            started.set()
+            release.wait(5)
+            return len(records)
+
+        embeddings = _embeddings()
+        embeddings.add_call_records.side_effect = slow
+        indexer = BackgroundIndexer(embeddings, batch_size=1, workers=1).start()
+        indexer.submit(_records(4))
+        assert started.wait(5)
+
+        # The worker is still on the first record when the rest are dropped
+        threading.Timer(0.2, release.set).start()
+        indexer.stop(drain=False)
+
+        assert not indexer.running
+        assert indexer.stats.pending == 0
+        assert embeddings.add_call_records.call_count == 1
+
+    def test_sync_thread_keeps_index_current(self, tmp_path: Path) -> None:
+        """Test the whole pipeline from a Graph server to the vector index."""
+        config = FakeGraphConfig(record_count=60, page_size=25)
+        embeddings = EmbeddingsClient(
+            persist_directory=str(tmp_path),
+            embedding_function=HashingEmbeddingProvider(dimension=16),
+        )
+        with (
+            FakeGraphServer(config) as server,
+            GraphClient(
+                base_url=server.url, auth_provider=StaticTokenProvider()
+            ) as graph,
+        ):
+            indexer = BackgroundIndexer(
+                embeddings,
+                CallRecordService(graph_client=graph),
+                batch_size=16,
+                days=(datetime.utcnow() - config.start_date).days + 1,
+                sync_interval=60,
+            )
+            with indexer:
+                for _ in range(200):
+                    if indexer.stats.last_sync is not None:
+                        break
+                    time.sleep(0.05)
+                assert indexer.wait(timeout=10)
+
+        assert embeddings.collection is not None
+        assert embeddings.collection.count() == 60
+        assert indexer.stats.watermark is not None
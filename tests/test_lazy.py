@@ -0,0 +1,42 @@
+"""
+Tests for lazy package exports.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import eden_teams.models
+
+
+class TestLazyExports:
+    """Tests for lazy_exports function."""
+
+    def test_exports_import_on_first_access(self) -> None:
+        """Test that a package export loads its submodule only when used."""
+        code = (
+            "import sys, eden_teams.models as models; "
+            "before = 'eden_teams.models.embeddings' in sys.modules; "
+            "client = models.EmbeddingsClient; "
+            "print(before, 'eden_teams.models.embeddings' in sys.modules, "
+            "client.__module__, 'EmbeddingsClient' in vars(models))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == [
+            "False",
+            "True",
+            "eden_teams.models.embeddings",
+            "True",
+        ]
+
+    def test_unknown_name_raises(self) -> None:
+        """Test that names that are not exported raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+            eden_teams.models.Missing  # noqa: B018
+
+    def test_dir_lists_exports(self) -> None:
+        """Test that dir() lists exports before they are imported."""
+        assert set(eden_teams.models.__all__) <= set(dir(eden_teams.models))
@@ -2,9 +2,12 @@
 Tests for the LLM client module.
 """
 
+import json
+from typing import Any, Optional
 from unittest.mock import MagicMock, patch
 
 from eden_teams.models.llm_client import LLMClient
+from eden_teams.models.response_cache import ResponseCache
 
 
 class TestLLMClient:
@@ -13,6 +16,7 @@ class TestLLMClient:
     def test_client_initialization_default(self) -> None:
         """Test LLM client initialization with defaults."""
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.default_model = "gpt-4"
             mock_settings.use_azure_openai = False
 
@@ -88,6 +92,7 @@ class TestLLMClient:
         client._client = mock_openai_client
 
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.temperature = 0.7
             mock_settings.max_tokens = 4096
 
@@ -130,6 +135,7 @@ class TestLLMClient:
         client._client = mock_openai_client
 
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.temperature = 0.7
             mock_settings.max_tokens = 4096
 
@@ -151,6 +157,7 @@ class TestLLMClient:
         client._client = mock_openai_client
 
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.temperature = 0.7
             mock_settings.max_tokens = 4096
 
@@ -178,6 +185,7 @@ class TestLLMClient:
         client._client = mock_openai_client
 
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.temperature = 0.7
             mock_settings.max_tokens = 4096
 
@@ -205,9 +213,192 @@ class TestLLMClient:
         client._client = mock_openai_client
 
         with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
             mock_settings.temperature = 0.7
             mock_settings.max_tokens = 4096
 
             response = client.chat("Test")
 
             assert response == ""
+
+    def test_history_trimmed_to_budget(self) -> None:
+        """Test that only recent history within the budget is sent."""
+        client = LLMClient(use_azure=False)
+        history = [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": "x" * 400}
+            for i in range(20)
+        ]
+
+        with patch("eden_teams.models.llm_client.settings") as mock_settings:
+            mock_settings.llm_cache_enabled = False
+            mock_settings.history_token_budget = 500
+            messages = client._build_messages("Next?", history=history)
+
+        kept = messages[1:-1]
+        assert 0 < len(kept) < len(history)
+        assert kept == history[-len(kept) :]
+        assert kept[0]["role"] == "user"
+
+
+def _reply(content: Optional[str] = None, tool_calls: Optional[list] = None) -> Any:
+    """Create a chat completion response with one message."""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.choices[0].message.tool_calls = tool_calls
+    return response
+
+
+def _tool_call(call_id: str, name: str, arguments: str) -> MagicMock:
+    """Create a tool call requested by the model."""
+    call = MagicMock()
+    call.id = call_id
+    call.function.name = name
+    call.function.arguments = arguments
+    return call
+
+
+def _completions(client: LLMClient) -> MagicMock:
+    """Get the mocked chat completions endpoint of a client."""
+    api: MagicMock = client._client  # type: ignore[assignment]
+    return api.chat.completions.create
+
+
+class TestResponseCaching:
+    """Tests for LLMClient's use of the response cache."""
+
+    def _client(self, cache: ResponseCache) -> LLMClient:
+        """Create a client with a mocked API answering "42 calls"."""
+        client = LLMClient(use_azure=False, response_cache=cache)
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "42 calls"
+        response.choices[0].message.tool_calls = None
+        client._client = MagicMock()
+        client._client.chat.completions.create.return_value = response
+        return client
+
+    def test_repeated_question_is_served_from_cache(self) -> None:
+        """Test that the same question against the same data is answered once."""
+        cache = ResponseCache()
+        client = self._client(cache)
+
+        first = client.query_calls("How many calls?", "data", watermark="w1")
+        assert client.last_cache_hit is False
+        second = client.query_calls("How many calls?", "data", watermark="w1")
+
+        assert first == second == "42 calls"
+        assert client.last_cache_hit is True
+        _completions(client).assert_called_once()
+        assert cache.stats.hits == 1
+
+    def test_repeated_question_in_session_is_served_from_cache(self) -> None:
+        """Test that a repeat question hits although the history has grown."""
+        client = self._client(ResponseCache())
+        history = [
+            {"role": "user", "content": "Who called most?"},
+            {"role": "assistant", "content": "Alice"},
+        ]
+
+        client.query_calls("How many calls?", "data", history, watermark="w1")
+        history += [
+            {"role": "user", "content": "How many calls?"},
+            {"role": "assistant", "content": "42 calls"},
+        ]
+        answer = client.query_calls("How many calls?", "data", history, watermark="w1")
+
+        assert answer == "42 calls"
+        assert client.last_cache_hit is True
+        _completions(client).assert_called_once()
+
+    def test_new_data_misses_cache(self) -> None:
+        """Test that a different watermark or context triggers a new completion."""
+        client = self._client(ResponseCache())
+
+        client.query_calls("How many calls?", "data", watermark="w1")
+        client.query_calls("How many calls?", "data", watermark="w2")
+        client.query_calls("How many calls?", "other data", watermark="w2")
+
+        assert _completions(client).call_count == 3
+
+    def test_paraphrase_reuses_answer(self) -> None:
+        """Test the semantic layer through the client."""
+        embeddings = {"How many calls?": [1.0, 0.0], "Number of calls?": [0.99, 0.1]}
+        cache = ResponseCache(similarity_threshold=0.95, embed=embeddings.__getitem__)
+        client = self._client(cache)
+
+        client.query_calls("How many calls?", "data", watermark="w1")
+        answer = client.query_calls("Number of calls?", "data", watermark="w1")
+
+        assert answer == "42 calls"
+        assert cache.stats.semantic_hits == 1
+        _completions(client).assert_called_once()
+
+    def test_tool_answers_are_cached(self) -> None:
+        """Test that answers gathered with tools are reused without rerunning them."""
+        client = self._client(ResponseCache())
+        handler = MagicMock(return_value={})
+        tools = [{"type": "function", "function": {"name": "get_call_summary"}}]
+
+        for _ in range(2):
+            answer = client.chat_with_tools(
+                "How many calls?", tools, handler, watermark="w1"
+            )
+
+        assert answer == "42 calls"
+        _completions(client).assert_called_once()
+
+
+class TestToolCalling:
+    """Tests for LLMClient.chat_with_tools."""
+
+    def test_runs_tools_until_answer(self) -> None:
+        """Test that tool results are sent back until the model answers."""
+        client = LLMClient(use_azure=False)
+        client._client = MagicMock()
+        create = client._client.chat.completions.create
+        create.side_effect = [
+            _reply(
+                tool_calls=[
+                    _tool_call("c1", "get_call_summary", '{"user": "alice"}'),
+                    _tool_call("c2", "get_peak_concurrency", "not json"),
+                ]
+            ),
+            _reply("Alice made 3 calls."),
+        ]
+        handler = MagicMock(return_value={"total_calls": 3})
+        tools = [{"type": "function", "function": {"name": "get_call_summary"}}]
+
+        answer = client.chat_with_tools(
+            "How many calls did Alice make?", tools, handler, context="overview"
+        )
+
+        assert answer == "Alice made 3 calls."
+        handler.assert_called_once_with("get_call_summary", {"user": "alice"})
+        messages = create.call_args_list[1].kwargs["messages"]
+        assert messages[-3]["tool_calls"][0]["function"]["name"] == "get_call_summary"
+        assert messages[-2] == {
+            "role": "tool",
+            "tool_call_id": "c1",
+            "content": '{"total_calls": 3}',
+        }
+        assert "Invalid JSON" in json.loads(messages[-1]["content"])["error"]
+        assert create.call_args_list[0].kwargs["tools"] == tools
+        assert create.call_args_list[0].kwargs["tool_choice"] == "auto"
+
+    def test_final_round_disables_tools(self) -> None:
+        """Test that the model must answer once the round limit is hit."""
+        client = LLMClient(use_azure=False)
+        client._client = MagicMock()
+        create = client._client.chat.completions.create
+        create.side_effect = [
+            _reply(tool_calls=[_tool_call("c1", "get_call_summary", "{}")]),
+            _reply("Done.", tool_calls=[_tool_call("c2", "get_call_summary", "{}")]),
+        ]
+        handler = MagicMock(return_value={})
+
+        answer = client.chat_with_tools("Q", [], handler, max_rounds=1)
+
+        assert answer == "Done."
+        assert handler.call_count == 1
+        assert create.call_args_list[1].kwargs["tool_choice"] == "none"
@@ -0,0 +1,133 @@
+"""
+Tests for the fake LLM server and LLMClient streaming.
+"""
+
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eden_teams.models.llm_client import LLMClient
+from eden_teams.testing.llm_server import FakeLLMConfig, FakeLLMServer, FakeToolCall
+
+
+@pytest.fixture
+def server() -> Iterator[FakeLLMServer]:
+    """Provide a running fake LLM server."""
+    with FakeLLMServer(FakeLLMConfig(reply="Three calls were made today.")) as srv:
+        yield srv
+
+
+def _client(server: FakeLLMServer) -> LLMClient:
+    """Create an LLMClient pointed at the fake server."""
+    with patch("eden_teams.models.llm_client.settings") as mock_settings:
+        mock_settings.openai_api_key = "test-key"
+        mock_settings.openai_base_url = server.base_url
+        client = LLMClient(model="gpt-4", use_azure=False)
+        client._get_client()
+    return client
+
+
+class TestFakeLLMServer:
+    """Tests for FakeLLMServer class."""
+
+    def test_blocking_chat(self, server: FakeLLMServer) -> None:
+        """Test a non-streaming completion through the OpenAI SDK."""
+        client = _client(server)
+
+        assert client.chat("How many calls?") == "Three calls were made today."
+        assert server.requests[0]["messages"][-1]["content"] == "How many calls?"
+        assert "stream" not in server.requests[0]
+
+    def test_stream_yields_tokens(self, server: FakeLLMServer) -> None:
+        """Test that streamed fragments arrive one token at a time."""
+        client = _client(server)
+
+        fragments = list(client.chat_stream("How many calls?"))
+
+        assert fragments == ["Three ", "calls ", "were ", "made ", "today."]
+        stats = client.last_stream_stats
+        assert stats is not None
+        assert stats.completion_tokens == 5
+        assert stats.time_to_first_token is not None
+        assert stats.seconds >= stats.time_to_first_token
+        assert server.requests[0]["stream_options"] == {"include_usage": True}
+
+    def test_cached_stream_replays_answer(self, server: FakeLLMServer) -> None:
+        """Test that a repeated streamed question is replayed from the cache."""
+        client = _client(server)
+
+        first = "".join(client.chat_stream("How many calls?", watermark="w1"))
+        second = list(client.chat_stream("How many calls?", watermark="w1"))
+
+        assert second == [first]
+        assert len(server.requests) == 1
+        stats = client.last_stream_stats
+        assert stats is not None
+        assert stats.cached is True
+
+    def test_abandoned_stream_is_not_cached(self, server: FakeLLMServer) -> None:
+        """Test that a partial answer is never stored."""
+        client = _client(server)
+
+        stream = client.chat_stream("How many calls?")
+        next(stream)
+        stream.close()
+        list(client.chat_stream("How many calls?"))
+
+        assert len(server.requests) == 2
+
+    def test_time_to_first_token(self) -> None:
+        """Test that the first token arrives well before the full answer."""
+        config = FakeLLMConfig(
+            reply=" ".join(["word"] * 20), first_token_ms=50, token_interval_ms=10
+        )
+        with FakeLLMServer(config) as srv:
+            client = _client(srv)
+            fragments = list(client.query_calls_stream("Summarize"))
+
+        stats = client.last_stream_stats
+        assert stats is not None and stats.time_to_first_token is not None
+        assert len(fragments) == 20
+        assert stats.time_to_first_token >= 0.05
+        assert stats.seconds - stats.time_to_first_token >= 0.15
+        assert stats.tokens_per_second > 0
+
+    def test_stream_with_tools(self) -> None:
+        """Test that streamed tool calls are assembled, run and answered."""
+        config = FakeLLMConfig(
+            reply="Alice made 4 calls.",
+            tool_calls=[
+                FakeToolCall(name="get_user_calls", arguments={"user": "alice"})
+            ],
+        )
+        handler = MagicMock(return_value={"total_calls": 4})
+        with FakeLLMServer(config) as srv:
+            client = _client(srv)
+            answer = "".join(
+                client.chat_with_tools_stream(
+                    "How many calls did Alice make?",
+                    tools=[{"type": "function", "function": {"name": "x"}}],
+                    handler=handler,
+                )
+            )
+            requests = srv.requests
+
+        assert answer == "Alice made 4 calls."
+        handler.assert_called_once_with("get_user_calls", {"user": "alice"})
+        assert len(requests) == 2
+        tool_message = requests[1]["messages"][-1]
+        assert tool_message == {
+            "role": "tool",
+            "tool_call_id": "call_0",
+            "content": '{"total_calls": 4}',
+        }
+        assert client.last_stream_stats is not None
+        assert client.last_stream_stats.tool_rounds == 1
+
+    def test_unknown_path(self, server: FakeLLMServer) -> None:
+        """Test that other endpoints return 404."""
+        import httpx
+
+        response = httpx.post(f"{server.base_url}/embeddings", json={})
+        assert response.status_code == 404
@@ -0,0 +1,57 @@
+"""
+Tests for the load-test driver.
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from eden_teams.testing.graph_server import FakeGraphConfig, FakeGraphServer
+from eden_teams.testing.loadtest import main, percentile, run_load_test
+
+
+class TestLoadTest:
+    """Tests for the load-test driver."""
+
+    def test_percentile(self) -> None:
+        """Test nearest-rank percentiles."""
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 0.5) == 50.0
+        assert percentile(samples, 0.99) == 99.0
+        assert percentile(samples, 1.0) == 100.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_run_load_test(self) -> None:
+        """Test a small concurrent run against the fake server."""
+        config = FakeGraphConfig(record_count=120, page_size=50)
+
+        with FakeGraphServer(config) as server:
+            result = run_load_test(
+                server.url,
+                concurrency=2,
+                iterations=2,
+                call_ids=[r["id"] for r in server.records],
+                user_ids=[u["id"] for u in server.users],
+                start_date=config.start_date,
+                end_date=config.start_date + timedelta(days=config.days),
+            )
+
+        assert result.operations == 2 * 2 * 5
+        assert result.errors == 0
+        # Each iteration lists one page and streams all records
+        assert result.records == 2 * 2 * (50 + 120)
+        assert set(result.latency) == {"list", "stream", "record", "sessions", "user"}
+        assert result.latency["stream"].p99_ms >= result.latency["stream"].p50_ms
+        assert "Throughput" in result.format_report()
+
+    def test_unknown_operation(self) -> None:
+        """Test that unknown operations are rejected."""
+        with pytest.raises(ValueError, match="Unknown operations"):
+            run_load_test("http://127.0.0.1:1", operations=["delete"])
+
+    def test_main(self, capsys: pytest.CaptureFixture) -> None:
+        """Test the command line entry point."""
+        exit_code = main(["--records", "50", "--concurrency", "2", "--iterations", "1"])
+
+        assert exit_code == 0
+        assert "Retries:" in capsys.readouterr().out
@@ -2,9 +2,28 @@
 Tests for the main module.
 """
 
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from eden_teams.main import CDRAssistant
+from eden_teams.config import settings
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.main import (
+    CDRAssistant,
+    answer_query,
+    parse_args,
+    run_bench,
+    run_pipeline,
+    run_profile,
+    run_reindex,
+)
+from eden_teams.models.embedding_providers import HashingEmbeddingProvider
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.models.llm_client import StreamStats
+from eden_teams.utils.profiling import Profiler
 
 
 class TestCDRAssistant:
@@ -27,6 +46,23 @@ class TestCDRAssistant:
         assistant.clear_history()
         assert assistant._conversation_history == []
 
+    def test_background_indexer(self) -> None:
+        """Test starting, describing and stopping the background indexer."""
+        service = MagicMock(spec=CallRecordService)
+        service.iter_call_records.return_value = iter([])
+        embeddings = MagicMock()
+        embeddings.watermark = None
+        assistant = CDRAssistant(cdr_service=service, embeddings=embeddings)
+        assert "not running" in assistant.format_index_stats()
+
+        indexer = assistant.start_indexer()
+        try:
+            assert indexer is not None and indexer.running
+            assert "Vector index: 0 records indexed" in assistant.format_index_stats()
+        finally:
+            assistant.stop_indexer()
+        assert not indexer.running
+
     def test_format_call_records_empty(self) -> None:
         """Test formatting empty call records."""
         assistant = CDRAssistant()
@@ -54,3 +90,482 @@ class TestCDRAssistant:
         result = assistant.process_query("Show me calls")
         assert "not configured" in result.lower()
         assert "OpenAI" in result
+
+
+class TestCommands:
+    """Tests for the bench and profile commands."""
+
+    def test_parse_args_keeps_top_level_query(self) -> None:
+        """Test that -q still works without a subcommand."""
+        args = parse_args(["-q", "Show calls", "--days", "14"])
+        assert args.command is None
+        assert args.query == "Show calls"
+        assert args.days == 14
+
+    def test_parse_args_window_controls(self) -> None:
+        """Test parsing the window, limit and context budget options."""
+        args = parse_args(["--days", "90", "--limit", "0", "--context-records", "5"])
+        assistant = CDRAssistant(
+            cdr_service=MagicMock(),
+            days=args.days,
+            limit=args.limit,
+            context_records=args.context_records,
+        )
+
+        working_set = assistant.working_set
+        assert working_set.days == 90
+        assert working_set.limit is None
+        assert working_set.rollup is True
+        assert working_set.sample_size == 5
+
+    def test_format_call_records_budget(self, sample_call_record_data: dict) -> None:
+        """Test that the context lists at most context_records records."""
+        parser = CallRecordService.__new__(CallRecordService)
+        records = [parser._parse_call_record(sample_call_record_data)] * 3
+        assistant = CDRAssistant(context_records=2)
+
+        context = assistant._format_call_records(records, total=50)
+
+        assert context.startswith("Found 50 call record(s)")
+        assert context.count("|p2p|") == 2
+        assert context.endswith("... 48 more records not listed.")
+
+    def test_parse_args_profile(self) -> None:
+        """Test parsing the profile subcommand."""
+        args = parse_args(["profile", "-q", "Top callers", "--profiler", "sample"])
+        assert args.command == "profile"
+        assert args.query == "Top callers"
+        assert args.profiler == "sample"
+        assert args.offline is False
+        assert args.days == settings.query_days
+        assert args.limit == settings.query_record_limit
+
+    def test_run_pipeline_phases(self) -> None:
+        """Test that each pipeline stage runs in its own phase."""
+        service = MagicMock()
+        service.graph.iter_call_records.return_value = iter([{"id": "1"}])
+        service.parse_call_records.return_value = []
+        service.get_call_summary.return_value = {}
+        llm = MagicMock()
+        llm.query_calls.return_value = "answer"
+        assistant = CDRAssistant(cdr_service=service, llm_client=llm)
+        profiler = Profiler(mode="cprofile", trace_memory=False)
+
+        response = run_pipeline(
+            assistant, "q", profiler, datetime(2024, 1, 1), datetime(2024, 1, 2)
+        )
+
+        assert response == "answer"
+        assert list(profiler.phases) == [
+            "graph fetch",
+            "parse",
+            "summarize",
+            "context build",
+            "llm call",
+        ]
+        service.parse_call_records.assert_called_once_with([{"id": "1"}])
+
+    @patch("eden_teams.main.settings")
+    def test_run_bench_offline(
+        self, mock_settings: MagicMock, tmp_path: Path, capsys
+    ) -> None:
+        """Test the bench command end to end against synthetic data."""
+        mock_settings.openai_api_key = ""
+        mock_settings.use_azure_openai = False
+        output = tmp_path / "profile"
+        args = parse_args(
+            ["bench", "--records", "50", "--repeat", "1", "-o", str(output)]
+        )
+
+        assert run_bench(args) == 0
+
+        assert (output / "profile.pstats").exists()
+        assert (output / "stacks.collapsed").exists()
+        assert "graph fetch" in (output / "report.txt").read_text()
+        assert "context build" in capsys.readouterr().out
+
+    @patch("eden_teams.main.settings")
+    def test_run_bench_index(
+        self, mock_settings: MagicMock, tmp_path: Path, capsys
+    ) -> None:
+        """Test that the bench command can measure indexing throughput."""
+        mock_settings.openai_api_key = ""
+        mock_settings.use_azure_openai = False
+        args = parse_args(
+            [
+                "bench",
+                "--records",
+                "30",
+                "--repeat",
+                "2",
+                "--index",
+                "--embedding-provider",
+                "hash",
+                "--profiler",
+                "cprofile",
+                "--no-memory",
+                "-o",
+                str(tmp_path / "profile"),
+            ]
+        )
+
+        assert run_bench(args) == 0
+
+        output = capsys.readouterr().out
+        assert "embed index" in output
+        assert "Indexed 60 records at" in output
+        assert "(hash provider)" in output
+
+    def test_run_reindex_embeds_only_new_records(self, tmp_path: Path, capsys) -> None:
+        """Test that reindexing a persisted index skips what it holds."""
+        argv = [
+            "reindex",
+            "--offline",
+            "--records",
+            "40",
+            "--embedding-provider",
+            "hash",
+            "--path",
+            str(tmp_path),
+        ]
+
+        assert run_reindex(parse_args(argv)) == 0
+        first = capsys.readouterr().out
+        assert "Fetched 40 call records" in first
+        assert "embedded 40, 0 unchanged" in first
+        assert "Index holds 40 records (hash-384)" in first
+
+        # The second run starts from the watermark and embeds nothing
+        assert run_reindex(parse_args(argv)) == 0
+        second = capsys.readouterr().out
+        assert "embedded 0" in second
+        assert "Index holds 40 records" in second
+
+    def test_parse_args_reindex_since(self) -> None:
+        """Test that reindex --since takes an ISO date."""
+        args = parse_args(["reindex", "--since", "2024-01-15"])
+        assert args.command == "reindex"
+        assert args.since == datetime(2024, 1, 15)
+
+    @patch("eden_teams.main.settings")
+    def test_run_profile_requires_graph(self, mock_settings: MagicMock) -> None:
+        """Test that online profiling requires Graph configuration."""
+        mock_settings.graph_configured = False
+        args = parse_args(["profile", "-q", "Top callers"])
+        assert run_profile(args) == 1
+
+
+class TestWorkingSetReuse:
+    """Tests for reusing call records between queries."""
+
+    @patch("eden_teams.main.settings")
+    def test_follow_up_query_uses_cached_records(
+        self, mock_settings: MagicMock, sample_call_record_data: dict
+    ) -> None:
+        """Test that a follow-up question does not refetch records."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = False
+        service = MagicMock()
+        parser = CallRecordService.__new__(CallRecordService)
+        records = [parser._parse_call_record(sample_call_record_data)]
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        service.get_call_summary.return_value = {
+            "total_calls": 1,
+            "total_duration_formatted": "30m 0s",
+            "participant_count": 2,
+            "call_types": {"peerToPeer": 1},
+        }
+        llm = MagicMock()
+        llm.query_calls.return_value = "answer"
+        assistant = CDRAssistant(cdr_service=service, llm_client=llm)
+
+        assistant.process_query("How many calls?")
+        assert assistant.format_last_timing().startswith("[loaded 1 records")
+        assistant.process_query("And how long were they?")
+
+        service.iter_call_records.assert_called_once()
+        service.get_call_summary.assert_called_once()
+        assert llm.query_calls.call_count == 2
+        assert "cached 1 records" in assistant.format_last_timing()
+
+        assistant.clear_working_set()
+        assistant.process_query("Again?")
+        assert service.iter_call_records.call_count == 2
+
+    @patch("eden_teams.main.settings")
+    def test_semantic_ranking_uses_embeddings(
+        self, mock_settings: MagicMock, sample_call_record_data: dict
+    ) -> None:
+        """Test that semantic context ranking searches the vector database."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = False
+        mock_settings.context_retrieval = False
+        service = MagicMock()
+        parser = CallRecordService.__new__(CallRecordService)
+        record = parser._parse_call_record(sample_call_record_data)
+        service.iter_call_records.side_effect = lambda **_: iter([record])
+        service.get_call_summary.return_value = None
+        embeddings = MagicMock()
+        embeddings.search_calls.return_value = [{"id": record.id}]
+        llm = MagicMock()
+        llm.model = "gpt-4"
+        llm.query_calls.return_value = "answer"
+        assistant = CDRAssistant(
+            cdr_service=service,
+            llm_client=llm,
+            context_ranking="semantic",
+            embeddings=embeddings,
+        )
+
+        assistant.process_query("Calls about the launch?")
+
+        assert assistant.context_builder.embeddings is embeddings
+        embeddings.search_calls.assert_called_once_with(
+            "Calls about the launch?",
+            n_results=1,
+            start_time=record.start_time,
+            end_time=record.start_time + timedelta(seconds=1),
+        )
+
+    @patch("eden_teams.main.settings")
+    def test_tool_calling_sends_overview(
+        self, mock_settings: MagicMock, sample_call_record_data: dict
+    ) -> None:
+        """Test that tool calling sends an overview and answers from the index."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = True
+        parser = CallRecordService.__new__(CallRecordService)
+        records = []
+        for i in range(100):
+            data = dict(sample_call_record_data, id=f"call-{i}")
+            records.append(parser._parse_call_record(data))
+        service = MagicMock()
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        llm = MagicMock()
+
+        def answer(query, tools, handler, context, history, watermark):
+            return str(handler("get_user_calls", {"user": "jane@company.com"}))
+
+        llm.chat_with_tools.side_effect = answer
+        assistant = CDRAssistant(cdr_service=service, llm_client=llm)
+
+        response = assistant.process_query("How many calls did Jane join?")
+
+        assert "'total_calls': 100" in response
+        context = llm.chat_with_tools.call_args.kwargs["context"]
+        assert context.startswith("100 call record(s)")
+        full = assistant.build_context(records, parser.get_call_summary(records))
+        assert len(context) * 10 < len(full)
+        llm.query_calls.assert_not_called()
+        service.get_call_summary.assert_not_called()
+
+    @patch("eden_teams.main.settings")
+    def test_context_is_retrieved_for_the_question(
+        self, mock_settings: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that the context lists the indexed calls the question is about."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = False
+        mock_settings.context_retrieval = True
+        mock_settings.working_set_overlap_seconds = 300
+        now = datetime.utcnow().replace(microsecond=0)
+        records = [
+            CallRecord(
+                id=f"call-{i}",
+                call_type=CallType.GROUP_CALL,
+                start_time=now - timedelta(hours=i + 1),
+                participants=[
+                    Participant(display_name="Zed Quinn" if i == 40 else f"User {i}")
+                ],
+            )
+            for i in range(60)
+        ]
+        service = MagicMock()
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        service.get_call_summary.return_value = None
+        llm = MagicMock()
+        llm.query_calls.return_value = "answer"
+        index = EmbeddingsClient(
+            persist_directory=str(tmp_path),
+            embedding_function=HashingEmbeddingProvider(dimension=16),
+        )
+        index.add_call_records(records)
+        assistant = CDRAssistant(
+            cdr_service=service, llm_client=llm, context_records=5, embeddings=index
+        )
+
+        assistant.process_query("Which calls did I have with Zed Quinn?")
+
+        context = llm.query_calls.call_args.kwargs["call_data"]
+        assert context.startswith("Calls selected for the question: ")
+        assert "involving Zed Quinn" in context
+        assert "Found 60 call record(s)." in context
+        rows = context.split("Most relevant calls:")[1].splitlines()
+        assert "Zed Quinn" in rows[2]
+        assert "59 more records not listed" in context
+
+    @patch("eden_teams.main.settings")
+    def test_tool_overview_lists_retrieved_calls(
+        self, mock_settings: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that with tool calling the overview is followed by retrieved calls."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = True
+        mock_settings.context_retrieval = True
+        mock_settings.working_set_overlap_seconds = 300
+        now = datetime.utcnow().replace(microsecond=0)
+        records = [
+            CallRecord(
+                id=f"call-{i}",
+                call_type=CallType.GROUP_CALL,
+                start_time=now - timedelta(hours=i + 1),
+                participants=[
+                    Participant(display_name="Zed Quinn" if i == 40 else f"User {i}")
+                ],
+            )
+            for i in range(60)
+        ]
+        service = MagicMock()
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        llm = MagicMock()
+        llm.chat_with_tools.return_value = "answer"
+        index = EmbeddingsClient(
+            persist_directory=str(tmp_path),
+            embedding_function=HashingEmbeddingProvider(dimension=16),
+        )
+        index.add_call_records(records)
+        assistant = CDRAssistant(
+            cdr_service=service, llm_client=llm, context_records=5, embeddings=index
+        )
+
+        assistant.process_query("Which calls did I have with Zed Quinn?")
+
+        context = llm.chat_with_tools.call_args.kwargs["context"]
+        overview, retrieved = context.split("\n\n", 1)
+        assert overview.startswith("60 call record(s)")
+        assert retrieved.startswith("Calls selected for the question: ")
+        rows = retrieved.split("Most relevant calls:")[1].splitlines()
+        assert "Zed Quinn" in rows[2]
+        assert "Summary Statistics:" not in retrieved
+        llm.query_calls.assert_not_called()
+
+    @patch("eden_teams.main.settings")
+    def test_stale_index_falls_back_to_working_set(
+        self, mock_settings: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that an index missing the newest calls is not searched."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = False
+        mock_settings.context_retrieval = True
+        mock_settings.working_set_overlap_seconds = 300
+        now = datetime.utcnow().replace(microsecond=0)
+        records = [
+            CallRecord(
+                id=f"call-{i}",
+                call_type=CallType.GROUP_CALL,
+                start_time=now - timedelta(hours=i + 1),
+            )
+            for i in range(10)
+        ]
+        service = MagicMock()
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        service.get_call_summary.return_value = None
+        llm = MagicMock()
+        llm.query_calls.return_value = "answer"
+        index = EmbeddingsClient(
+            persist_directory=str(tmp_path),
+            embedding_function=HashingEmbeddingProvider(dimension=16),
+        )
+        index.add_call_records(records[5:])
+        assistant = CDRAssistant(cdr_service=service, llm_client=llm, embeddings=index)
+
+        assistant.process_query("Which calls did I have?")
+
+        context = llm.query_calls.call_args.kwargs["call_data"]
+        assert not context.startswith("Calls selected for the question: ")
+        assert context.startswith("Found 10 call record(s).")
+
+    @patch("eden_teams.main.settings")
+    def test_streamed_answer_is_printed_and_remembered(
+        self, mock_settings: MagicMock, sample_call_record_data: dict, capsys
+    ) -> None:
+        """Test that streamed fragments are printed as they arrive."""
+        mock_settings.graph_configured = True
+        mock_settings.openai_api_key = "key"
+        mock_settings.llm_tool_calling = False
+        parser = CallRecordService.__new__(CallRecordService)
+        service = MagicMock()
+        records = [parser._parse_call_record(sample_call_record_data)]
+        service.iter_call_records.side_effect = lambda **_: iter(records)
+        service.get_call_summary.return_value = None
+        llm = MagicMock()
+        llm.query_calls_stream.return_value = iter(["One ", "call."])
+        llm.last_stream_stats = StreamStats(
+            time_to_first_token=0.4, seconds=1.4, completion_tokens=30
+        )
+        assistant = CDRAssistant(cdr_service=service, llm_client=llm)
+
+        response = answer_query(assistant, "How many calls?")
+
+        assert response == "One call."
+        assert capsys.readouterr().out == "One call.\n"
+        assert assistant._conversation_history[-1] == {
+            "role": "assistant",
+            "content": "One call.",
+        }
+        assert "(first token 0.40s, 30 tok/s)" in assistant.format_last_timing()
+        llm.query_calls.assert_not_called()
+
+
+class TestStartup:
+    """Tests for the CLI's startup cost."""
+
+    # Dependencies only the commands that use them may import
+    HEAVY_MODULES = {"azure", "chromadb", "httpx", "numpy", "openai", "tiktoken"}
+
+    # Importing eden_teams.main takes about 0.25s here, down from 1.2s when
+    # ChromaDB and the Azure SDK were imported eagerly
+    IMPORT_BUDGET_SECONDS = 0.75
+
+    def test_help_imports_no_heavy_dependencies(self) -> None:
+        """Test that --help runs without importing the optional heavy packages."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "eden_teams.main", "--help"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        imported = {
+            line.rsplit("|", 1)[1].strip().split(".")[0]
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        assert "usage:" in result.stdout
+        assert "eden_teams" in imported
+        assert not imported & self.HEAVY_MODULES
+
+    def test_import_time_budget(self) -> None:
+        """Test that a cold import of the CLI stays within its budget."""
+        code = (
+            "import time; start = time.perf_counter(); import eden_teams.main; "
+            "print(time.perf_counter() - start)"
+        )
+        seconds = min(
+            float(
+                subprocess.run(
+                    [sys.executable, "-c", code],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+            )
+            for _ in range(3)
+        )
+        assert seconds < self.IMPORT_BUDGET_SECONDS
@@ -0,0 +1,195 @@
+"""
+Tests for the metrics utilities.
+"""
+
+import random
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import respx
+
+from eden_teams.graph.client import GraphClient
+from eden_teams.models.llm_client import LLMClient
+from eden_teams.utils import metrics
+from eden_teams.utils.metrics import (
+    Histogram,
+    MetricsRegistry,
+    _bucket_index,
+    _bucket_upper,
+)
+
+
+@pytest.fixture
+def enabled_metrics() -> Iterator[MetricsRegistry]:
+    """Enable metrics on a clean default registry for one test."""
+    metrics.registry.reset()
+    metrics.enable()
+    yield metrics.registry
+    metrics.disable()
+    metrics.registry.reset()
+
+
+class TestHistogram:
+    """Tests for Histogram class."""
+
+    def test_bucket_bounds(self) -> None:
+        """Test that every value falls inside its bucket's bounds."""
+        for value in list(range(200)) + [
+            10**k + d for k in range(3, 9) for d in (-1, 0, 7)
+        ]:
+            index = _bucket_index(value)
+            assert value <= _bucket_upper(index)
+            assert index == 0 or _bucket_upper(index - 1) < value
+
+    def test_percentiles_within_relative_error(self) -> None:
+        """Test percentile accuracy against exact order statistics."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-3, 1.5) for _ in range(20000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        for fraction in (0.5, 0.9, 0.99):
+            exact = values[int(fraction * len(values)) - 1]
+            assert histogram.percentile(fraction) == pytest.approx(
+                exact, rel=0.04, abs=2e-6
+            )
+        assert histogram.count == 20000
+        assert histogram.percentile(1.0) == values[-1]
+
+    def test_empty_snapshot(self) -> None:
+        """Test the snapshot of an empty histogram."""
+        snapshot = Histogram().snapshot()
+        assert snapshot["count"] == 0
+        assert snapshot["min"] == 0.0
+        assert snapshot["p99"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry class."""
+
+    def test_labels_are_separate_series(self) -> None:
+        """Test that label sets create distinct metrics."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", status=200).inc()
+        registry.counter("requests_total", status=200).inc()
+        registry.counter("requests_total", status=429).inc()
+
+        snapshot = registry.snapshot()["requests_total"]
+        values = {entry["labels"]["status"]: entry["value"] for entry in snapshot}
+        assert values == {"200": 2, "429": 1}
+
+    def test_kind_conflict(self) -> None:
+        """Test that a name cannot be reused for another metric kind."""
+        registry = MetricsRegistry()
+        registry.counter("x")
+        with pytest.raises(ValueError, match="counter"):
+            registry.gauge("x")
+
+    def test_render_prometheus(self) -> None:
+        """Test the Prometheus text exposition format."""
+        registry = MetricsRegistry()
+        registry.histogram("request_seconds", method="GET").record(0.25)
+        registry.gauge("inflight").set(3)
+        registry.counter("errors_total", reason='say "hi"').inc()
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE eden_request_seconds summary" in text
+        assert 'eden_request_seconds{method="GET",quantile="0.5"} 0.25' in text
+        assert 'eden_request_seconds_count{method="GET"} 1' in text
+        assert "# TYPE eden_inflight gauge\neden_inflight 3" in text
+        assert 'eden_errors_total{reason="say \\"hi\\""} 1' in text
+
+
+class TestRecording:
+    """Tests for the module-level recording functions."""
+
+    def test_disabled_is_noop(self) -> None:
+        """Test that nothing is recorded while disabled."""
+        metrics.registry.reset()
+        assert metrics.is_enabled() is False
+
+        with metrics.timer("t"):
+            pass
+        metrics.increment("c")
+        metrics.set_gauge("g", 1)
+
+        assert metrics.snapshot() == {}
+
+    def test_timer_and_timed(self, enabled_metrics: MetricsRegistry) -> None:
+        """Test that timers and timed functions record durations."""
+
+        @metrics.timed("work_seconds", kind="decorated")
+        def work() -> int:
+            return 42
+
+        with metrics.timer("work_seconds", kind="block"):
+            pass
+        assert work() == 42
+
+        entries = metrics.snapshot()["work_seconds"]
+        assert {e["labels"]["kind"] for e in entries} == {"block", "decorated"}
+        assert all(e["count"] == 1 for e in entries)
+
+    def test_metrics_endpoint(self, enabled_metrics: MetricsRegistry) -> None:
+        """Test scraping the /metrics endpoint."""
+        metrics.increment("scrapes_total")
+        server = metrics.start_metrics_server(0)
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            response = httpx.get(f"{base}/metrics")
+            assert response.status_code == 200
+            assert "text/plain" in response.headers["content-type"]
+            assert "eden_scrapes_total 1" in response.text
+            assert httpx.get(f"{base}/other").status_code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInstrumentation:
+    """Tests for metrics recorded by the application layers."""
+
+    @respx.mock
+    def test_graph_requests(self, enabled_metrics: MetricsRegistry) -> None:
+        """Test that Graph requests, statuses and retries are recorded."""
+        auth = MagicMock()
+        auth.get_token.return_value = "token"
+        respx.get("https://graph.microsoft.com/v1.0/users/u1").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(200, json={"id": "u1"}),
+            ]
+        )
+
+        with GraphClient(auth_provider=auth) as client:
+            client.get_user("u1")
+
+        snapshot = metrics.snapshot()
+        statuses = {
+            e["labels"]["status"]: e["value"] for e in snapshot["graph_requests_total"]
+        }
+        assert statuses == {"200": 1, "429": 1}
+        assert snapshot["graph_retries_total"][0]["value"] == 1
+        assert snapshot["graph_request_seconds"][0]["count"] == 2
+        assert snapshot["graph_inflight_requests"][0]["value"] == 0
+
+    def test_llm_tokens(self, enabled_metrics: MetricsRegistry) -> None:
+        """Test that LLM latency and token usage are recorded."""
+        client = LLMClient(model="gpt-4")
+        response = MagicMock()
+        response.choices[0].message.content = "answer"
+        response.usage.prompt_tokens = 120
+        response.usage.completion_tokens = 30
+        client._client = MagicMock()
+        client._client.chat.completions.create.return_value = response
+
+        client.chat("hello")
+
+        snapshot = metrics.snapshot()
+        tokens = {e["labels"]["kind"]: e["value"] for e in snapshot["llm_tokens_total"]}
+        assert tokens == {"prompt": 120, "completion": 30}
+        assert snapshot["llm_request_seconds"][0]["labels"] == {"model": "gpt-4"}
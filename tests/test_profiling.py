@@ -0,0 +1,101 @@
+"""
+Tests for the profiling utilities.
+"""
+
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from eden_teams.utils.profiling import Profiler
+
+
+def _busy(seconds: float) -> int:
+    """Burn CPU for roughly the given time."""
+    deadline = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+    return count
+
+
+class TestProfiler:
+    """Tests for Profiler class."""
+
+    def test_phases_accumulate(self) -> None:
+        """Test that repeated phases accumulate calls and wall time."""
+        profiler = Profiler(mode="cprofile", trace_memory=False)
+        with profiler:
+            for _ in range(2):
+                with profiler.phase("parse"):
+                    _busy(0.01)
+            with profiler.phase("summarize"):
+                pass
+
+        assert list(profiler.phases) == ["parse", "summarize"]
+        assert profiler.phases["parse"].calls == 2
+        assert profiler.phases["parse"].wall_seconds >= 0.02
+
+    def test_nested_phase_rejected(self) -> None:
+        """Test that phases cannot be nested."""
+        profiler = Profiler(mode="cprofile", trace_memory=False)
+        with profiler.phase("outer"):
+            with pytest.raises(RuntimeError, match="inside phase 'outer'"):
+                with profiler.phase("inner"):
+                    pass
+
+    def test_sampling_collapsed_stacks(self) -> None:
+        """Test that samples are attributed to the active phase."""
+        profiler = Profiler(mode="sample", trace_memory=False)
+        with profiler:
+            with profiler.phase("graph fetch"):
+                _busy(0.1)
+
+        assert profiler.phases["graph fetch"].samples > 0
+        stack = next(iter(profiler.stacks))
+        assert stack.startswith("graph fetch;")
+        assert stack.endswith("test_profiling:_busy")
+
+    def test_memory_tracing(self) -> None:
+        """Test that allocations retained by a phase are reported."""
+        profiler = Profiler(mode="cprofile", top_allocations=3)
+        with profiler:
+            with profiler.phase("build"):
+                retained = [bytearray(1024) for _ in range(500)]
+
+        stats = profiler.phases["build"]
+        assert stats.retained_bytes >= 500 * 1024
+        assert stats.peak_bytes >= 500 * 1024
+        assert len(stats.top_allocations) <= 3
+        assert "test_profiling.py" in stats.top_allocations[0].location
+        del retained
+
+    def test_write_outputs(self, tmp_path: Path) -> None:
+        """Test that pstats, collapsed stacks and the report are written."""
+        profiler = Profiler(mode="all")
+        with profiler:
+            with profiler.phase("graph fetch"):
+                _busy(0.05)
+            with profiler.phase("llm call"):
+                _busy(0.05)
+
+        written = profiler.write(tmp_path / "out")
+        names = {path.name for path in written}
+
+        assert names == {
+            "profile.pstats",
+            "graph-fetch.pstats",
+            "llm-call.pstats",
+            "stacks.collapsed",
+            "report.txt",
+        }
+        stats = pstats.Stats(str(tmp_path / "out" / "profile.pstats"))
+        functions = stats.stats  # type: ignore[attr-defined]
+        assert any(func[2] == "_busy" for func in functions)
+        for line in (tmp_path / "out" / "stacks.collapsed").read_text().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert stack.split(";")[0] in ("graph fetch", "llm call")
+            assert int(count) > 0
+        report = (tmp_path / "out" / "report.txt").read_text()
+        assert "graph fetch" in report and "llm call" in report
@@ -0,0 +1,61 @@
+"""
+Tests for the store of full call records.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from eden_teams.cdr.models import CallRecord, CallType, Participant
+from eden_teams.models.record_store import RecordStore
+
+
+def _record(call_id: str, version: int = 1) -> CallRecord:
+    """Create a call record with a join URL the index does not keep."""
+    return CallRecord(
+        id=call_id,
+        version=version,
+        call_type=CallType.GROUP_CALL,
+        start_time=datetime(2024, 1, 15, 10),
+        participants=[Participant(email="alice@contoso.com")],
+        join_web_url=f"https://teams.example/{call_id}",
+    )
+
+
+class TestRecordStore:
+    """Tests for RecordStore class."""
+
+    def test_round_trip_and_replace(self, tmp_path: Path) -> None:
+        """Test that records are stored whole and replaced by ID."""
+        path = str(tmp_path / "index" / "records.db")
+        store = RecordStore(path)
+        store.put_many([_record("a"), _record("b")])
+        store.put_many([_record("a", version=2)])
+        store.close()
+
+        reopened = RecordStore(path)
+        found = reopened.get_many(["a", "b", "missing"])
+
+        assert len(reopened) == 2
+        assert set(found) == {"a", "b"}
+        assert found["a"].version == 2
+        assert found["b"] == _record("b")
+
+    def test_many_ids(self, tmp_path: Path) -> None:
+        """Test lookups of more IDs than one SQLite statement takes."""
+        store = RecordStore(str(tmp_path / "records.db"))
+        store.put_many(_record(f"call-{i}") for i in range(2000))
+
+        found = store.get_many([f"call-{i}" for i in range(0, 2000, 2)])
+
+        assert len(found) == 1000
+
+    def test_delete_and_clear(self, tmp_path: Path) -> None:
+        """Test removing records."""
+        store = RecordStore(str(tmp_path / "records.db"))
+        store.put_many([_record("a"), _record("b"), _record("c")])
+
+        store.delete(["a"])
+        assert set(store.get_many(["a", "b", "c"])) == {"b", "c"}
+
+        store.clear()
+        assert len(store) == 0
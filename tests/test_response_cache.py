@@ -0,0 +1,144 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from eden_teams.models.response_cache import ResponseCache, fingerprint
+
+# Questions embedded along two axes: call counts and durations
+EMBEDDINGS: Dict[str, List[float]] = {
+    "how many calls yesterday?": [1.0, 0.0],
+    "how many calls were there yesterday?": [0.98, 0.05],
+    "average call duration this week?": [0.0, 1.0],
+}
+
+
+class FakeClock:
+    """Settable Unix time."""
+
+    def __init__(self) -> None:
+        """Start at a fixed time."""
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+class TestFingerprint:
+    """Tests for fingerprint function."""
+
+    def test_stable_and_order_independent(self) -> None:
+        """Test that equal requests hash equally regardless of key order."""
+        assert fingerprint({"a": 1, "b": 2}, "x") == fingerprint({"b": 2, "a": 1}, "x")
+        assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+class TestResponseCache:
+    """Tests for ResponseCache class."""
+
+    def test_exact_hit_and_miss(self) -> None:
+        """Test that only the exact key is served without the semantic layer."""
+        cache = ResponseCache()
+        cache.store("k1", "42 calls", question="how many calls yesterday?", seconds=2.5)
+
+        entry = cache.lookup("k1")
+        assert entry is not None
+        assert entry.answer == "42 calls"
+        assert cache.lookup("k2", question="how many calls yesterday?") is None
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+        assert stats.saved_seconds == 2.5
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Test that the cache keeps at most max_entries entries."""
+        cache = ResponseCache(max_entries=2)
+        cache.store("a", "A")
+        cache.store("b", "B")
+        cache.lookup("a")
+        cache.store("c", "C")
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.lookup("c") is not None
+
+    def test_entries_expire(self) -> None:
+        """Test that entries older than the time to live are not served."""
+        clock = FakeClock()
+        cache = ResponseCache(ttl_seconds=60, clock=clock)
+        cache.store("a", "A")
+
+        clock.now += 59
+        assert cache.lookup("a") is not None
+        clock.now += 1
+        assert cache.lookup("a") is None
+        assert len(cache) == 0
+
+    def test_semantic_hit_for_paraphrase(self) -> None:
+        """Test that a paraphrased question in the same scope reuses the answer."""
+        cache = ResponseCache(similarity_threshold=0.95, embed=EMBEDDINGS.__getitem__)
+        cache.store("k1", "42 calls", scope="s", question="how many calls yesterday?")
+        cache.store(
+            "k2", "18 minutes", scope="s", question="average call duration this week?"
+        )
+
+        entry = cache.lookup(
+            "k3", scope="s", question="how many calls were there yesterday?"
+        )
+
+        assert entry is not None
+        assert entry.answer == "42 calls"
+        assert cache.stats.semantic_hits == 1
+
+    def test_semantic_match_stays_in_scope(self) -> None:
+        """Test that paraphrases asked against other data are not matched."""
+        cache = ResponseCache(similarity_threshold=0.95, embed=EMBEDDINGS.__getitem__)
+        cache.store("k1", "42 calls", scope="s1", question="how many calls yesterday?")
+
+        assert (
+            cache.lookup(
+                "k2", scope="s2", question="how many calls were there yesterday?"
+            )
+            is None
+        )
+
+    def test_invalidate_drops_other_watermarks(self) -> None:
+        """Test that answers about outdated data are dropped."""
+        cache = ResponseCache()
+        cache.store("old", "A", watermark="w1")
+        cache.store("new", "B", watermark="w2")
+        cache.store("plain", "C")
+
+        assert cache.invalidate("w2") == 1
+        assert cache.lookup("old") is None
+        assert cache.lookup("new") is not None
+        assert cache.lookup("plain") is not None
+        assert cache.invalidate() == 2
+
+    def test_persists_between_instances(self, tmp_path: Path) -> None:
+        """Test that entries are saved to and loaded from the cache file."""
+        path = tmp_path / "cache" / "responses.json"
+        clock = FakeClock()
+        ResponseCache(path=str(path), clock=clock).store("a", "A", seconds=1.0)
+
+        assert json.loads(path.read_text())["entries"]["a"]["answer"] == "A"
+        entry = ResponseCache(path=str(path), clock=clock).lookup("a")
+        assert entry is not None
+        assert entry.answer == "A"
+
+        clock.now += 3600
+        assert len(ResponseCache(path=str(path), clock=clock)) == 0
+
+    def test_unreadable_file_is_ignored(self, tmp_path: Path) -> None:
+        """Test that a corrupt cache file starts an empty cache."""
+        path = tmp_path / "responses.json"
+        path.write_text("{not json")
+
+        cache = ResponseCache(path=str(path))
+
+        assert len(cache) == 0
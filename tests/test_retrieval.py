@@ -0,0 +1,174 @@
+"""
+Tests for parsing filters from questions.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+
+from eden_teams.cdr.models import CallRecord, CallType
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.models.embedding_providers import HashingEmbeddingProvider
+from eden_teams.models.embeddings import EmbeddingsClient
+from eden_teams.models.retrieval import (
+    QueryFilters,
+    hydrate_results,
+    parse_query_filters,
+)
+
+# A Wednesday
+NOW = datetime(2024, 1, 17, 15, 30)
+
+
+class TestParseQueryFilters:
+    """Tests for parse_query_filters function."""
+
+    def test_relative_dates(self) -> None:
+        """Test that relative date phrases become start and end times."""
+        cases = {
+            "calls today": (datetime(2024, 1, 17), datetime(2024, 1, 18)),
+            "calls yesterday": (datetime(2024, 1, 16), datetime(2024, 1, 17)),
+            "last 3 days": (datetime(2024, 1, 14, 15, 30), None),
+            "the past 2 hours": (datetime(2024, 1, 17, 13, 30), None),
+            "last week": (datetime(2024, 1, 8), datetime(2024, 1, 15)),
+            "this week": (datetime(2024, 1, 15), None),
+            "last month": (datetime(2023, 12, 1), datetime(2024, 1, 1)),
+            "on Monday": (datetime(2024, 1, 15), datetime(2024, 1, 16)),
+        }
+        for query, expected in cases.items():
+            filters = parse_query_filters(query, now=NOW)
+            assert (filters.start_time, filters.end_time) == expected, query
+
+    def test_iso_dates(self) -> None:
+        """Test that ISO dates and their prepositions set the range."""
+        since = parse_query_filters("calls since 2024-01-10", now=NOW)
+        assert since.start_time == datetime(2024, 1, 10)
+        assert since.end_time is None
+
+        between = parse_query_filters(
+            "calls between 2024-01-02 and 2024-01-05", now=NOW
+        )
+        assert between.start_time == datetime(2024, 1, 2)
+        assert between.end_time == datetime(2024, 1, 6)
+
+        on = parse_query_filters("what happened on 2024-01-03?", now=NOW)
+        assert (on.start_time, on.end_time) == (
+            datetime(2024, 1, 3),
+            datetime(2024, 1, 4),
+        )
+
+    def test_call_type_and_names(self) -> None:
+        """Test that call types, names and email addresses are found."""
+        filters = parse_query_filters(
+            "Which 1:1 calls did I have with Alice Smith and bob@contoso.com "
+            "on Friday?",
+            now=NOW,
+        )
+        assert filters.call_type == CallType.PEER_TO_PEER
+        assert filters.names == ["bob@contoso.com", "Alice Smith"]
+        assert filters.keywords == "bob@contoso.com Alice Smith"
+        assert filters.start_time == datetime(2024, 1, 12)
+
+        meetings = parse_query_filters("How many meetings were organized by Carol?")
+        assert meetings.call_type == CallType.GROUP_CALL
+        assert meetings.names == ["Carol"]
+
+    def test_unconstrained_question(self) -> None:
+        """Test that a question without constraints sets no filters."""
+        filters = parse_query_filters("what is the average call duration?")
+        assert filters == QueryFilters()
+        assert filters.keywords is None
+        assert filters.search_kwargs() == {}
+        assert filters.describe() == ""
+
+    def test_search_kwargs_and_description(self) -> None:
+        """Test the search arguments and summary line for a set of filters."""
+        filters = parse_query_filters("group calls with Dave yesterday", now=NOW)
+        assert filters.search_kwargs() == {
+            "start_time": datetime(2024, 1, 16),
+            "end_time": datetime(2024, 1, 17),
+            "call_type": "groupCall",
+        }
+        assert filters.describe() == (
+            "started 2024-01-16 00:00 to 2024-01-17 00:00 UTC; "
+            "type groupCall; involving Dave"
+        )
+
+
+class TestHydrateResults:
+    """Tests for hydrate_results function."""
+
+    def test_records_come_from_memory_index_then_graph(self, tmp_path: Path) -> None:
+        """Test each lookup tier, in result order, with one Graph batch."""
+        full = [
+            CallRecord(
+                id=f"call-{i}",
+                call_type=CallType.MEETING,
+                start_time=datetime(2024, 1, 15, 10 + i),
+                join_web_url=f"https://teams.example/{i}",
+            )
+            for i in range(4)
+        ]
+        client = EmbeddingsClient(
+            persist_directory=str(tmp_path),
+            embedding_function=HashingEmbeddingProvider(8),
+        )
+        # call-2 and call-3 were indexed before full records were stored
+        client.record_store.put_many(full[:2])
+        results = [
+            {
+                "id": record.id,
+                "document": client._record_to_document(record),
+                "metadata": client._record_to_metadata(record),
+            }
+            for record in full
+        ]
+        service = MagicMock(spec=CallRecordService)
+        service.get_call_records_by_id.return_value = {"call-3": full[3]}
+
+        hydrated = hydrate_results(results, [full[1]], service, client)
+
+        assert [r.id for r in hydrated] == ["call-0", "call-1", "call-2", "call-3"]
+        assert hydrated[0] == full[0]
+        assert hydrated[1] is full[1]
+        # Not found in Graph: rebuilt from the index without the URL
+        assert hydrated[2].join_web_url is None
+        assert hydrated[3] is full[3]
+        service.get_call_records_by_id.assert_called_once_with(["call-2", "call-3"])
+
+    def test_graph_failure_falls_back_to_index(self) -> None:
+        """Test that a failed fetch still yields a record per result."""
+        service = MagicMock(spec=CallRecordService)
+        service.get_call_records_by_id.side_effect = httpx.ConnectError("down")
+        result = {
+            "id": "call-1",
+            "document": "Call Type: groupCall | Participants: Ann Lee",
+            "metadata": {
+                "call_type": "groupCall",
+                "start_time": "2024-01-15T10:00:00",
+            },
+        }
+
+        hydrated = hydrate_results([result], service=service)
+
+        assert len(hydrated) == 1
+        assert hydrated[0].participants[0].identifier == "Ann Lee"
+
+    def test_result_without_start_time_is_skipped(self) -> None:
+        """Test that a result that can be neither fetched nor rebuilt is dropped."""
+        service = MagicMock(spec=CallRecordService)
+        service.get_call_records_by_id.return_value = {}
+        results = [
+            {"id": "call-1", "document": "", "metadata": {"call_type": "groupCall"}},
+            {
+                "id": "call-2",
+                "document": "",
+                "metadata": {"start_time": "2024-01-15T10:00:00"},
+            },
+        ]
+
+        hydrated = hydrate_results(results, service=service)
+
+        assert [record.id for record in hydrated] == ["call-2"]
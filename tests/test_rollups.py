@@ -0,0 +1,73 @@
+"""
+Tests for call record rollups.
+"""
+
+from datetime import datetime, timedelta
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.rollups import CallRollup
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.testing.synthetic import SyntheticCDRConfig, SyntheticCDRGenerator
+
+
+def _records(count: int) -> list:
+    """Generate parsed synthetic call records."""
+    service = CallRecordService.__new__(CallRecordService)
+    generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=3))
+    return service.parse_call_records(list(generator.iter_call_records(count)))
+
+
+class TestCallRollup:
+    """Tests for CallRollup class."""
+
+    def test_summary_matches_service(self) -> None:
+        """Test that the rollup summary agrees with get_call_summary."""
+        records = _records(200)
+        expected = CallRecordService.__new__(CallRecordService).get_call_summary(
+            records
+        )
+
+        summary = CallRollup().add_all(records).summary()
+
+        for key, value in expected.items():
+            assert summary[key] == value, key
+        assert sum(summary["daily_counts"].values()) == 200
+        assert len(summary["top_organizers"]) <= 5
+
+    def test_combine_equals_single_pass(self) -> None:
+        """Test that combining partial rollups matches one rollup."""
+        records = _records(120)
+        whole = CallRollup(sample_size=5).add_all(records)
+        parts = [
+            CallRollup(sample_size=5).add_all(records[i : i + 40])
+            for i in range(0, 120, 40)
+        ]
+
+        combined = CallRollup.combine(parts, sample_size=5)
+
+        assert combined.summary() == whole.summary()
+        assert [r.id for r in combined.sample] == [r.id for r in whole.sample]
+
+    def test_sample_keeps_newest(self) -> None:
+        """Test that the sample holds the most recent records, newest first."""
+        start = datetime(2024, 1, 1)
+        rollup = CallRollup(sample_size=3)
+        for i in range(10):
+            rollup.add(
+                CallRecord(
+                    id=str(i),
+                    start_time=start + timedelta(hours=i),
+                    end_time=start + timedelta(hours=i, minutes=5),
+                )
+            )
+
+        assert [r.id for r in rollup.sample] == ["9", "8", "7"]
+        assert rollup.count == 10
+        assert rollup.first_start == start
+
+    def test_empty_summary(self) -> None:
+        """Test summarizing an empty rollup."""
+        summary = CallRollup().summary()
+        assert summary["total_calls"] == 0
+        assert summary["average_duration_seconds"] == 0
+        assert "date_range" not in summary
@@ -0,0 +1,169 @@
+"""
+Tests for the map-reduce summarizer.
+"""
+
+import threading
+import time
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+from eden_teams.models.context import TokenCounter
+from eden_teams.models.llm_client import LLMClient
+from eden_teams.models.response_cache import ResponseCache
+from eden_teams.models.summarizer import MapReduceSummarizer, chunk_texts
+
+COUNTER = TokenCounter("gpt-4")
+
+
+def _summaries(count: int, start: int = 0) -> List[str]:
+    """Create distinct call summaries of similar length."""
+    return [
+        f"Call {i}: meeting organized by user{i % 7}@contoso.com, 25 minutes"
+        for i in range(start, start + count)
+    ]
+
+
+class FakeClient:
+    """LLM client stand-in that records prompts and concurrency."""
+
+    model = "gpt-4"
+    system_prompt = "system"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize the fake."""
+        self.token_counter = COUNTER
+        self.prompts: List[str] = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def chat(
+        self, prompt: str, max_tokens: Optional[int] = None, cache: bool = True
+    ) -> str:
+        """Answer with a short summary of the prompt."""
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return f"summary of {prompt.count('Call ')} calls"
+
+
+def _summarizer(client: FakeClient, **kwargs: int) -> MapReduceSummarizer:
+    """Create a summarizer with small chunks."""
+    options = {"chunk_tokens": 400, "partial_tokens": 50, "max_workers": 3}
+    options.update(kwargs)
+    cache = ResponseCache(ttl_seconds=None)
+    return MapReduceSummarizer(client, cache=cache, **options)  # type: ignore[arg-type]
+
+
+class TestChunkTexts:
+    """Tests for chunk_texts function."""
+
+    def test_small_input_is_one_chunk(self) -> None:
+        """Test that texts fitting the budget are not split."""
+        texts = _summaries(3)
+        assert chunk_texts(texts, COUNTER, 1000) == [texts]
+        assert chunk_texts([], COUNTER, 1000) == []
+
+    def test_chunks_fit_budget_and_keep_order(self) -> None:
+        """Test that every chunk fits the budget and no text is lost."""
+        texts = _summaries(200)
+
+        chunks = chunk_texts(texts, COUNTER, 400)
+
+        assert len(chunks) > 1
+        assert [t for chunk in chunks for t in chunk] == texts
+        for chunk in chunks:
+            assert COUNTER.count("\n\n".join(chunk)) <= 400
+
+    def test_boundaries_survive_insertions(self) -> None:
+        """Test that adding a text early only changes the chunks around it."""
+        texts = _summaries(400)
+        before = chunk_texts(texts, COUNTER, 400)
+        after = chunk_texts(texts[:5] + ["Call new: extra"] + texts[5:], COUNTER, 400)
+
+        unchanged = {tuple(c) for c in before} & {tuple(c) for c in after}
+        assert len(unchanged) >= len(before) - 3
+
+    def test_oversized_text_is_truncated(self) -> None:
+        """Test that a single text longer than the budget is cut to fit."""
+        chunks = chunk_texts(["x" * 4000, "short"], COUNTER, 100)
+
+        assert COUNTER.count(chunks[0][0]) < 100
+
+
+class TestMapReduceSummarizer:
+    """Tests for MapReduceSummarizer class."""
+
+    def test_small_input_uses_one_request(self) -> None:
+        """Test that summaries fitting one request are summarized directly."""
+        client = FakeClient()
+        summarizer = _summarizer(client)
+
+        summarizer.summarize(_summaries(3), time_period="last week")
+
+        assert len(client.prompts) == 1
+        assert "comprehensive summary" in client.prompts[0]
+        assert "last week" in client.prompts[0]
+        assert summarizer.last_stats is not None
+        assert summarizer.last_stats.levels == 1
+
+    def test_large_input_is_mapped_and_reduced(self) -> None:
+        """Test that large inputs are chunked, summarized and combined."""
+        client = FakeClient()
+        summarizer = _summarizer(client)
+
+        result = summarizer.summarize(_summaries(500), time_period="last week")
+
+        stats = summarizer.last_stats
+        assert stats is not None
+        assert stats.chunks > 1
+        assert stats.levels >= 2
+        assert stats.requests == len(client.prompts)
+        map_prompts = [p for p in client.prompts if "Call Records:" in p]
+        assert len(map_prompts) == stats.chunks
+        assert sum(p.count("@contoso.com") for p in map_prompts) == 500
+        assert "Partial Summaries:" in client.prompts[-1]
+        assert "comprehensive summary" in client.prompts[-1]
+        assert result.startswith("summary of")
+
+    def test_parallelism_is_bounded(self) -> None:
+        """Test that chunks run concurrently, up to max_workers at a time."""
+        client = FakeClient(delay=0.02)
+        summarizer = _summarizer(client, max_workers=2)
+
+        summarizer.summarize(_summaries(300))
+
+        assert client.max_active == 2
+
+    def test_rerun_only_processes_changed_chunks(self) -> None:
+        """Test that unchanged chunks are answered from the cache."""
+        client = FakeClient()
+        summarizer = _summarizer(client)
+        texts = _summaries(500)
+        summarizer.summarize(texts)
+        first = summarizer.last_stats
+        assert first is not None
+
+        client.prompts.clear()
+        summarizer.summarize(texts[:250] + ["Call new: 5 minutes"] + texts[250:])
+
+        second = summarizer.last_stats
+        assert second is not None
+        assert second.cached > 0
+        map_prompts = [p for p in client.prompts if "Call Records:" in p]
+        assert 1 <= len(map_prompts) <= 3
+        assert second.requests < first.requests
+
+    def test_llm_client_delegates_to_summarizer(self) -> None:
+        """Test that LLMClient.summarize_calls uses the summarizer."""
+        client = LLMClient(use_azure=False)
+        client._summarizer = MagicMock()
+        client._summarizer.summarize.return_value = "done"
+
+        assert client.summarize_calls(["a"], "today") == "done"
+        client._summarizer.summarize.assert_called_once_with(["a"], "today")
@@ -0,0 +1,135 @@
+"""
+Tests for the synthetic CDR generator.
+"""
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from eden_teams.cdr.models import CallType
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.testing.synthetic import (
+    SyntheticCDRConfig,
+    SyntheticCDRGenerator,
+    main,
+    read_jsonl,
+)
+
+
+class TestSyntheticCDRGenerator:
+    """Tests for SyntheticCDRGenerator class."""
+
+    def test_deterministic(self) -> None:
+        """Test that the same seed produces the same records."""
+        first = list(
+            SyntheticCDRGenerator(SyntheticCDRConfig(seed=7)).iter_call_records(20)
+        )
+        second = list(
+            SyntheticCDRGenerator(SyntheticCDRConfig(seed=7)).iter_call_records(20)
+        )
+        other = list(
+            SyntheticCDRGenerator(SyntheticCDRConfig(seed=8)).iter_call_records(20)
+        )
+
+        assert first == second
+        assert first != other
+
+    def test_streams_share_directory(self) -> None:
+        """Test that record streams differ but share the same users."""
+        config = SyntheticCDRConfig(seed=1)
+        a = SyntheticCDRGenerator(config, stream=0)
+        b = SyntheticCDRGenerator(config, stream=1)
+
+        assert a.users == b.users
+        assert a.generate_call_record()["id"] != b.generate_call_record()["id"]
+
+    def test_single_user_directory(self) -> None:
+        """Test that a one-user directory still produces every call type."""
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=3, user_count=1))
+        records = list(generator.iter_call_records(30))
+
+        assert {r["type"] for r in records} >= {"peerToPeer"}
+        assert all(len(r["participants"]) == 1 for r in records)
+
+    def test_records_parse(self) -> None:
+        """Test that generated records and sessions parse into models."""
+        service = CallRecordService.__new__(CallRecordService)
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(seed=3))
+
+        for raw in generator.iter_call_records(50):
+            record = service._parse_call_record(raw)
+            sessions = [service._parse_session(s) for s in raw["sessions"]]
+
+            assert record.id == raw["id"]
+            assert record.duration_seconds is not None
+            assert record.duration_seconds >= 5
+            assert record.organizer is not None
+            assert record.participant_count >= 2
+            assert sessions[0].start_time == record.start_time
+
+    def test_media_streams(self) -> None:
+        """Test that sessions carry segment media quality streams."""
+        generator = SyntheticCDRGenerator(SyntheticCDRConfig(video_rate=1.0))
+        record = generator.generate_call_record()
+        media = record["sessions"][0]["segments"][0]["media"]
+
+        assert [m["label"] for m in media] == ["main-audio", "main-video"]
+        stream = media[1]["streams"][0]
+        assert stream["averageJitter"].startswith("PT")
+        assert 0.0 <= stream["averagePacketLossRate"] <= 1.0
+        assert "averageVideoFrameRate" in stream
+
+    def test_distributions(self) -> None:
+        """Test call type mix, diurnal pattern and heavy-tailed organizers."""
+        config = SyntheticCDRConfig(seed=11, include_sessions=False, user_count=200)
+        records = list(SyntheticCDRGenerator(config).iter_call_records(5000))
+
+        types = Counter(r["type"] for r in records)
+        assert abs(types[CallType.PEER_TO_PEER.value] / 5000 - 0.55) < 0.05
+
+        hours = Counter(int(r["startDateTime"][11:13]) for r in records)
+        assert hours[10] > 10 * hours[2]
+
+        organizers = Counter(r["organizer"]["identity"]["user"]["id"] for r in records)
+        top_share = sum(c for _, c in organizers.most_common(10)) / 5000
+        assert top_share > 0.25
+
+        sizes = [len(r["participants"]) for r in records if r["type"] == "meeting"]
+        assert min(sizes) >= 3
+        assert max(sizes) > 20
+
+    def test_write_jsonl_independent_of_workers(self, tmp_path: Path) -> None:
+        """Test that chunked output matches a sequential stream."""
+        config = SyntheticCDRConfig(seed=5, include_sessions=False)
+        generator = SyntheticCDRGenerator(config)
+
+        written = generator.write_jsonl(tmp_path / "calls.jsonl", 25, chunk_size=10)
+        records = list(read_jsonl(tmp_path / "calls.jsonl"))
+
+        assert written == 25
+        expected = list(SyntheticCDRGenerator(config, stream=0).iter_call_records(10))
+        assert records[:10] == expected
+
+    def test_write_partitions(self, tmp_path: Path) -> None:
+        """Test writing date partitions."""
+        config = SyntheticCDRConfig(days=3, include_sessions=False)
+        files = SyntheticCDRGenerator(config).write_partitions(tmp_path, 300)
+
+        assert [f.parent.name for f in files] == [
+            "date=2024-01-01",
+            "date=2024-01-02",
+            "date=2024-01-03",
+        ]
+        records = list(read_jsonl(tmp_path))
+        assert len(records) == 300
+        for path in files:
+            day = path.parent.name[5:]
+            assert all(r["startDateTime"].startswith(day) for r in read_jsonl(path))
+
+    def test_main(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        """Test the command line entry point."""
+        out = tmp_path / "calls.jsonl"
+        assert main(["--count", "10", "--out", str(out), "--workers", "1"]) == 0
+        assert len(list(read_jsonl(out))) == 10
+        assert "Wrote 10 records" in capsys.readouterr().out
@@ -0,0 +1,172 @@
+"""
+Tests for the tracing utilities.
+"""
+
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import respx
+
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.graph.client import GraphClient
+from eden_teams.models.llm_client import LLMClient
+from eden_teams.utils import tracing
+from eden_teams.utils.tracing import (
+    ConsoleSpanExporter,
+    InMemorySpanExporter,
+    JsonSpanExporter,
+)
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemorySpanExporter]:
+    """Enable tracing into an in-memory exporter for one test."""
+    exporter = InMemorySpanExporter()
+    tracing.set_exporter(exporter)
+    yield exporter
+    tracing.set_exporter(None)
+
+
+class TestSpans:
+    """Tests for span creation and propagation."""
+
+    def test_disabled_by_default(self) -> None:
+        """Test that spans are no-ops until an exporter is configured."""
+        assert tracing.is_enabled() is False
+        with tracing.span("work", key="value") as span:
+            span.set_attribute("x", 1)
+            assert span is tracing.NOOP_SPAN
+            assert tracing.current_span() is tracing.NOOP_SPAN
+
+    def test_parent_child(self, exporter: InMemorySpanExporter) -> None:
+        """Test that nested spans share a trace and link to their parent."""
+        with tracing.span("root") as root:
+            with tracing.span("child", n=1) as child:
+                assert tracing.current_span() is child
+            assert tracing.current_span() is root
+
+        assert [s.name for s in exporter.spans] == ["child", "root"]
+        assert child.trace_id == root.trace_id
+        assert child.parent_span_id == root.span_id
+        assert root.parent_span_id is None
+        assert len(root.trace_id) == 32 and len(root.span_id) == 16
+        assert child.attributes == {"n": 1}
+
+    def test_exception_recorded(self, exporter: InMemorySpanExporter) -> None:
+        """Test that an exception marks the span as failed."""
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+
+        span = exporter.spans[0]
+        assert span.status == tracing.STATUS_ERROR
+        assert span.events[0]["attributes"]["exception.message"] == "boom"
+        assert tracing.current_span() is tracing.NOOP_SPAN
+
+    def test_traced_decorator(self, exporter: InMemorySpanExporter) -> None:
+        """Test running a function inside a span."""
+
+        @tracing.traced("decorated", layer="test")
+        def work() -> str:
+            return tracing.current_span().name  # type: ignore[union-attr]
+
+        assert work() == "decorated"
+        assert exporter.spans[0].attributes == {"layer": "test"}
+
+    def test_configure_unknown_exporter(self) -> None:
+        """Test that unknown exporter names are rejected."""
+        with pytest.raises(ValueError, match="Unknown tracing exporter"):
+            tracing.configure("zipkin")
+
+
+class TestExporters:
+    """Tests for the offline exporters."""
+
+    def test_json_exporter(self) -> None:
+        """Test that spans are written as OTLP-shaped JSON lines."""
+        stream = io.StringIO()
+        tracing.set_exporter(JsonSpanExporter(stream=stream))
+        try:
+            with tracing.span("root"):
+                with tracing.span("child", **{"http.status_code": 200}):
+                    pass
+        finally:
+            tracing.set_exporter(None)
+
+        child, root = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["traceId"] == root["traceId"]
+        assert child["attributes"] == {"http.status_code": 200}
+        assert root["endTimeUnixNano"] >= root["startTimeUnixNano"]
+        assert root["status"] == {"code": tracing.STATUS_UNSET}
+
+    def test_console_exporter_prints_tree(self) -> None:
+        """Test that a trace is printed once its root span ends."""
+        stream = io.StringIO()
+        tracing.set_exporter(ConsoleSpanExporter(stream=stream))
+        try:
+            with tracing.span("assistant.query"):
+                with tracing.span("graph.request", page=1):
+                    pass
+                assert stream.getvalue() == ""
+        finally:
+            tracing.set_exporter(None)
+
+        lines = stream.getvalue().splitlines()
+        assert lines[0].startswith("trace ")
+        assert lines[1].startswith("  assistant.query ")
+        assert lines[2].startswith("    graph.request ")
+        assert lines[2].endswith("page=1")
+
+
+class TestInstrumentation:
+    """Tests for spans emitted by the application layers."""
+
+    @respx.mock
+    def test_call_records_trace(
+        self, exporter: InMemorySpanExporter, mock_graph_response: list
+    ) -> None:
+        """Test the span tree for fetching and parsing call records."""
+        auth = MagicMock()
+        auth.get_token.return_value = "token"
+        respx.get("https://graph.microsoft.com/v1.0/communications/callRecords").mock(
+            return_value=httpx.Response(200, json={"value": mock_graph_response})
+        )
+        service = CallRecordService(graph_client=GraphClient(auth_provider=auth))
+
+        records = service.get_call_records(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        spans = {s.name: s for s in exporter.spans}
+        root = spans["cdr.get_call_records"]
+        assert root.attributes["cdr.record_count"] == len(records) == 2
+        assert spans["graph.request"].parent_span_id == root.span_id
+        assert spans["graph.request"].attributes["http.status_code"] == 200
+        assert (
+            spans["graph.request"]
+            .attributes["http.target"]
+            .endswith("/communications/callRecords")
+        )
+        assert spans["cdr.parse"].parent_span_id == root.span_id
+
+    def test_llm_span(self, exporter: InMemorySpanExporter) -> None:
+        """Test that LLM calls record model and token counts."""
+        client = LLMClient(model="gpt-4")
+        response = MagicMock()
+        response.choices[0].message.content = "answer"
+        response.usage.prompt_tokens = 80
+        response.usage.completion_tokens = 12
+        client._client = MagicMock()
+        client._client.chat.completions.create.return_value = response
+
+        client.chat("hello")
+
+        span = exporter.spans[0]
+        assert span.name == "llm.chat"
+        assert span.attributes["llm.model"] == "gpt-4"
+        assert span.attributes["llm.prompt_tokens"] == 80
+        assert span.attributes["llm.completion_tokens"] == 12
@@ -0,0 +1,189 @@
+"""
+Tests for the built-in vector index.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from eden_teams.models.vector_index import VectorIndex
+
+
+def _unit(*values: float) -> List[float]:
+    """Create a vector."""
+    return list(values)
+
+
+def _fill(index: VectorIndex) -> None:
+    """Add four records pointing in different directions."""
+    index.upsert(
+        ids=["a", "b", "c", "d"],
+        embeddings=[_unit(1, 0, 0), _unit(0.9, 0.1, 0), _unit(0, 1, 0), _unit(0, 0, 1)],
+        documents=["doc a", "doc b", "doc c", "doc d"],
+        metadatas=[
+            {"call_type": "groupCall", "duration_seconds": 60},
+            {"call_type": "peerToPeer", "duration_seconds": 600},
+            {"call_type": "groupCall", "duration_seconds": 1200},
+            {"call_type": "peerToPeer"},
+        ],
+    )
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex class."""
+
+    def test_query_orders_by_similarity(self, tmp_path: Path) -> None:
+        """Test that the nearest records come first, in ChromaDB's shape."""
+        index = VectorIndex(str(tmp_path))
+        _fill(index)
+
+        result = index.query([_unit(1, 0, 0)], n_results=2)
+
+        assert result["ids"] == [["a", "b"]]
+        assert result["documents"] == [["doc a", "doc b"]]
+        assert result["metadatas"][0][0]["call_type"] == "groupCall"
+        assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+        assert result["distances"][0][0] < result["distances"][0][1]
+
+    def test_where_filters(self, tmp_path: Path) -> None:
+        """Test equality, range, set and boolean metadata filters."""
+        index = VectorIndex(str(tmp_path))
+        _fill(index)
+        query = [_unit(1, 0, 0)]
+
+        def ids(where: Dict[str, Any]) -> List[str]:
+            return sorted(index.query(query, n_results=10, where=where)["ids"][0])
+
+        assert ids({"call_type": "groupCall"}) == ["a", "c"]
+        assert ids({"duration_seconds": {"$gte": 600}}) == ["b", "c"]
+        assert ids({"call_type": {"$in": ["peerToPeer"]}}) == ["b", "d"]
+        assert ids(
+            {"$and": [{"call_type": "peerToPeer"}, {"duration_seconds": {"$lt": 900}}]}
+        ) == ["b"]
+        assert ids(
+            {"$or": [{"call_type": {"$ne": "groupCall"}}, {"duration_seconds": 60}]}
+        ) == ["a", "b", "d"]
+        with pytest.raises(ValueError):
+            index.query(query, where={"call_type": {"$like": "group"}})
+
+    def test_upsert_replaces_and_delete_removes(self, tmp_path: Path) -> None:
+        """Test that re-added IDs are replaced and deleted IDs disappear."""
+        index = VectorIndex(str(tmp_path))
+        _fill(index)
+
+        index.upsert(ids=["d"], embeddings=[_unit(1, 0, 0)], documents=["new d"])
+        index.delete(["a", "missing"])
+
+        result = index.query([_unit(1, 0, 0)], n_results=1)
+        assert result["ids"] == [["d"]]
+        assert result["documents"] == [["new d"]]
+        assert index.count() == 3
+        assert index.get(["a", "d"])["ids"] == ["d"]
+
+    def test_persists_and_compacts(self, tmp_path: Path) -> None:
+        """Test that a reopened index replays writes and deletes."""
+        index = VectorIndex(str(tmp_path))
+        _fill(index)
+        index.upsert(ids=["b"], embeddings=[_unit(0, 1, 0)])
+        index.delete(["c"])
+
+        reopened = VectorIndex(str(tmp_path))
+        assert reopened.count() == 3
+        assert reopened.query([_unit(0, 1, 0)], n_results=1)["ids"] == [["b"]]
+
+        reopened.compact()
+        assert os.path.getsize(tmp_path / "vectors") == 3 * 3 * 4
+        assert VectorIndex(str(tmp_path)).get(["a", "b", "d"])["ids"] == [
+            "a",
+            "b",
+            "d",
+        ]
+
+    def test_torn_write_is_discarded(self, tmp_path: Path) -> None:
+        """Test that partial rows and log lines are dropped on open."""
+        _fill(VectorIndex(str(tmp_path)))
+        with open(tmp_path / "vectors", "ab") as f:
+            f.write(b"\0" * 5)
+        with open(tmp_path / "records.jsonl", "a") as f:
+            f.write('{"id": "e", "row"')
+
+        index = VectorIndex(str(tmp_path))
+        index.upsert(ids=["e"], embeddings=[_unit(0, 1, 1)])
+
+        assert index.count() == 5
+        assert index.query([_unit(0, 1, 1)], n_results=1)["ids"] == [["e"]]
+
+        reopened = VectorIndex(str(tmp_path))
+        assert reopened.count() == 5
+        assert reopened.query([_unit(0, 1, 1)], n_results=1)["ids"] == [["e"]]
+
+    def test_quantized_matches_float(self, tmp_path: Path) -> None:
+        """Test that int8 vectors rank like float32 at a quarter of the size."""
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(500, 32)).tolist()
+        ids = [f"call-{i}" for i in range(500)]
+        exact = VectorIndex(str(tmp_path / "exact"))
+        quantized = VectorIndex(str(tmp_path / "int8"), quantize=True)
+        exact.upsert(ids=ids, embeddings=vectors)
+        quantized.upsert(ids=ids, embeddings=vectors)
+
+        queries = rng.normal(size=(20, 32)).tolist()
+        expected = exact.query(queries, n_results=10)["ids"]
+        actual = quantized.query(queries, n_results=10)["ids"]
+
+        overlap = np.mean([len(set(e) & set(a)) / 10 for e, a in zip(expected, actual)])
+        assert overlap > 0.9
+        assert os.path.getsize(tmp_path / "int8" / "vectors") == 500 * 32
+        assert VectorIndex(str(tmp_path / "int8")).quantize is True
+
+    def test_dimension_mismatch(self, tmp_path: Path) -> None:
+        """Test that vectors of another dimension are rejected."""
+        index = VectorIndex(str(tmp_path))
+        _fill(index)
+
+        with pytest.raises(ValueError):
+            index.upsert(ids=["e"], embeddings=[_unit(1, 0)])
+
+
+class TestEmbeddingsFallback:
+    """Tests for EmbeddingsClient without ChromaDB installed."""
+
+    def test_search_without_chromadb(self, tmp_path: Path) -> None:
+        """Test that indexing and search work when chromadb cannot be imported."""
+        script = f"""
+import sys
+from datetime import datetime
+sys.modules["chromadb"] = None
+from eden_teams.cdr.models import CallRecord, CallType
+from eden_teams.models.embeddings import CHROMADB_AVAILABLE, EmbeddingsClient
+assert not CHROMADB_AVAILABLE
+client = EmbeddingsClient(persist_directory={str(tmp_path)!r})
+records = [
+    CallRecord(
+        id="p2p", call_type=CallType.PEER_TO_PEER, start_time=datetime(2024, 1, 1)
+    ),
+    CallRecord(
+        id="group", call_type=CallType.GROUP_CALL, start_time=datetime(2024, 1, 2)
+    ),
+]
+assert client.add_call_records(records) == 2
+results = client.search_calls("Call Type: peerToPeer", n_results=1)
+assert [r["id"] for r in results] == ["p2p"], results
+assert set(results[0]) == {{"id", "document", "metadata", "distance"}}
+filtered = client.search_calls("peerToPeer", where={{"call_type": "groupCall"}})
+assert [r["id"] for r in filtered] == ["group"]
+client.delete_call_record("p2p")
+assert client.collection.count() == 1
+client.clear_collection()
+assert client.collection.count() == 0
+"""
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+
+        assert result.returncode == 0, result.stderr
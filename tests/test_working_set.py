@@ -0,0 +1,244 @@
+"""
+Tests for the session working set.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import MagicMock
+
+from eden_teams.cdr.models import CallRecord
+from eden_teams.cdr.service import CallRecordService
+from eden_teams.cdr.working_set import WorkingSet
+from eden_teams.graph.client import GraphClient
+from eden_teams.testing.graph_server import (
+    FakeGraphConfig,
+    FakeGraphServer,
+    StaticTokenProvider,
+)
+
+NOW = datetime(2024, 1, 15, 12, 0, 0)
+
+
+def _record(call_id: str, start: datetime, version: int = 1) -> CallRecord:
+    """Create a call record starting at the given time."""
+    return CallRecord(
+        id=call_id,
+        start_time=start,
+        end_time=start + timedelta(minutes=10),
+        version=version,
+    )
+
+
+def _service(*batches: List[CallRecord]) -> MagicMock:
+    """Create a service mock returning one batch per fetch."""
+    service = MagicMock()
+    service.iter_call_records.side_effect = [iter(batch) for batch in batches]
+    service.get_call_summary.side_effect = lambda records: {"total_calls": len(records)}
+    return service
+
+
+class TestWorkingSet:
+    """Tests for WorkingSet class."""
+
+    def test_first_request_loads_window(self) -> None:
+        """Test that the first request fetches the whole window."""
+        service = _service([_record("a", NOW - timedelta(days=1))])
+        working_set = WorkingSet(
+            service, days=7, staleness_seconds=60, clock=lambda: NOW
+        )
+
+        records = working_set.get_records()
+
+        assert [r.id for r in records] == ["a"]
+        service.iter_call_records.assert_called_once_with(
+            start_date=NOW - timedelta(days=7), end_date=NOW, limit=100
+        )
+        assert working_set.last_stats is not None
+        assert working_set.last_stats.result == "load"
+
+    def test_fresh_requests_hit_cache(self) -> None:
+        """Test that requests within the staleness interval skip Graph."""
+        service = _service([_record("a", NOW - timedelta(days=1))])
+        working_set = WorkingSet(service, staleness_seconds=60, clock=lambda: NOW)
+
+        working_set.get_records()
+        version = working_set.version
+        summary = working_set.get_summary()
+        records = working_set.get_records()
+
+        assert len(records) == 1
+        assert service.iter_call_records.call_count == 1
+        assert working_set.last_stats is not None
+        assert working_set.last_stats.cache_hit is True
+        assert working_set.version == version
+        assert working_set.get_summary() is summary
+        service.get_call_summary.assert_called_once()
+
+    def test_stale_refresh_fetches_tail_and_merges(self) -> None:
+        """Test that a stale working set refetches only the tail."""
+        clock = MagicMock(return_value=NOW)
+        later = NOW + timedelta(minutes=30)
+        service = _service(
+            [
+                _record("old", NOW - timedelta(days=6, hours=23, minutes=50)),
+                _record("a", NOW - timedelta(hours=2)),
+            ],
+            [
+                _record("a", NOW - timedelta(hours=2), version=2),
+                _record("b", NOW + timedelta(minutes=5)),
+            ],
+        )
+        working_set = WorkingSet(
+            service, staleness_seconds=0, overlap_seconds=3600, clock=clock
+        )
+        working_set.get_records()
+        working_set.get_summary()
+
+        clock.return_value = later
+        records = working_set.get_records()
+
+        tail_call = service.iter_call_records.call_args_list[1]
+        assert tail_call.kwargs["start_date"] == NOW - timedelta(hours=1)
+        assert tail_call.kwargs["end_date"] == later
+        # "old" slid out of the window; "a" was replaced by its new version
+        assert sorted(r.id for r in records) == ["a", "b"]
+        assert {r.id: r.version for r in records}["a"] == 2
+        assert working_set.last_stats is not None
+        assert working_set.last_stats.result == "refresh"
+        assert working_set.last_stats.new_records == 2
+        assert working_set.get_summary() == {"total_calls": 2}
+
+    def test_refresh_keeps_newest_up_to_limit(self) -> None:
+        """Test that merging the tail does not grow the set past the limit."""
+        clock = MagicMock(return_value=NOW)
+        service = _service(
+            [_record(f"old-{i}", NOW - timedelta(hours=10 - i)) for i in range(3)],
+            [_record(f"new-{i}", NOW + timedelta(minutes=i)) for i in range(2)],
+        )
+        working_set = WorkingSet(service, limit=3, staleness_seconds=0, clock=clock)
+        working_set.get_records()
+
+        clock.return_value = NOW + timedelta(minutes=5)
+        records = working_set.get_records()
+
+        assert sorted(r.id for r in records) == ["new-0", "new-1", "old-2"]
+
+    def test_clear_forces_reload(self) -> None:
+        """Test that clear() drops the cache."""
+        service = _service([_record("a", NOW)], [_record("b", NOW)])
+        working_set = WorkingSet(service, staleness_seconds=60, clock=lambda: NOW)
+
+        working_set.get_records()
+        working_set.clear()
+        records = working_set.get_records()
+
+        assert [r.id for r in records] == ["b"]
+        assert working_set.last_stats is not None
+        assert working_set.last_stats.result == "load"
+
+    def test_watermark_tracks_data_and_date(self) -> None:
+        """Test that the watermark changes with new records and at midnight."""
+        clock = MagicMock(return_value=NOW)
+        service = _service(
+            [_record("a", NOW - timedelta(hours=2))],
+            [_record("a", NOW - timedelta(hours=2))],
+            [_record("b", NOW - timedelta(minutes=5))],
+        )
+        working_set = WorkingSet(service, staleness_seconds=0, clock=clock)
+
+        working_set.get_records()
+        first = working_set.get_watermark()
+        working_set.get_records()
+        assert working_set.get_watermark() == first
+
+        working_set.get_records()
+        second = working_set.get_watermark()
+        assert second != first
+
+        clock.return_value = NOW + timedelta(days=1)
+        assert working_set.get_watermark() != second
+
+    def test_load_follows_pages(self) -> None:
+        """Test that a load reads every page, up to the limit."""
+        config = FakeGraphConfig(record_count=250, page_size=100, days=1)
+        end = config.start_date + timedelta(days=1)
+        with (
+            FakeGraphServer(config) as server,
+            GraphClient(
+                base_url=server.url, auth_provider=StaticTokenProvider()
+            ) as graph,
+        ):
+            service = CallRecordService(graph_client=graph)
+
+            unbounded = WorkingSet(service, days=1, limit=None, clock=lambda: end)
+            limited = WorkingSet(service, days=1, limit=150, clock=lambda: end)
+
+            assert len(unbounded.get_records()) == 250
+            assert len(limited.get_records()) == 150
+
+
+class TestRollupWorkingSet:
+    """Tests for WorkingSet in rollup mode."""
+
+    def test_wide_window_streams_into_rollups(self) -> None:
+        """Test that long windows stream every record and keep a sample."""
+        records = [_record(str(i), NOW - timedelta(days=i)) for i in range(60)]
+        service = MagicMock()
+        service.iter_call_records.return_value = iter(records)
+        working_set = WorkingSet(
+            service, days=90, sample_size=5, staleness_seconds=60, clock=lambda: NOW
+        )
+
+        sample = working_set.get_records()
+
+        assert working_set.rollup is True
+        start = service.iter_call_records.call_args.kwargs["start_date"]
+        assert start == datetime(2023, 10, 17)
+        service.get_call_records.assert_not_called()
+        assert [r.id for r in sample] == ["0", "1", "2", "3", "4"]
+        assert working_set.total_records == 60
+        summary = working_set.get_summary()
+        assert summary is not None
+        assert summary["total_calls"] == 60
+        assert len(summary["daily_counts"]) == 60
+        service.get_call_summary.assert_not_called()
+
+    def test_refresh_restreams_touched_days(self) -> None:
+        """Test that a refresh rebuilds only days touched by the tail."""
+        clock = MagicMock(return_value=NOW)
+        service = MagicMock()
+        service.iter_call_records.side_effect = [
+            iter(
+                [
+                    _record("old", NOW - timedelta(days=30)),
+                    _record("a", NOW - timedelta(days=3)),
+                    _record("b", NOW - timedelta(hours=1)),
+                ]
+            ),
+            iter(
+                [
+                    _record("b", NOW - timedelta(hours=1)),
+                    _record("c", NOW + timedelta(days=1)),
+                ]
+            ),
+        ]
+        working_set = WorkingSet(
+            service,
+            days=30,
+            rollup=True,
+            staleness_seconds=0,
+            overlap_seconds=3600,
+            clock=clock,
+        )
+        working_set.get_records()
+
+        clock.return_value = NOW + timedelta(days=1, hours=1)
+        sample = working_set.get_records()
+
+        refresh = service.iter_call_records.call_args_list[1]
+        assert refresh.kwargs["start_date"] == datetime(2024, 1, 15)
+        # "old" expired with its day, "b" was re-streamed rather than doubled
+        assert sorted(r.id for r in sample) == ["a", "b", "c"]
+        assert working_set.total_records == 3
+        assert working_set.last_stats is not None
+        assert working_set.last_stats.result == "refresh"